@@ -0,0 +1,52 @@
+"""
+Ranking fingerprints and deltas for periodic chart collection.
+
+A chart ranking is reduced to ``(rank, title, artist)`` rows; its SHA-1
+fingerprint tells whether a freshly parsed chart differs from the last one
+we stored.  When it does, the difference is: tracks that moved
+(``moves``), tracks that entered (``entries``, with the full track dict)
+and tracks that dropped out (``exits``).  Only changed charts are written
+to the chart history store; the summary goes to the collection log.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, List
+
+
+def track_key(track: Dict[str, Any]) -> str:
+    """곡 식별 키 (제목 + 아티스트, 공백/대소문자 정규화)"""
+    title = ' '.join(str(track.get('title', '')).split()).lower()
+    artist = ' '.join(str(track.get('artist', '')).split()).lower()
+    return f"{title}\x1f{artist}"
+
+
+def _keyed(tracks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """식별 키 -> 곡 (같은 곡이 여러 번 있으면 #2, #3 … 접미사)"""
+    keyed, seen = {}, {}
+    for track in sorted(tracks, key=lambda t: t.get('rank') or 0):
+        key = track_key(track)
+        seen[key] = seen.get(key, 0) + 1
+        keyed[key if seen[key] == 1 else f"{key}#{seen[key]}"] = track
+    return keyed
+
+
+def ranking_fingerprint(tracks: List[Dict[str, Any]]) -> str:
+    """순위 목록의 내용 지문 (rank, 제목, 아티스트 기준 SHA-1)"""
+    rows = [(t.get('rank'), t.get('title'), t.get('artist')) for t in sorted(tracks, key=lambda t: t.get('rank') or 0)]
+    return hashlib.sha1(json.dumps(rows, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def diff_rankings(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> Dict[str, list]:
+    """이전/현재 순위 비교 - 순위 이동, 신규 진입, 이탈 목록"""
+    before, after = _keyed(previous), _keyed(current)
+    moves = [
+        {'key': key, 'from': before[key].get('rank'), 'to': track.get('rank')}
+        for key, track in after.items()
+        if key in before and before[key].get('rank') != track.get('rank')
+    ]
+    entries = [track for key, track in after.items() if key not in before]
+    exits = [{'key': key, 'rank': track.get('rank')} for key, track in before.items() if key not in after]
+    return {'moves': moves, 'entries': entries, 'exits': exits}
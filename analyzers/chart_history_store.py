@@ -0,0 +1,342 @@
+"""
+Chart ranking history in a local SQLite file.
+
+Replaces the per-collection JSON files of ChartScheduler.  Every stored
+chart becomes narrow rows ``(chart_date, kind, service, chart_type,
+collected_at, rank, track_id)`` in a ``WITHOUT ROWID`` table whose primary
+key starts with the date, so each day's rows sit together on disk
+(SQLite has no real partitions; the clustered date prefix gives the same
+effect).  Date-range scans for weekly/monthly stats read only those
+pages, and retention deletes whole date ranges.  ``chart_tracks`` only
+holds track identity (title/artist) so each is stored once; album and the
+service-specific fields (song_id, url, thumbnail …) stay on the row they
+were collected with.  An index on ``(track_id, collected_at)`` serves
+per-track rank history.
+
+- chart_collections: one row per collection run, including runs where
+  nothing changed
+- chart_snapshots: one row per stored chart (service/chart_type) with its
+  ranking fingerprint; realtime charts are only stored when they changed,
+  so the ranking at any time is the latest snapshot before it
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from analyzers.chart_deltas import track_key
+except ImportError:
+    from chart_deltas import track_key
+
+
+SCHEMA_SQL = (
+    "CREATE TABLE IF NOT EXISTS chart_tracks ("
+    " id INTEGER PRIMARY KEY,"
+    " track_key TEXT NOT NULL UNIQUE,"
+    " title TEXT NOT NULL,"
+    " artist TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS chart_collections ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " collected_at REAL NOT NULL,"
+    " chart_date TEXT NOT NULL,"
+    " kind TEXT NOT NULL,"            # realtime | daily
+    " total_services INTEGER NOT NULL DEFAULT 0,"
+    " successful_services INTEGER NOT NULL DEFAULT 0,"
+    " stored_charts INTEGER NOT NULL DEFAULT 0,"
+    " total_tracks INTEGER NOT NULL DEFAULT 0)",
+    "CREATE TABLE IF NOT EXISTS chart_snapshots ("
+    " collection_id INTEGER NOT NULL,"
+    " chart_date TEXT NOT NULL,"
+    " kind TEXT NOT NULL,"
+    " service TEXT NOT NULL,"
+    " chart_type TEXT NOT NULL,"
+    " collected_at REAL NOT NULL,"
+    " fingerprint TEXT,"
+    " track_count INTEGER NOT NULL,"
+    " PRIMARY KEY (kind, service, chart_type, collected_at))",
+    "CREATE TABLE IF NOT EXISTS chart_rows ("
+    " chart_date TEXT NOT NULL,"
+    " kind TEXT NOT NULL,"
+    " service TEXT NOT NULL,"
+    " chart_type TEXT NOT NULL,"
+    " collected_at REAL NOT NULL,"
+    " rank INTEGER NOT NULL,"
+    " track_id INTEGER NOT NULL,"
+    " album TEXT,"
+    " extra TEXT,"                    # song_id/url/thumbnail 등 서비스별 부가 필드 (JSON)
+    " PRIMARY KEY (chart_date, kind, service, chart_type, collected_at, rank, track_id)"
+    ") WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS idx_chart_rows_track ON chart_rows(track_id, collected_at)",
+    "CREATE INDEX IF NOT EXISTS idx_chart_collections_date ON chart_collections(kind, chart_date)",
+    "CREATE INDEX IF NOT EXISTS idx_chart_snapshots_date ON chart_snapshots(chart_date)",
+)
+
+# chart_rows.extra에 넣지 않는 필드 (나머지 서비스별 필드는 JSON으로 행에 보관)
+CORE_FIELDS = {'rank', 'title', 'artist', 'album', 'chart_type', 'source'}
+
+
+def _chart_date(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+
+def _date_str(value) -> str:
+    return value.strftime('%Y-%m-%d') if isinstance(value, (date, datetime)) else str(value)
+
+
+class ChartHistoryStore:
+    """SQLite-backed chart rows, partitioned by date, with range and per-track queries."""
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            for statement in SCHEMA_SQL:
+                conn.execute(statement)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # =========================
+    # Writes
+    # =========================
+    def append_collection(
+        self,
+        chart_data: Dict[str, Any],
+        kind: str,
+        collected_at: float = None,
+        charts: Optional[Iterable[str]] = None,
+        fingerprints: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """
+        수집 결과 한 번을 기록하고 collection id 반환
+
+        charts가 주어지면 그 차트("service/chart_type")만 행으로 저장하고 (변동 없는 차트 생략),
+        None이면 수집된 모든 차트를 저장한다.
+        """
+        collected_at = collected_at or time.time()
+        chart_date = _chart_date(collected_at)
+        selected = None if charts is None else set(charts)
+        fingerprints = fingerprints or {}
+
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO chart_collections (collected_at, chart_date, kind, total_services, successful_services) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (collected_at, chart_date, kind, chart_data.get('total_services', 0),
+                 chart_data.get('successful_services', 0)),
+            )
+            collection_id = cursor.lastrowid
+            stored_charts = stored_tracks = 0
+
+            for service, by_type in chart_data.get('services', {}).items():
+                for chart_type, result in by_type.items():
+                    chart_key = f"{service}/{chart_type}"
+                    tracks = result.get('tracks') or []
+                    if (selected is not None and chart_key not in selected) or not tracks:
+                        continue
+                    rows = [
+                        (chart_date, kind, service, chart_type, collected_at, int(track.get('rank') or 0),
+                         self._track_id(conn, track), track.get('album'), self._extra(track))
+                        for track in tracks
+                    ]
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO chart_rows (chart_date, kind, service, chart_type, collected_at, "
+                        "rank, track_id, album, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO chart_snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (collection_id, chart_date, kind, service, chart_type, collected_at,
+                         fingerprints.get(chart_key), len(rows)),
+                    )
+                    stored_charts += 1
+                    stored_tracks += len(rows)
+
+            conn.execute(
+                "UPDATE chart_collections SET stored_charts = ?, total_tracks = ? WHERE id = ?",
+                (stored_charts, stored_tracks, collection_id),
+            )
+        return collection_id
+
+    def has_collection(self, kind: str, collected_at: float) -> bool:
+        row = self._conn().execute(
+            "SELECT 1 FROM chart_collections WHERE kind = ? AND collected_at = ?", (kind, collected_at)
+        ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _track_id(conn: sqlite3.Connection, track: Dict[str, Any]) -> int:
+        """곡 식별 행 id (제목+아티스트, 없으면 생성)"""
+        key = track_key(track)
+        conn.execute(
+            "INSERT OR IGNORE INTO chart_tracks (track_key, title, artist) VALUES (?, ?, ?)",
+            (key, track.get('title') or '', track.get('artist') or ''),
+        )
+        return conn.execute("SELECT id FROM chart_tracks WHERE track_key = ?", (key,)).fetchone()["id"]
+
+    @staticmethod
+    def _extra(track: Dict[str, Any]) -> Optional[str]:
+        extra = {k: v for k, v in track.items() if k not in CORE_FIELDS}
+        return json.dumps(extra, ensure_ascii=False) if extra else None
+
+    def prune(self, before_date) -> int:
+        """before_date 이전 날짜의 기록 삭제 (날짜 파티션 단위), 삭제된 행 수 반환"""
+        cutoff = _date_str(before_date)
+        with self._transaction() as conn:
+            deleted = conn.execute("DELETE FROM chart_rows WHERE chart_date < ?", (cutoff,)).rowcount
+            conn.execute("DELETE FROM chart_snapshots WHERE chart_date < ?", (cutoff,))
+            conn.execute("DELETE FROM chart_collections WHERE chart_date < ?", (cutoff,))
+            conn.execute(
+                "DELETE FROM chart_tracks WHERE NOT EXISTS "
+                "(SELECT 1 FROM chart_rows WHERE chart_rows.track_id = chart_tracks.id)"
+            )
+        return deleted
+
+    # =========================
+    # Rankings
+    # =========================
+    def latest_snapshot(self, service: str, chart_type: str, kind: str = 'realtime',
+                        at: float = None) -> Optional[Dict[str, Any]]:
+        """at 시점(기본: 지금)에 유효한 마지막 저장 순위 - {'collected_at', 'fingerprint', 'tracks'}"""
+        snapshot = self._conn().execute(
+            "SELECT chart_date, collected_at, fingerprint FROM chart_snapshots "
+            "WHERE kind = ? AND service = ? AND chart_type = ? AND collected_at <= ? "
+            "ORDER BY collected_at DESC LIMIT 1",
+            (kind, service, chart_type, at or time.time()),
+        ).fetchone()
+        if snapshot is None:
+            return None
+        rows = self._conn().execute(
+            "SELECT r.rank, t.title, t.artist, r.album, r.extra FROM chart_rows r "
+            "JOIN chart_tracks t ON t.id = r.track_id "
+            "WHERE r.chart_date = ? AND r.kind = ? AND r.service = ? AND r.chart_type = ? AND r.collected_at = ? "
+            "ORDER BY r.rank",
+            (snapshot["chart_date"], kind, service, chart_type, snapshot["collected_at"]),
+        ).fetchall()
+        tracks = [
+            {'rank': row["rank"], 'title': row["title"], 'artist': row["artist"], 'album': row["album"],
+             **json.loads(row["extra"] or '{}'), 'chart_type': chart_type, 'source': service}
+            for row in rows
+        ]
+        return {'collected_at': snapshot["collected_at"], 'fingerprint': snapshot["fingerprint"], 'tracks': tracks}
+
+    def charts_at(self, kind: str = 'realtime', at: float = None) -> Dict[str, List[Dict[str, Any]]]:
+        """at 시점의 차트별 순위 {"service/chart_type": [곡…]}"""
+        charts = self._conn().execute(
+            "SELECT DISTINCT service, chart_type FROM chart_snapshots WHERE kind = ? AND collected_at <= ?",
+            (kind, at or time.time()),
+        ).fetchall()
+        return {
+            f"{row['service']}/{row['chart_type']}": self.latest_snapshot(row["service"], row["chart_type"], kind, at)["tracks"]
+            for row in charts
+        }
+
+    def track_history(self, title: str, artist: str, start_date=None, end_date=None,
+                      kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """곡의 순위 기록 (저장 시점별 서비스/차트/순위, 시간순)"""
+        track = self._conn().execute(
+            "SELECT id FROM chart_tracks WHERE track_key = ?", (track_key({'title': title, 'artist': artist}),)
+        ).fetchone()
+        if track is None:
+            return []
+        sql = ("SELECT collected_at, chart_date, kind, service, chart_type, rank FROM chart_rows "
+               "WHERE track_id = ?")
+        params: List[Any] = [track["id"]]
+        if start_date is not None:
+            sql += " AND chart_date >= ?"
+            params.append(_date_str(start_date))
+        if end_date is not None:
+            sql += " AND chart_date <= ?"
+            params.append(_date_str(end_date))
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        rows = self._conn().execute(sql + " ORDER BY collected_at, service", params).fetchall()
+        return [dict(row) for row in rows]
+
+    # =========================
+    # Range statistics
+    # =========================
+    def period_stats(self, start_date, end_date, kind: str = 'daily', top: int = 20) -> Dict[str, Any]:
+        """
+        기간(날짜 포함) 통계 - 수집 횟수, 평균 성공률, 크로스 플랫폼 히트곡
+
+        히트곡의 appearances는 2개 이상 서비스 차트에 함께 오른 날 수.
+        """
+        start, end = _date_str(start_date), _date_str(end_date)
+        conn = self._conn()
+        summary = conn.execute(
+            "SELECT COUNT(*) AS collections, COALESCE(SUM(total_tracks), 0) AS tracks, "
+            "AVG(CASE WHEN total_services > 0 THEN 100.0 * successful_services / total_services END) AS success_rate "
+            "FROM chart_collections WHERE kind = ? AND chart_date BETWEEN ? AND ?",
+            (kind, start, end),
+        ).fetchone()
+        hits = conn.execute(
+            "WITH per_day AS ("
+            " SELECT chart_date, track_id, COUNT(DISTINCT service) AS services, MIN(rank) AS best_rank, AVG(rank) AS avg_rank"
+            " FROM chart_rows WHERE chart_date BETWEEN ? AND ? AND kind = ?"
+            " GROUP BY chart_date, track_id) "
+            "SELECT t.title, t.artist, SUM(services >= 2) AS appearances, COUNT(*) AS days_charted, "
+            "MAX(services) AS max_services, MIN(best_rank) AS best_rank, AVG(avg_rank) AS avg_rank "
+            "FROM per_day JOIN chart_tracks t ON t.id = per_day.track_id "
+            "GROUP BY per_day.track_id HAVING appearances > 0 "
+            "ORDER BY appearances DESC, avg_rank LIMIT ?",
+            (start, end, kind, top),
+        ).fetchall()
+        return {
+            'period': f"{start} ~ {end}",
+            'kind': kind,
+            'total_collections': summary["collections"],
+            'total_tracks_collected': summary["tracks"],
+            'average_success_rate': round(summary["success_rate"] or 0, 2),
+            'top_hits': [
+                {'track': f"{row['title']} - {row['artist']}", 'title': row["title"], 'artist': row["artist"],
+                 'appearances': row["appearances"], 'days_charted': row["days_charted"],
+                 'max_services': row["max_services"], 'best_rank': row["best_rank"],
+                 'avg_rank': round(row["avg_rank"], 1)}
+                for row in hits
+            ],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        counts = conn.execute(
+            "SELECT (SELECT COUNT(*) FROM chart_collections) AS collections, "
+            "(SELECT COUNT(*) FROM chart_snapshots) AS snapshots, "
+            "(SELECT COUNT(*) FROM chart_tracks) AS tracks, "
+            "(SELECT MIN(chart_date) FROM chart_collections) AS first_date, "
+            "(SELECT MAX(chart_date) FROM chart_collections) AS last_date"
+        ).fetchone()
+        return {**dict(counts), 'path': self.path,
+                'size_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0}
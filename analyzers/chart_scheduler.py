@@ -7,29 +7,73 @@ Chart Scheduler - 주기적 차트 수집 자동화
 import os
 import json
 import time
-import schedule
+import random
+import socket
 import threading
+import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
 
 try:
-    from korea_music_charts_connector import KoreaMusicChartsConnector
+    from connectors.korea_music_charts_connector import KoreaMusicChartsConnector
     KOREA_CHARTS_AVAILABLE = True
 except ImportError:
-    KOREA_CHARTS_AVAILABLE = False
-    print("KoreaMusicChartsConnector를 찾을 수 없습니다.")
+    try:
+        from korea_music_charts_connector import KoreaMusicChartsConnector
+        KOREA_CHARTS_AVAILABLE = True
+    except ImportError:
+        KOREA_CHARTS_AVAILABLE = False
+        print("KoreaMusicChartsConnector를 찾을 수 없습니다.")
+
+try:
+    from analyzers.schedule_store import ScheduleStore
+    from analyzers.chart_history_store import ChartHistoryStore
+    from analyzers.chart_deltas import diff_rankings, ranking_fingerprint
+except ImportError:
+    from schedule_store import ScheduleStore
+    from chart_history_store import ChartHistoryStore
+    from chart_deltas import diff_rankings, ranking_fingerprint
+
+try:
+    from utils import app_settings
+except ImportError:
+    app_settings = None
+
+
+def _setting(name, default):
+    return getattr(app_settings, name, default) if app_settings is not None else default
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
 
 class ChartScheduler:
-    """차트 수집 스케줄러"""
+    """
+    차트 수집 스케줄러
+
+    작업 정의와 마지막/다음 실행 시각은 SQLite(ScheduleStore)에 저장되어 재시작 후에도 유지되고,
+    재시작 동안 놓친 실행은 한 번으로 묶어 보충한다. gunicorn 워커마다 루프가 돌지만
+    리더 lease를 가진 프로세스 하나만 실제로 수집한다.
+
+    수집 결과는 ChartHistoryStore(SQLite, 날짜별 행)에 쌓는다. 실시간 수집은 조건부 요청
+    (ETag/Last-Modified)과 순위 지문으로 변동을 확인해 바뀐 차트만 저장한다.
+
+    db_path를 주면 순위 기록 DB(history_path 기본값), 로그, 주간 통계 파일도 같은 폴더를 쓴다.
+    """
     
-    def __init__(self, console_log=None):
+    def __init__(self, console_log=None, db_path=None, history_path=None):
         self.console_log = console_log or print
         self.running = False
+        self.is_leader = False
         self.scheduler_thread = None
+        self._stop_event = threading.Event()
+        self._owner = None
         
         # 로그 설정
-        self.setup_logging()
+        base_dir = os.path.dirname(os.path.abspath(db_path)) if db_path else None
+        self.setup_logging(os.path.join(base_dir, 'logs') if base_dir else None)
         
         # 스케줄 설정
         self.schedule_config = {
@@ -40,15 +84,34 @@ class ChartScheduler:
             'data_retention_days': 7  # 데이터 보관 기간
         }
         
-        # 데이터 저장소 설정
-        self.data_dir = os.path.join(os.path.dirname(__file__), 'chart_data')
+        # 데이터 저장소 설정 (주간 통계 파일, 이전 버전의 JSON 스냅샷)
+        self.data_dir = os.path.join(base_dir or os.path.dirname(__file__), 'chart_data')
         os.makedirs(self.data_dir, exist_ok=True)
         
+        # 차트 순위 기록 (수집 1회 = 차트별 순위 행)
+        default_history_db = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'chart_history.db')
+        if history_path is None:
+            history_path = (os.path.join(base_dir, 'chart_history.db') if base_dir
+                            else _setting('CHART_HISTORY_DB_PATH', default_history_db))
+        self.history = ChartHistoryStore(history_path)
+        self.history_retention_days = _setting('CHART_HISTORY_RETENTION_DAYS', 400)
+        
+        # 작업 정의/실행 기록/리더 lease 저장소 (저장된 설정이 있으면 기본값을 덮어씀)
+        default_db = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'chart_scheduler.db')
+        self.store = ScheduleStore(db_path or _setting('CHART_SCHEDULER_DB_PATH', default_db))
+        self.schedule_config.update(self.store.load_state()['config'])
+        
+        self.tick_seconds = _setting('CHART_SCHEDULER_TICK_SECONDS', 15)
+        self.lease_seconds = _setting('CHART_SCHEDULER_LEASE_SECONDS', 90)
+        self.jitter_seconds = _setting('CHART_SCHEDULER_JITTER_SECONDS', 60)
+        self.catchup_hours = _setting('CHART_SCHEDULER_CATCHUP_HOURS', 12)
+        self.run_history_days = _setting('CHART_SCHEDULER_RUN_HISTORY_DAYS', 30)
+        
         self.log("차트 스케줄러 초기화 완료")
     
-    def setup_logging(self):
-        """로깅 설정"""
-        log_dir = os.path.join(os.path.dirname(__file__), 'logs')
+    def setup_logging(self, log_dir=None):
+        """로깅 설정 (기본: analyzers/logs)"""
+        log_dir = log_dir or os.path.join(os.path.dirname(__file__), 'logs')
         os.makedirs(log_dir, exist_ok=True)
         
         log_file = os.path.join(log_dir, 'chart_scheduler.log')
@@ -71,8 +134,15 @@ class ChartScheduler:
         self.console_log(log_message)
         self.logger.info(message)
     
+    @property
+    def owner(self):
+        """리더 lease 소유자 id (호스트:pid, fork 이후에는 새로 생성)"""
+        if self._owner is None or self._owner[1] != os.getpid():
+            self._owner = (f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}", os.getpid())
+        return self._owner[0]
+    
     def start_scheduler(self):
-        """스케줄러 시작"""
+        """스케줄러 시작 (실행 상태를 저장해 재시작/다른 워커에서도 이어서 실행)"""
         if self.running:
             self.log("스케줄러가 이미 실행 중입니다.")
             return
@@ -83,12 +153,14 @@ class ChartScheduler:
         
         self.log("차트 수집 스케줄러 시작")
         self.running = True
+        self._stop_event.clear()
         
         # 스케줄 등록
+        self.store.save_state(enabled=True, config=self.schedule_config)
         self.setup_schedules()
         
         # 스케줄러 스레드 시작
-        self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
+        self.scheduler_thread = threading.Thread(target=self._run_scheduler, name="chart-scheduler", daemon=True)
         self.scheduler_thread.start()
         
         self.log(f"스케줄 등록 완료:")
@@ -97,61 +169,143 @@ class ChartScheduler:
         self.log(f"  - 대상 서비스: {', '.join(self.schedule_config['services'])}")
     
     def stop_scheduler(self):
-        """스케줄러 중지"""
+        """스케줄러 중지 (저장된 실행 상태도 꺼서 다른 워커의 수집도 멈춤)"""
         if not self.running:
             self.log("스케줄러가 실행되지 않았습니다.")
             return
         
         self.log("차트 수집 스케줄러 중지")
         self.running = False
-        schedule.clear()
+        self._stop_event.set()
+        self.store.save_state(enabled=False)
         
         if self.scheduler_thread and self.scheduler_thread.is_alive():
             self.scheduler_thread.join(timeout=5)
+        self._release_leadership()
+    
+    def _job_functions(self):
+        return {
+            'realtime_charts': self.collect_realtime_charts,
+            'daily_charts': self.collect_daily_charts,
+            'cleanup_old_data': self.cleanup_old_data,
+        }
     
     def setup_schedules(self):
-        """스케줄 설정"""
-        # 실시간 차트 스케줄 (주기적)
-        schedule.every(self.schedule_config['realtime_interval']).minutes.do(
-            self.collect_realtime_charts
-        )
-        
-        # 일일 종합 차트 스케줄
-        schedule.every().day.at(self.schedule_config['daily_time']).do(
-            self.collect_daily_charts
-        )
-        
-        # 데이터 정리 스케줄 (매일 자정)
-        schedule.every().day.at("00:00").do(
-            self.cleanup_old_data
-        )
-        
-        # 즉시 한 번 실행 (시작 시 데이터 수집)
-        schedule.every().minute.do(
-            lambda: self.collect_realtime_charts(immediate=True)
-        ).tag('immediate')
+        """스케줄 설정 (작업 정의를 저장소에 반영, 기존 실행 기록은 유지)"""
+        now = time.time()
+        definitions = [
+            # 실시간 차트 스케줄 (주기적) - 처음 등록될 때는 바로 한 번 수집
+            {'name': 'realtime_charts', 'kind': 'interval', 'spec': str(int(self.schedule_config['realtime_interval'])),
+             'catch_up_hours': None},
+            # 일일 종합 차트 스케줄
+            {'name': 'daily_charts', 'kind': 'daily', 'spec': self.schedule_config['daily_time'],
+             'catch_up_hours': self.catchup_hours},
+            # 데이터 정리 스케줄 (매일 자정)
+            {'name': 'cleanup_old_data', 'kind': 'daily', 'spec': '00:00', 'catch_up_hours': None},
+        ]
+        for job in definitions:
+            job['next_run_at'] = now + random.uniform(0, 5) if job['kind'] == 'interval' else self._next_run_at(job, now)
+        self.store.sync_jobs(definitions)
+    
+    def _next_run_at(self, job, now):
+        """다음 실행 시각 (epoch) - 워커/호스트끼리 몰리지 않도록 jitter 추가"""
+        if job['kind'] == 'interval':
+            interval = float(job['spec']) * 60
+            return now + interval + random.uniform(0, min(self.jitter_seconds, interval * 0.1))
+        hour, minute = (int(part) for part in job['spec'].split(':'))
+        current = datetime.fromtimestamp(now)
+        target = current.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target <= current:
+            target += timedelta(days=1)
+        return target.timestamp() + random.uniform(0, self.jitter_seconds)
+    
+    def _missed_windows(self, job, overdue):
+        """예약 시각 이후 지나간 회차 수 (밀린 회차는 한 번으로 묶어 실행)"""
+        period = float(job['spec']) * 60 if job['kind'] == 'interval' else 86400
+        return int(overdue // period)
     
     def _run_scheduler(self):
         """스케줄러 실행 루프"""
-        while self.running:
+        while not self._stop_event.is_set():
             try:
-                schedule.run_pending()
-                time.sleep(60)  # 1분마다 체크
+                self.tick()
             except Exception as e:
                 self.log(f"스케줄러 실행 오류: {str(e)}")
-                time.sleep(60)
+            self._stop_event.wait(self.tick_seconds + random.uniform(0, 1))
+    
+    def tick(self):
+        """리더 lease를 갱신하고, 리더이면 예약 시각이 지난 작업 실행"""
+        state = self.store.load_state()
+        if not state['enabled']:
+            # 다른 워커에서 중지됨
+            self._release_leadership()
+            return
+        self.schedule_config.update(state['config'])
+        
+        now = time.time()
+        was_leader = self.is_leader
+        self.is_leader = self.store.try_acquire_leader(self.owner, self.lease_seconds, now)
+        if not self.is_leader:
+            return
+        if not was_leader:
+            released = self.store.release_stale_runs(now)
+            self.log(f"수집 리더 획득 ({self.owner})" + (f", 중단된 작업 {released}개 정리" if released else ""))
+        
+        for job in self.store.due_jobs(now):
+            if self._stop_event.is_set():
+                break
+            overdue = now - job['next_run_at']
+            if job['catch_up_hours'] is not None and overdue > job['catch_up_hours'] * 3600:
+                self.log(f"{job['name']}: 예약 시각에서 {overdue / 3600:.1f}시간 지나 이번 회차는 건너뜀")
+                self.store.finish_job(job['name'], None, 'skipped', self._next_run_at(job, now))
+                continue
+            self._run_job(job, now, self._missed_windows(job, overdue))
     
-    def collect_realtime_charts(self, immediate=False):
-        """실시간 차트 수집"""
+    def _run_job(self, job, now, missed_windows=0):
+        """작업 하나 실행 (실행 중에는 리더 lease를 계속 갱신하고 소요 시간 기록)"""
+        run_id = self.store.claim_job(job['name'], self.owner, now, missed_windows)
+        if run_id is None:
+            return
+        if missed_windows:
+            self.log(f"{job['name']}: 놓친 실행 {missed_windows}회를 한 번으로 보충")
+        
+        done = threading.Event()
+        
+        def heartbeat():
+            while not done.wait(self.lease_seconds / 3):
+                if not self.store.try_acquire_leader(self.owner, self.lease_seconds):
+                    self.log(f"{job['name']} 실행 중 리더 lease를 잃었습니다")
+                    return
+        
+        threading.Thread(target=heartbeat, name="chart-scheduler-lease", daemon=True).start()
+        started = time.perf_counter()
+        status, error = 'success', None
+        try:
+            if self._job_functions()[job['name']]() is False:
+                status, error = 'error', '수집 실패'
+        except Exception as e:
+            status, error = 'error', str(e)
+        finally:
+            done.set()
+        
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        finished = time.time()
+        self.store.finish_job(job['name'], run_id, status, self._next_run_at(job, finished), duration_ms, error, finished)
+        self.log(f"작업 완료: {job['name']} ({status}, {duration_ms / 1000:.1f}초)")
+    
+    def _release_leadership(self):
+        if self.is_leader:
+            self.store.release_leader(self.owner)
+            self.is_leader = False
+    
+    def collect_realtime_charts(self):
+        """실시간 차트 수집 (성공 여부 반환, 순위가 바뀐 차트만 저장)"""
+        connector = None
         try:
-            if immediate:
-                # 즉시 실행 스케줄 제거
-                schedule.clear('immediate')
-            
             self.log("실시간 차트 수집 시작")
             
-            # 통합 차트 커넥터 초기화
-            connector = KoreaMusicChartsConnector(self.console_log)
+            # 통합 차트 커넥터 초기화 (조건부 요청 - 변경 없는 차트는 304)
+            connector = KoreaMusicChartsConnector(self.console_log, conditional=True)
             
             # 차트 데이터 수집
             chart_data = connector.get_all_charts(
@@ -159,24 +313,79 @@ class ChartScheduler:
                 limit_per_chart=self.schedule_config['limit_per_chart']
             )
             
-            if chart_data['success']:
-                # 크로스 플랫폼 분석 추가
-                cross_analysis = connector.get_cross_platform_analysis(chart_data)
-                if cross_analysis.get('success'):
-                    chart_data['cross_platform_analysis'] = cross_analysis
-                
-                # 데이터 저장
-                self.save_chart_data(chart_data, 'realtime')
-                
-                self.log(f"실시간 차트 수집 완료: {chart_data['successful_services']}/{chart_data['total_services']} 서비스, {chart_data['total_tracks']}곡")
-            else:
+            if not chart_data['success']:
                 self.log("실시간 차트 수집 실패")
+                return False
+            
+            # 순위 지문으로 직전 저장 순위와 비교 (304 차트는 직전 순위로 채움)
+            changes, unchanged = self._detect_changes(chart_data, connector)
+            
+            # 수집 기록은 항상, 순위 행은 바뀐 차트만 저장
+            collection_id = self.save_chart_data(chart_data, 'realtime', charts=changes,
+                                                 fingerprints={key: change['fingerprint'] for key, change in changes.items()})
+            if collection_id is None:
+                # 저장되지 않은 순위로 304를 받지 않도록 조건부 요청 캐시를 비움
+                connector.fetcher.clear_validators()
+                self.log("실시간 차트 저장 실패 - 다음 수집에서 전체 요청")
+                return False
+            
+            if changes:
+                moved = sum(len(change['moves']) for change in changes.values())
+                entered = sum(len(change['entries']) for change in changes.values())
+                self.log(f"실시간 차트 수집 완료: {chart_data['successful_services']}/{chart_data['total_services']} 서비스, "
+                         f"변동 {len(changes)}개 차트 (이동 {moved}, 진입 {entered})")
+            else:
+                self.log(f"실시간 차트 변동 없음: {len(unchanged)}개 차트")
+            return True
                 
         except Exception as e:
             self.log(f"실시간 차트 수집 오류: {str(e)}")
+            if connector is not None:
+                connector.fetcher.clear_validators()
+            return False
+    
+    def _detect_changes(self, chart_data, connector):
+        """
+        수집 결과를 저장소의 직전 순위와 비교해 {차트 키: 지문 + 변동분}, [변동 없는 차트 키] 반환
+
+        304인데 직전 순위가 없으면 다음 수집에서 전체 응답을 받도록 조건부 요청 캐시를 비운다.
+        """
+        changes, unchanged = {}, []
+        
+        for service, by_type in chart_data['services'].items():
+            for chart_type, result in list(by_type.items()):
+                chart_key = f"{service}/{chart_type}"
+                previous = self.history.latest_snapshot(service, chart_type, 'realtime')
+                
+                if result.get('not_modified'):
+                    if previous is None:
+                        self.log(f"{chart_key}: 304 응답이지만 직전 순위 없음 - 다음 수집에서 전체 요청")
+                        connector.fetcher.clear_validators()
+                        del by_type[chart_type]
+                        continue
+                    result['tracks'] = previous['tracks']
+                    result['total_tracks'] = len(previous['tracks'])
+                    unchanged.append(chart_key)
+                    continue
+                
+                fingerprint = ranking_fingerprint(result.get('tracks', []))
+                if previous and previous['fingerprint'] == fingerprint:
+                    unchanged.append(chart_key)
+                    continue
+                
+                changes[chart_key] = {
+                    'fingerprint': fingerprint,
+                    **diff_rankings(previous['tracks'] if previous else [], result.get('tracks', []))
+                }
+        
+        # 304로 채운 곡 수 반영
+        chart_data['total_tracks'] = sum(
+            result.get('total_tracks', 0) for by_type in chart_data['services'].values() for result in by_type.values()
+        )
+        return changes, unchanged
     
     def collect_daily_charts(self):
-        """일일 종합 차트 수집"""
+        """일일 종합 차트 수집 (성공 여부 반환)"""
         try:
             self.log("일일 종합 차트 수집 시작")
             
@@ -189,71 +398,36 @@ class ChartScheduler:
             )
             
             if chart_data['success']:
-                cross_analysis = connector.get_cross_platform_analysis(chart_data)
-                if cross_analysis.get('success'):
-                    chart_data['cross_platform_analysis'] = cross_analysis
-                
-                # 일일 데이터로 저장
+                # 일일 데이터로 저장 (모든 차트)
                 self.save_chart_data(chart_data, 'daily')
                 
                 # 주간 통계 생성
                 self.generate_weekly_stats()
                 
                 self.log(f"일일 종합 차트 수집 완료: {chart_data['total_tracks']}곡")
+                return True
             else:
                 self.log("일일 종합 차트 수집 실패")
+                return False
                 
         except Exception as e:
             self.log(f"일일 차트 수집 오류: {str(e)}")
+            return False
     
-    def save_chart_data(self, data, data_type='realtime'):
-        """차트 데이터 저장"""
+    def save_chart_data(self, data, data_type='realtime', charts=None, fingerprints=None):
+        """차트 데이터를 순위 기록 저장소에 추가 (charts가 주어지면 그 차트만 행으로 저장)"""
         try:
-            timestamp = datetime.now()
-            
-            # 파일명 생성
-            if data_type == 'realtime':
-                filename = f"charts_realtime_{timestamp.strftime('%Y%m%d_%H%M')}.json"
-            else:
-                filename = f"charts_daily_{timestamp.strftime('%Y%m%d')}.json"
-            
-            filepath = os.path.join(self.data_dir, filename)
-            
-            # 저장할 데이터에 메타데이터 추가
-            save_data = {
-                'metadata': {
-                    'collection_type': data_type,
-                    'collected_at': timestamp.isoformat(),
-                    'scheduler_version': '1.0'
-                },
-                'chart_data': data
-            }
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, ensure_ascii=False, indent=2)
-            
-            self.log(f"차트 데이터 저장: {filename}")
-            
-            # 최신 데이터 링크 업데이트
-            self.update_latest_data_link(filepath, data_type)
+            collection_id = self.history.append_collection(data, data_type, charts=charts, fingerprints=fingerprints)
+            self.log(f"차트 데이터 저장: {data_type} #{collection_id}")
+            return collection_id
             
         except Exception as e:
             self.log(f"데이터 저장 오류: {str(e)}")
+            return None
     
-    def update_latest_data_link(self, filepath, data_type):
-        """최신 데이터 링크 업데이트"""
-        try:
-            link_name = f"latest_{data_type}.json"
-            link_path = os.path.join(self.data_dir, link_name)
-            
-            # Windows에서는 심볼릭 링크 대신 복사
-            import shutil
-            shutil.copy2(filepath, link_path)
-            
-            self.log(f"최신 데이터 링크 업데이트: {link_name}")
-            
-        except Exception as e:
-            self.log(f"링크 업데이트 오류: {str(e)}")
+    def get_charts_at(self, at=None, data_type='realtime'):
+        """특정 시각(기본: 지금)의 차트별 순위 {"service/chart_type": [곡…]}"""
+        return self.history.charts_at(data_type, at.timestamp() if at else None)
     
     def cleanup_old_data(self):
         """오래된 데이터 정리"""
@@ -263,40 +437,43 @@ class ChartScheduler:
             cutoff_date = datetime.now() - timedelta(days=self.schedule_config['data_retention_days'])
             deleted_count = 0
             
+            # 이전 버전이 남긴 JSON 스냅샷/주간 통계 파일
             for filename in os.listdir(self.data_dir):
-                if filename.startswith('charts_') and filename.endswith('.json'):
+                if filename.startswith(('charts_', 'weekly_stats_')) and filename.endswith('.json'):
                     filepath = os.path.join(self.data_dir, filename)
                     
                     # 파일 생성 시간 확인
                     file_time = datetime.fromtimestamp(os.path.getctime(filepath))
                     
-                    if file_time < cutoff_date and not filename.startswith('latest_'):
+                    if file_time < cutoff_date:
                         os.remove(filepath)
                         deleted_count += 1
             
-            self.log(f"오래된 데이터 정리 완료: {deleted_count}개 파일 삭제")
+            # 순위 기록은 월간/장기 통계용으로 더 오래 보관 (날짜 단위 삭제)
+            history_cutoff = datetime.now() - timedelta(days=self.history_retention_days)
+            pruned_rows = self.history.prune(history_cutoff)
+            
+            # 스케줄러 실행 기록도 보관 기간이 지난 것은 삭제
+            pruned_runs = self.store.prune_runs(time.time() - self.run_history_days * 86400)
+            
+            self.log(f"오래된 데이터 정리 완료: {deleted_count}개 파일 삭제, 순위 기록 {pruned_rows}행 삭제, 실행 기록 {pruned_runs}건 삭제")
             
         except Exception as e:
             self.log(f"데이터 정리 오류: {str(e)}")
     
+    def get_chart_stats(self, days=7, data_type='daily', top=20):
+        """최근 days일(오늘 포함) 차트 통계 - 주간 7, 월간 30"""
+        today = datetime.now()
+        stats = self.history.period_stats(today - timedelta(days=days - 1), today, data_type, top)
+        stats['generated_at'] = today.isoformat()
+        return stats
+    
     def generate_weekly_stats(self):
-        """주간 통계 생성"""
+        """주간 통계 생성 (순위 기록 저장소에서 조회해 파일로 저장)"""
         try:
-            # 지난 7일간의 일일 데이터 수집
-            weekly_data = []
-            for i in range(7):
-                date = datetime.now() - timedelta(days=i)
-                filename = f"charts_daily_{date.strftime('%Y%m%d')}.json"
-                filepath = os.path.join(self.data_dir, filename)
-                
-                if os.path.exists(filepath):
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        weekly_data.append(data)
-            
-            if weekly_data:
-                # 주간 통계 계산
-                stats = self.calculate_weekly_stats(weekly_data)
+            stats = self.get_chart_stats(7)
+            if stats['total_collections']:
+                stats['top_weekly_hits'] = stats.pop('top_hits')
                 
                 # 주간 통계 저장
                 stats_filename = f"weekly_stats_{datetime.now().strftime('%Y%m%d')}.json"
@@ -310,56 +487,45 @@ class ChartScheduler:
         except Exception as e:
             self.log(f"주간 통계 생성 오류: {str(e)}")
     
-    def calculate_weekly_stats(self, weekly_data):
-        """주간 통계 계산"""
-        # 간단한 주간 통계 예시
-        total_tracks = sum(data['chart_data'].get('total_tracks', 0) for data in weekly_data)
-        avg_success_rate = sum(data['chart_data'].get('success_rate', 0) for data in weekly_data) / len(weekly_data)
-        
-        # 가장 자주 나타난 크로스 플랫폼 히트곡들
-        all_hits = []
-        for data in weekly_data:
-            cross_analysis = data['chart_data'].get('cross_platform_analysis', {})
-            if cross_analysis.get('success'):
-                all_hits.extend(cross_analysis.get('cross_platform_hits', []))
+    def get_status(self):
+        """스케줄러 상태 반환 (작업별 다음/마지막 실행, 최근 실행 기록 포함)"""
+        jobs = self.store.list_jobs()
+        for job in jobs:
+            for key in ('next_run_at', 'last_run_at', 'running_since'):
+                job[key] = _iso(job[key])
+        realtime = next((job for job in jobs if job['name'] == 'realtime_charts' and job['enabled']), None)
         
-        # 곡별 등장 횟수 계산
-        hit_counts = {}
-        for hit in all_hits:
-            key = f"{hit['title']} - {hit['artist']}"
-            hit_counts[key] = hit_counts.get(key, 0) + 1
+        runs = self.store.recent_runs(20)
+        for run in runs:
+            for key in ('scheduled_for', 'started_at', 'finished_at'):
+                run[key] = _iso(run[key])
         
-        top_weekly_hits = sorted(hit_counts.items(), key=lambda x: x[1], reverse=True)[:20]
+        leader = self.store.get_leader()
+        if leader:
+            leader = {**leader, 'acquired_at': _iso(leader['acquired_at']), 'expires_at': _iso(leader['expires_at'])}
         
-        return {
-            'period': f"{(datetime.now() - timedelta(days=6)).strftime('%Y-%m-%d')} ~ {datetime.now().strftime('%Y-%m-%d')}",
-            'total_collections': len(weekly_data),
-            'total_tracks_collected': total_tracks,
-            'average_success_rate': round(avg_success_rate, 2),
-            'top_weekly_hits': [{'track': track, 'appearances': count} for track, count in top_weekly_hits],
-            'generated_at': datetime.now().isoformat()
-        }
-    
-    def get_status(self):
-        """스케줄러 상태 반환"""
         return {
             'running': self.running,
+            'enabled': self.store.load_state()['enabled'],
+            'is_leader': self.is_leader,
+            'owner': self.owner,
+            'leader': leader,
             'schedule_config': self.schedule_config,
             'data_dir': self.data_dir,
-            'next_realtime': schedule.next_run() if schedule.jobs else None,
-            'data_files_count': len([f for f in os.listdir(self.data_dir) if f.endswith('.json')])
+            'next_realtime': realtime['next_run_at'] if realtime else None,
+            'jobs': jobs,
+            'recent_runs': runs,
+            'history': self.history.get_stats()
         }
     
     def update_config(self, new_config):
-        """스케줄 설정 업데이트"""
+        """스케줄 설정 업데이트 (저장소에 기록되어 다른 워커도 다음 tick부터 사용)"""
         try:
             self.schedule_config.update(new_config)
+            self.store.save_state(config=self.schedule_config)
             
-            if self.running:
-                # 스케줄러 재시작
-                self.stop_scheduler()
-                time.sleep(1)
-                self.start_scheduler()
+            # 주기/시각이 바뀐 작업만 다시 예약됨 (리더가 다른 워커여도 저장소를 통해 반영)
+            self.setup_schedules()
             
             self.log("스케줄 설정 업데이트 완료")
             
@@ -387,6 +553,13 @@ def stop_chart_scheduler():
     scheduler = get_scheduler()
     scheduler.stop_scheduler()
 
+def resume_chart_scheduler():
+    """저장된 상태가 실행 중이면 스케줄러 재개 (워커 시작/재시작 시 호출)"""
+    scheduler = get_scheduler()
+    if scheduler.store.load_state()['enabled']:
+        scheduler.start_scheduler()
+    return scheduler
+
 # 테스트 및 CLI 실행
 if __name__ == "__main__":
     import sys
@@ -413,7 +586,7 @@ if __name__ == "__main__":
             
         elif command == 'test':
             print("차트 수집 테스트를 실행합니다...")
-            scheduler.collect_realtime_charts(immediate=True)
+            scheduler.collect_realtime_charts()
             
         else:
             print("사용법: python chart_scheduler.py [start|status|test]")
@@ -421,5 +594,5 @@ if __name__ == "__main__":
         # 기본 테스트 실행
         print("=== 차트 스케줄러 테스트 ===")
         print("차트 수집 테스트 실행...")
-        scheduler.collect_realtime_charts(immediate=True)
+        scheduler.collect_realtime_charts()
         print("테스트 완료!")
\ No newline at end of file
@@ -12,9 +12,10 @@ from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
 
 # Google API Client
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from connectors.youtube_data_api import get_youtube_client
+
 # Text Processing
 from textblob import TextBlob
 import nltk
@@ -30,8 +31,11 @@ class MusicAnalyzer:
             enable_db: 데이터베이스 저장 활성화 여부
         """
         self.api_key = api_key
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
         self.console_log = console_log or print
+        # 프로세스 공유 YouTube Data API 클라이언트 (배치 조회 + 쿼터 관리)
+        self.youtube = get_youtube_client(api_key, console_log=self.console_log)
+        if self.youtube is None:
+            raise ValueError("YouTube API 키가 설정되지 않았습니다")
         
         # 데이터베이스 초기화
         self.db_manager = None
@@ -116,16 +120,11 @@ class MusicAnalyzer:
             비디오 정보 딕셔너리
         """
         try:
-            request = self.youtube.videos().list(
-                part='snippet,statistics,contentDetails',
-                id=video_id
-            )
-            response = request.execute()
+            video = self.youtube.get_video(video_id)
             
-            if not response['items']:
+            if not video:
                 return {'success': False, 'error': '비디오를 찾을 수 없습니다'}
             
-            video = response['items'][0]
             snippet = video['snippet']
             statistics = video['statistics']
             content_details = video['contentDetails']
@@ -166,13 +165,15 @@ class MusicAnalyzer:
             댓글 리스트
         """
         try:
-            request = self.youtube.commentThreads().list(
-                part='snippet',
-                videoId=video_id,
-                maxResults=max_results,
-                order='relevance'
+            response = self.youtube.execute(
+                'commentThreads.list',
+                lambda service: service.commentThreads().list(
+                    part='snippet',
+                    videoId=video_id,
+                    maxResults=max_results,
+                    order='relevance'
+                )
             )
-            response = request.execute()
             
             comments = []
             for item in response['items']:
@@ -0,0 +1,286 @@
+"""
+Persistent state for ChartScheduler in a local SQLite file.
+
+Holds everything the scheduler needs to survive restarts and to run in
+several gunicorn workers at once:
+
+- scheduler_state: desired on/off state and the schedule config
+- scheduled_jobs: job definitions, next/last run times and the last result
+- scheduler_leader: a lease row; only the process holding an unexpired
+  lease runs jobs, and it renews the lease while it is alive
+- job_runs: one row per run with duration and error, for status/debugging
+
+Claims are made inside ``BEGIN IMMEDIATE`` transactions that also check
+the lease, so a process that lost leadership cannot start a job.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+
+SCHEMA_SQL = (
+    "CREATE TABLE IF NOT EXISTS scheduler_state ("
+    " key TEXT PRIMARY KEY,"
+    " value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS scheduled_jobs ("
+    " name TEXT PRIMARY KEY,"
+    " kind TEXT NOT NULL,"            # interval | daily
+    " spec TEXT NOT NULL,"            # 분 단위 주기 또는 HH:MM
+    " catch_up_hours REAL,"           # NULL이면 놓친 실행은 항상 한 번 보충
+    " enabled INTEGER NOT NULL DEFAULT 1,"
+    " next_run_at REAL,"
+    " last_run_at REAL,"
+    " last_status TEXT,"
+    " last_duration_ms REAL,"
+    " last_error TEXT,"
+    " run_count INTEGER NOT NULL DEFAULT 0,"
+    " running_owner TEXT,"
+    " running_since REAL)",
+    "CREATE TABLE IF NOT EXISTS scheduler_leader ("
+    " id INTEGER PRIMARY KEY CHECK (id = 1),"
+    " owner TEXT NOT NULL,"
+    " acquired_at REAL NOT NULL,"
+    " expires_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS job_runs ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " job_name TEXT NOT NULL,"
+    " owner TEXT NOT NULL,"
+    " scheduled_for REAL,"
+    " started_at REAL NOT NULL,"
+    " finished_at REAL,"
+    " duration_ms REAL,"
+    " status TEXT NOT NULL,"          # running | success | error | skipped
+    " missed_windows INTEGER NOT NULL DEFAULT 0,"
+    " error TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_job_runs_started ON job_runs(started_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_job_runs_job ON job_runs(job_name, started_at DESC)",
+)
+
+JOB_COLUMNS = (
+    "name, kind, spec, catch_up_hours, enabled, next_run_at, last_run_at, last_status, "
+    "last_duration_ms, last_error, run_count, running_owner, running_since"
+)
+
+
+class ScheduleStore:
+    """SQLite-backed job definitions, run history and leader lease."""
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            for statement in SCHEMA_SQL:
+                conn.execute(statement)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # =========================
+    # Scheduler state
+    # =========================
+    def load_state(self) -> Dict[str, Any]:
+        """저장된 실행 여부와 스케줄 설정 (없으면 빈 값)"""
+        rows = self._conn().execute("SELECT key, value FROM scheduler_state").fetchall()
+        state = {row["key"]: json.loads(row["value"]) for row in rows}
+        return {"enabled": bool(state.get("enabled", False)), "config": state.get("config") or {}}
+
+    def save_state(self, enabled: Optional[bool] = None, config: Optional[Dict[str, Any]] = None) -> None:
+        with self._transaction() as conn:
+            for key, value in (("enabled", enabled), ("config", config)):
+                if value is None:
+                    continue
+                conn.execute(
+                    "INSERT INTO scheduler_state (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (key, json.dumps(value, ensure_ascii=False)),
+                )
+
+    # =========================
+    # Job definitions
+    # =========================
+    def sync_jobs(self, definitions: List[Dict[str, Any]]) -> None:
+        """
+        작업 정의를 저장 (실행 기록은 유지)
+
+        주기/시각이 바뀐 작업은 definition의 next_run_at으로 다시 예약하고,
+        목록에 없는 작업은 비활성화한다.
+        """
+        with self._transaction() as conn:
+            names = []
+            for job in definitions:
+                names.append(job["name"])
+                row = conn.execute("SELECT kind, spec FROM scheduled_jobs WHERE name = ?", (job["name"],)).fetchone()
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO scheduled_jobs (name, kind, spec, catch_up_hours, enabled, next_run_at) "
+                        "VALUES (?, ?, ?, ?, 1, ?)",
+                        (job["name"], job["kind"], job["spec"], job.get("catch_up_hours"), job["next_run_at"]),
+                    )
+                elif (row["kind"], row["spec"]) != (job["kind"], job["spec"]):
+                    conn.execute(
+                        "UPDATE scheduled_jobs SET kind = ?, spec = ?, catch_up_hours = ?, enabled = 1, next_run_at = ? "
+                        "WHERE name = ?",
+                        (job["kind"], job["spec"], job.get("catch_up_hours"), job["next_run_at"], job["name"]),
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE scheduled_jobs SET catch_up_hours = ?, enabled = 1, "
+                        "next_run_at = COALESCE(next_run_at, ?) WHERE name = ?",
+                        (job.get("catch_up_hours"), job["next_run_at"], job["name"]),
+                    )
+            placeholders = ",".join("?" * len(names))
+            conn.execute(f"UPDATE scheduled_jobs SET enabled = 0 WHERE name NOT IN ({placeholders})", names)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(f"SELECT {JOB_COLUMNS} FROM scheduled_jobs ORDER BY name").fetchall()
+        return [dict(row) for row in rows]
+
+    def due_jobs(self, now: float) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            f"SELECT {JOB_COLUMNS} FROM scheduled_jobs "
+            "WHERE enabled = 1 AND next_run_at <= ? ORDER BY next_run_at",
+            (now,),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    # =========================
+    # Leader lease
+    # =========================
+    def try_acquire_leader(self, owner: str, lease_seconds: float, now: float = None) -> bool:
+        """리더 lease 획득/갱신 (다른 프로세스가 유효한 lease를 가지고 있으면 False)"""
+        now = now or time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT owner, expires_at FROM scheduler_leader WHERE id = 1").fetchone()
+            if row is not None and row["owner"] != owner and row["expires_at"] > now:
+                return False
+            acquired_at = now if row is None or row["owner"] != owner else None
+            conn.execute(
+                "INSERT INTO scheduler_leader (id, owner, acquired_at, expires_at) VALUES (1, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at, "
+                "acquired_at = COALESCE(?, scheduler_leader.acquired_at)",
+                (owner, now, now + lease_seconds, acquired_at),
+            )
+            return True
+
+    def release_leader(self, owner: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM scheduler_leader WHERE id = 1 AND owner = ?", (owner,))
+
+    def get_leader(self) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT owner, acquired_at, expires_at FROM scheduler_leader WHERE id = 1").fetchone()
+        return dict(row) if row else None
+
+    # =========================
+    # Runs
+    # =========================
+    def claim_job(self, name: str, owner: str, now: float, missed_windows: int = 0) -> Optional[int]:
+        """
+        예약 시각이 지난 작업을 실행 중으로 표시하고 실행 기록 id 반환
+
+        리더가 아니거나, 이미 다른 곳에서 실행 중이거나, 아직 때가 아니면 None.
+        """
+        with self._transaction() as conn:
+            leader = conn.execute("SELECT owner, expires_at FROM scheduler_leader WHERE id = 1").fetchone()
+            if leader is None or leader["owner"] != owner or leader["expires_at"] <= now:
+                return None
+            job = conn.execute(
+                "SELECT next_run_at, running_owner FROM scheduled_jobs WHERE name = ? AND enabled = 1", (name,)
+            ).fetchone()
+            if job is None or job["next_run_at"] is None or job["next_run_at"] > now:
+                return None
+            if job["running_owner"] is not None and job["running_owner"] != owner:
+                return None
+            conn.execute(
+                "UPDATE scheduled_jobs SET running_owner = ?, running_since = ? WHERE name = ?", (owner, now, name)
+            )
+            cursor = conn.execute(
+                "INSERT INTO job_runs (job_name, owner, scheduled_for, started_at, status, missed_windows) "
+                "VALUES (?, ?, ?, ?, 'running', ?)",
+                (name, owner, job["next_run_at"], now, missed_windows),
+            )
+            return cursor.lastrowid
+
+    def finish_job(
+        self,
+        name: str,
+        run_id: Optional[int],
+        status: str,
+        next_run_at: float,
+        duration_ms: float = None,
+        error: str = None,
+        now: float = None,
+    ) -> None:
+        """실행 결과 기록 후 다음 실행 예약"""
+        now = now or time.time()
+        with self._transaction() as conn:
+            if run_id is not None:
+                conn.execute(
+                    "UPDATE job_runs SET finished_at = ?, duration_ms = ?, status = ?, error = ? WHERE id = ?",
+                    (now, duration_ms, status, error, run_id),
+                )
+            ran = status in ("success", "error")
+            conn.execute(
+                "UPDATE scheduled_jobs SET next_run_at = ?, last_status = ?, last_error = ?, "
+                "last_run_at = CASE WHEN ? THEN ? ELSE last_run_at END, "
+                "last_duration_ms = CASE WHEN ? THEN ? ELSE last_duration_ms END, "
+                "run_count = run_count + ?, running_owner = NULL, running_since = NULL "
+                "WHERE name = ?",
+                (next_run_at, status, error, ran, now, ran, duration_ms, 1 if ran else 0, name),
+            )
+
+    def release_stale_runs(self, older_than: float) -> int:
+        """실행 중 표시가 남은 채 죽은 프로세스의 작업 정리"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE job_runs SET status = 'error', error = 'abandoned', finished_at = ? "
+                "WHERE status = 'running' AND started_at < ?",
+                (time.time(), older_than),
+            )
+            cursor = conn.execute(
+                "UPDATE scheduled_jobs SET running_owner = NULL, running_since = NULL "
+                "WHERE running_owner IS NOT NULL AND running_since < ?",
+                (older_than,),
+            )
+            return cursor.rowcount
+
+    def recent_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT id, job_name, owner, scheduled_for, started_at, finished_at, duration_ms, status, "
+            "missed_windows, error FROM job_runs ORDER BY started_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def prune_runs(self, before: float) -> int:
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM job_runs WHERE started_at < ?", (before,)).rowcount
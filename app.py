@@ -68,7 +68,7 @@ except ImportError as e:
     korea_charts_connector_available = False
 
 try:
-    from analyzers.chart_scheduler import get_scheduler, start_chart_scheduler, stop_chart_scheduler
+    from analyzers.chart_scheduler import get_scheduler, start_chart_scheduler, stop_chart_scheduler, resume_chart_scheduler
     chart_scheduler_available = True
 except ImportError as e:
     print(f"ChartScheduler 로드 실패: {e}")
@@ -88,15 +88,22 @@ except ImportError as e:
     print(f"SupabaseClient 로드 실패: {e}")
     supabase_available = False
 
+from core.public_snapshot_service import EMPTY_SNAPSHOT, start_public_snapshot_service
+from core.visitor_log_writer import start_visitor_log_writer
+from core.track_view_cache import get_track_view_cache
+from utils.rate_limiter import get_rate_limiter
+
 from utils.growth_lead_store import GrowthLeadStore
 
 try:
-    from core.track_stats_service import TrackStatsService
+    from core.track_stats_refresher import start_track_stats_refresher
     track_stats_service_available = True
 except ImportError as e:
-    print(f"TrackStatsService 로드 실패: {e}")
+    print(f"TrackStatsRefresher 로드 실패: {e}")
     track_stats_service_available = False
 
+from utils import app_settings
+
 # Flask 앱 초기화 (Windows 경로 대응)
 app = Flask(__name__, 
            template_folder='app/templates', 
@@ -186,6 +193,8 @@ if database_available:
         db_path = os.path.join(os.path.dirname(__file__), 'music_analysis.db')
         db_manager = DatabaseManager(db_path=db_path, console_log=lambda msg: console.log(msg))
         console.log("데이터베이스 매니저 초기화 완료")
+        # ANALYSIS_RETENTION_DAYS > 0이면 오래된 분석을 주기적으로 보관 DB로 이동
+        db_manager.start_retention_job()
     except Exception as e:
         db_manager = None
         console.log(f"데이터베이스 매니저 초기화 실패: {str(e)}")
@@ -208,6 +217,58 @@ else:
 # Music Trend Analyzer V2는 위에서 trends_analyzer로 이미 초기화됨
 trend_analyzer_v2 = trends_analyzer
 
+# 트랙 상세 페이지 캐시 (곡/코멘트/통계 조각별 TTL + 명시적 무효화)
+track_view_cache = None
+if supabase_available:
+    track_view_cache = get_track_view_cache(
+        client_factory=SupabaseClient,
+        console_log=lambda msg: console.log(msg)
+    )
+
+# 트랙 외부 지표 백그라운드 갱신 (요청 처리 중에는 외부 API를 호출하지 않음)
+track_stats_refresher = None
+if track_stats_service_available and supabase_available and app_settings.TRACK_STATS_REFRESHER_ENABLED:
+    try:
+        track_stats_refresher = start_track_stats_refresher(
+            client_factory=SupabaseClient,
+            console_log=lambda msg: console.log(msg),
+            on_tracks_updated=track_view_cache.invalidate_tracks if track_view_cache else None,
+        )
+    except Exception as e:
+        track_stats_refresher = None
+        console.log(f"트랙 지표 갱신기 초기화 실패: {str(e)}")
+
+# 차트 수집 스케줄러: 이전에 켜 두었으면 워커 시작 시 재개 (리더 lease를 가진 워커 하나만 수집)
+if chart_scheduler_available:
+    try:
+        resume_chart_scheduler()
+    except Exception as e:
+        console.log(f"차트 스케줄러 재개 실패: {str(e)}")
+
+# 랜딩/브랜드 페이지 공개 지표 (백그라운드 재계산, 요청 경로에서는 메모리 값만 사용)
+public_snapshot_service = None
+if supabase_available:
+    try:
+        public_snapshot_service = start_public_snapshot_service(
+            client_factory=SupabaseClient,
+            console_log=lambda msg: console.log(msg)
+        )
+    except Exception as e:
+        public_snapshot_service = None
+        console.log(f"공개 지표 스냅샷 서비스 초기화 실패: {str(e)}")
+
+# 방문자 로그 일괄 기록 (요청 경로에서는 큐에 넣기만 함)
+visitor_log_writer = None
+if supabase_available:
+    try:
+        visitor_log_writer = start_visitor_log_writer(
+            client_factory=SupabaseClient,
+            console_log=lambda msg: console.log(msg)
+        )
+    except Exception as e:
+        visitor_log_writer = None
+        console.log(f"방문자 로그 writer 초기화 실패: {str(e)}")
+
 
 # 음악 분석 작업 저장소
 music_analysis_jobs = {}
@@ -224,9 +285,8 @@ COMMUNITY_AUTHOR_MAX_LEN = 50
 COMMUNITY_PER_PAGE_DEFAULT = 20
 COMMUNITY_PER_PAGE_MAX = 50
 
-# 간단한 스팸 방지(서버 메모리 기반): 같은 IP에서 너무 빠른 연속 작성 제한
+# 스팸 방지: 같은 IP에서 너무 빠른 연속 작성 제한 (토큰 버킷, utils.rate_limiter)
 COMMUNITY_POST_MIN_INTERVAL_SECONDS = 10
-_community_last_post_at_by_ip = {}
 
 TRACKS_PER_PAGE_DEFAULT = 20
 TRACKS_PER_PAGE_MAX = 50
@@ -237,12 +297,8 @@ TRACK_ARTIST_MAX_LEN = 200
 TRACK_COMMENT_MAX_LEN = 4000
 TRACK_COMMENT_AUTHOR_MAX_LEN = 50
 TRACK_COMMENT_MIN_INTERVAL_SECONDS = 5
-_track_last_comment_at_by_ip = {}
 
 TRACK_STATS_SYNC_MIN_INTERVAL_SECONDS = 30
-_track_last_stats_sync_at_by_ip = {}
-
-COMMUNITY_EXPLORE_SCAN_LIMIT = 300
 
 GROWTH_LEAD_MIN_INTERVAL_SECONDS = 10
 GROWTH_LEAD_EMAIL_MAX_LEN = 255
@@ -260,7 +316,6 @@ ALLOWED_GROWTH_LEAD_TYPES = {
     "media_kit",
     "insight_report",
 }
-_growth_last_submit_at_by_ip = {}
 
 
 def _get_client_ip() -> str:
@@ -271,6 +326,14 @@ def _get_client_ip() -> str:
     return request.remote_addr or 'Unknown'
 
 
+def _client_track_key() -> str:
+    """IP + 곡 ID (곡별 요청 제한 키)"""
+    return f"{_get_client_ip()}:{(request.view_args or {}).get('track_id', '')}"
+
+
+rate_limiter = get_rate_limiter(console_log=lambda msg: console.log(msg))
+
+
 def _validate_post_payload(title: str, content: str, author: str) -> Optional[str]:
     """게시글 입력값 검증. 문제 있으면 에러 메시지 반환, 아니면 None."""
     if not title or not content:
@@ -417,45 +480,16 @@ def _build_track_stats_view(track: dict, stored_stats: dict, comment_count: int,
     }
 
 
-def _filter_diary_posts(posts: list, search_query: str, author_query: str, period: str, sort: str) -> list:
-    """다이어리 리스트 탐색용 필터"""
-    normalized_search = (search_query or "").strip().lower()
-    normalized_author = (author_query or "").strip().lower()
+def _diary_period_start(period: str) -> Optional[str]:
+    """다이어리 기간 필터를 작성일 하한(ISO)으로 변환"""
     now = datetime.now()
-
-    filtered = []
-    for post in posts:
-        title = str(post.get("title", ""))
-        content = str(post.get("content", ""))
-        author = str(post.get("author", ""))
-        created_at = _parse_iso_datetime(post.get("created_at"))
-
-        haystack = " ".join([title, content, author]).lower()
-        if normalized_search and normalized_search not in haystack:
-            continue
-        if normalized_author and normalized_author not in author.lower():
-            continue
-
-        if period == "today":
-            if not created_at or created_at.date() != now.date():
-                continue
-        elif period == "7d":
-            if not created_at or created_at < (now - timedelta(days=7)):
-                continue
-        elif period == "30d":
-            if not created_at or created_at < (now - timedelta(days=30)):
-                continue
-
-        filtered.append(post)
-
-    if sort == "oldest":
-        filtered.sort(key=lambda item: item.get("created_at") or "")
-    elif sort == "title":
-        filtered.sort(key=lambda item: (item.get("title") or "").lower())
-    else:
-        filtered.sort(key=lambda item: item.get("created_at") or "", reverse=True)
-
-    return filtered
+    if period == "today":
+        return now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+    if period == "7d":
+        return (now - timedelta(days=7)).isoformat()
+    if period == "30d":
+        return (now - timedelta(days=30)).isoformat()
+    return None
 
 
 def _is_valid_email(email: str) -> bool:
@@ -474,48 +508,10 @@ def _truncate_text(value: Optional[str], max_len: int) -> Optional[str]:
 
 
 def _build_public_growth_snapshot() -> dict:
-    """수익화/브랜드 페이지용 공개 성장 지표"""
-    snapshot = {
-        "total_tracks": 0,
-        "total_posts": 0,
-        "today_visits": 0,
-        "total_votes": 0,
-        "recent_battles": 0,
-    }
-
-    if not supabase_available:
-        return snapshot
-
-    try:
-        supabase = SupabaseClient()
-
-        try:
-            tracks = supabase.get_tracks(limit=10000, offset=0, user_id=None, playlist_id=None)
-            snapshot["total_tracks"] = len(tracks) if tracks else 0
-        except Exception:
-            pass
-
-        try:
-            posts = supabase.get_posts(limit=10000, offset=0, user_id=None)
-            snapshot["total_posts"] = len(posts) if posts else 0
-        except Exception:
-            pass
-
-        try:
-            worldcup_stats = supabase.get_worldcup_stats()
-            snapshot["total_votes"] = worldcup_stats.get("total_votes", 0)
-            snapshot["recent_battles"] = worldcup_stats.get("recent_battles", 0)
-        except Exception:
-            pass
-
-        try:
-            snapshot["today_visits"] = supabase.get_today_visits()
-        except Exception:
-            pass
-    except Exception:
-        pass
-
-    return snapshot
+    """수익화/브랜드 페이지용 공개 성장 지표 (캐시된 스냅샷, 블로킹 쿼리 없음)"""
+    if public_snapshot_service is None:
+        return dict(EMPTY_SNAPSHOT)
+    return public_snapshot_service.get_snapshot()
 
 
 def _normalize_growth_lead_payload(data: dict) -> tuple[Optional[dict], Optional[str]]:
@@ -606,8 +602,8 @@ def log_visitor():
     if any(path.startswith(excluded) for excluded in excluded_paths):
         return None
     
-    # 방문자 로그 기록 (비동기로 처리하여 응답 속도에 영향 없도록)
-    if supabase_available:
+    # 방문자 로그 기록 (큐에 넣기만 하고 저장은 writer 스레드가 일괄 처리)
+    if visitor_log_writer is not None:
         try:
             # IP 주소 가져오기 (프록시 환경 고려)
             ip_address = request.headers.get('X-Forwarded-For', request.remote_addr)
@@ -625,24 +621,12 @@ def log_visitor():
             # Referer 가져오기
             referer = request.headers.get('Referer')
             
-            # 비동기로 로그 기록 (응답 속도에 영향 없도록)
-            def log_async():
-                try:
-                    supabase = SupabaseClient()
-                    supabase.log_visitor(
-                        ip_address=ip_address,
-                        user_agent=user_agent,
-                        page_url=page_url,
-                        referer=referer
-                    )
-                except Exception as e:
-                    # 로그 기록 실패해도 앱은 계속 동작
-                    console.log(f"[WARN] 방문자 로그 기록 실패: {e}")
-            
-            # 별도 스레드에서 실행
-            thread = threading.Thread(target=log_async)
-            thread.daemon = True
-            thread.start()
+            visitor_log_writer.record(
+                ip_address=ip_address,
+                user_agent=user_agent,
+                page_url=page_url,
+                referer=referer
+            )
             
         except Exception as e:
             # 로그 기록 실패해도 앱은 계속 동작
@@ -663,9 +647,9 @@ class User(UserMixin):
     def get(user_id):
         """사용자 ID로 사용자 객체 반환"""
         try:
-            from utils.auth import AuthManager
-            auth_manager = AuthManager()
-            user_data = auth_manager.get_user_by_id(user_id)
+            from utils.auth import get_session_user
+            # 세션 캐시 우선 (미스일 때만 users 테이블 조회)
+            user_data = get_session_user(user_id)
             if user_data:
                 return User(
                     user_id=user_data['id'],
@@ -871,6 +855,9 @@ def register():
 @login_required
 def logout():
     """로그아웃"""
+    if current_user.is_authenticated:
+        from utils.auth import user_session_cache
+        user_session_cache.invalidate(current_user.id)
     logout_user()
     # Supabase Auth 세션은 클라이언트 사이드에서 관리
     return redirect(url_for('index'))
@@ -959,7 +946,39 @@ def api_me():
     return jsonify({'success': False, 'message': '로그인되지 않았습니다.'}), 401
 
 
+def _is_system_admin() -> bool:
+    """SYSTEM_STATS_ADMIN_EMAILS에 등록된 로그인 사용자인지"""
+    email = (getattr(current_user, 'email', None) or '').strip().lower()
+    return bool(email) and email in app_settings.SYSTEM_STATS_ADMIN_EMAILS
+
+
+@app.route('/api/system/cache-stats')
+@login_required
+def api_cache_stats():
+    """프로세스 로컬 캐시/큐 지표 (적중률 등) - SYSTEM_STATS_ADMIN_EMAILS 관리자만"""
+    if not _is_system_admin():
+        return jsonify({'success': False, 'error': 'Not found'}), 404
+    
+    from utils.auth import user_session_cache
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'user_session_cache': user_session_cache.get_stats(),
+        'track_view_cache': track_view_cache.get_status() if track_view_cache else None,
+        'public_snapshot': public_snapshot_service.get_status() if public_snapshot_service else None,
+        'visitor_log_writer': visitor_log_writer.get_status() if visitor_log_writer else None,
+        'rate_limiter': rate_limiter.get_status(),
+        'analysis_db': db_manager.get_pool_status() if db_manager else None,
+    })
+
+
 @app.route('/api/growth/leads', methods=['POST'])
+@rate_limiter.limit(
+    "growth_lead",
+    per_seconds=GROWTH_LEAD_MIN_INTERVAL_SECONDS,
+    key_func=_get_client_ip,
+    message="너무 빠르게 제출하고 있어요. 잠시 후 다시 시도해주세요.",
+)
 def create_growth_lead_api():
     """수익화 리드/브랜드 문의 저장"""
     try:
@@ -968,20 +987,10 @@ def create_growth_lead_api():
         if error:
             return jsonify({"success": False, "error": error}), 400
 
-        ip_address = _get_client_ip()
-        now = datetime.now()
-        last_at = _growth_last_submit_at_by_ip.get(ip_address)
-        if last_at and (now - last_at).total_seconds() < GROWTH_LEAD_MIN_INTERVAL_SECONDS:
-            return jsonify({
-                "success": False,
-                "error": "너무 빠르게 제출하고 있어요. 잠시 후 다시 시도해주세요.",
-            }), 429
-
         success, lead_id, storage = _persist_growth_lead(payload)
         if not success:
             return jsonify({"success": False, "error": "리드 저장에 실패했습니다."}), 500
 
-        _growth_last_submit_at_by_ip[ip_address] = now
         return jsonify({
             "success": True,
             "lead_id": lead_id,
@@ -994,6 +1003,21 @@ def create_growth_lead_api():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/api/growth/leads/summary')
+@login_required
+def growth_lead_summary_api():
+    """로컬 fallback 리드 기간별 집계 (?from=YYYY-MM-DD&to=YYYY-MM-DD) - 관리자만"""
+    if not _is_system_admin():
+        return jsonify({"success": False, "error": "Not found"}), 404
+    
+    try:
+        summary = growth_lead_store.summarize(request.args.get("from"), request.args.get("to"))
+        return jsonify({"success": True, **summary})
+    except Exception as e:
+        print(f"[ERROR] growth lead 집계 실패: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route('/')
 def index():
     """랜딩 페이지"""
@@ -1002,19 +1026,6 @@ def index():
     featured_track = None
     daily_curator_track = None
     recent_diary = None
-    activity_stats = {
-        'total_tracks': 0,
-        'total_comments': 0,
-        'total_posts': 0,
-        'growth': 12.4
-    }
-    worldcup_stats = {
-        'total_battles': 0,
-        'total_votes': 0,
-        'recent_battles': 0
-    }
-    total_tracks_count = 0
-    today_visits = 0
     
     # 로그인한 사용자인지 확인
     is_authenticated = current_user.is_authenticated
@@ -1049,19 +1060,6 @@ def index():
                 except Exception as e:
                     print(f"[ERROR] 공개 다이어리 게시글 조회 실패: {e}")
                     recent_diary = []
-                
-                # 활동 통계 (현재 사용자)
-                try:
-                    user_tracks_count = supabase.get_tracks(limit=1000, offset=0, user_id=current_user_id, playlist_id=None)
-                    activity_stats['total_tracks'] = len(user_tracks_count) if user_tracks_count else 0
-                except:
-                    pass
-                
-                try:
-                    user_posts_count = supabase.get_posts(limit=1000, offset=0, user_id=current_user_id)
-                    activity_stats['total_posts'] = len(user_posts_count) if user_posts_count else 0
-                except:
-                    pass
             else:
                 # 로그인하지 않은 사용자: 곡 정보 표시 안 함
                 # featured_track, daily_curator_track은 None으로 유지
@@ -1072,43 +1070,14 @@ def index():
                 except Exception as e:
                     print(f"[ERROR] 공개 다이어리 게시글 조회 실패: {e}")
                     recent_diary = []
-            
-            # 월드컵 통계 조회 (전체 사용자 누적 - 로그인 여부와 관계없이 조회)
-            try:
-                worldcup_stats = supabase.get_worldcup_stats()
-            except Exception as e:
-                print(f"[ERROR] 월드컵 통계 조회 실패: {e}")
-                worldcup_stats = {'total_battles': 0, 'total_votes': 0, 'recent_battles': 0}
-            
-            # 전체 트랙 수 조회 (모든 사용자)
-            try:
-                all_tracks = supabase.get_tracks(limit=10000, offset=0, user_id=None, playlist_id=None)
-                total_tracks_count = len(all_tracks) if all_tracks else 0
-            except Exception as e:
-                print(f"[ERROR] 전체 트랙 수 조회 실패: {e}")
-                total_tracks_count = 0
-            
-            # 오늘 방문횟수 조회
-            try:
-                today_visits = supabase.get_today_visits()
-            except Exception as e:
-                print(f"[ERROR] 오늘 방문횟수 조회 실패: {e}")
-                today_visits = 0
                 
     except Exception as e:
         print(f"[ERROR] 인덱스 페이지 데이터 로드 실패: {e}")
         import traceback
         traceback.print_exc()
 
+    # 공개 집계 지표(전체 곡/게시글/투표/방문)는 백그라운드 스냅샷에서 읽음
     growth_snapshot = _build_public_growth_snapshot()
-    if total_tracks_count:
-        growth_snapshot["total_tracks"] = total_tracks_count
-    if today_visits:
-        growth_snapshot["today_visits"] = today_visits
-    if worldcup_stats.get("total_votes"):
-        growth_snapshot["total_votes"] = worldcup_stats.get("total_votes", 0)
-    if worldcup_stats.get("recent_battles"):
-        growth_snapshot["recent_battles"] = worldcup_stats.get("recent_battles", 0)
     
     # 오늘 날짜 포맷팅
     from datetime import datetime
@@ -1119,10 +1088,13 @@ def index():
         featured_track=featured_track,
         daily_curator_track=daily_curator_track,
         recent_diary=recent_diary,
-        activity_stats=activity_stats,
-        worldcup_stats=worldcup_stats,
-        total_tracks_count=total_tracks_count,
-        today_visits=today_visits,
+        worldcup_stats={
+            'total_battles': growth_snapshot.get('total_votes', 0),
+            'total_votes': growth_snapshot.get('total_votes', 0),
+            'recent_battles': growth_snapshot.get('recent_battles', 0),
+        },
+        total_tracks_count=growth_snapshot.get('total_tracks', 0),
+        today_visits=growth_snapshot.get('today_visits', 0),
         today_date=today_date,
         is_authenticated=is_authenticated,
         growth_snapshot=growth_snapshot,
@@ -1262,6 +1234,8 @@ def vote_worldcup():
         )
         
         if battle_id:
+            if track_view_cache:
+                track_view_cache.invalidate_battle(track_a_id, track_b_id)
             return jsonify({'success': True, 'battle_id': battle_id}), 201
         else:
             return jsonify({'success': False, 'error': '투표 저장에 실패했습니다.'}), 500
@@ -1280,7 +1254,9 @@ def get_worldcup_results():
         supabase = SupabaseClient()
         limit = int(request.args.get('limit', 50))
         
-        rankings = supabase.get_worldcup_rankings(limit=limit)
+        order_by = request.args.get('order', 'wins')
+        
+        rankings = supabase.get_worldcup_rankings(limit=limit, order_by=order_by)
         
         # duration_str 추가
         for ranking in rankings:
@@ -1329,20 +1305,42 @@ def diary():
     if sort not in {'latest', 'oldest', 'title'}:
         sort = 'latest'
 
+    after_cursor = str(request.args.get('after', '')).strip() or None
+    before_cursor = str(request.args.get('before', '')).strip() or None
+    if not (after_cursor or before_cursor):
+        # 커서 없이는 항상 첫 페이지를 조회하므로 page 번호도 1로 맞춤
+        page = 1
+    try:
+        known_total = int(request.args.get('total', ''))
+    except Exception:
+        known_total = None
+
+    next_cursor = None
+    prev_cursor = None
+    has_next = False
+    has_prev = page > 1
     try:
         if supabase_available:
             supabase = SupabaseClient()
-            scanned_posts = supabase.get_posts(limit=COMMUNITY_EXPLORE_SCAN_LIMIT, offset=0, user_id=None)
-            filtered_posts = _filter_diary_posts(
-                scanned_posts,
-                search_query=search_query,
-                author_query=author_query,
-                period=period,
+            # 한 페이지만 DB에서 조회 (전체 결과 수는 첫 페이지에서만 세고 링크로 전달)
+            result = supabase.search_posts(
+                search=search_query,
+                author=author_query,
+                date_from=_diary_period_start(period),
                 sort=sort,
+                limit=per_page,
+                after=after_cursor,
+                before=before_cursor,
+                search_mode=app_settings.DIARY_SEARCH_MODE,
+                with_count=known_total is None,
             )
-            total_results = len(filtered_posts)
-            offset = (page - 1) * per_page
-            posts = filtered_posts[offset:offset + per_page]
+            posts = result["posts"]
+            total_results = result["total"] if result["total"] is not None else known_total
+            next_cursor = result["next_cursor"]
+            prev_cursor = result["prev_cursor"]
+            has_next = result["has_next"]
+            if after_cursor or before_cursor:
+                has_prev = result["has_prev"]
         else:
             total_results = 0
     except Exception as e:
@@ -1351,7 +1349,6 @@ def diary():
         posts = []
         total_results = 0
 
-    has_next = (page * per_page) < total_results
     return render_template(
         'community.html',
         posts=posts,
@@ -1359,6 +1356,9 @@ def diary():
         page=page,
         per_page=per_page,
         has_next=has_next,
+        has_prev=has_prev,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
         total_results=total_results,
         filters={
             'q': search_query,
@@ -1441,12 +1441,15 @@ def track_detail(track_id):
     if not supabase_available:
         return render_template('tracks.html', error="Supabase 연결이 불가능합니다.", tracks=[]), 503
 
-    supabase = SupabaseClient()
-    track = supabase.get_track(track_id)
-    if not track:
+    # 곡/코멘트/통계는 캐시에서 (미스인 조각만 동시에 조회)
+    view = track_view_cache.get_view(track_id)
+    if not view:
         return render_template('tracks.html', error="곡을 찾을 수 없습니다.", tracks=[]), 404
 
+    track = dict(view["track"])
     track["duration_str"] = _format_duration(track.get("duration_seconds"))
+    if track_stats_refresher:
+        track_stats_refresher.note_view(track_id)
 
     source = track.get("source")
     embed = {"type": source, "url": track.get("url"), "source_id": track.get("source_id")}
@@ -1457,23 +1460,24 @@ def track_detail(track_id):
     # 트랙을 추가한 사용자 ID
     track_user_id = track.get('user_id')
     
-    # 코멘트 조회 (본인이 추가한 곡이면 본인 코멘트만, 아니면 모든 코멘트)
-    comments = supabase.get_track_comments(
-        track_id, 
-        limit=50, 
-        offset=0,
-        track_user_id=track_user_id,
-        current_user_id=current_user_id
-    )
+    # 코멘트 (본인이 추가한 곡이면 본인 코멘트만 직접 조회, 아니면 캐시된 전체 코멘트)
+    if track_user_id and current_user_id and str(track_user_id) == current_user_id:
+        comments = SupabaseClient().get_track_comments(
+            track_id, 
+            limit=50, 
+            offset=0,
+            track_user_id=str(track_user_id),
+            current_user_id=current_user_id
+        )
+    else:
+        comments = view["comments"]
 
-    track_comment_count = supabase.get_track_comment_count(track_id)
-    battle_stats = supabase.get_track_battle_stats(track_id)
     metadata = _safe_dict(track.get("metadata"))
     track_stats = _build_track_stats_view(
         track=track,
         stored_stats=_safe_dict(metadata.get("stats")),
-        comment_count=track_comment_count,
-        battle_stats=battle_stats,
+        comment_count=view["comment_count"],
+        battle_stats=view["battle_stats"],
     )
 
     return render_template(
@@ -1483,7 +1487,7 @@ def track_detail(track_id):
         comments=comments,
         track_data_items=_build_track_data_items(track),
         track_stats=track_stats,
-        can_sync_stats=(source in {'youtube', 'soundcloud'}) and track_stats_service_available,
+        can_sync_stats=(source in {'youtube', 'soundcloud'}) and track_stats_refresher is not None,
     )
 
 
@@ -1730,6 +1734,8 @@ def create_track_api():
                     "thumbnail_url": thumbnail,
                     "metadata": metadata,
                 })
+                if track_view_cache:
+                    track_view_cache.invalidate_tracks([existing_id])
 
             return jsonify({"success": True, "track_id": existing_id, "playlist_id": playlist_id, "existing": True}), 200
 
@@ -1795,6 +1801,8 @@ def add_track_to_playlist_api(track_id):
         success = supabase.update_track(track_id, {"playlist_id": playlist_id})
         
         if success:
+            if track_view_cache:
+                track_view_cache.invalidate_tracks([track_id])
             return jsonify({'success': True}), 200
         else:
             return jsonify({'success': False, 'error': '플레이리스트에 추가에 실패했습니다.'}), 500
@@ -1836,6 +1844,8 @@ def delete_track_api(track_id):
         ok = supabase.delete_track(track_id)
         if not ok:
             return jsonify({"success": False, "error": "삭제에 실패했습니다."}), 500
+        if track_view_cache:
+            track_view_cache.invalidate(track_id)
         return jsonify({"success": True}), 200
     except Exception as e:
         print(f"[ERROR] track 삭제 실패: {e}")
@@ -1863,22 +1873,28 @@ def update_tracks_order_api():
         supabase = SupabaseClient()
         current_user_id = str(current_user.id)
         
-        # 모든 트랙이 본인 것인지 확인
-        for item in track_orders:
-            track_id = item.get('id')
-            if not track_id:
-                continue
-            track = supabase.get_track(track_id)
-            if not track:
+        # 모든 트랙이 본인 것인지 한 번의 쿼리로 확인
+        try:
+            track_ids = [str(item['id']) for item in track_orders if item.get('id')]
+            for item in track_orders:
+                if item.get('order') is not None:
+                    int(item.get('order'))
+        except (TypeError, ValueError, AttributeError):
+            return jsonify({'success': False, 'error': '잘못된 요청입니다.'}), 400
+        
+        owners = supabase.get_track_owners(track_ids)
+        for track_id in track_ids:
+            if track_id not in owners:
                 return jsonify({'success': False, 'error': f'곡을 찾을 수 없습니다: {track_id}'}), 404
-            track_user_id = track.get('user_id')
-            if not track_user_id or str(track_user_id) != current_user_id:
+            if owners[track_id] != current_user_id:
                 return jsonify({'success': False, 'error': '본인이 추가한 곡만 순서를 변경할 수 있습니다.'}), 403
         
-        # 순서 업데이트
-        ok = supabase.update_tracks_order(track_orders)
+        # 순서 업데이트 (단일 RPC)
+        ok = supabase.update_tracks_order(track_orders, user_id=current_user_id)
         if not ok:
             return jsonify({"success": False, "error": "순서 변경에 실패했습니다."}), 500
+        if track_view_cache:
+            track_view_cache.invalidate_tracks(track_ids)
         return jsonify({"success": True}), 200
     except Exception as e:
         print(f"[ERROR] tracks 순서 변경 실패: {e}")
@@ -1888,6 +1904,12 @@ def update_tracks_order_api():
 
 
 @app.route('/api/tracks/<track_id>/comments', methods=['POST'])
+@rate_limiter.limit(
+    "track_comment",
+    per_seconds=TRACK_COMMENT_MIN_INTERVAL_SECONDS,
+    key_func=_get_client_ip,
+    message="너무 빠르게 작성하고 있어요. 잠시 후 다시 시도해주세요.",
+)
 def create_track_comment_api(track_id):
     """곡 코멘트 작성 API"""
     try:
@@ -1905,12 +1927,6 @@ def create_track_comment_api(track_id):
         if len(author) > TRACK_COMMENT_AUTHOR_MAX_LEN:
             return jsonify({"success": False, "error": f"닉네임은 {TRACK_COMMENT_AUTHOR_MAX_LEN}자 이하로 입력해주세요."}), 400
 
-        ip_address = _get_client_ip()
-        now = datetime.now()
-        last_at = _track_last_comment_at_by_ip.get(ip_address)
-        if last_at and (now - last_at).total_seconds() < TRACK_COMMENT_MIN_INTERVAL_SECONDS:
-            return jsonify({"success": False, "error": "너무 빠르게 작성하고 있어요. 잠시 후 다시 시도해주세요."}), 429
-
         supabase = SupabaseClient()
         # 현재 로그인한 사용자 ID
         user_id = None
@@ -1924,7 +1940,8 @@ def create_track_comment_api(track_id):
         if not comment_id:
             return jsonify({"success": False, "error": "코멘트 저장에 실패했습니다."}), 500
 
-        _track_last_comment_at_by_ip[ip_address] = now
+        if track_view_cache:
+            track_view_cache.invalidate_comments(track_id)
         return jsonify({"success": True, "comment_id": comment_id}), 201
     except Exception as e:
         print(f"[ERROR] track_comments 생성 실패: {e}")
@@ -1977,6 +1994,8 @@ def delete_track_comment_api(comment_id):
         ok = supabase.delete_track_comment(comment_id)
         if not ok:
             return jsonify({"success": False, "error": "삭제에 실패했습니다."}), 500
+        if track_view_cache and comment.get('track_id'):
+            track_view_cache.invalidate_comments(str(comment.get('track_id')))
         return jsonify({"success": True}), 200
     except Exception as e:
         print(f"[ERROR] track_comment 삭제 실패: {e}")
@@ -1986,76 +2005,35 @@ def delete_track_comment_api(comment_id):
 
 
 @app.route('/api/tracks/<track_id>/sync-stats', methods=['POST'])
+@rate_limiter.limit(
+    "track_stats_sync",
+    per_seconds=TRACK_STATS_SYNC_MIN_INTERVAL_SECONDS,
+    key_func=_client_track_key,
+    message="잠시 후 다시 시도해주세요. 약 {retry_after}초 남았습니다.",
+)
 def sync_track_stats_api(track_id):
-    """트랙 외부 지표 동기화"""
+    """트랙 외부 지표 갱신 요청 (캐시된 지표를 즉시 반환, 실제 조회는 백그라운드 배치에서 처리)"""
     try:
         if not supabase_available:
             return jsonify({"success": False, "error": "Supabase 연결이 불가능합니다."}), 503
 
-        if not track_stats_service_available:
+        if not track_stats_refresher:
             return jsonify({"success": False, "error": "트랙 통계 기능을 사용할 수 없습니다."}), 503
 
-        ip_address = _get_client_ip()
-        sync_key = f"{ip_address}:{track_id}"
-        now = datetime.now()
-        last_sync_at = _track_last_stats_sync_at_by_ip.get(sync_key)
-        if last_sync_at and (now - last_sync_at).total_seconds() < TRACK_STATS_SYNC_MIN_INTERVAL_SECONDS:
-            remaining = TRACK_STATS_SYNC_MIN_INTERVAL_SECONDS - int((now - last_sync_at).total_seconds())
-            return jsonify({
-                "success": False,
-                "error": f"잠시 후 다시 시도해주세요. 약 {max(1, remaining)}초 남았습니다.",
-            }), 429
-
         supabase = SupabaseClient()
         track = supabase.get_track(track_id)
         if not track:
             return jsonify({"success": False, "error": "곡을 찾을 수 없습니다."}), 404
 
-        stats_service = TrackStatsService(console_log=console.log)
-        result = stats_service.fetch_stats(track)
-        if not result.get("success"):
-            return jsonify({
-                "success": False,
-                "error": result.get("error") or "외부 지표를 가져오지 못했습니다.",
-            }), 502
-
-        metadata = _safe_dict(track.get("metadata"))
-        provider = _safe_dict(metadata.get("provider"))
-        provider_fields = _safe_dict(result.get("provider_fields"))
-
-        for key in ("title", "uploader", "duration_seconds", "thumbnail_url"):
-            if provider_fields.get(key) is not None:
-                provider[key] = provider_fields.get(key)
-        metadata["provider"] = provider
-
-        synced_stats = _safe_dict(result.get("stats"))
-        synced_stats["comment_count"] = supabase.get_track_comment_count(track_id)
-        synced_stats["last_synced_at"] = now.isoformat()
-        metadata["stats"] = synced_stats
-
-        update_data = {"metadata": metadata}
-
-        if result.get("source_id") and not track.get("source_id"):
-            update_data["source_id"] = result.get("source_id")
-        if provider_fields.get("thumbnail_url") and not track.get("thumbnail_url"):
-            update_data["thumbnail_url"] = provider_fields.get("thumbnail_url")
-        if provider_fields.get("duration_seconds") and not track.get("duration_seconds"):
-            update_data["duration_seconds"] = provider_fields.get("duration_seconds")
-        if provider_fields.get("uploader") and not track.get("artist"):
-            update_data["artist"] = provider_fields.get("uploader")
-        if provider_fields.get("title") and not track.get("title"):
-            update_data["title"] = provider_fields.get("title")[:TRACK_TITLE_MAX_LEN]
-
-        updated = supabase.update_track(track_id, update_data)
-        if not updated:
-            return jsonify({"success": False, "error": "통계 저장에 실패했습니다."}), 500
-
-        _track_last_stats_sync_at_by_ip[sync_key] = now
+        track_stats_refresher.request_refresh(track_id)
+
+        cached_stats = _safe_dict(_safe_dict(track.get("metadata")).get("stats"))
         return jsonify({
             "success": True,
-            "stats": synced_stats,
-            "provider": result.get("provider"),
-        }), 200
+            "stats": cached_stats,
+            "last_synced_at": cached_stats.get("last_synced_at"),
+            "refresh_queued": True,
+        }), 202
     except Exception as e:
         print(f"[ERROR] track stats sync 실패: {e}")
         import traceback
@@ -2064,6 +2042,12 @@ def sync_track_stats_api(track_id):
 
 
 @app.route('/api/community/posts', methods=['POST'])
+@rate_limiter.limit(
+    "community_post",
+    per_seconds=COMMUNITY_POST_MIN_INTERVAL_SECONDS,
+    key_func=_get_client_ip,
+    message="너무 빠르게 작성하고 있어요. 잠시 후 다시 시도해주세요.",
+)
 def create_post():
     """게시글 생성 API - 로그인 필요"""
     # 로그인 체크
@@ -2078,13 +2062,6 @@ def create_post():
         content = str(data.get('content', '')).strip()
         author = str(data.get('author', 'Anonymous')).strip() or 'Anonymous'
 
-        # 기본 스팸 방지(연속 작성 제한)
-        ip_address = _get_client_ip()
-        now = datetime.now()
-        last_at = _community_last_post_at_by_ip.get(ip_address)
-        if last_at and (now - last_at).total_seconds() < COMMUNITY_POST_MIN_INTERVAL_SECONDS:
-            return jsonify({'success': False, 'error': '너무 빠르게 작성하고 있어요. 잠시 후 다시 시도해주세요.'}), 429
-
         validation_error = _validate_post_payload(title, content, author)
         if validation_error:
             return jsonify({'success': False, 'error': validation_error}), 400
@@ -2101,7 +2078,6 @@ def create_post():
             post_id = supabase.create_post(title, content, author, user_id=user_id)
             
             if post_id:
-                _community_last_post_at_by_ip[ip_address] = now
                 return jsonify({'success': True, 'post_id': post_id}), 201
             else:
                 return jsonify({'success': False, 'error': '게시글 생성에 실패했습니다.'}), 500
@@ -3511,6 +3487,46 @@ def get_session_details(session_id):
         })
 
 
+@app.route('/api/database/search')
+def search_analysis_history():
+    """분석 이력 전문 검색 (제목/아티스트/장르/태그/댓글, 관련도 순)"""
+    console.log("[Route] /api/database/search - 전문 검색")
+
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({
+                'success': False,
+                'error': '검색어를 입력해주세요'
+            }), 400
+
+        scope = request.args.get('scope', 'all')
+        limit = max(1, min(request.args.get('limit', 20, type=int), 50))
+        page = max(1, request.args.get('page', 1, type=int))
+
+        if db_manager:
+            found = db_manager.search_history(query, scope=scope, limit=limit, offset=(page - 1) * limit)
+            return jsonify({
+                'success': True,
+                'results': found['results'],
+                'count': len(found['results']),
+                'total': found['total'],
+                'page': page,
+                'has_next': found['has_next']
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': '데이터베이스가 초기화되지 않았습니다'
+            })
+    except Exception as e:
+        console.log(f"[Route] 전문 검색 오류: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+
 @app.route('/api/database/search/artist')
 def search_by_artist():
     """아티스트로 검색"""
@@ -3806,10 +3822,13 @@ def analyze_music_job(job_id, url):
             # 데이터베이스에 저장
             if db_manager:
                 try:
-                    session_id = db_manager.save_analysis_result(result)
+                    save_report = db_manager.bulk_save_analysis(result)
+                    session_id = save_report['session_id']
                     result['database'] = {
                         'saved': True,
-                        'session_id': session_id
+                        'session_id': session_id,
+                        'rows': save_report['rows'],
+                        'timings_ms': save_report['timings_ms']
                     }
                     console.log(f"[Analyze Job] {job_id} - 데이터베이스 저장 완료: session_id={session_id}")
                 except Exception as e:
@@ -4082,94 +4101,38 @@ def get_all_korea_charts():
         from connectors.korea_music_charts_connector import KoreaMusicChartsConnector
         connector = KoreaMusicChartsConnector(console.log)
         
-        # 서비스별 차트 수집
+        # 서비스별 차트 수집 (모든 서비스를 한 번에 동시 요청)
+        default_chart_types = {'melon': 'realtime', 'bugs': 'realtime', 'genie': 'realtime', 'vibe': 'chart'}
+        targets = [(service, default_chart_types[service]) for service in services if service in default_chart_types]
+        results = connector.collect_charts(targets, limit_per_chart)
+        
         all_services = {}
         total_tracks = 0
         successful_services = 0
         
-        for service in services:
-            try:
-                chart_result = None
-                if service == 'melon':
-                    chart_result = connector._get_melon_chart('realtime', limit_per_chart)
-                elif service == 'bugs':
-                    chart_result = connector._get_bugs_chart('realtime', limit_per_chart)
-                elif service == 'genie':
-                    chart_result = connector._get_genie_chart('realtime', limit_per_chart)
-                elif service == 'vibe':
-                    chart_result = connector._get_vibe_chart('chart', limit_per_chart)
-                else:
-                    continue
-                
-                # 반환 타입에 따른 처리
-                if isinstance(chart_result, dict):
-                    # 딕셔너리 형태 (멜론)
-                    if chart_result.get('success') and chart_result.get('tracks'):
-                        tracks = chart_result['tracks']
-                        all_services[service] = {
-                            'realtime': {
-                                'success': True,
-                                'tracks': tracks,
-                                'total_tracks': len(tracks)
-                            }
-                        }
-                        total_tracks += len(tracks)
-                        successful_services += 1
-                        console.log(f"[API] {service} 차트 수집 성공: {len(tracks)}곡")
-                    else:
-                        all_services[service] = {
-                            'realtime': {
-                                'success': False,
-                                'tracks': [],
-                                'total_tracks': 0,
-                                'error': chart_result.get('error', f'{service} 차트 수집 실패')
-                            }
-                        }
-                        console.log(f"[API] {service} 차트 수집 실패: {chart_result.get('error', 'Unknown')}")
-                elif isinstance(chart_result, list):
-                    # 리스트 형태 (기타 서비스)
-                    if chart_result and len(chart_result) > 0:
-                        all_services[service] = {
-                            'realtime': {
-                                'success': True,
-                                'tracks': chart_result,
-                                'total_tracks': len(chart_result)
-                            }
-                        }
-                        total_tracks += len(chart_result)
-                        successful_services += 1
-                        console.log(f"[API] {service} 차트 수집 성공: {len(chart_result)}곡")
-                    else:
-                        all_services[service] = {
-                            'realtime': {
-                                'success': False,
-                                'tracks': [],
-                                'total_tracks': 0,
-                                'error': f'{service} 차트 데이터 없음'
-                            }
-                        }
-                        console.log(f"[API] {service} 차트 수집 실패")
-                else:
-                    all_services[service] = {
-                        'realtime': {
-                            'success': False,
-                            'tracks': [],
-                            'total_tracks': 0,
-                            'error': f'{service} 차트 데이터 형식 오류'
-                        }
+        for (service, chart_type), chart_result in results.items():
+            if chart_result.get('success') and chart_result.get('tracks'):
+                tracks = chart_result['tracks']
+                all_services[service] = {
+                    'realtime': {
+                        'success': True,
+                        'tracks': tracks,
+                        'total_tracks': len(tracks)
                     }
-                    console.log(f"[API] {service} 차트 데이터 형식 오류: {type(chart_result)}")
-                    
-            except Exception as e:
+                }
+                total_tracks += len(tracks)
+                successful_services += 1
+                console.log(f"[API] {service} 차트 수집 성공: {len(tracks)}곡")
+            else:
                 all_services[service] = {
                     'realtime': {
                         'success': False,
                         'tracks': [],
                         'total_tracks': 0,
-                        'error': str(e)
+                        'error': chart_result.get('error', f'{service} 차트 수집 실패')
                     }
                 }
-                console.log(f"[API] {service} 차트 수집 오류: {str(e)}")
+                console.log(f"[API] {service} 차트 수집 실패: {chart_result.get('error', 'Unknown')}")
         
         # 성공률 계산
         success_rate = (successful_services / len(services) * 100) if services else 0
@@ -4348,6 +4311,63 @@ def scheduler_config():
         console.log(f"[API] 스케줄러 설정 오류: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/scheduler/history/stats')
+def scheduler_history_stats():
+    """수집 차트 기간 통계 (days=7 주간, 30 월간)"""
+    console.log("[Route] /api/scheduler/history/stats - 차트 기간 통계")
+    
+    try:
+        if not chart_scheduler_available:
+            return jsonify({'success': False, 'error': '스케줄러를 사용할 수 없습니다'}), 500
+        
+        days = max(1, min(request.args.get('days', 7, type=int), 400))
+        kind = request.args.get('type', 'daily')
+        if kind not in ('daily', 'realtime'):
+            return jsonify({'success': False, 'error': 'type은 daily 또는 realtime'}), 400
+        top = max(1, min(request.args.get('top', 20, type=int), 100))
+        
+        return jsonify({
+            'success': True,
+            'stats': get_scheduler().get_chart_stats(days, kind, top)
+        })
+    
+    except Exception as e:
+        console.log(f"[API] 차트 기간 통계 오류: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/scheduler/history/track')
+def scheduler_history_track():
+    """곡별 차트 순위 추이"""
+    console.log("[Route] /api/scheduler/history/track - 곡 순위 추이")
+    
+    try:
+        if not chart_scheduler_available:
+            return jsonify({'success': False, 'error': '스케줄러를 사용할 수 없습니다'}), 500
+        
+        title = request.args.get('title', '').strip()
+        artist = request.args.get('artist', '').strip()
+        if not title or not artist:
+            return jsonify({'success': False, 'error': 'title과 artist가 필요합니다'}), 400
+        days = max(1, min(request.args.get('days', 30, type=int), 400))
+        kind = request.args.get('type')
+        
+        history = get_scheduler().history.track_history(
+            title, artist, start_date=datetime.now() - timedelta(days=days - 1), kind=kind
+        )
+        for row in history:
+            row['collected_at'] = datetime.fromtimestamp(row['collected_at']).isoformat()
+        
+        return jsonify({
+            'success': True,
+            'title': title,
+            'artist': artist,
+            'history': history
+        })
+    
+    except Exception as e:
+        console.log(f"[API] 곡 순위 추이 오류: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/charts/analysis')
 def analyze_charts():
     """차트 분석 및 비교"""
@@ -0,0 +1,293 @@
+"""
+Async HTTP fetch engine for chart connectors.
+
+All chart pages of one collection are fetched concurrently on one
+``aiohttp`` session: connections are kept alive and reused per host,
+``limit_per_host`` keeps us polite to each music service, and every
+request gets the timeout of its service plus retry with exponential
+backoff on timeouts, connection errors, 429 and 5xx.
+
+Connectors build their collection as coroutines and hand them to
+``ChartFetcher.run``, which owns the event loop and the session, so a full
+collection takes roughly as long as the slowest single page.
+
+With ``conditional=True`` the fetcher remembers ETag / Last-Modified per
+URL and sends If-None-Match / If-Modified-Since on the next request; a 304
+comes back as ``FetchResult.not_modified`` without a body.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+import aiohttp
+
+try:
+    from utils import app_settings
+except ImportError:
+    app_settings = None
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
+    'Accept-Encoding': 'gzip, deflate',
+    'DNT': '1',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Retry-After가 이보다 길면 기다리지 않고 실패 처리
+MAX_RETRY_AFTER_SECONDS = 10.0
+
+
+def parse_timeouts(spec: str) -> Dict[str, float]:
+    """'melon=8,bugs=6' 형식의 서비스별 타임아웃 설정 파싱"""
+    timeouts = {}
+    for part in (spec or '').split(','):
+        name, _, value = part.partition('=')
+        if name.strip() and value.strip():
+            timeouts[name.strip().lower()] = float(value)
+    return timeouts
+
+
+class FetchResult(NamedTuple):
+    url: str
+    status: Optional[int]
+    text: Optional[str]
+    error: Optional[str]
+    attempts: int
+    elapsed_ms: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class ChartFetcher:
+    """Concurrent chart page fetcher with per-host limits, keep-alive, retries and per-service timeouts."""
+
+    def __init__(
+        self,
+        per_host_limit: int = 4,
+        total_limit: int = 32,
+        default_timeout: float = 10.0,
+        service_timeouts: Optional[Dict[str, float]] = None,
+        retries: int = 2,
+        backoff_seconds: float = 0.5,
+        console_log=None,
+    ):
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.default_timeout = default_timeout
+        self.service_timeouts = service_timeouts or {}
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.console_log = console_log or print
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._failures = 0
+        self._not_modified = 0
+        # 조건부 요청용 검증자: (url, params) -> (ETag, Last-Modified)
+        self._validators: Dict[tuple, tuple] = {}
+
+    def timeout_for(self, service: Optional[str]) -> float:
+        return self.service_timeouts.get((service or '').lower(), self.default_timeout)
+
+    # =========================
+    # Running collections
+    # =========================
+    def run(self, work: Callable[[aiohttp.ClientSession], Awaitable[Any]]) -> Any:
+        """
+        세션을 열고 work(session) 코루틴을 끝까지 실행 (동기 코드에서 호출)
+
+        이미 이벤트 루프가 도는 스레드에서 호출되면 별도 스레드에서 실행한다.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._run(work))
+
+        outcome: Dict[str, Any] = {}
+
+        def target():
+            try:
+                outcome['result'] = asyncio.run(self._run(work))
+            except BaseException as exc:
+                outcome['error'] = exc
+
+        thread = threading.Thread(target=target, name="chart-fetcher")
+        thread.start()
+        thread.join()
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome.get('result')
+
+    async def _run(self, work):
+        async with self.session() as session:
+            return await work(session)
+
+    def session(self) -> aiohttp.ClientSession:
+        """keep-alive 연결을 호스트별 상한까지 재사용하는 세션"""
+        connector = aiohttp.TCPConnector(
+            limit=self.total_limit,
+            limit_per_host=self.per_host_limit,
+            keepalive_timeout=30,
+            ttl_dns_cache=300,
+        )
+        return aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS)
+
+    # =========================
+    # Requests
+    # =========================
+    async def fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        service: str = None,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        conditional: bool = False,
+    ) -> FetchResult:
+        """
+        GET 요청 (재시도 포함). 예외를 던지지 않고 FetchResult.error에 담아 반환
+
+        4xx(429 제외)는 재시도하지 않는다. conditional이면 지난 응답의 ETag/Last-Modified로
+        조건부 요청을 보내고, 304면 본문 없이 status=304인 결과를 반환한다.
+        """
+        timeout = aiohttp.ClientTimeout(total=self.timeout_for(service))
+        cache_key = (url, tuple(sorted((params or {}).items())))
+        if conditional:
+            headers = {**(headers or {}), **self._conditional_headers(cache_key)}
+        started = time.perf_counter()
+        status, error = None, None
+        attempt = 0
+        for attempt in range(1, self.retries + 2):
+            retry_after = None
+            try:
+                async with session.get(url, headers=headers, params=params, timeout=timeout) as response:
+                    status = response.status
+                    if status == 304:
+                        self._count(attempt, not_modified=True)
+                        return FetchResult(url, status, None, None, attempt, self._elapsed(started))
+                    if status in RETRY_STATUSES:
+                        error = f"HTTP {status}"
+                        retry_after = self._retry_after(response.headers.get('Retry-After'))
+                    elif status >= 400:
+                        error = f"HTTP {status}"
+                        break
+                    else:
+                        text = await response.text(encoding='utf-8', errors='replace')
+                        etag = response.headers.get('ETag')
+                        last_modified = response.headers.get('Last-Modified')
+                        if conditional:
+                            self._remember_validators(cache_key, etag, last_modified)
+                        self._count(attempt)
+                        return FetchResult(url, status, text, None, attempt, self._elapsed(started), etag, last_modified)
+            except asyncio.TimeoutError:
+                status, error = None, f"timeout ({self.timeout_for(service)}s)"
+            except aiohttp.ClientError as exc:
+                status, error = None, f"{type(exc).__name__}: {exc}"
+
+            if attempt > self.retries or (retry_after is not None and retry_after > MAX_RETRY_AFTER_SECONDS):
+                break
+            delay = retry_after if retry_after is not None else self.backoff_seconds * (2 ** (attempt - 1))
+            await asyncio.sleep(delay + random.uniform(0, self.backoff_seconds))
+
+        self._count(attempt, failed=True)
+        return FetchResult(url, status, None, error, attempt, self._elapsed(started))
+
+    def _conditional_headers(self, cache_key: tuple) -> Dict[str, str]:
+        with self._lock:
+            etag, last_modified = self._validators.get(cache_key, (None, None))
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def _remember_validators(self, cache_key: tuple, etag: Optional[str], last_modified: Optional[str]) -> None:
+        with self._lock:
+            if etag or last_modified:
+                self._validators[cache_key] = (etag, last_modified)
+            else:
+                self._validators.pop(cache_key, None)
+
+    def clear_validators(self) -> None:
+        """저장된 ETag/Last-Modified를 모두 버림 (다음 조건부 요청은 전체 응답을 받음)"""
+        with self._lock:
+            self._validators.clear()
+
+    @staticmethod
+    def _retry_after(value: Optional[str]) -> Optional[float]:
+        try:
+            return max(0.0, float(value)) if value else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _elapsed(started: float) -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    def _count(self, attempts: int, failed: bool = False, not_modified: bool = False) -> None:
+        with self._lock:
+            self._requests += 1
+            self._retries += attempts - 1
+            if failed:
+                self._failures += 1
+            if not_modified:
+                self._not_modified += 1
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'retries': self._retries,
+                'failures': self._failures,
+                'not_modified': self._not_modified,
+                'conditional_urls': len(self._validators),
+                'per_host_limit': self.per_host_limit,
+                'default_timeout': self.default_timeout,
+                'service_timeouts': dict(self.service_timeouts),
+            }
+
+
+# 전역 fetcher 인스턴스
+_global_fetcher: Optional[ChartFetcher] = None
+_global_lock = threading.Lock()
+
+
+def get_chart_fetcher(console_log=None) -> ChartFetcher:
+    """설정(CHART_FETCH_*)으로 만든 공유 fetcher 반환"""
+    global _global_fetcher
+    with _global_lock:
+        if _global_fetcher is None:
+            settings = app_settings
+            _global_fetcher = ChartFetcher(
+                per_host_limit=getattr(settings, 'CHART_FETCH_PER_HOST_LIMIT', 4),
+                total_limit=getattr(settings, 'CHART_FETCH_TOTAL_LIMIT', 32),
+                default_timeout=getattr(settings, 'CHART_FETCH_TIMEOUT_SECONDS', 10.0),
+                service_timeouts=parse_timeouts(getattr(settings, 'CHART_FETCH_SERVICE_TIMEOUTS', '')),
+                retries=getattr(settings, 'CHART_FETCH_RETRIES', 2),
+                backoff_seconds=getattr(settings, 'CHART_FETCH_BACKOFF_SECONDS', 0.5),
+                console_log=console_log,
+            )
+        return _global_fetcher
@@ -0,0 +1,344 @@
+"""
+Pluggable HTML parsers for chart pages (melon, bugs, genie).
+
+Each service's extraction rules are written once in ``ChartHTMLParser``
+against four primitives (first / all / text / attr) and named selectors.
+Backends implement the primitives:
+
+- bs4: BeautifulSoup with html.parser (previous behaviour, always available)
+- lxml: lxml.html with XPath expressions compiled once at import
+- selectolax: lexbor CSS engine
+
+``get_chart_parser`` picks the backend from CHART_HTML_PARSER
+(``auto`` = fastest installed). All backends must return identical track
+dicts for the fixtures in data/chart_fixtures; scripts/bench_chart_parsers.py
+checks that and times each backend per service.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional
+
+try:
+    from bs4 import BeautifulSoup
+    BEAUTIFULSOUP_AVAILABLE = True
+except ImportError:
+    BEAUTIFULSOUP_AVAILABLE = False
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    from utils import app_settings
+except ImportError:
+    app_settings = None
+
+
+class Selector(NamedTuple):
+    css: str      # selectolax
+    xpath: str    # lxml (상대 경로, 컴파일해서 사용)
+    name: str     # bs4 find 태그
+    attrs: Dict[str, str]  # bs4 find 속성 (class는 토큰 일치, 공백이 있으면 전체 문자열 일치)
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+TBODY = Selector('tbody', './/tbody', 'tbody', {})
+TR = Selector('tr', './/tr', 'tr', {})
+TD = Selector('td', './/td', 'td', {})
+LINK = Selector('a', './/a', 'a', {})
+IMG = Selector('img', './/img', 'img', {})
+
+MELON_RANK = Selector('span.rank', f'.//span[{_has_class("rank")}]', 'span', {'class': 'rank'})
+MELON_TITLE = Selector('div[class="ellipsis rank01"]', './/div[@class="ellipsis rank01"]', 'div', {'class': 'ellipsis rank01'})
+MELON_ARTIST = Selector('div[class="ellipsis rank02"]', './/div[@class="ellipsis rank02"]', 'div', {'class': 'ellipsis rank02'})
+MELON_ALBUM = Selector('div[class="ellipsis rank03"]', './/div[@class="ellipsis rank03"]', 'div', {'class': 'ellipsis rank03'})
+MELON_GENRE_TABLE = Selector('table.list_table_song', f'.//table[{_has_class("list_table_song")}]', 'table', {'class': 'list_table_song'})
+
+BUGS_TABLE = Selector('table.list', f'.//table[{_has_class("list")}]', 'table', {'class': 'list'})
+BUGS_RANK = Selector('p.ranking', f'.//p[{_has_class("ranking")}]', 'p', {'class': 'ranking'})
+BUGS_TITLE = Selector('p.title', f'.//p[{_has_class("title")}]', 'p', {'class': 'title'})
+BUGS_ARTIST = Selector('p.artist', f'.//p[{_has_class("artist")}]', 'p', {'class': 'artist'})
+BUGS_ALBUM = Selector('a.album', f'.//a[{_has_class("album")}]', 'a', {'class': 'album'})
+
+GENIE_TABLE = Selector('table.list', f'.//table[{_has_class("list")}]', 'table', {'class': 'list'})
+GENIE_RANK = Selector('td.number', f'.//td[{_has_class("number")}]', 'td', {'class': 'number'})
+GENIE_TITLE = Selector('a.title', f'.//a[{_has_class("title")}]', 'a', {'class': 'title'})
+GENIE_ARTIST = Selector('a.artist', f'.//a[{_has_class("artist")}]', 'a', {'class': 'artist'})
+
+SELECTORS = (
+    TBODY, TR, TD, LINK, IMG,
+    MELON_RANK, MELON_TITLE, MELON_ARTIST, MELON_ALBUM, MELON_GENRE_TABLE,
+    BUGS_TABLE, BUGS_RANK, BUGS_TITLE, BUGS_ARTIST, BUGS_ALBUM,
+    GENIE_TABLE, GENIE_RANK, GENIE_TITLE, GENIE_ARTIST,
+)
+
+UNKNOWN = '알 수 없음'
+
+
+class ChartHTMLParser:
+    """Chart extraction rules on top of BeautifulSoup (html.parser); base for the other backends."""
+
+    name = 'bs4'
+
+    # =========================
+    # Backend primitives
+    # =========================
+    def document(self, html: str) -> Any:
+        return BeautifulSoup(html, 'html.parser')
+
+    def first(self, node, selector: Selector):
+        return node.find(selector.name, selector.attrs)
+
+    def all(self, node, selector: Selector) -> List[Any]:
+        return node.find_all(selector.name, selector.attrs)
+
+    def text(self, node) -> str:
+        return node.get_text(strip=True)
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.get(name)
+
+    # =========================
+    # Melon
+    # =========================
+    def parse_melon_chart(self, html: str, chart_type: str, limit: int) -> Optional[List[Dict]]:
+        """멜론 차트 페이지 (tbody가 없으면 None)"""
+        tbody = self.first(self.document(html), TBODY)
+        if tbody is None:
+            return None
+        return self._melon_rows(self.all(tbody, TR)[:limit], chart_type)
+
+    def parse_melon_genre(self, html: str, chart_type: str, limit: int) -> Optional[List[Dict]]:
+        """멜론 장르 차트 페이지 (목록 테이블이 없으면 None)"""
+        table = self.first(self.document(html), MELON_GENRE_TABLE)
+        if table is None:
+            return None
+        return self._melon_rows(self.all(self.first(table, TBODY), TR)[:limit], chart_type)
+
+    def _melon_rows(self, rows, chart_type) -> List[Dict]:
+        tracks = []
+        for idx, row in enumerate(rows, 1):
+            track = self.parse_melon_row(row, idx, chart_type)
+            if track:
+                tracks.append(track)
+        return tracks
+
+    def parse_melon_row(self, row, rank: int, chart_type: str) -> Optional[Dict]:
+        """멜론 차트 행 하나 (곡명이 없거나 형식이 다르면 None)"""
+        try:
+            tds = self.all(row, TD)
+            if len(tds) < 6:
+                return None
+
+            # 순위 (두 번째 td)
+            rank_elem = self.first(tds[1], MELON_RANK)
+            rank_text = self.text(rank_elem) if rank_elem is not None else str(rank)
+
+            # 곡 ID (tr 태그의 data-song-no 속성)
+            song_id = self.attr(row, 'data-song-no')
+
+            # 곡명/아티스트/앨범 (6번째 td)
+            song_info_td = tds[5]
+            title = None
+            title_elem = self.first(song_info_td, MELON_TITLE)
+            if title_elem is not None:
+                title_link = self.first(title_elem, LINK)
+                title = self.text(title_link if title_link is not None else title_elem)
+            if not title:
+                return None
+
+            artist = UNKNOWN
+            artist_elem = self.first(song_info_td, MELON_ARTIST)
+            if artist_elem is not None:
+                artist_links = self.all(artist_elem, LINK)
+                if artist_links:
+                    artist = ', '.join(self.text(link) for link in artist_links)
+                else:
+                    artist = self.text(artist_elem)
+
+            album = UNKNOWN
+            album_elem = self.first(song_info_td, MELON_ALBUM)
+            if album_elem is not None:
+                album_link = self.first(album_elem, LINK)
+                album = self.text(album_link if album_link is not None else album_elem)
+
+            # 썸네일 이미지 (4번째 td)
+            thumbnail = None
+            img_elem = self.first(tds[3], IMG)
+            if img_elem is not None:
+                thumbnail = self.attr(img_elem, 'src')
+
+            return {
+                'rank': int(rank_text) if rank_text.isdigit() else rank,
+                'song_id': song_id,
+                'title': title,
+                'artist': artist,
+                'album': album,
+                'like_count': 0,
+                'thumbnail': thumbnail,
+                'chart_type': chart_type,
+                'source': 'melon',
+                'url': f"https://www.melon.com/song/detail.htm?songId={song_id}" if song_id else None
+            }
+        except Exception:
+            return None
+
+    # =========================
+    # Bugs
+    # =========================
+    def parse_bugs_chart(self, html: str, chart_type: str, limit: int) -> List[Dict]:
+        """벅스 차트 페이지 (td가 4개 이상인 데이터 행만)"""
+        doc = self.document(html)
+        chart_list = self.first(doc, BUGS_TABLE)
+        if chart_list is None:
+            chart_list = self.first(doc, TBODY)
+        if chart_list is None:
+            return []
+
+        valid_rows = [row for row in self.all(chart_list, TR) if len(self.all(row, TD)) >= 4]
+        tracks = []
+        for idx, row in enumerate(valid_rows[:limit], 1):
+            rank_elem = self.first(row, BUGS_RANK)
+            rank_text = self.text(rank_elem) if rank_elem is not None else str(idx)
+            title_elem = self.first(row, BUGS_TITLE)
+            artist_elem = self.first(row, BUGS_ARTIST)
+            album_elem = self.first(row, BUGS_ALBUM)
+            tracks.append({
+                'rank': int(rank_text) if rank_text.isdigit() else idx,
+                'title': self.text(title_elem) if title_elem is not None else UNKNOWN,
+                'artist': self.text(artist_elem) if artist_elem is not None else UNKNOWN,
+                'album': self.text(album_elem) if album_elem is not None else UNKNOWN,
+                'chart_type': chart_type,
+                'source': 'bugs'
+            })
+        return tracks
+
+    # =========================
+    # Genie
+    # =========================
+    def parse_genie_chart(self, html: str, chart_type: str, limit: int) -> List[Dict]:
+        """지니 차트 페이지 (앞에서 limit개 행 중 td가 4개 이상인 행만)"""
+        doc = self.document(html)
+        chart_list = self.first(doc, TBODY)
+        if chart_list is None:
+            chart_list = self.first(doc, GENIE_TABLE)
+        if chart_list is None:
+            return []
+
+        tracks = []
+        for idx, row in enumerate(self.all(chart_list, TR)[:limit], 1):
+            if len(self.all(row, TD)) < 4:
+                continue
+            rank_elem = self.first(row, GENIE_RANK)
+            rank_text = self.text(rank_elem) if rank_elem is not None else str(idx)
+            title_elem = self.first(row, GENIE_TITLE)
+            artist_elem = self.first(row, GENIE_ARTIST)
+            tracks.append({
+                'rank': int(rank_text) if rank_text.isdigit() else idx,
+                'title': self.text(title_elem) if title_elem is not None else UNKNOWN,
+                'artist': self.text(artist_elem) if artist_elem is not None else UNKNOWN,
+                'album': UNKNOWN,
+                'chart_type': chart_type,
+                'source': 'genie'
+            })
+        return tracks
+
+
+class LxmlChartParser(ChartHTMLParser):
+    """lxml.html backend with XPath compiled once per selector."""
+
+    name = 'lxml'
+
+    def __init__(self):
+        self._compiled = {selector.xpath: etree.XPath(selector.xpath) for selector in SELECTORS}
+
+    def document(self, html: str) -> Any:
+        return lxml.html.document_fromstring(html)
+
+    def first(self, node, selector: Selector):
+        found = self._compiled[selector.xpath](node)
+        return found[0] if found else None
+
+    def all(self, node, selector: Selector) -> List[Any]:
+        return self._compiled[selector.xpath](node)
+
+    def text(self, node) -> str:
+        return ''.join(part.strip() for part in node.itertext())
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.get(name)
+
+
+class SelectolaxChartParser(ChartHTMLParser):
+    """selectolax (lexbor) backend using CSS selectors."""
+
+    name = 'selectolax'
+
+    def document(self, html: str) -> Any:
+        return LexborHTMLParser(html)
+
+    def first(self, node, selector: Selector):
+        return node.css_first(selector.css)
+
+    def all(self, node, selector: Selector) -> List[Any]:
+        return node.css(selector.css)
+
+    def text(self, node) -> str:
+        return node.text(deep=True, separator='', strip=True)
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+
+PARSER_CLASSES = {
+    'bs4': (ChartHTMLParser, BEAUTIFULSOUP_AVAILABLE),
+    'lxml': (LxmlChartParser, LXML_AVAILABLE),
+    'selectolax': (SelectolaxChartParser, SELECTOLAX_AVAILABLE),
+}
+# auto 선택 순서 (빠른 순)
+AUTO_ORDER = ('selectolax', 'lxml', 'bs4')
+
+
+def available_parsers() -> List[str]:
+    return [name for name in AUTO_ORDER if PARSER_CLASSES[name][1]]
+
+
+_parsers: Dict[str, ChartHTMLParser] = {}
+_parsers_lock = threading.Lock()
+
+
+def get_chart_parser(name: str = None) -> Optional[ChartHTMLParser]:
+    """
+    설정된 백엔드의 공유 파서 반환 (name 생략 시 CHART_HTML_PARSER)
+
+    요청한 백엔드가 설치되어 있지 않으면 auto 순서로 대체하고, 하나도 없으면 None.
+    """
+    name = (name or getattr(app_settings, 'CHART_HTML_PARSER', 'auto') or 'auto').strip().lower()
+    candidates = available_parsers()
+    if name in candidates:
+        chosen = name
+    elif candidates:
+        chosen = candidates[0]
+    else:
+        return None
+
+    with _parsers_lock:
+        parser = _parsers.get(chosen)
+        if parser is None:
+            parser = PARSER_CLASSES[chosen][0]()
+            _parsers[chosen] = parser
+        return parser
@@ -7,23 +7,12 @@ Korea Music Charts Connector - 국내 주요 음원사 차트 통합 크롤링
 import os
 import json
 import time
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import re
 from urllib.parse import urljoin, urlparse
 from collections import Counter
 import asyncio
-import aiohttp
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-try:
-    from bs4 import BeautifulSoup
-    BEAUTIFULSOUP_AVAILABLE = True
-    print(f"BeautifulSoup 로드 성공")
-except ImportError as e:
-    BEAUTIFULSOUP_AVAILABLE = False
-    print(f"BeautifulSoup 로드 실패: {e}")
 
 # 기존 멜론 커넥터 임포트
 try:
@@ -33,23 +22,24 @@ except ImportError:
     MELON_AVAILABLE = False
     print("멜론 커넥터를 찾을 수 없습니다.")
 
+try:
+    from .chart_fetcher import get_chart_fetcher
+    from .chart_parsers import get_chart_parser
+except ImportError:
+    from chart_fetcher import get_chart_fetcher
+    from chart_parsers import get_chart_parser
+
 class KoreaMusicChartsConnector:
     """국내 주요 음원사 차트 통합 커넥터"""
     
-    def __init__(self, console_log=None):
+    def __init__(self, console_log=None, conditional=False):
         self.console_log = console_log or print
-        self.session = requests.Session()
-        
-        # 공통 헤더 설정
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        # True면 ETag/Last-Modified 조건부 요청 (변경 없는 차트는 not_modified 결과, 스케줄러 수집용)
+        self.conditional = conditional
+        # 비동기 요청 엔진 (공통 헤더, keep-alive, 호스트별 동시 연결 제한, 서비스별 타임아웃, 재시도)
+        self.fetcher = get_chart_fetcher(self.console_log)
+        # HTML 파서 백엔드 (CHART_HTML_PARSER: auto/bs4/lxml/selectolax)
+        self.parser = get_chart_parser()
         
         # 음원사별 설정
         self.music_services = {
@@ -94,7 +84,7 @@ class KoreaMusicChartsConnector:
         
         # 멜론 커넥터 초기화
         if MELON_AVAILABLE:
-            self.music_services['melon']['connector'] = MelonConnector(console_log)
+            self.music_services['melon']['connector'] = MelonConnector(console_log, conditional=conditional)
         
         self.console_log("[통합차트] 국내 음원사 통합 커넥터 초기화 완료")
     
@@ -137,46 +127,27 @@ class KoreaMusicChartsConnector:
             'source': 'korea_music_charts'
         }
         
-        successful_services = 0
+        # 모든 서비스/차트 페이지를 한 세션에서 동시에 요청
+        targets = [
+            (service, chart_type)
+            for service in services if service in self.music_services
+            for chart_type in chart_types.get(service, ['realtime'])
+        ]
+        results = self.collect_charts(targets, limit_per_chart)
         
-        # 병렬 처리를 위한 ThreadPoolExecutor 사용
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            future_to_service = {}
-            
-            for service in services:
-                if service in self.music_services:
-                    for chart_type in chart_types.get(service, ['realtime']):
-                        future = executor.submit(
-                            self._get_service_chart,
-                            service,
-                            chart_type,
-                            limit_per_chart
-                        )
-                        future_to_service[future] = (service, chart_type)
-            
-            # 결과 수집
-            for future in as_completed(future_to_service):
-                service, chart_type = future_to_service[future]
-                try:
-                    chart_data = future.result(timeout=30)  # 30초 타임아웃
-                    
-                    if chart_data and chart_data.get('success'):
-                        if service not in all_data['services']:
-                            all_data['services'][service] = {}
-                        
-                        all_data['services'][service][chart_type] = chart_data
-                        all_data['total_tracks'] += chart_data.get('total_tracks', 0)
-                        
-                        if service not in [s for s, _ in [future_to_service.get(f) for f in future_to_service if f != future]]:
-                            successful_services += 1
-                            
-                        self.log(f"{self.music_services[service]['name']} {chart_type} 수집 완료: {chart_data.get('total_tracks', 0)}곡")
-                    else:
-                        error_msg = chart_data.get('error', '알 수 없는 오류') if chart_data else '응답 없음'
-                        self.log(f"{self.music_services[service]['name']} {chart_type} 수집 실패: {error_msg}")
-                
-                except Exception as e:
-                    self.log(f"{service} {chart_type} 수집 중 오류: {str(e)}")
+        for (service, chart_type), chart_data in results.items():
+            if chart_data and chart_data.get('success'):
+                all_data['services'].setdefault(service, {})[chart_type] = chart_data
+                all_data['total_tracks'] += chart_data.get('total_tracks', 0)
+                if chart_data.get('not_modified'):
+                    self.log(f"{self.music_services[service]['name']} {chart_type} 변경 없음 (304)")
+                else:
+                    self.log(f"{self.music_services[service]['name']} {chart_type} 수집 완료: {chart_data.get('total_tracks', 0)}곡")
+            else:
+                error_msg = chart_data.get('error', '알 수 없는 오류') if chart_data else '응답 없음'
+                self.log(f"{self.music_services[service]['name']} {chart_type} 수집 실패: {error_msg}")
+        
+        successful_services = len(all_data['services'])
         
         # 성공률 계산
         success_rate = (successful_services / len(services)) * 100 if services else 0
@@ -187,270 +158,222 @@ class KoreaMusicChartsConnector:
         
         return all_data
     
-    def _get_service_chart(self, service, chart_type, limit):
-        """개별 음원사 차트 데이터 수집"""
+    def collect_charts(self, targets, limit):
+        """
+        (서비스, 차트 타입) 목록을 동시에 수집
+        
+        Returns:
+            {(서비스, 차트 타입): 차트 데이터}
+        """
+        async def collect(session):
+            results = await asyncio.gather(
+                *[self._fetch_service_chart(session, service, chart_type, limit) for service, chart_type in targets]
+            )
+            return dict(zip(targets, results))
+        
+        started = time.perf_counter()
+        results = self.fetcher.run(collect)
+        self.log(f"차트 페이지 {len(targets)}개 수집: {(time.perf_counter() - started):.2f}초")
+        return results
+    
+    async def _fetch_service_chart(self, session, service, chart_type, limit):
+        """개별 음원사 차트 데이터 수집 (코루틴)"""
         try:
             if service == 'melon' and MELON_AVAILABLE:
-                return self._get_melon_chart(chart_type, limit)
+                return await self._fetch_melon_chart(session, chart_type, limit)
             elif service == 'bugs':
-                return self._get_bugs_chart(chart_type, limit)
+                return await self._fetch_bugs_chart(session, chart_type, limit)
             elif service == 'genie':
-                return self._get_genie_chart(chart_type, limit)
+                return await self._fetch_genie_chart(session, chart_type, limit)
             elif service == 'vibe':
-                return self._get_vibe_chart(chart_type, limit)
+                return await self._fetch_vibe_chart(session, chart_type, limit)
             elif service == 'flo':
-                return self._get_flo_chart(chart_type, limit)
+                return await self._fetch_flo_chart(session, chart_type, limit)
             else:
                 return {'success': False, 'error': f'지원하지 않는 서비스: {service}'}
                 
         except Exception as e:
             return {'success': False, 'error': f'{service} 차트 수집 오류: {str(e)}'}
     
+    def _get_service_chart(self, service, chart_type, limit):
+        """개별 음원사 차트 데이터 수집"""
+        return self.collect_charts([(service, chart_type)], limit)[(service, chart_type)]
+    
     def _get_melon_chart(self, chart_type, limit):
+        """멜론 차트 데이터 수집 (기존 커넥터 활용)"""
+        return self._get_service_chart('melon', chart_type, limit)
+    
+    def _get_bugs_chart(self, chart_type, limit):
+        """벅스 차트 데이터 수집"""
+        return self._get_service_chart('bugs', chart_type, limit)
+    
+    def _get_genie_chart(self, chart_type, limit):
+        """지니 차트 데이터 수집"""
+        return self._get_service_chart('genie', chart_type, limit)
+    
+    def _get_vibe_chart(self, chart_type, limit):
+        """바이브 차트 데이터 수집"""
+        return self._get_service_chart('vibe', chart_type, limit)
+    
+    def _get_flo_chart(self, chart_type, limit):
+        """플로 차트 데이터 수집"""
+        return self._get_service_chart('flo', chart_type, limit)
+    
+    def _not_modified_result(self, service, chart_type):
+        """조건부 요청 304 - 직전 수집 결과를 그대로 쓰라는 표시 (트랙 없음)"""
+        return {
+            'success': True,
+            'not_modified': True,
+            'chart_type': chart_type,
+            'total_tracks': 0,
+            'tracks': [],
+            'collected_at': datetime.now().isoformat(),
+            'source': service
+        }
+    
+    async def _fetch_melon_chart(self, session, chart_type, limit):
         """멜론 차트 데이터 수집 (기존 커넥터 활용)"""
         if not MELON_AVAILABLE:
             return {'success': False, 'error': '멜론 커넥터 사용 불가'}
         
         connector = self.music_services['melon']['connector']
-        return connector.get_chart_data(chart_type, limit)
+        return await connector.fetch_chart_data(session, chart_type, limit)
     
-    def _get_bugs_chart(self, chart_type, limit):
+    async def _fetch_bugs_chart(self, session, chart_type, limit):
         """벅스 차트 데이터 수집"""
-        if not BEAUTIFULSOUP_AVAILABLE:
-            return {'success': False, 'error': 'BeautifulSoup 라이브러리 필요'}
+        if self.parser is None:
+            return {'success': False, 'error': 'HTML 파서 라이브러리 필요'}
+        
+        url = self.music_services['bugs']['urls'].get(chart_type)
+        if not url:
+            return {'success': False, 'error': f'벅스 {chart_type} 차트 URL 없음'}
+        
+        # 벅스 특화 헤더
+        response = await self.fetcher.fetch(session, url, service='bugs', headers={'Referer': 'https://music.bugs.co.kr/'},
+                                            conditional=self.conditional)
+        if response.not_modified:
+            return self._not_modified_result('bugs', chart_type)
+        if not response.ok:
+            return {'success': False, 'error': f'벅스 차트 수집 오류: {response.error}'}
         
         try:
-            url = self.music_services['bugs']['urls'].get(chart_type)
-            if not url:
-                return {'success': False, 'error': f'벅스 {chart_type} 차트 URL 없음'}
-            
-            # 벅스 특화 헤더
-            headers = self.session.headers.copy()
-            headers['Referer'] = 'https://music.bugs.co.kr/'
-            
-            response = self.session.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 벅스 차트 구조 파싱
-            tracks = []
-            chart_list = soup.find('table', {'class': 'list'}) or soup.find('tbody')
-            
-            if chart_list:
-                rows = chart_list.find_all('tr')
-                self.console_log(f"[DEBUG] 벅스 전체 행 수: {len(rows)}")
-                
-                # 첫 번째 행이 헤더인지 확인
-                valid_rows = []
-                for i, row in enumerate(rows):
-                    tds = row.find_all('td')
-                    if len(tds) >= 4:  # 데이터 행만 선택
-                        valid_rows.append(row)
-                        if i < 3: # 처음 3개 행만 디버그
-                            self.console_log(f"[DEBUG] 벅스 행 {i}: {len(tds)}개 td, 내용: {row.get_text()[:100]}")
-                
-                self.console_log(f"[DEBUG] 벅스 유효 행 수: {len(valid_rows)}")
-                
-                for idx, row in enumerate(valid_rows[:limit], 1):
-                    track_data = self._parse_bugs_track(row, idx, chart_type)
-                    if track_data:
-                        tracks.append(track_data)
-                        self.console_log(f"[DEBUG] 벅스 트랙 {idx}: {track_data['title']} (순위: {track_data['rank']})")
-            
-            return {
-                'success': True,
-                'chart_type': chart_type,
-                'total_tracks': len(tracks),
-                'tracks': tracks,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'bugs'
-            }
-            
+            return self._parse_bugs_chart(response.text, chart_type, limit)
         except Exception as e:
             return {'success': False, 'error': f'벅스 차트 수집 오류: {str(e)}'}
     
-    def _parse_bugs_track(self, row, rank, chart_type):
-        """벅스 트랙 데이터 파싱"""
-        try:
-            # 벅스 HTML 구조에 맞춘 파싱 로직
-            tds = row.find_all('td')
-            if len(tds) < 4:
-                return None
-            
-            # 순위
-            rank_elem = row.find('p', {'class': 'ranking'})
-            if rank_elem:
-                rank_text = rank_elem.get_text(strip=True)
-            else:
-                rank_text = str(rank)
-            
-            # 곡명 및 아티스트
-            title_elem = row.find('p', {'class': 'title'})
-            artist_elem = row.find('p', {'class': 'artist'})
-            
-            title = title_elem.get_text(strip=True) if title_elem else '알 수 없음'
-            artist = artist_elem.get_text(strip=True) if artist_elem else '알 수 없음'
-            
-            # 앨범
-            album_elem = row.find('a', {'class': 'album'})
-            album = album_elem.get_text(strip=True) if album_elem else '알 수 없음'
-            
-            return {
-                'rank': int(rank_text) if rank_text.isdigit() else rank,
-                'title': title,
-                'artist': artist,
-                'album': album,
-                'chart_type': chart_type,
-                'source': 'bugs'
-            }
-            
-        except Exception as e:
-            return None
+    def _parse_bugs_chart(self, html, chart_type, limit):
+        """벅스 차트 페이지 HTML 파싱"""
+        tracks = self.parser.parse_bugs_chart(html, chart_type, limit)
+        self.console_log(f"[DEBUG] 벅스 유효 행 수: {len(tracks)} (파서: {self.parser.name})")
+        
+        return {
+            'success': True,
+            'chart_type': chart_type,
+            'total_tracks': len(tracks),
+            'tracks': tracks,
+            'collected_at': datetime.now().isoformat(),
+            'source': 'bugs'
+        }
     
-    def _get_genie_chart(self, chart_type, limit):
+    async def _fetch_genie_chart(self, session, chart_type, limit):
         """지니 차트 데이터 수집"""
-        if not BEAUTIFULSOUP_AVAILABLE:
-            return {'success': False, 'error': 'BeautifulSoup 라이브러리 필요'}
+        if self.parser is None:
+            return {'success': False, 'error': 'HTML 파서 라이브러리 필요'}
+        
+        url = self.music_services['genie']['urls'].get(chart_type)
+        if not url:
+            return {'success': False, 'error': f'지니 {chart_type} 차트 URL 없음'}
+        
+        response = await self.fetcher.fetch(session, url, service='genie', headers={'Referer': 'https://www.genie.co.kr/'},
+                                            conditional=self.conditional)
+        if response.not_modified:
+            return self._not_modified_result('genie', chart_type)
+        if not response.ok:
+            return {'success': False, 'error': f'지니 차트 수집 오류: {response.error}'}
         
         try:
-            url = self.music_services['genie']['urls'].get(chart_type)
-            if not url:
-                return {'success': False, 'error': f'지니 {chart_type} 차트 URL 없음'}
-            
-            headers = self.session.headers.copy()
-            headers['Referer'] = 'https://www.genie.co.kr/'
-            
-            response = self.session.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            tracks = []
-            chart_list = soup.find('tbody') or soup.find('table', {'class': 'list'})
-            
-            if chart_list:
-                rows = chart_list.find_all('tr')[:limit]
-                
-                for idx, row in enumerate(rows, 1):
-                    track_data = self._parse_genie_track(row, idx, chart_type)
-                    if track_data:
-                        tracks.append(track_data)
-            
-            return {
-                'success': True,
-                'chart_type': chart_type,
-                'total_tracks': len(tracks),
-                'tracks': tracks,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'genie'
-            }
-            
+            return self._parse_genie_chart(response.text, chart_type, limit)
         except Exception as e:
             return {'success': False, 'error': f'지니 차트 수집 오류: {str(e)}'}
     
-    def _parse_genie_track(self, row, rank, chart_type):
-        """지니 트랙 데이터 파싱"""
-        try:
-            tds = row.find_all('td')
-            if len(tds) < 4:
-                return None
-            
-            # 지니 구조에 맞춘 파싱
-            rank_elem = row.find('td', {'class': 'number'})
-            title_elem = row.find('a', {'class': 'title'})
-            artist_elem = row.find('a', {'class': 'artist'})
-            
-            rank_text = rank_elem.get_text(strip=True) if rank_elem else str(rank)
-            title = title_elem.get_text(strip=True) if title_elem else '알 수 없음'
-            artist = artist_elem.get_text(strip=True) if artist_elem else '알 수 없음'
-            
-            return {
-                'rank': int(rank_text) if rank_text.isdigit() else rank,
-                'title': title,
-                'artist': artist,
-                'album': '알 수 없음',
-                'chart_type': chart_type,
-                'source': 'genie'
-            }
-            
-        except Exception as e:
-            return None
+    def _parse_genie_chart(self, html, chart_type, limit):
+        """지니 차트 페이지 HTML 파싱"""
+        tracks = self.parser.parse_genie_chart(html, chart_type, limit)
+        
+        return {
+            'success': True,
+            'chart_type': chart_type,
+            'total_tracks': len(tracks),
+            'tracks': tracks,
+            'collected_at': datetime.now().isoformat(),
+            'source': 'genie'
+        }
     
-    def _get_vibe_chart(self, chart_type, limit):
+    async def _fetch_vibe_chart(self, session, chart_type, limit):
         """바이브 차트 데이터 수집 - API 방식 시도"""
-        try:
-            # VIBE는 SPA이므로 API 엔드포인트 시도
-            api_url = 'https://apis.naver.com/vibeWeb/musicapiweb/vibe/v1/chart/track/top100'
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Referer': 'https://vibe.naver.com/',
-                'Accept': 'application/json',
-                'Accept-Language': 'ko-KR,ko;q=0.9'
-            }
-            
-            params = {
-                'display': min(limit, 100),
-                'start': 1
-            }
-            
-            response = requests.get(api_url, headers=headers, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    return self._parse_vibe_api_response(data, chart_type)
-                except json.JSONDecodeError:
-                    pass
-            
-            # API 실패 시 기본 웹 크롤링 시도
-            return self._get_vibe_chart_fallback(chart_type, limit)
-            
-        except Exception as e:
-            return {'success': False, 'error': f'바이브 차트 수집 오류: {str(e)}'}
+        # VIBE는 SPA이므로 API 엔드포인트 시도
+        api_url = 'https://apis.naver.com/vibeWeb/musicapiweb/vibe/v1/chart/track/top100'
+        
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Referer': 'https://vibe.naver.com/',
+            'Accept': 'application/json',
+            'Accept-Language': 'ko-KR,ko;q=0.9'
+        }
+        
+        params = {
+            'display': min(limit, 100),
+            'start': 1
+        }
+        
+        response = await self.fetcher.fetch(session, api_url, service='vibe', headers=headers, params=params,
+                                            conditional=self.conditional)
+        if response.not_modified:
+            return self._not_modified_result('vibe', chart_type)
+        if response.ok:
+            try:
+                return self._parse_vibe_api_response(response.json(), chart_type)
+            except json.JSONDecodeError:
+                pass
+        
+        # API 실패 시 기본 웹 크롤링 시도
+        return await self._fetch_vibe_chart_fallback(session, chart_type, limit)
     
-    def _get_vibe_chart_fallback(self, chart_type, limit):
+    async def _fetch_vibe_chart_fallback(self, session, chart_type, limit):
         """바이브 차트 웹 크롤링 대체 방법"""
-        try:
-            # 모바일 버전 시도 (더 간단한 구조)
-            url = 'https://m.vibe.naver.com/chart'
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15',
-                'Referer': 'https://vibe.naver.com/'
-            }
-            
-            response = self.session.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            
-            # 임시로 샘플 데이터 반환 (실제 파싱 로직은 HTML 구조 확인 후 구현)
-            tracks = []
-            for i in range(min(10, limit)):  # 임시로 10곡만
-                tracks.append({
-                    'rank': i + 1,
-                    'title': f'바이브 샘플곡 {i+1}',
-                    'artist': f'바이브 아티스트 {i+1}',
-                    'album': '알 수 없음',
-                    'chart_type': chart_type,
-                    'source': 'vibe'
-                })
-            
-            return {
-                'success': True,
+        # 모바일 버전 시도 (더 간단한 구조)
+        url = 'https://m.vibe.naver.com/chart'
+        
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/605.1.15',
+            'Referer': 'https://vibe.naver.com/'
+        }
+        
+        response = await self.fetcher.fetch(session, url, service='vibe', headers=headers)
+        if not response.ok:
+            return {'success': False, 'error': f'바이브 대체 수집 오류: {response.error}'}
+        
+        # 임시로 샘플 데이터 반환 (실제 파싱 로직은 HTML 구조 확인 후 구현)
+        tracks = []
+        for i in range(min(10, limit)):  # 임시로 10곡만
+            tracks.append({
+                'rank': i + 1,
+                'title': f'바이브 샘플곡 {i+1}',
+                'artist': f'바이브 아티스트 {i+1}',
+                'album': '알 수 없음',
                 'chart_type': chart_type,
-                'total_tracks': len(tracks),
-                'tracks': tracks,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'vibe',
-                'note': '임시 샘플 데이터 - 실제 파싱 로직 개발 필요'
-            }
-            
-        except Exception as e:
-            return {'success': False, 'error': f'바이브 대체 수집 오류: {str(e)}'}
+                'source': 'vibe'
+            })
+        
+        return {
+            'success': True,
+            'chart_type': chart_type,
+            'total_tracks': len(tracks),
+            'tracks': tracks,
+            'collected_at': datetime.now().isoformat(),
+            'source': 'vibe',
+            'note': '임시 샘플 데이터 - 실제 파싱 로직 개발 필요'
+        }
     
     def _parse_vibe_api_response(self, data, chart_type):
         """바이브 API 응답 파싱"""
@@ -505,41 +428,38 @@ class KoreaMusicChartsConnector:
         except Exception as e:
             return None
     
-    def _get_flo_chart(self, chart_type, limit):
+    async def _fetch_flo_chart(self, session, chart_type, limit):
         """플로 차트 데이터 수집 - API/웹 크롤링 하이브리드"""
-        try:
-            # 플로 API 엔드포인트 시도 (추정)
-            api_urls = [
-                'https://www.music-flo.com/api/chart/track',
-                'https://api.music-flo.com/v1/chart/top100',
-                'https://www.music-flo.com/api/display/chart'
-            ]
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Referer': 'https://www.music-flo.com/',
-                'Accept': 'application/json, text/plain, */*',
-                'Accept-Language': 'ko-KR,ko;q=0.9'
-            }
-            
-            # API 방식들 순차 시도
-            for api_url in api_urls:
+        # 플로 API 엔드포인트 시도 (추정)
+        api_urls = [
+            'https://www.music-flo.com/api/chart/track',
+            'https://api.music-flo.com/v1/chart/top100',
+            'https://www.music-flo.com/api/display/chart'
+        ]
+        
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Referer': 'https://www.music-flo.com/',
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Language': 'ko-KR,ko;q=0.9'
+        }
+        
+        # API 후보들을 동시에 요청하고 목록 순서대로 첫 성공 응답 사용
+        responses = await asyncio.gather(
+            *[self.fetcher.fetch(session, api_url, service='flo', headers=headers, conditional=self.conditional)
+              for api_url in api_urls]
+        )
+        for response in responses:
+            if response.not_modified:
+                return self._not_modified_result('flo', chart_type)
+            if response.ok:
                 try:
-                    response = requests.get(api_url, headers=headers, timeout=10)
-                    if response.status_code == 200:
-                        try:
-                            data = response.json()
-                            return self._parse_flo_api_response(data, chart_type, limit)
-                        except json.JSONDecodeError:
-                            continue
-                except:
+                    return self._parse_flo_api_response(response.json(), chart_type, limit)
+                except json.JSONDecodeError:
                     continue
-            
-            # API 실패 시 웹 크롤링 시도
-            return self._get_flo_chart_fallback(chart_type, limit)
-            
-        except Exception as e:
-            return {'success': False, 'error': f'플로 차트 수집 오류: {str(e)}'}
+        
+        # API 실패 시 웹 크롤링 시도
+        return self._get_flo_chart_fallback(chart_type, limit)
     
     def _get_flo_chart_fallback(self, chart_type, limit):
         """플로 차트 웹 크롤링 대체 방법"""
@@ -6,8 +6,7 @@ Melon Connector - 멜론 차트 크롤링을 통한 한국 음악 차트 데이
 
 import os
 import json
-import time
-import requests
+import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import re
@@ -15,31 +14,26 @@ from urllib.parse import urljoin, urlparse
 from collections import Counter
 
 try:
-    from bs4 import BeautifulSoup
-    BEAUTIFULSOUP_AVAILABLE = True
-    print(f"BeautifulSoup 로드 성공")
-except ImportError as e:
-    BEAUTIFULSOUP_AVAILABLE = False
-    print(f"BeautifulSoup 로드 실패: {e}")
+    from .chart_fetcher import get_chart_fetcher
+    from .chart_parsers import get_chart_parser
+except ImportError:
+    from chart_fetcher import get_chart_fetcher
+    from chart_parsers import get_chart_parser
+
+# 멜론 요청 공통 헤더 (기본 헤더는 ChartFetcher 세션에 설정됨)
+MELON_HEADERS = {'Referer': 'https://www.melon.com/'}
 
 class MelonConnector:
     """멜론 차트 데이터 크롤링 클래스"""
     
-    def __init__(self, console_log=None):
+    def __init__(self, console_log=None, conditional=False):
         self.console_log = console_log or print
-        self.session = requests.Session()
-        
-        # 멜론 크롤링을 위한 헤더 설정
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Referer': 'https://www.melon.com/'
-        })
+        # True면 ETag/Last-Modified 조건부 요청 (변경 없으면 not_modified 결과 반환)
+        self.conditional = conditional
+        # 비동기 요청 엔진 (keep-alive, 호스트별 동시 연결 제한, 재시도)
+        self.fetcher = get_chart_fetcher(self.console_log)
+        # HTML 파서 백엔드 (CHART_HTML_PARSER: auto/bs4/lxml/selectolax)
+        self.parser = get_chart_parser()
         
         # 멜론 차트 URL들
         self.chart_urls = {
@@ -78,149 +72,62 @@ class MelonConnector:
         Returns:
             차트 데이터 딕셔너리
         """
-        if not BEAUTIFULSOUP_AVAILABLE:
-            self.log("BeautifulSoup이 설치되지 않아 크롤링할 수 없습니다.")
-            return {'success': False, 'error': 'BeautifulSoup 라이브러리 필요'}
+        return self.fetcher.run(lambda session: self.fetch_chart_data(session, chart_type, limit))
+    
+    async def fetch_chart_data(self, session, chart_type='realtime', limit=100):
+        """멜론 차트 데이터 크롤링 (ChartFetcher 세션 공유용 코루틴)"""
+        if self.parser is None:
+            self.log("HTML 파서(bs4/lxml/selectolax)가 설치되지 않아 크롤링할 수 없습니다.")
+            return {'success': False, 'error': 'HTML 파서 라이브러리 필요'}
         
         self.log(f"멜론 {chart_type} 차트 크롤링 시작 (상위 {limit}곡)")
         
-        try:
-            url = self.chart_urls.get(chart_type, self.chart_urls['realtime'])
-            
-            # 페이지 요청
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            
-            # HTML 파싱
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 차트 데이터는 tbody에 있음
-            tbody = soup.find('tbody')
-            if not tbody:
-                self.log("차트 tbody를 찾을 수 없습니다.")
-                return {'success': False, 'error': '차트 데이터를 찾을 수 없음'}
-            
-            tracks = []
-            rows = tbody.find_all('tr')[:limit]
-            
-            for idx, row in enumerate(rows, 1):
-                try:
-                    track_data = self._parse_track_row(row, idx, chart_type)
-                    if track_data:
-                        tracks.append(track_data)
-                        
-                        # 로그 출력 (처음 10곡만)
-                        if idx <= 10:
-                            self.log(f"#{idx:2d} {track_data['title']} - {track_data['artist']}")
-                
-                except Exception as e:
-                    self.log(f"트랙 파싱 오류 (순위 {idx}): {str(e)}")
-                    continue
-            
-            self.log(f"멜론 {chart_type} 차트 크롤링 완료: {len(tracks)}곡")
-            
-            return {
-                'success': True,
-                'chart_type': chart_type,
-                'total_tracks': len(tracks),
-                'tracks': tracks,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'melon'
-            }
-            
-        except requests.RequestException as e:
-            error_msg = f"멜론 차트 요청 실패: {str(e)}"
+        url = self.chart_urls.get(chart_type, self.chart_urls['realtime'])
+        
+        # 페이지 요청
+        response = await self.fetcher.fetch(session, url, service='melon', headers=MELON_HEADERS, conditional=self.conditional)
+        if response.not_modified:
+            self.log(f"멜론 {chart_type} 차트 변경 없음 (304)")
+            return {'success': True, 'not_modified': True, 'chart_type': chart_type, 'total_tracks': 0, 'tracks': [],
+                    'collected_at': datetime.now().isoformat(), 'source': 'melon'}
+        if not response.ok:
+            error_msg = f"멜론 차트 요청 실패: {response.error}"
             self.log(error_msg)
             return {'success': False, 'error': error_msg}
         
+        try:
+            return self._parse_chart_page(response.text, chart_type, limit)
         except Exception as e:
             error_msg = f"멜론 차트 크롤링 오류: {str(e)}"
             self.log(error_msg)
             return {'success': False, 'error': error_msg}
     
+    def _parse_chart_page(self, html, chart_type, limit):
+        """차트 페이지 HTML 파싱"""
+        # 차트 데이터는 tbody에 있음
+        tracks = self.parser.parse_melon_chart(html, chart_type, limit)
+        if tracks is None:
+            self.log("차트 tbody를 찾을 수 없습니다.")
+            return {'success': False, 'error': '차트 데이터를 찾을 수 없음'}
+        
+        # 로그 출력 (처음 10곡만)
+        for track_data in tracks[:10]:
+            self.log(f"#{track_data['rank']:2} {track_data['title']} - {track_data['artist']}")
+        
+        self.log(f"멜론 {chart_type} 차트 크롤링 완료: {len(tracks)}곡")
+        
+        return {
+            'success': True,
+            'chart_type': chart_type,
+            'total_tracks': len(tracks),
+            'tracks': tracks,
+            'collected_at': datetime.now().isoformat(),
+            'source': 'melon'
+        }
+    
     def _parse_track_row(self, row, rank, chart_type):
-        """차트 행 파싱 - 멜론 실제 HTML 구조에 맞게 수정"""
-        try:
-            tds = row.find_all('td')
-            if len(tds) < 6:
-                return None
-            
-            # 순위 (두 번째 td에서)
-            rank_elem = tds[1].find('span', {'class': 'rank'})
-            if rank_elem:
-                rank_text = rank_elem.get_text(strip=True)
-            else:
-                rank_text = str(rank)
-            
-            # 곡 ID (tr 태그의 data-song-no 속성에서)
-            song_id = row.get('data-song-no', None)
-            
-            # 곡명과 아티스트 (6번째 td에 wrap_song_info가 있음)
-            song_info_td = tds[5] if len(tds) > 5 else None
-            if not song_info_td:
-                return None
-            
-            # 곡명 추출
-            title_elem = song_info_td.find('div', {'class': 'ellipsis rank01'})
-            title = None
-            if title_elem:
-                title_link = title_elem.find('a')
-                if title_link:
-                    title = title_link.get_text(strip=True)
-                else:
-                    title = title_elem.get_text(strip=True)
-            
-            if not title:
-                return None
-            
-            # 아티스트 추출
-            artist_elem = song_info_td.find('div', {'class': 'ellipsis rank02'})
-            artist = '알 수 없음'
-            if artist_elem:
-                artist_links = artist_elem.find_all('a')
-                if artist_links:
-                    artists = [link.get_text(strip=True) for link in artist_links]
-                    artist = ', '.join(artists)
-                else:
-                    artist = artist_elem.get_text(strip=True)
-            
-            # 앨범 추출
-            album_elem = song_info_td.find('div', {'class': 'ellipsis rank03'})
-            album = '알 수 없음'
-            if album_elem:
-                album_link = album_elem.find('a')
-                if album_link:
-                    album = album_link.get_text(strip=True)
-                else:
-                    album = album_elem.get_text(strip=True)
-            
-            # 썸네일 이미지 (4번째 td)
-            thumbnail = None
-            if len(tds) > 3:
-                img_elem = tds[3].find('img')
-                if img_elem and 'src' in img_elem.attrs:
-                    thumbnail = img_elem['src']
-            
-            # 좋아요 수 (추후 추가 가능)
-            like_count = 0
-            
-            return {
-                'rank': int(rank_text) if rank_text.isdigit() else rank,
-                'song_id': song_id,
-                'title': title,
-                'artist': artist,
-                'album': album,
-                'like_count': like_count,
-                'thumbnail': thumbnail,
-                'chart_type': chart_type,
-                'source': 'melon',
-                'url': f"https://www.melon.com/song/detail.htm?songId={song_id}" if song_id else None
-            }
-            
-        except Exception as e:
-            self.log(f"트랙 행 파싱 오류: {str(e)}")
-            return None
+        """차트 행 파싱 (row는 self.parser 백엔드의 노드)"""
+        return self.parser.parse_melon_row(row, rank, chart_type)
     
     def get_genre_chart(self, genre='kpop', limit=50):
         """
@@ -233,58 +140,57 @@ class MelonConnector:
         Returns:
             장르별 차트 데이터
         """
-        if not BEAUTIFULSOUP_AVAILABLE:
-            return {'success': False, 'error': 'BeautifulSoup 라이브러리 필요'}
+        return self.fetcher.run(lambda session: self.fetch_genre_chart(session, genre, limit))
+    
+    async def fetch_genre_chart(self, session, genre='kpop', limit=50):
+        """장르별 차트 데이터 크롤링 (ChartFetcher 세션 공유용 코루틴)"""
+        if self.parser is None:
+            return {'success': False, 'error': 'HTML 파서 라이브러리 필요'}
         
         self.log(f"멜론 {genre} 장르 차트 크롤링 시작")
         
+        url = self.genre_urls.get(genre)
+        if not url:
+            return {'success': False, 'error': f'지원하지 않는 장르: {genre}'}
+        
+        response = await self.fetcher.fetch(session, url, service='melon', headers=MELON_HEADERS)
+        if not response.ok:
+            error_msg = f"장르 차트 요청 실패: {response.error}"
+            self.log(error_msg)
+            return {'success': False, 'error': error_msg}
+        
         try:
-            url = self.genre_urls.get(genre)
-            if not url:
-                return {'success': False, 'error': f'지원하지 않는 장르: {genre}'}
-            
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 장르별 페이지는 다른 구조를 가질 수 있음
-            song_list = soup.find('table', {'class': 'list_table_song'})
-            if not song_list:
-                return {'success': False, 'error': '장르 차트 데이터를 찾을 수 없음'}
-            
-            tracks = []
-            rows = song_list.find('tbody').find_all('tr')[:limit]
-            
-            for idx, row in enumerate(rows, 1):
-                try:
-                    track_data = self._parse_track_row(row, idx, f'genre_{genre}')
-                    if track_data:
-                        tracks.append(track_data)
-                except Exception as e:
-                    continue
-            
-            self.log(f"멜론 {genre} 장르 차트 완료: {len(tracks)}곡")
-            
-            return {
-                'success': True,
-                'genre': genre,
-                'total_tracks': len(tracks),
-                'tracks': tracks,
-                'collected_at': datetime.now().isoformat(),
-                'source': 'melon'
-            }
-            
+            return self._parse_genre_page(response.text, genre, limit)
         except Exception as e:
             error_msg = f"장르 차트 크롤링 오류: {str(e)}"
             self.log(error_msg)
             return {'success': False, 'error': error_msg}
     
+    def _parse_genre_page(self, html, genre, limit):
+        """장르 차트 페이지 HTML 파싱"""
+        # 장르별 페이지는 다른 구조를 가질 수 있음
+        tracks = self.parser.parse_melon_genre(html, f'genre_{genre}', limit)
+        if tracks is None:
+            return {'success': False, 'error': '장르 차트 데이터를 찾을 수 없음'}
+        
+        self.log(f"멜론 {genre} 장르 차트 완료: {len(tracks)}곡")
+        
+        return {
+            'success': True,
+            'genre': genre,
+            'total_tracks': len(tracks),
+            'tracks': tracks,
+            'collected_at': datetime.now().isoformat(),
+            'source': 'melon'
+        }
+    
     def get_all_charts(self, limit_per_chart=50):
         """
         모든 멜론 차트 데이터 수집
         
+        차트/장르 페이지를 한 세션에서 동시에 요청하고, 멜론 서버 부하는
+        ChartFetcher의 호스트별 동시 연결 제한으로 조절한다.
+        
         Args:
             limit_per_chart: 차트별 곡 수 제한
         
@@ -301,31 +207,25 @@ class MelonConnector:
             'source': 'melon'
         }
         
-        # 기본 차트들
-        for chart_type in ['realtime', 'hot100']:
-            self.log(f"수집 중: {chart_type} 차트")
-            chart_data = self.get_chart_data(chart_type, limit_per_chart)
-            
+        # 기본 차트들 + 주요 장르들
+        chart_types = ['realtime', 'hot100']
+        major_genres = ['kpop', 'ballad', 'hiphop', 'dance']
+        
+        async def collect(session):
+            return await asyncio.gather(
+                *[self.fetch_chart_data(session, chart_type, limit_per_chart) for chart_type in chart_types],
+                *[self.fetch_genre_chart(session, genre, min(30, limit_per_chart)) for genre in major_genres],
+            )
+        
+        results = self.fetcher.run(collect)
+        keys = chart_types + [f'genre_{genre}' for genre in major_genres]
+        
+        for key, chart_data in zip(keys, results):
             if chart_data['success']:
-                all_data['charts'][chart_type] = chart_data
+                all_data['charts'][key] = chart_data
                 all_data['total_tracks'] += chart_data['total_tracks']
-            else:
-                self.log(f"{chart_type} 차트 수집 실패: {chart_data.get('error', '알 수 없는 오류')}")
-            
-            # 요청 간격 (서버 부하 방지)
-            time.sleep(1)
-        
-        # 주요 장르들
-        major_genres = ['kpop', 'ballad', 'hiphop', 'dance']
-        for genre in major_genres:
-            self.log(f"수집 중: {genre} 장르")
-            genre_data = self.get_genre_chart(genre, min(30, limit_per_chart))
-            
-            if genre_data['success']:
-                all_data['charts'][f'genre_{genre}'] = genre_data
-                all_data['total_tracks'] += genre_data['total_tracks']
-            
-            time.sleep(1)
+            elif key in chart_types:
+                self.log(f"{key} 차트 수집 실패: {chart_data.get('error', '알 수 없는 오류')}")
         
         self.log(f"멜론 전체 차트 수집 완료: 총 {all_data['total_tracks']}곡")
         return all_data
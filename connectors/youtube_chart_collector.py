@@ -6,13 +6,14 @@ YouTube Chart Collector - YouTube Data API를 통한 음악 차트 데이터 수
 
 import os
 import json
-import requests
 import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 import time
 
+from connectors.youtube_data_api import get_youtube_client
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -29,7 +30,8 @@ class YouTubeChartCollector:
         """
         self.console_log = console_log or print
         self.api_key = os.getenv('YOUTUBE_API_KEY')
-        self.base_url = 'https://www.googleapis.com/youtube/v3'
+        # 프로세스 공유 YouTube Data API 클라이언트 (쿼터 집계 포함)
+        self.youtube = get_youtube_client(self.api_key, console_log=self.console_log) if self.api_key else None
         
         # 차트 수집용 검색 키워드 (한국/글로벌)
         self.chart_keywords = {
@@ -73,7 +75,7 @@ class YouTubeChartCollector:
             차트 데이터
         """
         try:
-            if not self.api_key:
+            if not self.api_key or not self.youtube:
                 return {
                     'success': False,
                     'error': 'YouTube API 키가 설정되지 않았습니다',
@@ -139,22 +141,18 @@ class YouTubeChartCollector:
     def _search_music_videos(self, query: str, max_results: int = 10, min_view_count: int = 50000) -> List[Dict]:
         """YouTube에서 음악 동영상 검색"""
         try:
-            search_url = f"{self.base_url}/search"
-            params = {
-                'key': self.api_key,
-                'q': query,
-                'part': 'snippet',
-                'type': 'video',
-                'videoCategoryId': '10',  # 음악 카테고리
-                'order': 'date',          # 최신순
-                'maxResults': max_results * 3,  # 조회수 필터링을 위해 더 많이 가져옴
-                'publishedAfter': (datetime.now() - timedelta(days=90)).isoformat() + 'Z'  # 최근 3개월
-            }
-            
-            response = requests.get(search_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self.youtube.execute(
+                'search.list',
+                lambda service: service.search().list(
+                    q=query,
+                    part='snippet',
+                    type='video',
+                    videoCategoryId='10',  # 음악 카테고리
+                    order='date',          # 최신순
+                    maxResults=min(50, max_results * 3),  # 조회수 필터링을 위해 더 많이 가져옴
+                    publishedAfter=(datetime.now() - timedelta(days=90)).isoformat() + 'Z'  # 최근 3개월
+                )
+            )
             video_ids = [item['id']['videoId'] for item in data.get('items', [])]
             
             # 상세 정보 가져오기
@@ -177,20 +175,14 @@ class YouTubeChartCollector:
     def _get_video_details(self, video_ids: List[str]) -> List[Dict]:
         """동영상 상세 정보 조회"""
         try:
-            videos_url = f"{self.base_url}/videos"
-            params = {
-                'key': self.api_key,
-                'id': ','.join(video_ids),
-                'part': 'snippet,statistics,contentDetails'
-            }
-            
-            response = requests.get(videos_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            # 50개 단위 배치 조회 (입력 순서 유지)
+            items_by_id = self.youtube.get_videos(video_ids)
             videos = []
             
-            for item in data.get('items', []):
+            for video_id in video_ids:
+                item = items_by_id.get(video_id)
+                if not item:
+                    continue
                 video_info = {
                     'video_id': item['id'],
                     'title': item['snippet']['title'],
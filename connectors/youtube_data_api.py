@@ -0,0 +1,345 @@
+"""
+Shared YouTube Data API v3 client.
+
+Builds the discovery-based service once per API key and shares it across
+MusicAnalyzer, LinkExtractor, TrackStatsService and YouTubeChartCollector.
+Concurrent single-video lookups are coalesced into batched videos.list calls
+(up to 50 IDs per request), and quota units are tracked per endpoint so that
+callers back off before the daily quota is exhausted.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    from googleapiclient.discovery import build
+    from googleapiclient.errors import HttpError
+except ImportError:
+    build = None
+    HttpError = None
+
+from utils import app_settings
+
+
+VIDEOS_LIST_MAX_IDS = 50
+DEFAULT_VIDEO_PARTS = "snippet,contentDetails,statistics"
+
+# 엔드포인트별 쿼터 비용 (units, YouTube Data API v3 기준)
+ENDPOINT_QUOTA_COST = {
+    "videos.list": 1,
+    "commentThreads.list": 1,
+    "channels.list": 1,
+    "playlistItems.list": 1,
+    "search.list": 100,
+}
+
+# 일일 쿼터는 태평양 표준시 자정에 초기화됨
+QUOTA_RESET_TZ = timezone(timedelta(hours=-8))
+
+QUOTA_ERROR_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+RETRYABLE_ERROR_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "backendError"}
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 쿼터가 부족해지면 배치 대기 시간을 늘려 더 많은 ID를 한 번에 묶음
+LOW_QUOTA_BATCH_WINDOW_MULTIPLIER = 4
+
+
+class YouTubeQuotaExceeded(Exception):
+    """Raised when a call would exceed the remaining YouTube API quota."""
+
+
+class YouTubeDataClient:
+    """Process-wide YouTube Data API client with batching and quota tracking."""
+
+    def __init__(
+        self,
+        api_key: str,
+        daily_quota: int = None,
+        quota_reserve: int = None,
+        batch_window_ms: int = None,
+        max_retries: int = 3,
+        console_log=None,
+    ):
+        if not api_key:
+            raise ValueError("YouTube API 키가 설정되지 않았습니다.")
+
+        self.api_key = api_key
+        self.daily_quota = daily_quota if daily_quota is not None else app_settings.YOUTUBE_DAILY_QUOTA
+        self.quota_reserve = quota_reserve if quota_reserve is not None else app_settings.YOUTUBE_QUOTA_RESERVE
+        self.batch_window = (
+            batch_window_ms if batch_window_ms is not None else app_settings.YOUTUBE_BATCH_WINDOW_MS
+        ) / 1000.0
+        self.max_retries = max_retries
+        self.console_log = console_log or print
+
+        self._service = None
+        self._service_lock = threading.Lock()
+        # googleapiclient의 httplib2 전송 계층은 thread-safe 하지 않으므로 호출을 직렬화
+        self._call_lock = threading.Lock()
+
+        self._quota_lock = threading.Lock()
+        self._quota_day = self._current_quota_day()
+        self._quota_used: Dict[str, int] = {}
+        self._call_counts: Dict[str, int] = {}
+        self._exhausted_until_day = None
+
+        self._batch_lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, List[Future]]] = {}
+        self._flush_scheduled = set()
+        self._batched_ids = 0
+        self._batched_requests = 0
+
+    @property
+    def service(self):
+        """Discovery 문서 기반 서비스 객체 (최초 1회만 생성)"""
+        if self._service is None:
+            with self._service_lock:
+                if self._service is None:
+                    if build is None:
+                        raise ImportError("google-api-python-client가 설치되지 않았습니다.")
+                    self.console_log("[YouTubeAPI] YouTube Data API v3 클라이언트 초기화 중...")
+                    self._service = build(
+                        "youtube",
+                        "v3",
+                        developerKey=self.api_key,
+                        cache_discovery=False,
+                    )
+                    self.console_log("[YouTubeAPI] YouTube Data API v3 클라이언트 초기화 완료")
+        return self._service
+
+    # =========================
+    # Quota
+    # =========================
+    @staticmethod
+    def _current_quota_day() -> str:
+        return datetime.now(QUOTA_RESET_TZ).strftime("%Y-%m-%d")
+
+    def _roll_quota_day(self) -> None:
+        today = self._current_quota_day()
+        if today != self._quota_day:
+            self._quota_day = today
+            self._quota_used = {}
+            self._call_counts = {}
+            self._exhausted_until_day = None
+
+    def _reserve_quota(self, endpoint: str, units: int) -> None:
+        with self._quota_lock:
+            self._roll_quota_day()
+
+            if self._exhausted_until_day == self._quota_day:
+                raise YouTubeQuotaExceeded("YouTube API 일일 쿼터가 소진되었습니다.")
+
+            remaining = self.daily_quota - sum(self._quota_used.values())
+            if units > remaining:
+                raise YouTubeQuotaExceeded(f"YouTube API 쿼터 부족: {endpoint} ({units} units, 남은 {remaining})")
+            # 쿼터가 얼마 남지 않으면 단건 조회(1 unit)만 허용하고 고비용 호출은 막음
+            if units > 1 and remaining - units < self.quota_reserve:
+                raise YouTubeQuotaExceeded(f"YouTube API 쿼터 예약분 보호: {endpoint} 호출 보류 (남은 {remaining})")
+
+            self._quota_used[endpoint] = self._quota_used.get(endpoint, 0) + units
+            self._call_counts[endpoint] = self._call_counts.get(endpoint, 0) + 1
+
+    def _mark_quota_exhausted(self) -> None:
+        with self._quota_lock:
+            self._roll_quota_day()
+            self._exhausted_until_day = self._quota_day
+        self.console_log("[YouTubeAPI] 쿼터 소진 응답 수신, 다음 초기화까지 API 호출을 중단합니다.")
+
+    def quota_remaining(self) -> int:
+        with self._quota_lock:
+            self._roll_quota_day()
+            if self._exhausted_until_day == self._quota_day:
+                return 0
+            return max(0, self.daily_quota - sum(self._quota_used.values()))
+
+    def is_quota_low(self) -> bool:
+        return self.quota_remaining() < self.quota_reserve
+
+    def quota_status(self) -> Dict[str, Any]:
+        """모니터링용 쿼터/배치 현황"""
+        with self._quota_lock:
+            self._roll_quota_day()
+            used = sum(self._quota_used.values())
+            exhausted = self._exhausted_until_day == self._quota_day
+            status = {
+                "quota_day": self._quota_day,
+                "daily_quota": self.daily_quota,
+                "used": used,
+                "remaining": 0 if exhausted else max(0, self.daily_quota - used),
+                "exhausted": exhausted,
+                "used_by_endpoint": dict(self._quota_used),
+                "calls_by_endpoint": dict(self._call_counts),
+            }
+        with self._batch_lock:
+            status["batched_ids"] = self._batched_ids
+            status["batched_requests"] = self._batched_requests
+        return status
+
+    # =========================
+    # Execution
+    # =========================
+    @staticmethod
+    def _error_reason(exc: Exception) -> Optional[str]:
+        try:
+            details = getattr(exc, "error_details", None) or []
+            for detail in details:
+                if isinstance(detail, dict) and detail.get("reason"):
+                    return detail.get("reason")
+            return getattr(exc, "reason", None)
+        except Exception:
+            return None
+
+    def execute(self, endpoint: str, request_factory: Callable[[Any], Any], units: int = None) -> Dict:
+        """
+        쿼터를 예약하고 API 요청 실행 (일시 오류는 지수 백오프로 재시도)
+
+        Args:
+            endpoint: 쿼터 집계용 엔드포인트 이름 (예: "videos.list")
+            request_factory: service 객체를 받아 HttpRequest를 반환하는 함수
+            units: 호출 비용 (기본값: ENDPOINT_QUOTA_COST)
+        """
+        units = units if units is not None else ENDPOINT_QUOTA_COST.get(endpoint, 1)
+        service = self.service
+
+        attempt = 0
+        while True:
+            self._reserve_quota(endpoint, units)
+            try:
+                with self._call_lock:
+                    return request_factory(service).execute()
+            except Exception as exc:
+                if HttpError is None or not isinstance(exc, HttpError):
+                    raise
+
+                reason = self._error_reason(exc)
+                status = getattr(getattr(exc, "resp", None), "status", None)
+
+                if reason in QUOTA_ERROR_REASONS:
+                    self._mark_quota_exhausted()
+                    raise YouTubeQuotaExceeded("YouTube API 일일 쿼터가 소진되었습니다.") from exc
+
+                retryable = reason in RETRYABLE_ERROR_REASONS or status in RETRYABLE_STATUS_CODES
+                if not retryable or attempt >= self.max_retries:
+                    raise
+
+                delay = (2 ** attempt) * 0.5 + random.uniform(0, 0.25)
+                self.console_log(f"[YouTubeAPI] {endpoint} 일시 오류({status}, {reason}), {delay:.2f}초 후 재시도")
+                time.sleep(delay)
+                attempt += 1
+
+    def get_videos(self, video_ids: Iterable[str], parts: str = DEFAULT_VIDEO_PARTS) -> Dict[str, Dict]:
+        """
+        여러 비디오를 50개 단위 videos.list 호출로 조회
+
+        Returns:
+            Dict[str, Dict]: video_id -> API item (찾지 못한 ID는 포함되지 않음)
+        """
+        unique_ids = []
+        seen = set()
+        for video_id in video_ids:
+            if video_id and video_id not in seen:
+                seen.add(video_id)
+                unique_ids.append(video_id)
+
+        items: Dict[str, Dict] = {}
+        for start in range(0, len(unique_ids), VIDEOS_LIST_MAX_IDS):
+            chunk = unique_ids[start:start + VIDEOS_LIST_MAX_IDS]
+            response = self.execute(
+                "videos.list",
+                lambda service, chunk=chunk: service.videos().list(
+                    part=parts,
+                    id=",".join(chunk),
+                    maxResults=len(chunk),
+                ),
+            )
+            for item in response.get("items", []):
+                if item.get("id"):
+                    items[item["id"]] = item
+        return items
+
+    # =========================
+    # Coalesced single lookups
+    # =========================
+    def get_video(self, video_id: str, parts: str = DEFAULT_VIDEO_PARTS, timeout: float = 30.0) -> Optional[Dict]:
+        """
+        단건 비디오 조회. 짧은 대기 시간 동안 들어온 다른 단건 조회와 묶어서
+        하나의 videos.list 요청으로 처리합니다.
+        """
+        if not video_id:
+            return None
+
+        future: Future = Future()
+        batch = None
+        with self._batch_lock:
+            waiters = self._pending.setdefault(parts, {})
+            waiters.setdefault(video_id, []).append(future)
+
+            if len(waiters) >= VIDEOS_LIST_MAX_IDS:
+                batch = self._pending.pop(parts)
+            elif parts not in self._flush_scheduled:
+                self._flush_scheduled.add(parts)
+                window = self.batch_window
+                if self.is_quota_low():
+                    window *= LOW_QUOTA_BATCH_WINDOW_MULTIPLIER
+                timer = threading.Timer(window, self._flush, args=(parts,))
+                timer.daemon = True
+                timer.start()
+
+        if batch:
+            self._dispatch(parts, batch)
+
+        return future.result(timeout=timeout)
+
+    def _flush(self, parts: str) -> None:
+        with self._batch_lock:
+            self._flush_scheduled.discard(parts)
+            batch = self._pending.pop(parts, None)
+        if batch:
+            self._dispatch(parts, batch)
+
+    def _dispatch(self, parts: str, batch: Dict[str, List[Future]]) -> None:
+        with self._batch_lock:
+            self._batched_ids += len(batch)
+            self._batched_requests += 1
+
+        try:
+            items = self.get_videos(list(batch.keys()), parts=parts)
+        except Exception as exc:
+            for futures in batch.values():
+                for future in futures:
+                    future.set_exception(exc)
+            return
+
+        for video_id, futures in batch.items():
+            item = items.get(video_id)
+            for future in futures:
+                future.set_result(item)
+
+
+_clients: Dict[str, YouTubeDataClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_youtube_client(api_key: str = None, console_log=None) -> Optional[YouTubeDataClient]:
+    """
+    API 키별 공유 YouTubeDataClient 반환
+
+    API 키가 없거나 google-api-python-client가 설치되지 않은 경우 None을 반환하므로
+    호출 측에서 yt-dlp 등으로 fallback 할 수 있습니다.
+    """
+    api_key = api_key or app_settings.YOUTUBE_API_KEY
+    if not api_key or build is None:
+        return None
+
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = YouTubeDataClient(api_key, console_log=console_log)
+            _clients[api_key] = client
+        return client
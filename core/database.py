@@ -7,119 +7,418 @@ YouTube 분석 결과와 댓글 데이터 저장
 import sqlite3
 import json
 import os
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from contextlib import contextmanager
 
+try:
+    from utils import app_settings
+    from core.db_migrations import Migration, run_migrations
+    from core.sqlite_pool import get_sqlite_pool
+except ImportError:
+    import app_settings
+    from db_migrations import Migration, run_migrations
+    from sqlite_pool import get_sqlite_pool
+
+SESSION_INSERT_SQL = '''
+    INSERT INTO analysis_sessions (
+        video_id, video_url, video_title, channel_name,
+        artist, song, duration, view_count, like_count,
+        primary_genre, primary_mood, estimated_bpm,
+        estimated_key, energy_level, sentiment_score,
+        thumbnail_url, published_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+COMMENT_INSERT_SQL = '''
+    INSERT INTO comments (
+        session_id, author, text, like_count,
+        published_at, sentiment_score
+    ) VALUES (?, ?, ?, ?, ?, ?)
+'''
+TAG_INSERT_SQL = 'INSERT INTO video_tags (session_id, tag) VALUES (?, ?)'
+GENRE_SCORE_INSERT_SQL = 'INSERT INTO genre_scores (session_id, genre, score) VALUES (?, ?, ?)'
+MOOD_SCORE_INSERT_SQL = 'INSERT INTO mood_scores (session_id, mood, score) VALUES (?, ?, ?)'
+
+# 전문 검색 (FTS5): 세션 메타데이터 + 태그는 analysis_search, 댓글은 comments를 외부 콘텐츠로 쓰는 comments_fts
+SEARCH_SCHEMA_SQL = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS analysis_search USING fts5(
+        video_title, artist, song, channel_name, genre_mood, tags,
+        tokenize = 'unicode61 remove_diacritics 2'
+    );
+    CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5(
+        text, author,
+        content = 'comments', content_rowid = 'id',
+        tokenize = 'unicode61 remove_diacritics 2'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS analysis_sessions_search_ai AFTER INSERT ON analysis_sessions BEGIN
+        INSERT INTO analysis_search (rowid, video_title, artist, song, channel_name, genre_mood, tags)
+        VALUES (new.id, new.video_title, new.artist, new.song, new.channel_name,
+                coalesce(new.primary_genre, '') || ' ' || coalesce(new.primary_mood, ''), '');
+    END;
+    CREATE TRIGGER IF NOT EXISTS analysis_sessions_search_au
+    AFTER UPDATE OF video_title, artist, song, channel_name, primary_genre, primary_mood ON analysis_sessions BEGIN
+        DELETE FROM analysis_search WHERE rowid = old.id;
+        INSERT INTO analysis_search (rowid, video_title, artist, song, channel_name, genre_mood, tags)
+        VALUES (new.id, new.video_title, new.artist, new.song, new.channel_name,
+                coalesce(new.primary_genre, '') || ' ' || coalesce(new.primary_mood, ''),
+                coalesce((SELECT group_concat(tag, ' ') FROM video_tags WHERE session_id = new.id), ''));
+    END;
+    CREATE TRIGGER IF NOT EXISTS analysis_sessions_search_ad AFTER DELETE ON analysis_sessions BEGIN
+        DELETE FROM analysis_search WHERE rowid = old.id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS video_tags_search_ai AFTER INSERT ON video_tags BEGIN
+        UPDATE analysis_search
+        SET tags = coalesce((SELECT group_concat(tag, ' ') FROM video_tags WHERE session_id = new.session_id), '')
+        WHERE rowid = new.session_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS video_tags_search_ad AFTER DELETE ON video_tags BEGIN
+        UPDATE analysis_search
+        SET tags = coalesce((SELECT group_concat(tag, ' ') FROM video_tags WHERE session_id = old.session_id), '')
+        WHERE rowid = old.session_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS comments_search_ai AFTER INSERT ON comments BEGIN
+        INSERT INTO comments_fts (rowid, text, author) VALUES (new.id, new.text, new.author);
+    END;
+    CREATE TRIGGER IF NOT EXISTS comments_search_ad AFTER DELETE ON comments BEGIN
+        INSERT INTO comments_fts (comments_fts, rowid, text, author) VALUES ('delete', old.id, old.text, old.author);
+    END;
+    CREATE TRIGGER IF NOT EXISTS comments_search_au AFTER UPDATE OF text, author ON comments BEGIN
+        INSERT INTO comments_fts (comments_fts, rowid, text, author) VALUES ('delete', old.id, old.text, old.author);
+        INSERT INTO comments_fts (rowid, text, author) VALUES (new.id, new.text, new.author);
+    END;
+'''
+
+# 기존 DB에 검색 인덱스를 처음 만들 때 채우기
+SEARCH_BACKFILL_SQL = '''
+    INSERT INTO analysis_search (rowid, video_title, artist, song, channel_name, genre_mood, tags)
+    SELECT s.id, s.video_title, s.artist, s.song, s.channel_name,
+           coalesce(s.primary_genre, '') || ' ' || coalesce(s.primary_mood, ''),
+           coalesce((SELECT group_concat(tag, ' ') FROM video_tags WHERE session_id = s.id), '')
+    FROM analysis_sessions s;
+    INSERT INTO comments_fts (comments_fts) VALUES ('rebuild');
+'''
+
+# bm25 컬럼 가중치 (video_title, artist, song, channel_name, genre_mood, tags)
+SESSION_SEARCH_WEIGHTS = (8.0, 10.0, 8.0, 3.0, 4.0, 4.0)
+# 댓글 매치 점수를 세션 점수에 더할 때의 비중
+COMMENT_SEARCH_WEIGHT = 0.3
+# 한 번의 검색에서 점수를 계산할 댓글 매치 상한 (관련도 순)
+COMMENT_SEARCH_MAX_HITS = 5000
+SEARCH_SCOPES = ('all', 'sessions', 'comments')
+
+# 대시보드 통계 요약 테이블 (저장/삭제 트랜잭션 안에서 증감, 장르/분위기 NULL은 ''로 저장)
+STATS_SCHEMA_SQL = '''
+    CREATE TABLE IF NOT EXISTS analysis_stats_totals (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS analysis_stats_genre (
+        genre TEXT PRIMARY KEY,
+        analyses INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS analysis_stats_mood (
+        mood TEXT PRIMARY KEY,
+        analyses INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS analysis_stats_daily (
+        day TEXT PRIMARY KEY,
+        analyses INTEGER NOT NULL DEFAULT 0,
+        comments INTEGER NOT NULL DEFAULT 0
+    );
+'''
+
+STATS_REBUILD_SQL = '''
+    DELETE FROM analysis_stats_totals;
+    DELETE FROM analysis_stats_genre;
+    DELETE FROM analysis_stats_mood;
+    DELETE FROM analysis_stats_daily;
+    INSERT INTO analysis_stats_totals (key, value) VALUES
+        ('analyses', (SELECT COUNT(*) FROM analysis_sessions)),
+        ('comments', (SELECT COUNT(*) FROM comments));
+    INSERT INTO analysis_stats_genre (genre, analyses)
+    SELECT coalesce(primary_genre, ''), COUNT(*) FROM analysis_sessions GROUP BY 1;
+    INSERT INTO analysis_stats_mood (mood, analyses)
+    SELECT coalesce(primary_mood, ''), COUNT(*) FROM analysis_sessions GROUP BY 1;
+    INSERT INTO analysis_stats_daily (day, analyses, comments)
+    SELECT substr(s.analyzed_at, 1, 10), COUNT(*), coalesce(SUM(c.comment_count), 0)
+    FROM analysis_sessions s
+    LEFT JOIN (SELECT session_id, COUNT(*) AS comment_count FROM comments GROUP BY session_id) c
+        ON c.session_id = s.id
+    GROUP BY 1;
+'''
+
+# get_statistics에 포함할 최근 일별 집계 일수
+STATS_RECENT_DAYS = 30
+
+# 조회 패턴별 커버링 인덱스
+# - get_session_details: 댓글 정렬(like_count, published_at)과 태그/장르/분위기 조회를 인덱스만으로 처리
+# - get_analysis_history: 최신순 + 세션별 댓글 수 (comments(session_id, ...) 접두사)
+# - search_by_genre: primary_genre 일치 + 최신순
+# comments(session_id) 단일 인덱스는 새 인덱스의 접두사라 삭제
+COVERING_INDEXES_SQL = '''
+    CREATE INDEX IF NOT EXISTS idx_comments_session_likes
+        ON comments(session_id, like_count DESC, published_at DESC);
+    DROP INDEX IF EXISTS idx_session_comments;
+    CREATE INDEX IF NOT EXISTS idx_sessions_analyzed_at_id ON analysis_sessions(analyzed_at DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_sessions_genre_analyzed_at ON analysis_sessions(primary_genre, analyzed_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_video_tags_session_tag ON video_tags(session_id, tag);
+    CREATE INDEX IF NOT EXISTS idx_genre_scores_session ON genre_scores(session_id, genre, score);
+    CREATE INDEX IF NOT EXISTS idx_mood_scores_session ON mood_scores(session_id, mood, score);
+'''
+
+# 보관(archive) DB: 세션 1건 = 상세 정보(댓글 포함) JSON을 zlib 압축한 행 1개
+ARCHIVE_SCHEMA_SQL = '''
+    CREATE TABLE IF NOT EXISTS archived_sessions (
+        id INTEGER PRIMARY KEY,
+        video_id TEXT NOT NULL,
+        artist TEXT,
+        song TEXT,
+        primary_genre TEXT,
+        analyzed_at TEXT,
+        comment_count INTEGER NOT NULL DEFAULT 0,
+        archived_at TEXT NOT NULL,
+        payload BLOB NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_archived_sessions_analyzed_at ON archived_sessions(analyzed_at);
+    CREATE INDEX IF NOT EXISTS idx_archived_sessions_video_id ON archived_sessions(video_id);
+'''
+
+_text_blob_class = None
+_text_blob_loaded = False
+
+
+def _fts5_available() -> bool:
+    """현재 sqlite3 빌드의 FTS5 지원 여부"""
+    try:
+        conn = sqlite3.connect(':memory:')
+        try:
+            conn.execute('CREATE VIRTUAL TABLE fts5_probe USING fts5(x)')
+            return True
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+
+def _execute_statements(conn: sqlite3.Connection, script: str) -> None:
+    """
+    여러 SQL 문을 현재 트랜잭션 안에서 실행
+    
+    executescript는 열린 트랜잭션을 먼저 커밋하므로 writer 트랜잭션 안에서는 문장 단위로 실행한다.
+    """
+    buffer = ''
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip():
+                conn.execute(buffer)
+            buffer = ''
+
+
+def _migrate_base_schema(conn: sqlite3.Connection) -> None:
+    """v1: 기본 테이블 (기존 init_database 스키마)"""
+    cursor = conn.cursor()
+    
+    # 분석 세션 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS analysis_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_id TEXT NOT NULL,
+            video_url TEXT NOT NULL,
+            video_title TEXT,
+            channel_name TEXT,
+            artist TEXT,
+            song TEXT,
+            duration INTEGER,
+            view_count INTEGER,
+            like_count INTEGER,
+            primary_genre TEXT,
+            primary_mood TEXT,
+            estimated_bpm INTEGER,
+            estimated_key TEXT,
+            energy_level TEXT,
+            sentiment_score REAL,
+            analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            thumbnail_url TEXT,
+            published_at TEXT,
+            UNIQUE(video_id, analyzed_at)
+        )
+    ''')
+    
+    # 댓글 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS comments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER,
+            author TEXT NOT NULL,
+            text TEXT NOT NULL,
+            like_count INTEGER DEFAULT 0,
+            published_at TEXT,
+            sentiment_score REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES analysis_sessions (id)
+        )
+    ''')
+    
+    # 태그 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS video_tags (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER,
+            tag TEXT NOT NULL,
+            FOREIGN KEY (session_id) REFERENCES analysis_sessions (id)
+        )
+    ''')
+    
+    # 장르 점수 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS genre_scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER,
+            genre TEXT NOT NULL,
+            score INTEGER DEFAULT 0,
+            FOREIGN KEY (session_id) REFERENCES analysis_sessions (id)
+        )
+    ''')
+    
+    # 분위기 점수 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS mood_scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER,
+            mood TEXT NOT NULL,
+            score INTEGER DEFAULT 0,
+            FOREIGN KEY (session_id) REFERENCES analysis_sessions (id)
+        )
+    ''')
+    
+    # 인덱스 생성
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_video_id ON analysis_sessions(video_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_analyzed_at ON analysis_sessions(analyzed_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_comments ON comments(session_id)')
+
+
+def _migrate_statistics_tables(conn: sqlite3.Connection) -> None:
+    """v2: 대시보드 통계 요약 테이블 (처음 만들 때는 기존 데이터로 채움)"""
+    stats_exist = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'analysis_stats_totals'").fetchone()
+    _execute_statements(conn, STATS_SCHEMA_SQL)
+    if not stats_exist:
+        _execute_statements(conn, STATS_REBUILD_SQL)
+
+
+def _migrate_covering_indexes(conn: sqlite3.Connection) -> None:
+    """v4: 이력/상세/검색 조회 패턴용 커버링 인덱스"""
+    _execute_statements(conn, COVERING_INDEXES_SQL)
+
+
+def build_fts_query(text: str, column: str = None) -> Optional[str]:
+    """
+    사용자 입력을 FTS5 MATCH 식으로 변환
+    
+    단어마다 따옴표로 감싼 접두 검색("단어"*)을 AND로 묶어 FTS 문법 문자가 섞여도 오류가 나지 않게 한다.
+    """
+    terms = re.findall(r'\w+', text or '')
+    if not terms:
+        return None
+    expression = ' '.join(f'"{term}"*' for term in terms[:10])
+    return f'{column} : ({expression})' if column else expression
+
+
+def _get_text_blob():
+    """TextBlob 클래스 (최초 1회만 import 시도, 미설치면 None)"""
+    global _text_blob_class, _text_blob_loaded
+    if not _text_blob_loaded:
+        try:
+            from textblob import TextBlob
+            _text_blob_class = TextBlob
+        except ImportError:
+            _text_blob_class = None
+        _text_blob_loaded = True
+    return _text_blob_class
+
+
 class DatabaseManager:
-    def __init__(self, db_path: str = None, console_log=None):
+    def __init__(self, db_path: str = None, console_log=None, pooled: bool = True):
         """
         데이터베이스 매니저 초기화
         
         Args:
             db_path: 데이터베이스 파일 경로 (기본: music_analysis.db)
             console_log: 로그 출력 함수
+            pooled: True면 스레드별 WAL 연결 재사용 + 단일 writer 큐 (core/sqlite_pool.py),
+                    False면 호출마다 새 연결 (벤치마크 비교용)
         """
         self.db_path = db_path or os.path.join(os.getcwd(), 'music_analysis.db')
         self.console_log = console_log or print
+        self.search_enabled = _fts5_available()
+        if not self.search_enabled:
+            self.console_log("[Database] SQLite FTS5를 사용할 수 없어 전문 검색을 비활성화합니다 (LIKE 검색 사용)")
+        self.pool = None
+        if pooled:
+            self.pool = get_sqlite_pool(
+                self.db_path,
+                busy_timeout_ms=app_settings.ANALYSIS_DB_BUSY_TIMEOUT_MS,
+                cache_size_kb=app_settings.ANALYSIS_DB_CACHE_SIZE_KB,
+                mmap_size_bytes=app_settings.ANALYSIS_DB_MMAP_SIZE_MB * 1024 * 1024,
+                synchronous=app_settings.ANALYSIS_DB_SYNCHRONOUS,
+                console_log=self.console_log,
+            )
         
         # 데이터베이스 초기화
         self.init_database()
     
     def init_database(self):
-        """데이터베이스 테이블 생성"""
+        """데이터베이스 스키마 마이그레이션 (적용되지 않은 버전만 순서대로 실행)"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # 분석 세션 테이블
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS analysis_sessions (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        video_id TEXT NOT NULL,
-                        video_url TEXT NOT NULL,
-                        video_title TEXT,
-                        channel_name TEXT,
-                        artist TEXT,
-                        song TEXT,
-                        duration INTEGER,
-                        view_count INTEGER,
-                        like_count INTEGER,
-                        primary_genre TEXT,
-                        primary_mood TEXT,
-                        estimated_bpm INTEGER,
-                        estimated_key TEXT,
-                        energy_level TEXT,
-                        sentiment_score REAL,
-                        analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        thumbnail_url TEXT,
-                        published_at TEXT,
-                        UNIQUE(video_id, analyzed_at)
-                    )
-                ''')
-                
-                # 댓글 테이블
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS comments (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        session_id INTEGER,
-                        author TEXT NOT NULL,
-                        text TEXT NOT NULL,
-                        like_count INTEGER DEFAULT 0,
-                        published_at TEXT,
-                        sentiment_score REAL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (session_id) REFERENCES analysis_sessions (id)
-                    )
-                ''')
-                
-                # 태그 테이블
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS video_tags (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        session_id INTEGER,
-                        tag TEXT NOT NULL,
-                        FOREIGN KEY (session_id) REFERENCES analysis_sessions (id)
-                    )
-                ''')
-                
-                # 장르 점수 테이블
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS genre_scores (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        session_id INTEGER,
-                        genre TEXT NOT NULL,
-                        score INTEGER DEFAULT 0,
-                        FOREIGN KEY (session_id) REFERENCES analysis_sessions (id)
-                    )
-                ''')
-                
-                # 분위기 점수 테이블
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS mood_scores (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        session_id INTEGER,
-                        mood TEXT NOT NULL,
-                        score INTEGER DEFAULT 0,
-                        FOREIGN KEY (session_id) REFERENCES analysis_sessions (id)
-                    )
-                ''')
-                
-                # 인덱스 생성
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_video_id ON analysis_sessions(video_id)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_analyzed_at ON analysis_sessions(analyzed_at)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_comments ON comments(session_id)')
-                
-                conn.commit()
-                self.console_log("[Database] 데이터베이스 초기화 완료")
-                
+            if self._is_new_database():
+                # 증분 VACUUM 모드는 빈 DB에서 설정 후 VACUUM해야 적용됨 (WAL 전환으로 헤더가 이미 생성됨)
+                self._maintenance(lambda conn: (
+                    conn.execute('PRAGMA auto_vacuum = INCREMENTAL'), conn.execute('VACUUM')
+                ))
+            self._write(lambda conn: run_migrations(conn, self._migrations(), console_log=self.console_log))
+            self.console_log("[Database] 데이터베이스 초기화 완료")
         except Exception as e:
             self.console_log(f"[Database] 초기화 오류: {str(e)}")
             raise
     
+    def _migrations(self) -> List[Migration]:
+        """스키마 버전 목록 (새 변경은 끝에 다음 번호로 추가)"""
+        return [
+            Migration(1, 'base schema', _migrate_base_schema),
+            Migration(2, 'dashboard statistics tables', _migrate_statistics_tables),
+            Migration(3, 'fts5 search index', self._migrate_search_index, condition=lambda: self.search_enabled),
+            Migration(4, 'covering indexes for history/detail/search', _migrate_covering_indexes),
+        ]
+    
+    def _migrate_search_index(self, conn: sqlite3.Connection) -> None:
+        """v3: 전문 검색 인덱스 (처음 만들 때는 기존 데이터로 채움)"""
+        search_exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'analysis_search'").fetchone()
+        _execute_statements(conn, SEARCH_SCHEMA_SQL)
+        if not search_exists:
+            _execute_statements(conn, SEARCH_BACKFILL_SQL)
+            self.console_log("[Database] 전문 검색 인덱스 생성 (기존 데이터 색인)")
+    
+    def _is_new_database(self) -> bool:
+        if not os.path.exists(self.db_path) or os.path.getsize(self.db_path) == 0:
+            return True
+        with self.get_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+    
     @contextmanager
     def get_connection(self):
-        """데이터베이스 연결 컨텍스트 매니저"""
+        """데이터베이스 연결 컨텍스트 매니저 (읽기용, 풀 사용 시 스레드 연결 재사용)"""
+        if self.pool is not None:
+            with self.pool.read() as conn:
+                yield conn
+            return
+        
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row  # 딕셔너리 형태 결과
         try:
@@ -127,6 +426,35 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    def _write(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """
+        쓰기 함수를 하나의 트랜잭션으로 실행 (fn 안에서 commit 하지 않음)
+        
+        풀 사용 시 프로세스의 모든 쓰기가 단일 writer 스레드에서 순서대로 실행된다.
+        """
+        if self.pool is not None:
+            return self.pool.write(fn)
+        
+        with self.get_connection() as conn:
+            result = fn(conn)
+            conn.commit()
+            return result
+    
+    def _maintenance(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """트랜잭션 밖에서 실행해야 하는 작업 (VACUUM, auto_vacuum 설정 등)"""
+        if self.pool is not None:
+            return self.pool.write(fn, transaction=False)
+        
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            return fn(conn)
+        finally:
+            conn.close()
+    
+    def get_pool_status(self) -> Optional[Dict]:
+        """연결 풀 / writer 큐 상태"""
+        return self.pool.get_status() if self.pool is not None else None
+    
     def save_analysis_result(self, analysis_result: Dict) -> int:
         """
         분석 결과를 데이터베이스에 저장
@@ -137,92 +465,121 @@ class DatabaseManager:
         Returns:
             저장된 세션 ID
         """
+        return self.bulk_save_analysis(analysis_result)['session_id']
+    
+    def bulk_save_analysis(self, analysis_result: Dict) -> Dict:
+        """
+        분석 결과를 한 번의 트랜잭션으로 일괄 저장
+        
+        댓글 감성 점수는 트랜잭션 밖에서 미리 계산하고(댓글에 sentiment_score가 있으면 그대로 사용),
+        테이블별로 executemany 한 번씩 실행한 뒤 한 번만 커밋한다.
+        
+        Args:
+            analysis_result: music_analyzer의 분석 결과
+            
+        Returns:
+            {session_id, rows: 테이블별 저장 행 수, timings_ms: 단계/테이블별 소요 시간}
+        """
+        timings = {}
+        started = time.perf_counter()
+        
+        # 기본 분석 정보 추출
+        video_info = analysis_result['video_info']
+        music_analysis = analysis_result['music_analysis']
+        comments_data = analysis_result.get('comments_data', {})
+        
+        session_row = (
+            video_info['video_id'],
+            video_info['url'],
+            video_info['title'],
+            video_info['channel'],
+            music_analysis['artist'],
+            music_analysis['song'],
+            video_info['duration'],
+            video_info['view_count'],
+            video_info['like_count'],
+            music_analysis['genre']['primary_genre'],
+            music_analysis['mood']['primary_mood'],
+            music_analysis['estimated_bpm'],
+            music_analysis['estimated_key'],
+            music_analysis['energy_level'],
+            comments_data.get('sentiment_analysis', {}).get('average_sentiment', 0),
+            video_info['thumbnail'],
+            video_info['published_at']
+        )
+        
+        # 댓글 감성 점수는 쓰기 잠금을 잡기 전에 계산
+        comments = comments_data.get('comments') or []
+        comment_rows = [
+            (
+                comment['author'],
+                comment['text'],
+                comment['like_count'],
+                comment['published_at'],
+                comment['sentiment_score'] if comment.get('sentiment_score') is not None
+                else self._calculate_sentiment(comment['text'])
+            )
+            for comment in comments
+        ]
+        tag_rows = [(tag,) for tag in music_analysis.get('tags') or []]
+        genre_rows = list((music_analysis['genre'].get('genre_scores') or {}).items())
+        mood_rows = list((music_analysis['mood'].get('mood_scores') or {}).items())
+        timings['prepare'] = (time.perf_counter() - started) * 1000
+        
+        def insert_all(conn):
+            cursor = conn.cursor()
+            table_started = time.perf_counter()
+            
+            # 분석 세션 저장
+            cursor.execute(SESSION_INSERT_SQL, session_row)
+            session_id = cursor.lastrowid
+            table_timings = {'analysis_sessions': (time.perf_counter() - table_started) * 1000}
+            
+            # 하위 테이블은 session_id를 붙여 테이블별로 executemany 한 번씩
+            for table, sql, rows in (
+                ('comments', COMMENT_INSERT_SQL, comment_rows),
+                ('video_tags', TAG_INSERT_SQL, tag_rows),
+                ('genre_scores', GENRE_SCORE_INSERT_SQL, genre_rows),
+                ('mood_scores', MOOD_SCORE_INSERT_SQL, mood_rows),
+            ):
+                table_started = time.perf_counter()
+                if rows:
+                    cursor.executemany(sql, [(session_id,) + row for row in rows])
+                table_timings[table] = (time.perf_counter() - table_started) * 1000
+            
+            table_started = time.perf_counter()
+            self._apply_stats_delta(cursor, session_id, 1)
+            table_timings['statistics'] = (time.perf_counter() - table_started) * 1000
+            
+            return session_id, table_timings
+        
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # 기본 분석 정보 추출
-                video_info = analysis_result['video_info']
-                music_analysis = analysis_result['music_analysis']
-                comments_data = analysis_result.get('comments_data', {})
-                
-                # 분석 세션 저장
-                cursor.execute('''
-                    INSERT INTO analysis_sessions (
-                        video_id, video_url, video_title, channel_name,
-                        artist, song, duration, view_count, like_count,
-                        primary_genre, primary_mood, estimated_bpm, 
-                        estimated_key, energy_level, sentiment_score,
-                        thumbnail_url, published_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    video_info['video_id'],
-                    video_info['url'],
-                    video_info['title'],
-                    video_info['channel'],
-                    music_analysis['artist'],
-                    music_analysis['song'],
-                    video_info['duration'],
-                    video_info['view_count'],
-                    video_info['like_count'],
-                    music_analysis['genre']['primary_genre'],
-                    music_analysis['mood']['primary_mood'],
-                    music_analysis['estimated_bpm'],
-                    music_analysis['estimated_key'],
-                    music_analysis['energy_level'],
-                    comments_data.get('sentiment_analysis', {}).get('average_sentiment', 0),
-                    video_info['thumbnail'],
-                    video_info['published_at']
-                ))
-                
-                session_id = cursor.lastrowid
-                
-                # 댓글 저장
-                if 'comments' in comments_data:
-                    for comment in comments_data['comments']:
-                        sentiment = self._calculate_sentiment(comment['text'])
-                        cursor.execute('''
-                            INSERT INTO comments (
-                                session_id, author, text, like_count, 
-                                published_at, sentiment_score
-                            ) VALUES (?, ?, ?, ?, ?, ?)
-                        ''', (
-                            session_id,
-                            comment['author'],
-                            comment['text'],
-                            comment['like_count'],
-                            comment['published_at'],
-                            sentiment
-                        ))
-                
-                # 태그 저장
-                if 'tags' in music_analysis:
-                    for tag in music_analysis['tags']:
-                        cursor.execute('''
-                            INSERT INTO video_tags (session_id, tag) VALUES (?, ?)
-                        ''', (session_id, tag))
-                
-                # 장르 점수 저장
-                if 'genre_scores' in music_analysis['genre']:
-                    for genre, score in music_analysis['genre']['genre_scores'].items():
-                        cursor.execute('''
-                            INSERT INTO genre_scores (session_id, genre, score) VALUES (?, ?, ?)
-                        ''', (session_id, genre, score))
-                
-                # 분위기 점수 저장
-                if 'mood_scores' in music_analysis['mood']:
-                    for mood, score in music_analysis['mood']['mood_scores'].items():
-                        cursor.execute('''
-                            INSERT INTO mood_scores (session_id, mood, score) VALUES (?, ?, ?)
-                        ''', (session_id, mood, score))
-                
-                conn.commit()
-                self.console_log(f"[Database] 분석 결과 저장 완료: session_id={session_id}")
-                return session_id
-                
+            write_started = time.perf_counter()
+            session_id, table_timings = self._write(insert_all)
+            timings['write'] = (time.perf_counter() - write_started) * 1000
         except Exception as e:
             self.console_log(f"[Database] 저장 오류: {str(e)}")
             raise
+        
+        timings.update(table_timings)
+        timings['total'] = (time.perf_counter() - started) * 1000
+        report = {
+            'session_id': session_id,
+            'rows': {
+                'analysis_sessions': 1,
+                'comments': len(comment_rows),
+                'video_tags': len(tag_rows),
+                'genre_scores': len(genre_rows),
+                'mood_scores': len(mood_rows),
+            },
+            'timings_ms': {key: round(value, 2) for key, value in timings.items()},
+        }
+        self.console_log(
+            f"[Database] 분석 결과 저장 완료: session_id={session_id}, "
+            f"댓글 {len(comment_rows)}개, {report['timings_ms']['total']}ms "
+            f"(감성 계산 {report['timings_ms']['prepare']}ms, 쓰기 {report['timings_ms']['write']}ms)"
+        )
+        return report
     
     def get_analysis_history(self, limit: int = 50) -> List[Dict]:
         """
@@ -238,24 +595,17 @@ class DatabaseManager:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
+                # 세션별 댓글 수는 comments(session_id, ...) 인덱스로 같은 쿼리에서 계산
                 cursor.execute('''
-                    SELECT * FROM analysis_sessions 
-                    ORDER BY analyzed_at DESC 
+                    SELECT s.*,
+                           (SELECT COUNT(*) FROM comments c WHERE c.session_id = s.id) AS comment_count
+                    FROM analysis_sessions s
+                    ORDER BY s.analyzed_at DESC, s.id DESC
                     LIMIT ?
                 ''', (limit,))
                 
                 sessions = [dict(row) for row in cursor.fetchall()]
                 
-                # 각 세션의 댓글 수 추가
-                for session in sessions:
-                    cursor.execute('''
-                        SELECT COUNT(*) as comment_count 
-                        FROM comments 
-                        WHERE session_id = ?
-                    ''', (session['id'],))
-                    
-                    session['comment_count'] = cursor.fetchone()['comment_count']
-                
                 return sessions
                 
         except Exception as e:
@@ -312,16 +662,25 @@ class DatabaseManager:
             return None
     
     def search_by_artist(self, artist: str) -> List[Dict]:
-        """아티스트로 검색"""
+        """아티스트로 검색 (FTS 인덱스의 artist 컬럼, 사용할 수 없으면 LIKE)"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('''
-                    SELECT * FROM analysis_sessions 
-                    WHERE artist LIKE ? 
-                    ORDER BY analyzed_at DESC
-                ''', (f'%{artist}%',))
+                match = build_fts_query(artist, column='artist') if self.search_enabled else None
+                if match:
+                    cursor.execute('''
+                        SELECT s.* FROM analysis_search
+                        JOIN analysis_sessions s ON s.id = analysis_search.rowid
+                        WHERE analysis_search MATCH ?
+                        ORDER BY s.analyzed_at DESC
+                    ''', (match,))
+                else:
+                    cursor.execute('''
+                        SELECT * FROM analysis_sessions 
+                        WHERE artist LIKE ? 
+                        ORDER BY analyzed_at DESC
+                    ''', (f'%{artist}%',))
                 
                 return [dict(row) for row in cursor.fetchall()]
                 
@@ -329,6 +688,112 @@ class DatabaseManager:
             self.console_log(f"[Database] 아티스트 검색 오류: {str(e)}")
             return []
     
+    def search_history(self, query: str, scope: str = 'all', limit: int = 20, offset: int = 0) -> Dict:
+        """
+        분석 이력 전문 검색 (제목/아티스트/곡명/채널/장르·분위기/태그 + 댓글 본문)
+        
+        세션 메타데이터 매치와 댓글 매치의 bm25 점수를 세션 단위로 합쳐 관련도 순으로 정렬한다.
+        
+        Args:
+            query: 검색어 (단어별 접두 검색, 모든 단어 포함)
+            scope: 'all' | 'sessions' (메타데이터만) | 'comments' (댓글만)
+            limit: 페이지 크기
+            offset: 건너뛸 결과 수
+            
+        Returns:
+            Dict: {results, total, limit, offset, has_next}
+            results 항목은 세션 정보 + score, comment_hits, comment_snippet
+        """
+        empty = {'results': [], 'total': 0, 'limit': limit, 'offset': offset, 'has_next': False}
+        scope = scope if scope in SEARCH_SCOPES else 'all'
+        match = build_fts_query(query)
+        if not match:
+            return empty
+        if not self.search_enabled:
+            results = self.search_by_artist(query)
+            return {**empty, 'results': results[offset:offset + limit], 'total': len(results),
+                    'has_next': offset + limit < len(results)}
+        
+        parts, params = [], []
+        if scope in ('all', 'sessions'):
+            # 세션 부분만 있으면 hits CTE가 평탄화되어 bm25가 FTS 조회 밖으로 빠지므로 LIMIT -1 서브쿼리로 고정
+            weights = ', '.join(str(w) for w in SESSION_SEARCH_WEIGHTS)
+            parts.append(f'''
+                SELECT rowid AS session_id, score, 0 AS comment_hits
+                FROM (
+                    SELECT rowid, bm25(analysis_search, {weights}) AS score FROM analysis_search
+                    WHERE analysis_search MATCH ? LIMIT -1
+                )
+            ''')
+            params.append(match)
+        if scope in ('all', 'comments'):
+            # bm25는 FTS 테이블 단독 조회에서만 쓸 수 있으므로 서브쿼리(LIMIT로 평탄화 방지)에서
+            # 관련도 상위 댓글만 계산한 뒤 세션별로 합산
+            parts.append('''
+                SELECT c.session_id, SUM(f.score) * ? AS score, COUNT(*) AS comment_hits
+                FROM (
+                    SELECT rowid, bm25(comments_fts) AS score FROM comments_fts
+                    WHERE comments_fts MATCH ? ORDER BY rank LIMIT ?
+                ) f
+                JOIN comments c ON c.id = f.rowid
+                GROUP BY c.session_id
+            ''')
+            params.extend([COMMENT_SEARCH_WEIGHT, match, COMMENT_SEARCH_MAX_HITS])
+        ranked_sql = f'''
+            WITH hits AS ({' UNION ALL '.join(parts)}),
+            ranked AS (
+                SELECT session_id, SUM(score) AS score, SUM(comment_hits) AS comment_hits
+                FROM hits GROUP BY session_id
+            )
+        '''
+        
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute(ranked_sql + 'SELECT COUNT(*) AS total FROM ranked', params)
+                total = cursor.fetchone()['total']
+                if not total:
+                    return empty
+                
+                # bm25는 관련도가 높을수록 작은(음수) 값
+                cursor.execute(ranked_sql + '''
+                    SELECT s.*, r.score, r.comment_hits
+                    FROM ranked r JOIN analysis_sessions s ON s.id = r.session_id
+                    ORDER BY r.score ASC, s.analyzed_at DESC
+                    LIMIT ? OFFSET ?
+                ''', params + [limit, offset])
+                results = [dict(row) for row in cursor.fetchall()]
+                
+                # 댓글 매치가 있는 세션은 가장 관련도 높은 댓글 일부를 함께 반환
+                comment_sessions = [r['id'] for r in results if r['comment_hits']]
+                snippets = {}
+                if comment_sessions:
+                    placeholders = ', '.join('?' for _ in comment_sessions)
+                    cursor.execute(f'''
+                        SELECT c.session_id, snippet(comments_fts, 0, '', '', '…', 16) AS snippet
+                        FROM comments_fts JOIN comments c ON c.id = comments_fts.rowid
+                        WHERE comments_fts MATCH ? AND c.session_id IN ({placeholders})
+                        ORDER BY rank
+                    ''', [match] + comment_sessions)
+                    for row in cursor.fetchall():
+                        snippets.setdefault(row['session_id'], row['snippet'])
+                for result in results:
+                    result['score'] = round(-result['score'], 4)
+                    result['comment_snippet'] = snippets.get(result['id'])
+                
+                return {
+                    'results': results,
+                    'total': total,
+                    'limit': limit,
+                    'offset': offset,
+                    'has_next': offset + len(results) < total,
+                }
+                
+        except Exception as e:
+            self.console_log(f"[Database] 전문 검색 오류: {str(e)}")
+            return empty
+    
     def search_by_genre(self, genre: str) -> List[Dict]:
         """장르로 검색"""
         try:
@@ -348,74 +813,301 @@ class DatabaseManager:
             return []
     
     def get_statistics(self) -> Dict:
-        """데이터베이스 통계 조회"""
+        """데이터베이스 통계 조회 (요약 테이블만 읽음)"""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # 총 분석 수
-                cursor.execute('SELECT COUNT(*) as total_analyses FROM analysis_sessions')
-                total_analyses = cursor.fetchone()['total_analyses']
-                
-                # 총 댓글 수
-                cursor.execute('SELECT COUNT(*) as total_comments FROM comments')
-                total_comments = cursor.fetchone()['total_comments']
+                # 총 분석 수 / 총 댓글 수
+                cursor.execute('SELECT key, value FROM analysis_stats_totals')
+                totals = {row['key']: row['value'] for row in cursor.fetchall()}
                 
                 # 장르별 분석 수
                 cursor.execute('''
-                    SELECT primary_genre, COUNT(*) as count 
-                    FROM analysis_sessions 
-                    GROUP BY primary_genre 
-                    ORDER BY count DESC
+                    SELECT genre, analyses FROM analysis_stats_genre
+                    WHERE analyses > 0 ORDER BY analyses DESC
                 ''')
-                genre_stats = {row['primary_genre']: row['count'] for row in cursor.fetchall()}
+                genre_stats = {(row['genre'] or None): row['analyses'] for row in cursor.fetchall()}
                 
                 # 분위기별 분석 수
                 cursor.execute('''
-                    SELECT primary_mood, COUNT(*) as count 
-                    FROM analysis_sessions 
-                    GROUP BY primary_mood 
-                    ORDER BY count DESC
+                    SELECT mood, analyses FROM analysis_stats_mood
+                    WHERE analyses > 0 ORDER BY analyses DESC
                 ''')
-                mood_stats = {row['primary_mood']: row['count'] for row in cursor.fetchall()}
+                mood_stats = {(row['mood'] or None): row['analyses'] for row in cursor.fetchall()}
+                
+                # 최근 일별 분석/댓글 수
+                cursor.execute('''
+                    SELECT day, analyses, comments FROM analysis_stats_daily
+                    ORDER BY day DESC LIMIT ?
+                ''', (STATS_RECENT_DAYS,))
+                daily_stats = {
+                    row['day']: {'analyses': row['analyses'], 'comments': row['comments']}
+                    for row in reversed(cursor.fetchall())
+                }
                 
                 return {
-                    'total_analyses': total_analyses,
-                    'total_comments': total_comments,
+                    'total_analyses': totals.get('analyses', 0),
+                    'total_comments': totals.get('comments', 0),
                     'genre_distribution': genre_stats,
-                    'mood_distribution': mood_stats
+                    'mood_distribution': mood_stats,
+                    'daily_activity': daily_stats
                 }
                 
         except Exception as e:
             self.console_log(f"[Database] 통계 조회 오류: {str(e)}")
             return {}
     
+    def _apply_stats_delta(self, cursor: sqlite3.Cursor, session_id: int, sign: int) -> None:
+        """
+        세션 1건의 통계 요약 테이블 증감 (저장 후 +1, 삭제 전 -1, 같은 트랜잭션에서 호출)
+        """
+        cursor.execute('''
+            SELECT coalesce(primary_genre, '') AS genre, coalesce(primary_mood, '') AS mood,
+                   substr(analyzed_at, 1, 10) AS day
+            FROM analysis_sessions WHERE id = ?
+        ''', (session_id,))
+        session = cursor.fetchone()
+        if session is None:
+            return
+        cursor.execute('SELECT COUNT(*) AS comment_count FROM comments WHERE session_id = ?', (session_id,))
+        comments = cursor.fetchone()[0] * sign
+        
+        cursor.executemany('''
+            INSERT INTO analysis_stats_totals (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = value + excluded.value
+        ''', [('analyses', sign), ('comments', comments)])
+        cursor.execute('''
+            INSERT INTO analysis_stats_genre (genre, analyses) VALUES (?, ?)
+            ON CONFLICT(genre) DO UPDATE SET analyses = analyses + excluded.analyses
+        ''', (session[0], sign))
+        cursor.execute('''
+            INSERT INTO analysis_stats_mood (mood, analyses) VALUES (?, ?)
+            ON CONFLICT(mood) DO UPDATE SET analyses = analyses + excluded.analyses
+        ''', (session[1], sign))
+        cursor.execute('''
+            INSERT INTO analysis_stats_daily (day, analyses, comments) VALUES (?, ?, ?)
+            ON CONFLICT(day) DO UPDATE SET
+                analyses = analyses + excluded.analyses,
+                comments = comments + excluded.comments
+        ''', (session[2], sign, comments))
+        
+        if sign < 0:
+            cursor.execute('DELETE FROM analysis_stats_genre WHERE genre = ? AND analyses <= 0', (session[0],))
+            cursor.execute('DELETE FROM analysis_stats_mood WHERE mood = ? AND analyses <= 0', (session[1],))
+            cursor.execute(
+                'DELETE FROM analysis_stats_daily WHERE day = ? AND analyses <= 0 AND comments <= 0',
+                (session[2],)
+            )
+    
+    def rebuild_statistics(self) -> Dict:
+        """통계 요약 테이블을 원본 테이블로 다시 계산 (불일치 복구용)"""
+        started = time.perf_counter()
+        self._write(lambda conn: _execute_statements(conn, STATS_REBUILD_SQL))
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.console_log(f"[Database] 통계 요약 재계산 완료 ({elapsed_ms}ms)")
+        return {**self.get_statistics(), 'rebuild_ms': elapsed_ms}
+    
     def _calculate_sentiment(self, text: str) -> float:
         """텍스트 감성 점수 계산"""
+        text_blob = _get_text_blob()
+        if text_blob is None:
+            return 0.0
         try:
-            from textblob import TextBlob
-            blob = TextBlob(text)
-            return blob.sentiment.polarity
-        except:
+            return text_blob(text).sentiment.polarity
+        except Exception:
             return 0.0
     
+    def _delete_session_rows(self, cursor: sqlite3.Cursor, session_id: int) -> None:
+        """세션 1건과 하위 행 삭제 (쓰기 트랜잭션 안에서 호출)"""
+        # 통계는 행이 남아 있을 때 먼저 차감
+        self._apply_stats_delta(cursor, session_id, -1)
+        
+        # 관련 데이터 삭제 (외래키 제약 때문에 순서 중요)
+        cursor.execute('DELETE FROM comments WHERE session_id = ?', (session_id,))
+        cursor.execute('DELETE FROM video_tags WHERE session_id = ?', (session_id,))
+        cursor.execute('DELETE FROM genre_scores WHERE session_id = ?', (session_id,))
+        cursor.execute('DELETE FROM mood_scores WHERE session_id = ?', (session_id,))
+        cursor.execute('DELETE FROM analysis_sessions WHERE id = ?', (session_id,))
+    
     def delete_session(self, session_id: int) -> bool:
         """세션 및 관련 데이터 삭제"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
+            self._write(lambda conn: self._delete_session_rows(conn.cursor(), session_id))
+            self.console_log(f"[Database] 세션 삭제 완료: session_id={session_id}")
+            return True
+        except Exception as e:
+            self.console_log(f"[Database] 삭제 오류: {str(e)}")
+            return False
+    
+    # =========================
+    # 보관 (retention / archive)
+    # =========================
+    def archive_old_sessions(self, older_than_days: int, archive_path: str = None,
+                             batch_size: int = None, dry_run: bool = False) -> Dict:
+        """
+        오래된 세션을 압축 보관 DB로 옮기고 원본에서 삭제한 뒤 증분 VACUUM
+        
+        보관 DB에 먼저 커밋한 다음 원본을 지우므로 중간에 실패해도 데이터는 유실되지 않는다
+        (같은 세션이 다시 옮겨지면 보관 DB에서 덮어씀). 읽지 못한 세션은 지우지 않고 남겨두며,
+        그런 세션이 나오면 해당 배치까지만 처리하고 멈춘다 (report['failed']).
+        
+        Args:
+            older_than_days: 이 일수보다 오래된 분석(analyzed_at 기준)을 보관
+            archive_path: 보관 DB 경로 (기본: ANALYSIS_ARCHIVE_PATH)
+            batch_size: 한 번에 옮길 세션 수
+            dry_run: True면 대상 수만 계산
+            
+        Returns:
+            Dict: {candidates, archived, comments, failed, archive_path, vacuum, duration_ms}
+        """
+        started = time.perf_counter()
+        archive_path = archive_path or app_settings.ANALYSIS_ARCHIVE_PATH
+        batch_size = batch_size or app_settings.ANALYSIS_RETENTION_BATCH_SIZE
+        # analyzed_at은 CURRENT_TIMESTAMP(UTC, 'YYYY-MM-DD HH:MM:SS')로 저장됨
+        cutoff = (datetime.utcnow() - timedelta(days=older_than_days)).strftime('%Y-%m-%d %H:%M:%S')
+        
+        with self.get_connection() as conn:
+            candidates = conn.execute(
+                'SELECT COUNT(*) FROM analysis_sessions WHERE analyzed_at < ?', (cutoff,)
+            ).fetchone()[0]
+        report = {'candidates': candidates, 'archived': 0, 'comments': 0, 'failed': [], 'archive_path': archive_path,
+                  'cutoff': cutoff, 'vacuum': None}
+        if dry_run or not candidates:
+            report['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            return report
+        
+        archive = self._open_archive(archive_path)
+        try:
+            while True:
+                with self.get_connection() as conn:
+                    session_ids = [row[0] for row in conn.execute('''
+                        SELECT id FROM analysis_sessions WHERE analyzed_at < ?
+                        ORDER BY analyzed_at, id LIMIT ?
+                    ''', (cutoff, batch_size))]
+                if not session_ids:
+                    break
+                
+                details, failed = [], []
+                for sid in session_ids:
+                    detail = self.get_session_details(sid)
+                    if detail:
+                        details.append(detail)
+                    else:
+                        failed.append(sid)
+                archived_at = datetime.now().isoformat()
+                archive.executemany('''
+                    INSERT OR REPLACE INTO archived_sessions (
+                        id, video_id, artist, song, primary_genre, analyzed_at,
+                        comment_count, archived_at, payload
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(
+                    d['id'], d['video_id'], d.get('artist'), d.get('song'), d.get('primary_genre'),
+                    d.get('analyzed_at'), len(d.get('comments') or []), archived_at,
+                    zlib.compress(json.dumps(d, ensure_ascii=False, default=str).encode('utf-8'), 6)
+                ) for d in details])
+                archive.commit()
+                
+                # 보관 DB에 들어간 세션만 삭제
+                archived_ids = [d['id'] for d in details]
                 
-                # 관련 데이터 삭제 (외래키 제약 때문에 순서 중요)
-                cursor.execute('DELETE FROM comments WHERE session_id = ?', (session_id,))
-                cursor.execute('DELETE FROM video_tags WHERE session_id = ?', (session_id,))
-                cursor.execute('DELETE FROM genre_scores WHERE session_id = ?', (session_id,))
-                cursor.execute('DELETE FROM mood_scores WHERE session_id = ?', (session_id,))
-                cursor.execute('DELETE FROM analysis_sessions WHERE id = ?', (session_id,))
+                def delete_batch(conn):
+                    cursor = conn.cursor()
+                    for sid in archived_ids:
+                        self._delete_session_rows(cursor, sid)
                 
-                conn.commit()
-                self.console_log(f"[Database] 세션 삭제 완료: session_id={session_id}")
-                return True
+                self._write(delete_batch)
+                report['archived'] += len(details)
+                report['comments'] += sum(len(d.get('comments') or []) for d in details)
                 
+                # 읽지 못한 세션은 다음 배치에서도 다시 선택되므로 여기서 중단
+                if failed:
+                    report['failed'] = failed
+                    self.console_log(f"[Database] 세션 읽기 실패로 보관 중단 (원본 유지): {failed}")
+                    break
+        finally:
+            archive.close()
+        
+        report['vacuum'] = self.incremental_vacuum()
+        report['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self.console_log(
+            f"[Database] 오래된 분석 보관 완료: 세션 {report['archived']}건, 댓글 {report['comments']}개 "
+            f"-> {archive_path} ({report['duration_ms']}ms)"
+        )
+        return report
+    
+    @staticmethod
+    def _open_archive(archive_path: str) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(archive_path)), exist_ok=True)
+        archive = sqlite3.connect(archive_path, timeout=30)
+        archive.execute('PRAGMA journal_mode=WAL')
+        archive.executescript(ARCHIVE_SCHEMA_SQL)
+        return archive
+    
+    def get_archived_session(self, session_id: int, archive_path: str = None) -> Optional[Dict]:
+        """보관 DB에서 세션 상세 정보 복원 (get_session_details와 같은 형태)"""
+        archive_path = archive_path or app_settings.ANALYSIS_ARCHIVE_PATH
+        if not os.path.exists(archive_path):
+            return None
+        try:
+            archive = self._open_archive(archive_path)
+            try:
+                row = archive.execute('SELECT payload FROM archived_sessions WHERE id = ?', (session_id,)).fetchone()
+            finally:
+                archive.close()
+            return json.loads(zlib.decompress(row[0]).decode('utf-8')) if row else None
         except Exception as e:
-            self.console_log(f"[Database] 삭제 오류: {str(e)}")
-            return False
\ No newline at end of file
+            self.console_log(f"[Database] 보관 세션 조회 오류: {str(e)}")
+            return None
+    
+    def incremental_vacuum(self, max_pages: int = 0) -> Dict:
+        """
+        빈 페이지를 파일에서 반환 (PRAGMA incremental_vacuum)
+        
+        auto_vacuum이 INCREMENTAL이 아닌 기존 DB는 처음 한 번 전체 VACUUM으로 전환한다.
+        
+        Args:
+            max_pages: 반환할 최대 페이지 수 (0이면 전부)
+        """
+        def vacuum(conn):
+            result = {'converted': False}
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                conn.execute('VACUUM')
+                result['converted'] = True
+            before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            conn.execute(f'PRAGMA incremental_vacuum({int(max_pages)})').fetchall()
+            after = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            result['freed_pages'] = before - after
+            result['page_size'] = conn.execute('PRAGMA page_size').fetchone()[0]
+            return result
+        
+        try:
+            return self._maintenance(vacuum)
+        except Exception as e:
+            self.console_log(f"[Database] VACUUM 오류: {str(e)}")
+            return {'error': str(e)}
+    
+    def start_retention_job(self, retention_days: int = None, interval_hours: float = None) -> Optional[threading.Thread]:
+        """
+        보관 작업을 주기적으로 실행하는 백그라운드 스레드 시작 (retention_days가 0이면 비활성)
+        """
+        retention_days = retention_days if retention_days is not None else app_settings.ANALYSIS_RETENTION_DAYS
+        interval_hours = interval_hours or app_settings.ANALYSIS_RETENTION_INTERVAL_HOURS
+        if retention_days <= 0:
+            return None
+        
+        def loop():
+            # 서버 시작 직후 부하를 피하기 위해 잠시 대기 후 첫 실행
+            time.sleep(60)
+            while True:
+                try:
+                    self.archive_old_sessions(retention_days)
+                except Exception as e:
+                    self.console_log(f"[Database] 보관 작업 오류: {str(e)}")
+                time.sleep(interval_hours * 3600)
+        
+        thread = threading.Thread(target=loop, name="analysis-retention", daemon=True)
+        thread.start()
+        self.console_log(f"[Database] 보관 작업 시작: {retention_days}일 초과 분석, {interval_hours}시간 간격")
+        return thread
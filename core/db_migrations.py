@@ -0,0 +1,68 @@
+"""
+Versioned schema migrations for local SQLite databases.
+
+Each migration has an integer version and runs at most once per database;
+applied versions are recorded in ``schema_migrations`` (and the highest one
+mirrored into ``PRAGMA user_version``). Migrations with a condition that is
+not met (e.g. FTS5 missing from the sqlite build) are skipped without being
+recorded, so they apply later once the condition holds.
+
+``run_migrations`` is called inside the caller's write transaction, so a
+failing migration rolls back the whole batch.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from datetime import datetime
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], None]
+    condition: Optional[Callable[[], bool]] = None
+
+
+def applied_versions(conn: sqlite3.Connection) -> List[int]:
+    """적용된 마이그레이션 버전 목록"""
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version INTEGER PRIMARY KEY,"
+        " name TEXT NOT NULL,"
+        " applied_at TEXT NOT NULL,"
+        " duration_ms REAL)"
+    )
+    return [row[0] for row in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+
+
+def run_migrations(conn: sqlite3.Connection, migrations: Iterable[Migration], console_log=None) -> List[int]:
+    """
+    아직 적용되지 않은 마이그레이션을 버전 순으로 실행
+
+    Returns:
+        이번에 적용한 버전 목록
+    """
+    console_log = console_log or print
+    done = set(applied_versions(conn))
+    applied = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        if migration.condition is not None and not migration.condition():
+            continue
+        started = time.perf_counter()
+        migration.apply(conn)
+        duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        conn.execute(
+            "INSERT INTO schema_migrations (version, name, applied_at, duration_ms) VALUES (?, ?, ?, ?)",
+            (migration.version, migration.name, datetime.now().isoformat(), duration_ms),
+        )
+        applied.append(migration.version)
+        console_log(f"[Migration] v{migration.version} {migration.name} 적용 ({duration_ms}ms)")
+
+    if applied:
+        conn.execute(f"PRAGMA user_version = {int(max(done | set(applied)))}")
+    return applied
@@ -0,0 +1,161 @@
+"""
+Cached public aggregate snapshot for the landing and brand-studio pages.
+
+Recomputes public counters (total tracks, posts, votes, recent battles and
+today's visits) on a background interval and serves them from memory with
+stale-while-revalidate semantics, so page requests never wait on aggregate
+Supabase queries.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from utils import app_settings
+
+
+EMPTY_SNAPSHOT = {
+    "total_tracks": 0,
+    "total_posts": 0,
+    "today_visits": 0,
+    "total_votes": 0,
+    "recent_battles": 0,
+}
+
+
+class PublicSnapshotService:
+    """Serve public growth counters from memory, refreshed in the background."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        refresh_interval_seconds: int = None,
+        stale_after_seconds: int = None,
+        console_log=None,
+    ):
+        self.console_log = console_log or print
+        self.client_factory = client_factory
+        self.refresh_interval_seconds = refresh_interval_seconds or app_settings.PUBLIC_SNAPSHOT_REFRESH_SECONDS
+        self.stale_after_seconds = stale_after_seconds or app_settings.PUBLIC_SNAPSHOT_STALE_SECONDS
+
+        self.running = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        self._snapshot: Dict[str, Any] = dict(EMPTY_SNAPSHOT)
+        self._computed_at: Optional[float] = None
+        self._last_duration_ms: Optional[int] = None
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        메모리의 최신 스냅샷을 즉시 반환
+
+        값이 없거나 오래되었으면 백그라운드 재계산만 예약하고 기다리지 않는다.
+        """
+        with self._lock:
+            snapshot = dict(self._snapshot)
+            computed_at = self._computed_at
+
+        if computed_at is None or time.time() - computed_at > self.stale_after_seconds:
+            self._revalidate_async()
+
+        snapshot["computed_at"] = datetime.fromtimestamp(computed_at).isoformat() if computed_at else None
+        return snapshot
+
+    def refresh(self) -> Dict[str, Any]:
+        """집계 쿼리를 실행해 스냅샷 갱신 (백그라운드 스레드에서 호출)"""
+        started = time.time()
+        supabase = self.client_factory()
+
+        # 하나라도 실패하면 예외로 빠져 이전 스냅샷을 유지 (0으로 덮어쓰지 않음)
+        snapshot = dict(EMPTY_SNAPSHOT)
+        snapshot["total_tracks"] = supabase.count_tracks(raise_errors=True)
+        snapshot["total_posts"] = supabase.count_posts(raise_errors=True)
+
+        worldcup_stats = supabase.get_worldcup_stats(raise_errors=True)
+        snapshot["total_votes"] = worldcup_stats.get("total_votes", 0)
+        snapshot["recent_battles"] = worldcup_stats.get("recent_battles", 0)
+
+        snapshot["today_visits"] = supabase.get_today_visits(raise_errors=True)
+
+        with self._lock:
+            self._snapshot = snapshot
+            self._computed_at = time.time()
+            self._last_duration_ms = int((time.time() - started) * 1000)
+        return dict(snapshot)
+
+    def _refresh_guarded(self) -> None:
+        try:
+            self.refresh()
+        except Exception as exc:
+            self.console_log(f"[PublicSnapshot] 스냅샷 갱신 실패 (이전 값 유지): {exc}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _revalidate_async(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_guarded, name="public-snapshot-revalidate", daemon=True).start()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="public-snapshot", daemon=True)
+        self._thread.start()
+        self.console_log(f"[PublicSnapshot] 시작 (interval={self.refresh_interval_seconds}s)")
+
+    def stop(self) -> None:
+        self.running = False
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+
+    def _run_loop(self) -> None:
+        while self.running:
+            with self._lock:
+                busy = self._refreshing
+                self._refreshing = True
+            if not busy:
+                self._refresh_guarded()
+            self._stop_event.wait(self.refresh_interval_seconds)
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            computed_at = self._computed_at
+            return {
+                "running": self.running,
+                "refresh_interval_seconds": self.refresh_interval_seconds,
+                "stale_after_seconds": self.stale_after_seconds,
+                "computed_at": datetime.fromtimestamp(computed_at).isoformat() if computed_at else None,
+                "age_seconds": round(time.time() - computed_at, 1) if computed_at else None,
+                "last_duration_ms": self._last_duration_ms,
+            }
+
+
+# 전역 스냅샷 서비스 인스턴스
+_global_snapshot_service = None
+
+
+def get_public_snapshot_service(client_factory: Callable[[], Any] = None, console_log=None) -> Optional[PublicSnapshotService]:
+    """전역 스냅샷 서비스 반환 (최초 호출 시 client_factory 필요)"""
+    global _global_snapshot_service
+    if _global_snapshot_service is None and client_factory is not None:
+        _global_snapshot_service = PublicSnapshotService(client_factory=client_factory, console_log=console_log)
+    return _global_snapshot_service
+
+
+def start_public_snapshot_service(client_factory: Callable[[], Any], console_log=None) -> PublicSnapshotService:
+    """전역 스냅샷 서비스 시작"""
+    service = get_public_snapshot_service(client_factory=client_factory, console_log=console_log)
+    service.start()
+    return service
@@ -0,0 +1,192 @@
+"""
+Shared SQLite access layer for local databases (music_analysis.db).
+
+Each thread reuses one connection opened in WAL mode with tuned pragmas, so
+readers never block behind a writer and no connection is opened per call.
+All writes in the process go through a single writer thread that runs each
+write function inside one ``BEGIN IMMEDIATE`` transaction; concurrent
+writers queue in memory instead of spinning on ``database is locked``.
+Other processes on the same file are covered by ``busy_timeout``.
+
+Pools are shared per database path (``get_sqlite_pool``) so every
+DatabaseManager on the same file uses the same writer queue.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+
+class SQLitePool:
+    """Per-thread WAL connections plus a single-writer queue for one database file."""
+
+    def __init__(
+        self,
+        path: str,
+        busy_timeout_ms: int = 5000,
+        cache_size_kb: int = 16384,
+        mmap_size_bytes: int = 64 * 1024 * 1024,
+        synchronous: str = "NORMAL",
+        write_queue_size: int = 1000,
+        console_log=None,
+    ):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size_bytes = mmap_size_bytes
+        self.synchronous = synchronous.upper()
+        self.write_queue_size = write_queue_size
+        self.console_log = console_log or print
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=write_queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_pid: Optional[int] = None
+
+        self._writes = 0
+        self._write_errors = 0
+        self._write_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    # =========================
+    # Connections
+    # =========================
+    def connection(self) -> sqlite3.Connection:
+        """현재 스레드 전용 연결 반환 (fork 이후에는 새로 생성)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_ms / 1000.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size_bytes)}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def read(self):
+        """읽기용 연결 (스레드 연결 재사용, 끝나면 열린 트랜잭션 정리)"""
+        conn = self.connection()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+
+    # =========================
+    # Writes
+    # =========================
+    def write(self, fn: Callable[[sqlite3.Connection], Any], timeout: float = None, transaction: bool = True) -> Any:
+        """
+        쓰기 함수를 단일 writer 스레드에서 하나의 트랜잭션으로 실행
+
+        fn(conn)은 commit/rollback을 직접 호출하지 않는다. 예외가 나면 롤백되고 호출자에게 다시 던진다.
+
+        Args:
+            fn: 연결을 받아 쓰기를 수행하는 함수
+            timeout: 결과 대기 최대 시간(초), None이면 무한 대기
+            transaction: False면 트랜잭션 없이 실행 (VACUUM 등 트랜잭션 안에서 못 쓰는 유지보수 작업)
+
+        Returns:
+            fn의 반환값
+        """
+        if threading.current_thread() is self._writer:
+            # writer 스레드 안에서의 중첩 호출은 같은 트랜잭션에서 바로 실행
+            return fn(self.connection())
+
+        self._ensure_writer()
+        future: Future = Future()
+        self._queue.put((fn, future, time.perf_counter(), transaction))
+        return future.result(timeout=timeout)
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and self._writer_pid == os.getpid() and self._writer.is_alive():
+            return
+        with self._lock:
+            if self._writer is not None and self._writer_pid == os.getpid() and self._writer.is_alive():
+                return
+            if self._writer_pid != os.getpid():
+                # fork 이후 부모의 큐/스레드는 쓸 수 없음
+                self._queue = queue.Queue(maxsize=self.write_queue_size)
+            self._writer = threading.Thread(target=self._writer_loop, name="sqlite-writer", daemon=True)
+            self._writer_pid = os.getpid()
+            self._writer.start()
+
+    def _writer_loop(self) -> None:
+        conn = self.connection()
+        while True:
+            fn, future, queued_at, transaction = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            started = time.perf_counter()
+            try:
+                if transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                try:
+                    result = fn(conn)
+                    if transaction:
+                        conn.execute("COMMIT")
+                except BaseException:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+            except BaseException as exc:
+                with self._lock:
+                    self._write_errors += 1
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self._writes += 1
+                    self._write_seconds += finished - started
+                    self._max_wait_seconds = max(self._max_wait_seconds, started - queued_at)
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": self.path,
+                "writer_alive": bool(self._writer and self._writer.is_alive()),
+                "queue_depth": self._queue.qsize(),
+                "writes": self._writes,
+                "write_errors": self._write_errors,
+                "avg_write_ms": round(self._write_seconds / self._writes * 1000, 2) if self._writes else None,
+                "max_queue_wait_ms": round(self._max_wait_seconds * 1000, 2),
+            }
+
+
+# 경로별 공유 풀
+_pools: Dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_sqlite_pool(path: str, **options) -> SQLitePool:
+    """DB 경로별 공유 풀 반환 (최초 호출의 options로 생성)"""
+    key = os.path.abspath(path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SQLitePool(key, **options)
+            _pools[key] = pool
+        return pool
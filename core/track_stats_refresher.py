@@ -0,0 +1,471 @@
+"""
+Background refresher for track engagement stats.
+
+Walks tracks in priority order (explicit refresh requests, recently viewed,
+high worldcup battle activity, stalest last_synced_at), fetches stats for a
+whole batch through TrackStatsService and writes the results back with one
+bulk update. External calls are capped by an hourly API budget.
+
+Every gunicorn worker starts a refresher, but only the one holding the
+leader lease (same SQLite lease as the chart scheduler, in its own file)
+refreshes; the others forward refresh requests and recent views through
+that file so the leader sees them.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from analyzers.schedule_store import ScheduleStore
+from core.track_stats_service import TrackStatsService
+from utils import app_settings
+
+
+SUPPORTED_SOURCES = ("youtube", "soundcloud")
+RECENT_VIEWS_MAX = 500
+BATTLE_ACTIVITY_WINDOW_DAYS = 7
+# 명시적 갱신 요청이라도 직전 동기화 후 이 시간 이내면 건너뜀
+MIN_RESYNC_SECONDS = 60
+# 갱신 요청이 들어오면 잠깐 기다렸다가 함께 처리
+REQUEST_COALESCE_SECONDS = 2
+# 리더가 다른 워커의 갱신 요청을 확인하는 주기
+SIGNAL_POLL_SECONDS = 5
+
+
+class RefresherStore(ScheduleStore):
+    """리더 lease와 워커 간 갱신 요청/조회 신호 (ScheduleStore의 lease 테이블 재사용)"""
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        super().__init__(path, busy_timeout_ms)
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS refresh_signals ("
+                " track_id TEXT NOT NULL,"
+                " kind TEXT NOT NULL,"        # request | view
+                " at REAL NOT NULL,"
+                " PRIMARY KEY (track_id, kind))"
+            )
+
+    def push_signals(self, signals: List[Tuple[str, str, float]]) -> None:
+        if not signals:
+            return
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO refresh_signals (track_id, kind, at) VALUES (?, ?, ?) "
+                "ON CONFLICT(track_id, kind) DO UPDATE SET at = MAX(at, excluded.at)",
+                signals,
+            )
+
+    def pop_signals(self) -> List[Dict[str, Any]]:
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT track_id, kind, at FROM refresh_signals ORDER BY at").fetchall()
+            conn.execute("DELETE FROM refresh_signals")
+        return [dict(row) for row in rows]
+
+    def has_requests(self) -> bool:
+        row = self._conn().execute("SELECT 1 FROM refresh_signals WHERE kind = 'request' LIMIT 1").fetchone()
+        return row is not None
+
+
+class TrackStatsRefresher:
+    """Periodically refresh tracks.metadata.stats in batches."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        stats_service: TrackStatsService = None,
+        interval_seconds: int = None,
+        batch_size: int = None,
+        api_budget_per_hour: int = None,
+        stale_after_minutes: int = None,
+        title_max_len: int = 200,
+        on_tracks_updated: Callable[[List[str]], None] = None,
+        console_log=None,
+        lease_path: str = None,
+        lease_seconds: int = None,
+    ):
+        self.console_log = console_log or print
+        self.client_factory = client_factory
+        self.on_tracks_updated = on_tracks_updated
+        self.stats_service = stats_service or TrackStatsService(console_log=self.console_log)
+        self.interval_seconds = interval_seconds or app_settings.TRACK_STATS_REFRESH_INTERVAL_SECONDS
+        self.batch_size = batch_size or app_settings.TRACK_STATS_REFRESH_BATCH_SIZE
+        self.api_budget_per_hour = (
+            api_budget_per_hour if api_budget_per_hour is not None else app_settings.TRACK_STATS_API_BUDGET_PER_HOUR
+        )
+        self.stale_after = timedelta(
+            minutes=stale_after_minutes or app_settings.TRACK_STATS_STALE_AFTER_MINUTES
+        )
+        self.title_max_len = title_max_len
+
+        self.running = False
+        self._thread: Optional[threading.Thread] = None
+        self._wake_event = threading.Event()
+        self._lock = threading.Lock()
+
+        self._requested: "OrderedDict[str, float]" = OrderedDict()
+        self._recent_views: "OrderedDict[str, float]" = OrderedDict()
+        self._failed_until: Dict[str, float] = {}
+        self._spent = deque()  # (timestamp, api_cost)
+
+        self._last_run_at: Optional[str] = None
+        self._last_run_stats: Dict[str, Any] = {}
+
+        # 워커가 여러 개면 lease를 가진 하나만 갱신 (lease_path 없으면 단일 프로세스로 간주)
+        self.store = RefresherStore(lease_path) if lease_path else None
+        self.lease_seconds = lease_seconds or max(3 * self.interval_seconds, 600)
+        self.is_leader = self.store is None
+        self._owner = None
+        self._lease_renewed_at = 0.0
+        self._views_shared_at = 0.0
+
+    @property
+    def owner(self) -> str:
+        """lease 소유자 id (호스트:pid, fork 이후에는 새로 생성)"""
+        if self._owner is None or self._owner[1] != os.getpid():
+            self._owner = (f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}", os.getpid())
+        return self._owner[0]
+
+    # =========================
+    # Signals from request handlers
+    # =========================
+    def note_view(self, track_id: str) -> None:
+        """상세 페이지 조회 기록 (최근 조회 우선순위에 사용)"""
+        if not track_id:
+            return
+        with self._lock:
+            self._recent_views.pop(str(track_id), None)
+            self._recent_views[str(track_id)] = time.time()
+            while len(self._recent_views) > RECENT_VIEWS_MAX:
+                self._recent_views.popitem(last=False)
+
+    def request_refresh(self, track_id: str) -> None:
+        """다음 배치에서 최우선으로 갱신하도록 요청"""
+        if not track_id:
+            return
+        with self._lock:
+            self._requested.pop(str(track_id), None)
+            self._requested[str(track_id)] = time.time()
+            while len(self._requested) > self.batch_size * 4:
+                self._requested.popitem(last=False)
+        if self.store is not None and not self.is_leader:
+            # 리더 워커가 다음 확인 때 처리하도록 공유
+            try:
+                self.store.push_signals([(str(track_id), "request", time.time())])
+            except Exception as exc:
+                self.console_log(f"[TrackStatsRefresher] 갱신 요청 공유 실패: {exc}")
+        self._wake_event.set()
+
+    # =========================
+    # Lifecycle
+    # =========================
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run_loop, name="track-stats-refresher", daemon=True)
+        self._thread.start()
+        self.console_log(
+            f"[TrackStatsRefresher] 시작 (interval={self.interval_seconds}s, batch={self.batch_size}, "
+            f"budget={self.api_budget_per_hour}/h)"
+        )
+
+    def stop(self) -> None:
+        self.running = False
+        self._wake_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        if self.store is not None and self.is_leader:
+            self.store.release_leader(self.owner)
+            self.is_leader = False
+
+    def _run_loop(self) -> None:
+        while self.running:
+            try:
+                if self._hold_lease():
+                    self._pull_signals()
+                    self.run_once()
+                else:
+                    self._share_views()
+            except Exception as exc:
+                self.console_log(f"[TrackStatsRefresher] 배치 실행 오류: {exc}")
+
+            woke = self._wait_for_next_run()
+            if woke and self.running:
+                time.sleep(REQUEST_COALESCE_SECONDS)
+
+    def _wait_for_next_run(self) -> bool:
+        """다음 배치까지 대기 (요청이 들어오면 True로 일찍 깨어남)"""
+        if self.store is None:
+            woke = self._wake_event.wait(self.interval_seconds)
+            self._wake_event.clear()
+            return woke
+
+        # 리더는 다른 워커가 남긴 요청을 짧은 주기로 확인하고 lease를 갱신
+        deadline = time.time() + self.interval_seconds
+        while self.running and time.time() < deadline:
+            if self._wake_event.wait(min(SIGNAL_POLL_SECONDS, max(deadline - time.time(), 0))):
+                self._wake_event.clear()
+                return self.is_leader
+            if self.is_leader:
+                try:
+                    if not self._hold_lease():
+                        return False
+                    if self.store.has_requests():
+                        return True
+                except Exception as exc:
+                    self.console_log(f"[TrackStatsRefresher] lease 확인 오류: {exc}")
+        return False
+
+    # =========================
+    # Leader lease / shared signals
+    # =========================
+    def _hold_lease(self) -> bool:
+        """리더 lease 획득/갱신 (lease 만료 1/3 전마다 갱신)"""
+        if self.store is None:
+            return True
+        now = time.time()
+        if self.is_leader and now - self._lease_renewed_at < self.lease_seconds / 3:
+            return True
+        was_leader = self.is_leader
+        self.is_leader = self.store.try_acquire_leader(self.owner, self.lease_seconds, now)
+        if self.is_leader:
+            self._lease_renewed_at = now
+        if self.is_leader != was_leader:
+            self.console_log(f"[TrackStatsRefresher] {'리더 획득' if self.is_leader else '리더 아님'} ({self.owner})")
+        return self.is_leader
+
+    def _pull_signals(self) -> None:
+        """다른 워커가 남긴 갱신 요청/최근 조회를 메모리 큐로 가져옴"""
+        if self.store is None:
+            return
+        signals = self.store.pop_signals()
+        with self._lock:
+            for signal in signals:
+                queue = self._requested if signal["kind"] == "request" else self._recent_views
+                queue.pop(signal["track_id"], None)
+                queue[signal["track_id"]] = signal["at"]
+            while len(self._requested) > self.batch_size * 4:
+                self._requested.popitem(last=False)
+            while len(self._recent_views) > RECENT_VIEWS_MAX:
+                self._recent_views.popitem(last=False)
+
+    def _share_views(self) -> None:
+        """리더가 아닐 때 지난 공유 이후의 최근 조회를 저장소로 넘김"""
+        with self._lock:
+            views = [(track_id, "view", at) for track_id, at in self._recent_views.items() if at > self._views_shared_at]
+        if views:
+            self.store.push_signals(views)
+            self._views_shared_at = max(at for _, _, at in views)
+
+    # =========================
+    # Budget
+    # =========================
+    def _budget_remaining(self) -> int:
+        with self._lock:
+            cutoff = time.time() - 3600
+            while self._spent and self._spent[0][0] < cutoff:
+                self._spent.popleft()
+            return self.api_budget_per_hour - sum(cost for _, cost in self._spent)
+
+    def _spend(self, cost: int) -> None:
+        with self._lock:
+            self._spent.append((time.time(), cost))
+
+    # =========================
+    # Batch selection
+    # =========================
+    def _last_synced_at(self, track: Dict) -> Optional[datetime]:
+        metadata = track.get("metadata") if isinstance(track.get("metadata"), dict) else {}
+        stats = metadata.get("stats") if isinstance(metadata.get("stats"), dict) else {}
+        value = stats.get("last_synced_at")
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone().replace(tzinfo=None)
+            return parsed
+        except Exception:
+            return None
+
+    def _is_due(self, track: Dict, now: datetime, explicit: bool) -> bool:
+        last_synced = self._last_synced_at(track)
+        if last_synced is None:
+            return True
+        if explicit:
+            return (now - last_synced).total_seconds() >= MIN_RESYNC_SECONDS
+        return now - last_synced >= self.stale_after
+
+    def _select_batch(self, supabase, now: datetime) -> List[Dict]:
+        with self._lock:
+            requested_ids = list(reversed(self._requested.keys()))
+            viewed_ids = list(reversed(self._recent_views.keys()))
+            now_ts = time.time()
+            self._failed_until = {k: v for k, v in self._failed_until.items() if v > now_ts}
+            failed = set(self._failed_until.keys())
+
+        since_iso = (now - timedelta(days=BATTLE_ACTIVITY_WINDOW_DAYS)).isoformat()
+        activity = supabase.get_recent_battle_activity(since_iso)
+        battle_ids = [track_id for track_id, _ in sorted(activity.items(), key=lambda x: x[1], reverse=True)]
+
+        candidate_ids = []
+        seen = set()
+        for track_id in requested_ids + viewed_ids + battle_ids:
+            if track_id not in seen and track_id not in failed:
+                seen.add(track_id)
+                candidate_ids.append(track_id)
+        candidate_ids = candidate_ids[: self.batch_size * 4]
+
+        tracks_by_id = {str(t.get("id")): t for t in supabase.get_tracks_by_ids(candidate_ids)}
+        ordered = [tracks_by_id[track_id] for track_id in candidate_ids if track_id in tracks_by_id]
+        ordered.extend(supabase.get_stalest_synced_tracks(limit=self.batch_size, sources=list(SUPPORTED_SOURCES)))
+
+        requested = set(requested_ids)
+        budget = self._budget_remaining()
+        batch: List[Dict] = []
+        picked = set()
+        deferred = set()  # 예산 부족으로 다음 배치로 미룬 명시적 요청
+        for track in ordered:
+            track_id = str(track.get("id"))
+            if track_id in picked or track_id in failed:
+                continue
+            if (track.get("source") or "").strip().lower() not in SUPPORTED_SOURCES:
+                continue
+            if not self._is_due(track, now, explicit=track_id in requested):
+                continue
+            if TrackStatsService.estimate_api_cost(batch + [track]) > budget:
+                deferred.add(track_id)
+                continue
+            batch.append(track)
+            picked.add(track_id)
+            if len(batch) >= self.batch_size:
+                break
+
+        with self._lock:
+            for track_id in requested - deferred:
+                self._requested.pop(track_id, None)
+        return batch
+
+    # =========================
+    # Refresh
+    # =========================
+    def run_once(self) -> Dict[str, Any]:
+        """배치 1회 실행: 선택 → 일괄 조회 → 일괄 저장"""
+        started = time.time()
+        now = datetime.now()
+        supabase = self.client_factory()
+
+        batch = self._select_batch(supabase, now)
+        if not batch:
+            self._last_run_at = now.isoformat()
+            self._last_run_stats = {"selected": 0, "updated": 0, "failed": 0, "budget_remaining": self._budget_remaining()}
+            return self._last_run_stats
+
+        cost = TrackStatsService.estimate_api_cost(batch)
+        self._spend(cost)
+
+        results = self.stats_service.fetch_stats_batch(batch)
+        comment_counts = supabase.get_track_comment_counts([str(t.get("id")) for t in batch])
+
+        synced_at = now.isoformat()
+        rows = []
+        failed = 0
+        for track in batch:
+            track_id = str(track.get("id"))
+            result = results.get(track_id) or {}
+            if not result.get("success"):
+                failed += 1
+                with self._lock:
+                    self._failed_until[track_id] = time.time() + self.stale_after.total_seconds()
+                continue
+            update = TrackStatsService.build_track_update(
+                track,
+                result,
+                synced_at=synced_at,
+                comment_count=comment_counts.get(track_id),
+                title_max_len=self.title_max_len,
+            )
+            # 바뀐 컬럼만 전송 (조회 이후의 사용자 수정은 서버에서 유지)
+            rows.append({"id": track.get("id"), **update})
+
+        saved = supabase.bulk_update_tracks(rows) if rows else True
+        if saved and rows and self.on_tracks_updated:
+            try:
+                self.on_tracks_updated([str(row.get("id")) for row in rows])
+            except Exception as exc:
+                self.console_log(f"[TrackStatsRefresher] 갱신 알림 실패: {exc}")
+
+        self._last_run_at = synced_at
+        self._last_run_stats = {
+            "selected": len(batch),
+            "updated": len(rows) if saved else 0,
+            "failed": failed,
+            "api_cost": cost,
+            "budget_remaining": self._budget_remaining(),
+            "duration_ms": int((time.time() - started) * 1000),
+        }
+        self.console_log(f"[TrackStatsRefresher] 배치 완료: {self._last_run_stats}")
+        return self._last_run_stats
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            pending_requests = len(self._requested)
+            recent_views = len(self._recent_views)
+        return {
+            "running": self.running,
+            "is_leader": self.is_leader,
+            "owner": self.owner if self.store is not None else None,
+            "interval_seconds": self.interval_seconds,
+            "batch_size": self.batch_size,
+            "api_budget_per_hour": self.api_budget_per_hour,
+            "budget_remaining": self._budget_remaining(),
+            "pending_requests": pending_requests,
+            "recent_views": recent_views,
+            "last_run_at": self._last_run_at,
+            "last_run": self._last_run_stats,
+        }
+
+
+# 전역 refresher 인스턴스
+_global_refresher = None
+
+
+def get_track_stats_refresher(
+    client_factory: Callable[[], Any] = None,
+    console_log=None,
+    on_tracks_updated: Callable[[List[str]], None] = None,
+) -> Optional[TrackStatsRefresher]:
+    """전역 refresher 인스턴스 반환 (최초 호출 시 client_factory 필요)"""
+    global _global_refresher
+    if _global_refresher is None and client_factory is not None:
+        _global_refresher = TrackStatsRefresher(
+            client_factory=client_factory,
+            on_tracks_updated=on_tracks_updated,
+            console_log=console_log,
+            lease_path=app_settings.TRACK_STATS_REFRESHER_LEASE_DB or None,
+            lease_seconds=app_settings.TRACK_STATS_REFRESHER_LEASE_SECONDS or None,
+        )
+    return _global_refresher
+
+
+def start_track_stats_refresher(
+    client_factory: Callable[[], Any],
+    console_log=None,
+    on_tracks_updated: Callable[[List[str]], None] = None,
+) -> TrackStatsRefresher:
+    """전역 refresher 시작"""
+    refresher = get_track_stats_refresher(
+        client_factory=client_factory,
+        console_log=console_log,
+        on_tracks_updated=on_tracks_updated,
+    )
+    refresher.start()
+    return refresher
@@ -7,7 +7,7 @@ normalized payloads that can be stored in tracks.metadata.stats.
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import yt_dlp
 
@@ -40,39 +40,15 @@ class TrackStatsService:
 
         if self.extractor.youtube and source_id:
             try:
-                request = self.extractor.youtube.videos().list(
-                    part="snippet,contentDetails,statistics",
-                    id=source_id,
-                )
-                response = request.execute()
-                items = response.get("items", [])
-                if items:
-                    video = items[0]
-                    snippet = video.get("snippet", {})
-                    content_details = video.get("contentDetails", {})
-                    statistics = video.get("statistics", {})
-
-                    return {
-                        "success": True,
-                        "provider": "youtube_api",
-                        "source_id": source_id,
-                        "stats": {
-                            "views": self._safe_int(statistics.get("viewCount")),
-                            "likes": self._safe_int(statistics.get("likeCount")),
-                            "comments": self._safe_int(statistics.get("commentCount")),
-                        },
-                        "provider_fields": {
-                            "title": snippet.get("title"),
-                            "uploader": snippet.get("channelTitle"),
-                            "duration_seconds": self.extractor._parse_duration(
-                                content_details.get("duration", "PT0S")
-                            ),
-                            "thumbnail_url": self._best_thumbnail(snippet.get("thumbnails", {})),
-                        },
-                    }
+                video = self.extractor.youtube.get_video(source_id)
+                if video:
+                    return self._youtube_result_from_item(source_id, video)
             except Exception as exc:
                 self.console_log(f"[TrackStats] YouTube API sync failed, fallback to yt-dlp: {exc}")
 
+        return self._fetch_youtube_stats_ytdlp(url, source_id)
+
+    def _fetch_youtube_stats_ytdlp(self, url: str, source_id: Optional[str]) -> Dict[str, Any]:
         info = self._extract_info(url)
         if not info.get("success"):
             return info
@@ -89,6 +65,117 @@ class TrackStatsService:
             "provider_fields": self._provider_fields_from_info(info),
         }
 
+    def _youtube_result_from_item(self, source_id: str, video: Dict[str, Any]) -> Dict[str, Any]:
+        snippet = video.get("snippet", {})
+        content_details = video.get("contentDetails", {})
+        statistics = video.get("statistics", {})
+
+        return {
+            "success": True,
+            "provider": "youtube_api",
+            "source_id": source_id,
+            "stats": {
+                "views": self._safe_int(statistics.get("viewCount")),
+                "likes": self._safe_int(statistics.get("likeCount")),
+                "comments": self._safe_int(statistics.get("commentCount")),
+            },
+            "provider_fields": {
+                "title": snippet.get("title"),
+                "uploader": snippet.get("channelTitle"),
+                "duration_seconds": self.extractor._parse_duration(
+                    content_details.get("duration", "PT0S")
+                ),
+                "thumbnail_url": self._best_thumbnail(snippet.get("thumbnails", {})),
+            },
+        }
+
+    def fetch_stats_batch(self, tracks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch stats for many tracks at once.
+
+        YouTube tracks with a known video ID share batched videos.list calls
+        (50 IDs per quota unit); everything else falls back to per-track
+        fetches. Returns results keyed by track ID.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        youtube_ids: Dict[str, str] = {}
+
+        for track in tracks:
+            track_id = str(track.get("id"))
+            source = (track.get("source") or "").strip().lower()
+            if source == "youtube" and self.extractor.youtube:
+                url = (track.get("url") or "").strip()
+                source_id = (track.get("source_id") or "").strip() or self.extractor.extract_video_id(url)
+                if source_id:
+                    youtube_ids[track_id] = source_id
+                    continue
+            results[track_id] = self.fetch_stats(track)
+
+        if youtube_ids:
+            try:
+                items = self.extractor.youtube.get_videos(youtube_ids.values())
+            except Exception as exc:
+                self.console_log(f"[TrackStats] YouTube batch sync failed, fallback to yt-dlp: {exc}")
+                items = {}
+
+            tracks_by_id = {str(track.get("id")): track for track in tracks}
+            for track_id, source_id in youtube_ids.items():
+                video = items.get(source_id)
+                if video:
+                    results[track_id] = self._youtube_result_from_item(source_id, video)
+                else:
+                    url = (tracks_by_id[track_id].get("url") or "").strip()
+                    results[track_id] = self._fetch_youtube_stats_ytdlp(url, source_id)
+
+        return results
+
+    @staticmethod
+    def estimate_api_cost(tracks: List[Dict[str, Any]]) -> int:
+        """Approximate external calls needed for fetch_stats_batch (YouTube: 1 per 50)."""
+        youtube_count = sum(1 for track in tracks if (track.get("source") or "").strip().lower() == "youtube")
+        return -(-youtube_count // 50) + (len(tracks) - youtube_count)
+
+    @staticmethod
+    def build_track_update(
+        track: Dict[str, Any],
+        result: Dict[str, Any],
+        synced_at: str,
+        comment_count: Optional[int] = None,
+        title_max_len: int = 200,
+    ) -> Dict[str, Any]:
+        """Merge a successful fetch result into a tracks row update payload."""
+        metadata = track.get("metadata") if isinstance(track.get("metadata"), dict) else {}
+        metadata = dict(metadata)
+        provider = metadata.get("provider") if isinstance(metadata.get("provider"), dict) else {}
+        provider = dict(provider)
+        provider_fields = result.get("provider_fields") if isinstance(result.get("provider_fields"), dict) else {}
+
+        for key in ("title", "uploader", "duration_seconds", "thumbnail_url"):
+            if provider_fields.get(key) is not None:
+                provider[key] = provider_fields.get(key)
+        metadata["provider"] = provider
+
+        synced_stats = dict(result.get("stats") or {})
+        if comment_count is not None:
+            synced_stats["comment_count"] = comment_count
+        synced_stats["last_synced_at"] = synced_at
+        metadata["stats"] = synced_stats
+
+        update_data = {"metadata": metadata}
+
+        if result.get("source_id") and not track.get("source_id"):
+            update_data["source_id"] = result.get("source_id")
+        if provider_fields.get("thumbnail_url") and not track.get("thumbnail_url"):
+            update_data["thumbnail_url"] = provider_fields.get("thumbnail_url")
+        if provider_fields.get("duration_seconds") and not track.get("duration_seconds"):
+            update_data["duration_seconds"] = provider_fields.get("duration_seconds")
+        if provider_fields.get("uploader") and not track.get("artist"):
+            update_data["artist"] = provider_fields.get("uploader")
+        if provider_fields.get("title") and not track.get("title"):
+            update_data["title"] = provider_fields.get("title")[:title_max_len]
+
+        return update_data
+
     def _fetch_soundcloud_stats(self, track: Dict[str, Any]) -> Dict[str, Any]:
         url = (track.get("url") or "").strip()
         info = self._extract_info(url)
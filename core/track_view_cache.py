@@ -0,0 +1,195 @@
+"""
+Per-track cache for the track detail page.
+
+Caches the pieces `/track/<id>` needs (track row, latest comments, comment
+count and worldcup battle stats) keyed by track ID, each with its own short
+TTL. Missing pieces are fetched concurrently, concurrent misses for the same
+piece share one fetch, and writers invalidate pieces explicitly when
+comments, battles, stats syncs or track edits happen. Invalidation is
+process-local; the TTLs bound staleness across gunicorn workers.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from utils import app_settings
+
+
+COMMENTS_LIMIT = 50
+
+PART_TRACK = "track"
+PART_COMMENTS = "comments"
+PART_COMMENT_COUNT = "comment_count"
+PART_BATTLE_STATS = "battle_stats"
+ALL_PARTS = (PART_TRACK, PART_COMMENTS, PART_COMMENT_COUNT, PART_BATTLE_STATS)
+
+_MISSING = object()
+
+
+class TrackViewCache:
+    """TTL cache of track detail data with explicit invalidation."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        track_ttl_seconds: int = None,
+        activity_ttl_seconds: int = None,
+        max_tracks: int = None,
+        max_workers: int = 4,
+        console_log=None,
+    ):
+        self.console_log = console_log or print
+        self.client_factory = client_factory
+        track_ttl = track_ttl_seconds or app_settings.TRACK_VIEW_CACHE_TRACK_TTL_SECONDS
+        activity_ttl = activity_ttl_seconds or app_settings.TRACK_VIEW_CACHE_ACTIVITY_TTL_SECONDS
+        self.ttls = {
+            PART_TRACK: track_ttl,
+            PART_COMMENTS: activity_ttl,
+            PART_COMMENT_COUNT: activity_ttl,
+            PART_BATTLE_STATS: activity_ttl,
+        }
+        self.max_tracks = max_tracks or app_settings.TRACK_VIEW_CACHE_MAX_TRACKS
+
+        self._lock = threading.Lock()
+        # track_id -> {part: (expires_at, value)}, LRU 순서
+        self._entries: "OrderedDict[str, Dict[str, tuple]]" = OrderedDict()
+        # (track_id, part) -> 진행 중인 조회 Future (같은 조각 동시 미스는 한 번만 조회)
+        self._inflight: Dict[tuple, Future] = {}
+        # 무효화 세대: 조회 중에 무효화되면 그 결과는 캐시에 넣지 않음
+        # (진행 중인 조회가 있는 곡만 기록, 마지막 조회가 끝나면 삭제)
+        self._generation: Dict[str, int] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="track-view")
+
+        self._hits = 0
+        self._misses = 0
+
+    # =========================
+    # Reads
+    # =========================
+    def get_view(self, track_id: str) -> Optional[Dict[str, Any]]:
+        """
+        상세 페이지용 데이터 반환 (없는 조각만 동시에 조회)
+
+        Returns:
+            {track, comments, comment_count, battle_stats} 또는 곡이 없으면 None
+        """
+        track_id = str(track_id)
+        futures = {part: self._get_or_fetch(track_id, part) for part in ALL_PARTS}
+        view = {part: (future.result() if isinstance(future, Future) else future) for part, future in futures.items()}
+        if not view[PART_TRACK]:
+            self.invalidate(track_id)
+            return None
+        return view
+
+    def _get_or_fetch(self, track_id: str, part: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(track_id)
+            if entry is not None:
+                cached = entry.get(part)
+                if cached is not None and cached[0] > now:
+                    self._entries.move_to_end(track_id)
+                    self._hits += 1
+                    return cached[1]
+
+            self._misses += 1
+            key = (track_id, part)
+            future = self._inflight.get(key)
+            if future is None:
+                generation = self._generation.get(track_id, 0)
+                future = self._executor.submit(self._fetch_and_store, track_id, part, generation)
+                self._inflight[key] = future
+            return future
+
+    def _fetch_and_store(self, track_id: str, part: str, generation: int):
+        value = _MISSING
+        try:
+            value = self._fetch_part(self.client_factory(), track_id, part)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop((track_id, part), None)
+                if value is not _MISSING and value is not None and self._generation.get(track_id, 0) == generation:
+                    entry = self._entries.setdefault(track_id, {})
+                    entry[part] = (time.time() + self.ttls[part], value)
+                    self._entries.move_to_end(track_id)
+                    while len(self._entries) > self.max_tracks:
+                        self._entries.popitem(last=False)
+                if not self._has_inflight(track_id):
+                    self._generation.pop(track_id, None)
+
+    def _has_inflight(self, track_id: str) -> bool:
+        return any((track_id, part) in self._inflight for part in ALL_PARTS)
+
+    def _fetch_part(self, supabase, track_id: str, part: str):
+        if part == PART_TRACK:
+            return supabase.get_track(track_id)
+        if part == PART_COMMENTS:
+            return supabase.get_track_comments(track_id, limit=COMMENTS_LIMIT, offset=0)
+        if part == PART_COMMENT_COUNT:
+            return supabase.get_track_comment_count(track_id)
+        if part == PART_BATTLE_STATS:
+            return supabase.get_track_battle_stats(track_id)
+        raise ValueError(f"unknown part: {part}")
+
+    # =========================
+    # Invalidation
+    # =========================
+    def invalidate(self, track_id: str, parts: Iterable[str] = None) -> None:
+        """곡의 캐시 조각 무효화 (parts가 없으면 전체)"""
+        track_id = str(track_id)
+        with self._lock:
+            if self._has_inflight(track_id):
+                self._generation[track_id] = self._generation.get(track_id, 0) + 1
+            entry = self._entries.get(track_id)
+            if entry is None:
+                return
+            if parts is None:
+                self._entries.pop(track_id, None)
+                return
+            for part in parts:
+                entry.pop(part, None)
+
+    def invalidate_comments(self, track_id: str) -> None:
+        self.invalidate(track_id, parts=(PART_COMMENTS, PART_COMMENT_COUNT))
+
+    def invalidate_battle(self, *track_ids: str) -> None:
+        for track_id in track_ids:
+            if track_id:
+                self.invalidate(track_id, parts=(PART_BATTLE_STATS,))
+
+    def invalidate_tracks(self, track_ids: Iterable[str]) -> None:
+        """곡 행이 바뀐 경우 (수정, 지표 동기화 등)"""
+        for track_id in track_ids:
+            if track_id:
+                self.invalidate(track_id, parts=(PART_TRACK,))
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "tracks": len(self._entries),
+                "max_tracks": self.max_tracks,
+                "ttls": dict(self.ttls),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+                "inflight": len(self._inflight),
+            }
+
+
+# 전역 캐시 인스턴스
+_global_track_view_cache = None
+
+
+def get_track_view_cache(client_factory: Callable[[], Any] = None, console_log=None) -> Optional[TrackViewCache]:
+    """전역 캐시 반환 (최초 호출 시 client_factory 필요)"""
+    global _global_track_view_cache
+    if _global_track_view_cache is None and client_factory is not None:
+        _global_track_view_cache = TrackViewCache(client_factory=client_factory, console_log=console_log)
+    return _global_track_view_cache
@@ -0,0 +1,349 @@
+"""
+Batched, bounded writer for visitor_logs rows.
+
+Request hooks only enqueue a row into a bounded in-process queue. A single
+flusher thread batch-inserts rows every N records or T milliseconds. When the
+queue runs hot, rows are sampled and, once full, dropped, with counters for
+both. Batches that cannot be written because Supabase is unreachable are
+spilled to a local JSONL file and replayed after writes succeed again.
+Workers share the spill file: appends and the hand-off to the replay file
+happen under an advisory file lock, and only the process holding the replay
+lock replays, starting with any replay file a crashed worker left behind.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from utils import app_settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# 큐가 이 비율 이상 차면 샘플링 시작
+SAMPLING_HIGH_WATERMARK = 0.8
+# 스필 파일 재전송 사이 최소 간격
+REPLAY_INTERVAL_SECONDS = 30
+FIELD_MAX_LEN = 500
+
+
+class VisitorLogWriter:
+    """Queue visitor rows in memory and insert them in batches."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        max_queue: int = None,
+        batch_size: int = None,
+        flush_interval_ms: int = None,
+        sample_rate_when_busy: float = None,
+        spill_path: str = None,
+        spill_max_bytes: int = None,
+        console_log=None,
+    ):
+        self.console_log = console_log or print
+        self.client_factory = client_factory
+        self.max_queue = max_queue or app_settings.VISITOR_LOG_QUEUE_SIZE
+        self.batch_size = batch_size or app_settings.VISITOR_LOG_BATCH_SIZE
+        self.flush_interval = (flush_interval_ms or app_settings.VISITOR_LOG_FLUSH_INTERVAL_MS) / 1000.0
+        self.sample_rate_when_busy = (
+            sample_rate_when_busy if sample_rate_when_busy is not None else app_settings.VISITOR_LOG_BUSY_SAMPLE_RATE
+        )
+        self.spill_path = spill_path or app_settings.VISITOR_LOG_SPILL_PATH
+        self.spill_max_bytes = spill_max_bytes or app_settings.VISITOR_LOG_SPILL_MAX_BYTES
+        self.replay_path = self.spill_path + ".replay"
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=self.max_queue)
+        self._high_watermark = max(1, int(self.max_queue * SAMPLING_HIGH_WATERMARK))
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._last_replay_at = 0.0
+        self.running = False
+
+        self._counters = {
+            "enqueued": 0,
+            "written": 0,
+            "sampled_out": 0,
+            "dropped_full": 0,
+            "spilled": 0,
+            "spill_dropped": 0,
+            "replayed": 0,
+            "failed_batches": 0,
+        }
+
+    # =========================
+    # Request path
+    # =========================
+    def record(self, ip_address: str, user_agent: str, page_url: str, referer: str = None) -> bool:
+        """방문 1건을 큐에 넣음 (요청 스레드에서 호출, 절대 블로킹하지 않음)"""
+        if self._queue.qsize() >= self._high_watermark and random.random() >= self.sample_rate_when_busy:
+            self._incr("sampled_out")
+            return False
+
+        row = {
+            "ip_address": ip_address,
+            "user_agent": user_agent[:FIELD_MAX_LEN] if user_agent else None,
+            "page_url": page_url[:FIELD_MAX_LEN] if page_url else None,
+            "referer": referer[:FIELD_MAX_LEN] if referer else None,
+            "visited_at": datetime.now().isoformat(),
+        }
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._incr("dropped_full")
+            return False
+        self._incr("enqueued")
+        return True
+
+    def _incr(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[key] += amount
+
+    # =========================
+    # Lifecycle
+    # =========================
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_loop, name="visitor-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        self.console_log(
+            f"[VisitorLog] 시작 (queue={self.max_queue}, batch={self.batch_size}, "
+            f"interval={int(self.flush_interval * 1000)}ms)"
+        )
+
+    def stop(self) -> None:
+        """남은 큐를 마지막으로 비우고 종료"""
+        if not self.running:
+            return
+        self.running = False
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+
+    def _run_loop(self) -> None:
+        while not self._stop_event.is_set():
+            batch = self._collect_batch()
+            if batch:
+                self._write(batch)
+            elif self._spill_pending():
+                self._replay_spill()
+
+        # 종료 시 남은 행 처리 (실패분은 스필 파일로)
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                break
+            self._write(batch)
+
+    def _collect_batch(self) -> List[Dict[str, Any]]:
+        """batch_size개가 모이거나 flush_interval이 지날 때까지 모음"""
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stop_event.is_set():
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    # =========================
+    # Writes
+    # =========================
+    def _insert(self, rows: List[Dict[str, Any]]) -> Optional[bool]:
+        """
+        Supabase에 일괄 insert
+
+        Returns:
+            True 성공, False 실패(재시도 대상), None 로깅 비활성화(버림)
+        """
+        supabase = self.client_factory()
+        if getattr(supabase, "visitor_logging_disabled", False):
+            return None
+        ok = supabase.insert_visitor_logs(rows)
+        if not ok and getattr(supabase, "visitor_logging_disabled", False):
+            return None
+        return ok
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            result = self._insert(batch)
+        except Exception as exc:
+            self.console_log(f"[VisitorLog] 배치 저장 오류: {exc}")
+            result = False
+
+        if result is None:
+            return
+        if result:
+            self._incr("written", len(batch))
+            if self._spill_pending():
+                self._replay_spill()
+            return
+
+        self._incr("failed_batches")
+        self._spill(batch)
+
+    # =========================
+    # Spill / replay
+    # =========================
+    def _spill_pending(self) -> bool:
+        # 시작 직후(_last_replay_at=0)에는 이전 프로세스가 남긴 .replay 파일도 바로 재전송
+        if time.time() - self._last_replay_at < REPLAY_INTERVAL_SECONDS:
+            return False
+        return os.path.exists(self.spill_path) or os.path.exists(self.replay_path)
+
+    @contextmanager
+    def _file_lock(self, suffix: str, blocking: bool = True):
+        """워커 간 advisory lock (blocking=False면 다른 프로세스가 잡고 있을 때 False)"""
+        os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+        with open(self.spill_path + suffix, "a") as lock_handle:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+                except BlockingIOError:
+                    yield False
+                    return
+            try:
+                yield True
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+    def _spill(self, rows: List[Dict[str, Any]]) -> None:
+        """Supabase에 쓰지 못한 행을 로컬 파일에 보관"""
+        with self._spill_lock:
+            try:
+                with self._file_lock(".lock"):
+                    size = os.path.getsize(self.spill_path) if os.path.exists(self.spill_path) else 0
+                    if size >= self.spill_max_bytes:
+                        self._incr("spill_dropped", len(rows))
+                        return
+                    with open(self.spill_path, "a", encoding="utf-8") as handle:
+                        for row in rows:
+                            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+                self._incr("spilled", len(rows))
+            except OSError as exc:
+                self._incr("spill_dropped", len(rows))
+                self.console_log(f"[VisitorLog] 스필 파일 기록 실패: {exc}")
+
+    def _replay_spill(self) -> None:
+        """스필 파일을 배치 단위로 재전송 (한 번에 한 프로세스만, 실패한 나머지는 다시 스필)"""
+        self._last_replay_at = time.time()
+        try:
+            with self._file_lock(".replay.lock", blocking=False) as acquired:
+                if acquired:
+                    self._replay_claimed()
+        except OSError as exc:
+            self.console_log(f"[VisitorLog] 스필 재전송 lock 실패: {exc}")
+
+    def _replay_claimed(self) -> None:
+        """replay lock을 잡은 상태에서 .replay 파일(없으면 현재 스필 파일을 넘겨받아) 재전송"""
+        replay_path = self.replay_path
+        with self._spill_lock:
+            try:
+                with self._file_lock(".lock"):
+                    # 중단된 재전송이 남긴 .replay가 있으면 그것부터 처리
+                    if not os.path.exists(replay_path):
+                        if not os.path.exists(self.spill_path):
+                            return
+                        os.replace(self.spill_path, replay_path)
+            except OSError:
+                return
+
+        rows: List[Dict[str, Any]] = []
+        try:
+            with open(replay_path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rows.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError as exc:
+            self.console_log(f"[VisitorLog] 스필 파일 읽기 실패: {exc}")
+            return
+
+        replayed = 0
+        for start in range(0, len(rows), self.batch_size):
+            chunk = rows[start:start + self.batch_size]
+            try:
+                result = self._insert(chunk)
+            except Exception:
+                result = False
+            if result is None:
+                break
+            if not result:
+                self._spill(rows[start:])
+                break
+            replayed += len(chunk)
+
+        try:
+            os.remove(replay_path)
+        except OSError:
+            pass
+        if replayed:
+            self._incr("replayed", replayed)
+            self.console_log(f"[VisitorLog] 스필 파일 {replayed}건 재전송 완료")
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "running": self.running,
+            "queue_size": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "batch_size": self.batch_size,
+            "flush_interval_ms": int(self.flush_interval * 1000),
+            "spill_pending": os.path.exists(self.spill_path) or os.path.exists(self.replay_path),
+            **counters,
+        }
+
+
+# 전역 writer 인스턴스
+_global_visitor_log_writer = None
+
+
+def get_visitor_log_writer(client_factory: Callable[[], Any] = None, console_log=None) -> Optional[VisitorLogWriter]:
+    """전역 writer 반환 (최초 호출 시 client_factory 필요)"""
+    global _global_visitor_log_writer
+    if _global_visitor_log_writer is None and client_factory is not None:
+        _global_visitor_log_writer = VisitorLogWriter(client_factory=client_factory, console_log=console_log)
+    return _global_visitor_log_writer
+
+
+def start_visitor_log_writer(client_factory: Callable[[], Any], console_log=None) -> VisitorLogWriter:
+    """전역 writer 시작"""
+    writer = get_visitor_log_writer(client_factory=client_factory, console_log=console_log)
+    writer.start()
+    return writer
@@ -10,7 +10,7 @@ import tempfile
 import subprocess
 import re
 from datetime import datetime
-from googleapiclient.discovery import build
+from connectors.youtube_data_api import get_youtube_client
 from core.utils import generate_safe_filename, validate_audio_file, get_file_size_mb
 
 class LinkExtractor:
@@ -26,9 +26,8 @@ class LinkExtractor:
         
         if self.youtube_api_key:
             try:
-                self.console_log("[Extract] YouTube Data API v3 클라이언트 초기화 중...")
-                self.youtube = build('youtube', 'v3', developerKey=self.youtube_api_key)
-                self.console_log("[Extract] YouTube Data API v3 클라이언트 초기화 성공")
+                # 프로세스 공유 클라이언트 재사용 (요청마다 discovery 문서를 다시 만들지 않음)
+                self.youtube = get_youtube_client(self.youtube_api_key, console_log=self.console_log)
             except Exception as e:
                 self.console_log(f"[Extract] YouTube API 초기화 실패: {str(e)}")
                 self.youtube = None
@@ -326,19 +325,12 @@ class LinkExtractor:
             
             # YouTube Data API 호출
             self.console_log("[Extract] YouTube Data API 호출 중...")
-            request = self.youtube.videos().list(
-                part='snippet,contentDetails,statistics',
-                id=video_id
-            )
+            video = self.youtube.get_video(video_id)
             
-            response = request.execute()
-            self.console_log(f"[Extract] API 응답 수신, 아이템 수: {len(response.get('items', []))}")
-            
-            if not response.get('items'):
+            if not video:
                 self.console_log("[Extract] API 응답에서 비디오를 찾을 수 없음")
                 return {'success': False, 'error': '비디오를 찾을 수 없습니다'}
             
-            video = response['items'][0]
             snippet = video['snippet']
             content_details = video['contentDetails']
             statistics = video['statistics']
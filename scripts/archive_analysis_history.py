@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+분석 이력 보관(archive) + 증분 VACUUM
+
+music_analysis.db에서 오래된 분석 세션(댓글/태그/점수 포함)을 압축 보관 DB로 옮기고
+원본에서 삭제한 뒤 빈 페이지를 반환합니다. 보관된 세션은 DatabaseManager.get_archived_session으로
+다시 읽을 수 있습니다. 서버에서는 ANALYSIS_RETENTION_DAYS > 0이면 같은 작업이 주기적으로 실행됩니다.
+
+사용법:
+    python scripts/archive_analysis_history.py --days 365 --dry-run
+    python scripts/archive_analysis_history.py --days 365
+    python scripts/archive_analysis_history.py --vacuum-only
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.database import DatabaseManager
+from utils import app_settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old analysis sessions and vacuum music_analysis.db")
+    parser.add_argument("--db", default=str(project_root / "music_analysis.db"), help="DB 경로 (기본: 프로젝트 루트 music_analysis.db)")
+    parser.add_argument("--days", type=int, default=app_settings.ANALYSIS_RETENTION_DAYS,
+                        help="이 일수보다 오래된 분석을 보관 (기본: ANALYSIS_RETENTION_DAYS)")
+    parser.add_argument("--archive", default=app_settings.ANALYSIS_ARCHIVE_PATH, help="보관 DB 경로 (기본: ANALYSIS_ARCHIVE_PATH)")
+    parser.add_argument("--batch-size", type=int, default=app_settings.ANALYSIS_RETENTION_BATCH_SIZE, help="한 번에 옮길 세션 수")
+    parser.add_argument("--dry-run", action="store_true", help="대상 수만 출력")
+    parser.add_argument("--vacuum-only", action="store_true", help="보관 없이 증분 VACUUM만 실행")
+    args = parser.parse_args()
+
+    db = DatabaseManager(db_path=args.db)
+    size_before = os.path.getsize(args.db)
+
+    if args.vacuum_only:
+        report = {"vacuum": db.incremental_vacuum()}
+    else:
+        if args.days <= 0:
+            print("[ERROR] --days(또는 ANALYSIS_RETENTION_DAYS)는 1 이상이어야 합니다")
+            sys.exit(1)
+        report = db.archive_old_sessions(args.days, archive_path=args.archive,
+                                         batch_size=args.batch_size, dry_run=args.dry_run)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"DB 크기: {size_before / 1024 / 1024:.1f}MB -> {os.path.getsize(args.db) / 1024 / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
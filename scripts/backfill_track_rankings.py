@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+이상형 월드컵 랭킹 백필
+
+track_rankings 테이블을 기존 track_battles 전체로 다시 계산합니다.
+(마이그레이션 20261019001000_create_track_rankings.sql 적용 직후 1회 실행)
+이후 투표는 DB 트리거가 실시간으로 반영하므로 다시 실행할 필요는 없습니다.
+
+rebuild_track_rankings 함수는 service_role 키로만 호출할 수 있습니다.
+
+사용법:
+    SUPABASE_SERVICE_ROLE_KEY=... python scripts/backfill_track_rankings.py
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from utils.supabase_client import SupabaseClient
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild track_rankings from track_battles")
+    parser.add_argument("--url", default=os.getenv("SUPABASE_URL"), help="Supabase URL (기본: SUPABASE_URL)")
+    parser.add_argument(
+        "--key",
+        default=os.getenv("SUPABASE_SERVICE_ROLE_KEY"),
+        help="service_role 키 (기본: SUPABASE_SERVICE_ROLE_KEY)",
+    )
+    args = parser.parse_args()
+
+    if not args.key:
+        print("[ERROR] service_role 키가 필요합니다 (--key 또는 SUPABASE_SERVICE_ROLE_KEY)")
+        sys.exit(1)
+
+    client = SupabaseClient(url=args.url, key=args.key, pooled=False)
+
+    started = time.time()
+    applied = client.rebuild_track_rankings()
+    if applied is None:
+        sys.exit(1)
+
+    print(f"[OK] track_rankings 재계산 완료: 배틀 {applied}건 반영 ({time.time() - started:.1f}s)")
+    top = client.get_worldcup_rankings(limit=5)
+    for ranking in top:
+        print(f"  #{ranking['rank']} {ranking['title']} - {ranking['artist']} (wins={ranking['wins']}, elo={ranking['elo_rating']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+분석 이력 DB(music_analysis.db) 동시성 벤치마크
+
+분석 작업 스레드(save_analysis_result)와 이력 조회(get_analysis_history / get_session_details)를
+동시에 실행해, 호출마다 새 연결을 여는 기존 방식(pooled=False, rollback journal)과
+스레드별 WAL 연결 + 단일 writer 큐(pooled=True)를 비교합니다.
+각 방식은 임시 디렉토리의 새 DB 파일에서 실행되므로 실제 music_analysis.db는 건드리지 않습니다.
+
+사용법:
+    python scripts/bench_analysis_db.py
+    python scripts/bench_analysis_db.py --readers 8 --writers 4 --seconds 10 --comments 500
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.database import DatabaseManager
+
+
+def make_result(rng: random.Random, comments: int) -> dict:
+    """music_analyzer 분석 결과와 같은 형태의 가짜 결과"""
+    video_id = f"{rng.getrandbits(40):011x}"
+    return {
+        "video_info": {
+            "video_id": video_id,
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "title": f"Bench Song {video_id}",
+            "channel": "Bench Channel",
+            "duration": rng.randint(120, 400),
+            "view_count": rng.randint(0, 10_000_000),
+            "like_count": rng.randint(0, 100_000),
+            "thumbnail": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+            "published_at": "2026-01-01T00:00:00Z",
+        },
+        "music_analysis": {
+            "artist": rng.choice(["IU", "NewJeans", "BTS", "AKMU", "Zion.T"]),
+            "song": f"Song {video_id}",
+            "genre": {"primary_genre": rng.choice(["pop", "ballad", "hiphop", "rock"]),
+                      "genre_scores": {"pop": rng.randint(0, 10), "ballad": rng.randint(0, 10)}},
+            "mood": {"primary_mood": rng.choice(["happy", "sad", "calm"]),
+                     "mood_scores": {"happy": rng.randint(0, 10), "sad": rng.randint(0, 10)}},
+            "estimated_bpm": rng.randint(70, 160),
+            "estimated_key": "C",
+            "energy_level": "medium",
+            "tags": ["kpop", "bench", video_id],
+        },
+        "comments_data": {
+            "sentiment_analysis": {"average_sentiment": 0.1},
+            "comments": [
+                {"author": f"user{i}", "text": f"comment {i} on {video_id}", "like_count": rng.randint(0, 500),
+                 "published_at": "2026-01-01T00:00:00Z"}
+                for i in range(comments)
+            ],
+        },
+    }
+
+
+def run_case(pooled: bool, args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench_analysis_db_")
+    db = DatabaseManager(db_path=os.path.join(workdir, "music_analysis.db"), console_log=lambda msg: None, pooled=pooled)
+    # 조회 대상이 있도록 미리 채움
+    seed_rng = random.Random(0)
+    session_ids = [db.save_analysis_result(make_result(seed_rng, args.comments)) for _ in range(20)]
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    read_ms, write_ms, errors = [], [], []
+
+    def reader(seed: int):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                if rng.random() < 0.5:
+                    db.get_analysis_history(50)
+                else:
+                    db.get_session_details(rng.choice(session_ids))
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    read_ms.append(elapsed)
+            except Exception as exc:
+                with lock:
+                    errors.append(f"read: {exc}")
+
+    def writer(seed: int):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            result = make_result(rng, args.comments)
+            started = time.perf_counter()
+            try:
+                session_id = db.save_analysis_result(result)
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    write_ms.append(elapsed)
+                    session_ids.append(session_id)
+            except Exception as exc:
+                with lock:
+                    errors.append(f"write: {exc}")
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(100 + i,)) for i in range(args.writers)]
+    # 기존 방식은 DatabaseManager가 예외를 로그만 남기고 빈 결과를 반환하므로 실패를 세기 위해 로그를 가로챔
+    db.console_log = lambda msg: errors.append(msg) if "오류" in msg else None
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {"reads": read_ms, "writes": write_ms, "errors": errors, "pool": db.get_pool_status()}
+
+
+def summarize(label: str, timings: list, seconds: float) -> str:
+    if not timings:
+        return f"{label:<7} n=0"
+    ordered = sorted(timings)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return (
+        f"{label:<7} n={len(timings):6d} ({len(timings) / seconds:7.1f}/s)  "
+        f"median={statistics.median(timings):7.2f}ms  p95={p95:8.2f}ms  max={ordered[-1]:8.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="music_analysis.db mixed reader/writer benchmark")
+    parser.add_argument("--readers", type=int, default=8, help="조회 스레드 수 (기본 8)")
+    parser.add_argument("--writers", type=int, default=4, help="저장 스레드 수 (기본 4)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="방식별 실행 시간 (기본 5초)")
+    parser.add_argument("--comments", type=int, default=200, help="분석 1건당 댓글 수 (기본 200)")
+    args = parser.parse_args()
+
+    print(f"=== music_analysis.db 동시성 벤치마크 (readers={args.readers}, writers={args.writers}, "
+          f"comments={args.comments}, {args.seconds:.0f}s) ===")
+    for label, pooled in (("before (per-call connection)", False), ("after (WAL pool + writer queue)", True)):
+        result = run_case(pooled, args)
+        print(label)
+        print("  " + summarize("read", result["reads"], args.seconds))
+        print("  " + summarize("write", result["writes"], args.seconds))
+        locked = sum(1 for e in result["errors"] if "locked" in e)
+        print(f"  errors={len(result['errors'])} (database is locked: {locked})")
+        if result["pool"]:
+            print(f"  writer: {result['pool']}")
+
+
+if __name__ == "__main__":
+    main()
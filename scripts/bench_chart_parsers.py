@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+차트 페이지 파서 벤치마크 / 회귀 검사
+
+data/chart_fixtures에 저장된 차트 페이지를 설치된 파서 백엔드(bs4, lxml, selectolax)로
+반복 파싱해 서비스별 소요 시간을 비교하고, 모든 백엔드의 결과가
+저장된 기대 결과(data/chart_fixtures/expected/*.json)와 같은지 확인합니다.
+결과가 다르면 종료 코드 1로 끝나므로 파서 수정 후 오프라인으로 회귀를 잡을 수 있습니다.
+
+사용법:
+    python scripts/bench_chart_parsers.py                       # 벤치마크 + 회귀 검사
+    python scripts/bench_chart_parsers.py --repeat 50 --parsers lxml selectolax
+    python scripts/bench_chart_parsers.py --update-expected     # bs4 결과로 기대 결과 갱신
+    python scripts/bench_chart_parsers.py --capture             # 실제 차트 페이지를 fixture로 저장
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from connectors.chart_parsers import available_parsers, get_chart_parser
+
+FIXTURE_DIR = project_root / "data" / "chart_fixtures"
+EXPECTED_DIR = FIXTURE_DIR / "expected"
+
+# 서비스: (fixture 파일, 파서 메서드, 차트 타입, limit, 실제 수집 URL)
+HTML_FIXTURES = {
+    "melon": ("melon_realtime.html", "parse_melon_chart", "realtime", 100, "https://www.melon.com/chart/index.htm"),
+    "melon_genre": ("melon_genre_kpop.html", "parse_melon_genre", "genre_kpop", 50,
+                    "https://www.melon.com/genre/song_list.htm?gnr_code=GN0100"),
+    "bugs": ("bugs_realtime.html", "parse_bugs_chart", "realtime", 100, "https://music.bugs.co.kr/chart/track/realtime/total"),
+    "genie": ("genie_top200.html", "parse_genie_chart", "top200", 200, "https://www.genie.co.kr/chart/top200"),
+}
+# JSON API 응답 (파서 백엔드와 무관, 커넥터 메서드로 파싱)
+JSON_FIXTURES = {
+    "vibe": ("vibe_chart.json", "_parse_vibe_api_response"),
+    "flo": ("flo_chart.json", "_parse_flo_api_response"),
+}
+
+
+def parse_json_fixture(connector, service: str, data) -> list:
+    _, method = JSON_FIXTURES[service]
+    if service == "flo":
+        result = getattr(connector, method)(data, "chart", 100)
+    else:
+        result = getattr(connector, method)(data, "chart")
+    return result["tracks"]
+
+
+def time_call(fn, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def load_expected(service: str):
+    path = EXPECTED_DIR / f"{service}.json"
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_expected(service: str, tracks: list) -> None:
+    EXPECTED_DIR.mkdir(parents=True, exist_ok=True)
+    with open(EXPECTED_DIR / f"{service}.json", "w", encoding="utf-8") as f:
+        json.dump(tracks, f, ensure_ascii=False, indent=1)
+
+
+def capture_fixtures() -> None:
+    """실제 차트 페이지를 받아 fixture로 저장 (기대 결과는 --update-expected로 다시 생성)"""
+    from connectors.chart_fetcher import get_chart_fetcher
+
+    fetcher = get_chart_fetcher(lambda msg: None)
+
+    async def fetch_all(session):
+        import asyncio
+        services = list(HTML_FIXTURES)
+        results = await asyncio.gather(
+            *[fetcher.fetch(session, HTML_FIXTURES[service][4], service=service.split("_")[0]) for service in services]
+        )
+        return dict(zip(services, results))
+
+    for service, response in fetcher.run(fetch_all).items():
+        if response.ok:
+            (FIXTURE_DIR / HTML_FIXTURES[service][0]).write_text(response.text, encoding="utf-8")
+            print(f"[OK] {service}: {len(response.text):,} bytes 저장")
+        else:
+            print(f"[FAIL] {service}: {response.error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chart page parser benchmark and regression check")
+    parser.add_argument("--repeat", type=int, default=20, help="서비스/백엔드별 반복 횟수 (기본 20)")
+    parser.add_argument("--parsers", nargs="+", help=f"비교할 백엔드 (기본: 설치된 전부 - {', '.join(available_parsers())})")
+    parser.add_argument("--update-expected", action="store_true", help="bs4 결과로 기대 결과 파일을 다시 씀")
+    parser.add_argument("--capture", action="store_true", help="실제 차트 페이지를 받아 fixture로 저장 (네트워크 필요)")
+    args = parser.parse_args()
+
+    if args.capture:
+        capture_fixtures()
+        return
+
+    backends = args.parsers or available_parsers()
+    missing = [name for name in backends if name not in available_parsers()]
+    if missing:
+        print(f"[ERROR] 설치되지 않은 파서: {', '.join(missing)}")
+        sys.exit(2)
+
+    if args.update_expected:
+        reference = get_chart_parser("bs4")
+        for service, (filename, method, chart_type, limit, _) in HTML_FIXTURES.items():
+            html = (FIXTURE_DIR / filename).read_text(encoding="utf-8")
+            save_expected(service, getattr(reference, method)(html, chart_type, limit))
+        print(f"[OK] 기대 결과 갱신: {EXPECTED_DIR}")
+
+    print(f"=== 차트 파서 벤치마크 (repeat={args.repeat}, median ms) ===")
+    print(f"{'service':<12}" + "".join(f"{name:>12}" for name in backends) + "   rows")
+    failures = []
+
+    for service, (filename, method, chart_type, limit, _) in HTML_FIXTURES.items():
+        html = (FIXTURE_DIR / filename).read_text(encoding="utf-8")
+        expected = load_expected(service)
+        cells, rows = [], 0
+        for name in backends:
+            backend = get_chart_parser(name)
+            tracks = getattr(backend, method)(html, chart_type, limit)
+            rows = len(tracks or [])
+            if expected is not None and tracks != expected:
+                failures.append(f"{service}/{name}")
+            timings = time_call(lambda: getattr(backend, method)(html, chart_type, limit), args.repeat)
+            cells.append(f"{statistics.median(timings):12.2f}")
+        print(f"{service:<12}" + "".join(cells) + f"   {rows}")
+
+    # JSON API 응답은 백엔드와 무관하므로 한 열만 출력
+    try:
+        from connectors.korea_music_charts_connector import KoreaMusicChartsConnector
+        connector = KoreaMusicChartsConnector(console_log=lambda msg: None)
+    except ImportError as e:
+        connector = None
+        print(f"[SKIP] vibe/flo JSON: 커넥터 로드 실패 ({e})")
+
+    if connector is not None:
+        for service, (filename, _) in JSON_FIXTURES.items():
+            with open(FIXTURE_DIR / filename, encoding="utf-8") as f:
+                data = json.load(f)
+            tracks = parse_json_fixture(connector, service, data)
+            if args.update_expected:
+                save_expected(service, tracks)
+            expected = load_expected(service)
+            if expected is not None and tracks != expected:
+                failures.append(f"{service}/json")
+            timings = time_call(lambda: parse_json_fixture(connector, service, data), args.repeat)
+            print(f"{service + ' (json)':<12}{statistics.median(timings):12.2f}   {len(tracks)}")
+
+    if failures:
+        print(f"[FAIL] 기대 결과와 다른 파싱 결과: {', '.join(failures)}")
+        sys.exit(1)
+    print("[OK] 모든 백엔드 결과가 기대 결과와 일치합니다")
+
+
+if __name__ == "__main__":
+    main()
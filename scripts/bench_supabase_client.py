@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+SupabaseClient 요청당 오버헤드 마이크로 벤치마크
+
+라우트 한 번에 해당하는 "SupabaseClient() 생성 + 쿼리 1회"를 반복 실행해
+요청마다 create_client를 호출하던 방식(pooled=False)과 프로세스 공유 풀(pooled=True)을 비교합니다.
+
+사용법:
+    python scripts/bench_supabase_client.py                 # 생성 비용만 측정 (네트워크 불필요)
+    python scripts/bench_supabase_client.py --query -n 50   # 실제 쿼리 포함 (SUPABASE_URL/KEY 필요)
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from utils.supabase_client import SupabaseClient
+
+
+def run_case(pooled: bool, iterations: int, with_query: bool) -> list:
+    """한 가지 방식으로 iterations회 반복하고 회당 소요 시간(ms) 리스트 반환"""
+    SupabaseClient.reset_pool()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        client = SupabaseClient(pooled=pooled)
+        if with_query:
+            client.client.table("posts").select("id").limit(1).execute()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def summarize(label: str, timings: list) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{label:<22} mean={statistics.mean(timings):8.2f}ms  "
+        f"median={statistics.median(timings):8.2f}ms  p95={p95:8.2f}ms  "
+        f"first={timings[0]:8.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SupabaseClient pooled vs per-request benchmark")
+    parser.add_argument("-n", "--iterations", type=int, default=200, help="반복 횟수 (기본 200)")
+    parser.add_argument("--query", action="store_true", help="posts 테이블 1행 조회까지 포함해서 측정")
+    args = parser.parse_args()
+
+    iterations = args.iterations if not args.query else min(args.iterations, 100)
+    mode = "생성 + 쿼리 1회" if args.query else "생성만"
+    print(f"=== SupabaseClient 벤치마크 ({mode}, {iterations}회) ===")
+
+    before = run_case(pooled=False, iterations=iterations, with_query=args.query)
+    summarize("before (per-request)", before)
+
+    after = run_case(pooled=True, iterations=iterations, with_query=args.query)
+    summarize("after (pooled)", after)
+
+    saved = statistics.mean(before) - statistics.mean(after)
+    print(f"요청당 절감: {saved:.2f}ms ({saved / statistics.mean(before) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
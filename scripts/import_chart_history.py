@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+이전 버전 차트 JSON 스냅샷을 순위 기록 저장소로 가져오기
+
+analyzers/chart_data의 charts_realtime_*.json / charts_daily_*.json 파일을 읽어
+ChartHistoryStore(CHART_HISTORY_DB_PATH)에 수집 시각 그대로 추가합니다.
+이미 같은 시각으로 들어간 수집은 건너뛰므로 여러 번 실행해도 됩니다.
+
+사용법:
+    python scripts/import_chart_history.py                 # 가져오기
+    python scripts/import_chart_history.py --dry-run       # 대상 파일만 확인
+    python scripts/import_chart_history.py --delete        # 가져온 파일 삭제
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from analyzers.chart_deltas import ranking_fingerprint
+from analyzers.chart_history_store import ChartHistoryStore
+from utils import app_settings
+
+DEFAULT_SOURCE = project_root / "analyzers" / "chart_data"
+
+
+def snapshot_files(source: Path) -> list:
+    """가져올 스냅샷 파일 (latest_* 복사본, 주간 통계, 변동분 파일 제외, 시간순)"""
+    files = [
+        path for path in source.glob("charts_*.json")
+        if path.name.startswith(("charts_realtime_", "charts_daily_"))
+        and not path.name.startswith("charts_realtime_delta_")
+    ]
+    return sorted(files, key=lambda path: path.name.split("_", 2)[2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import legacy chart JSON snapshots into the chart history store")
+    parser.add_argument("--source", default=str(DEFAULT_SOURCE), help=f"스냅샷 폴더 (기본 {DEFAULT_SOURCE})")
+    parser.add_argument("--db", default=app_settings.CHART_HISTORY_DB_PATH, help="순위 기록 DB 경로")
+    parser.add_argument("--dry-run", action="store_true", help="가져오지 않고 대상 파일만 출력")
+    parser.add_argument("--delete", action="store_true", help="가져온 파일 삭제")
+    args = parser.parse_args()
+
+    files = snapshot_files(Path(args.source))
+    print(f"=== 차트 스냅샷 {len(files)}개 ({args.source}) ===")
+    if args.dry_run:
+        for path in files:
+            print(f"  {path.name}")
+        return
+
+    store = ChartHistoryStore(args.db)
+    imported = skipped = failed = 0
+
+    for path in files:
+        try:
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            metadata, chart_data = saved["metadata"], saved["chart_data"]
+            kind = metadata.get("collection_type", "realtime")
+            collected_at = datetime.fromisoformat(metadata["collected_at"]).timestamp()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[FAIL] {path.name}: {e}")
+            failed += 1
+            continue
+
+        if store.has_collection(kind, collected_at):
+            skipped += 1
+        else:
+            fingerprints = {
+                f"{service}/{chart_type}": ranking_fingerprint(result.get("tracks") or [])
+                for service, by_type in chart_data.get("services", {}).items()
+                for chart_type, result in by_type.items()
+            }
+            store.append_collection(chart_data, kind, collected_at=collected_at, fingerprints=fingerprints)
+            imported += 1
+        if args.delete:
+            path.unlink()
+
+    print(f"[OK] 가져오기 {imported}개, 이미 있음 {skipped}개, 실패 {failed}개")
+    print(f"     {store.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+분석 대시보드 통계 요약 테이블 재계산
+
+analysis_stats_* 요약 테이블은 save_analysis_result / delete_session 트랜잭션 안에서 증감됩니다.
+DB 파일을 직접 수정했거나 값이 어긋났을 때 원본 테이블(analysis_sessions, comments)로 다시 계산합니다.
+
+사용법:
+    python scripts/rebuild_analysis_stats.py            # 재계산
+    python scripts/rebuild_analysis_stats.py --check    # 요약 테이블과 원본 집계 비교만
+    python scripts/rebuild_analysis_stats.py --db /path/to/music_analysis.db
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from core.database import DatabaseManager
+
+
+def compute_from_source(db: DatabaseManager) -> dict:
+    """원본 테이블 전체 스캔 집계 (요약 테이블 도입 전 get_statistics와 같은 방식)"""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM analysis_sessions')
+        total_analyses = cursor.fetchone()[0]
+        cursor.execute('SELECT COUNT(*) FROM comments')
+        total_comments = cursor.fetchone()[0]
+        cursor.execute('SELECT primary_genre, COUNT(*) FROM analysis_sessions GROUP BY primary_genre')
+        genres = {row[0]: row[1] for row in cursor.fetchall()}
+        cursor.execute('SELECT primary_mood, COUNT(*) FROM analysis_sessions GROUP BY primary_mood')
+        moods = {row[0]: row[1] for row in cursor.fetchall()}
+    return {
+        'total_analyses': total_analyses,
+        'total_comments': total_comments,
+        'genre_distribution': genres,
+        'mood_distribution': moods,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild music_analysis.db dashboard statistics tables")
+    parser.add_argument("--db", default=str(project_root / "music_analysis.db"), help="DB 경로 (기본: 프로젝트 루트 music_analysis.db)")
+    parser.add_argument("--check", action="store_true", help="재계산하지 않고 불일치만 출력")
+    args = parser.parse_args()
+
+    db = DatabaseManager(db_path=args.db, console_log=lambda msg: None)
+    expected = compute_from_source(db)
+    current = db.get_statistics()
+
+    mismatches = [key for key in expected if expected[key] != current.get(key)]
+    if mismatches:
+        for key in mismatches:
+            print(f"[DIFF] {key}: 요약={current.get(key)} 원본={expected[key]}")
+    else:
+        print("[OK] 요약 테이블이 원본 집계와 일치합니다")
+
+    if args.check:
+        sys.exit(1 if mismatches else 0)
+
+    rebuilt = db.rebuild_statistics()
+    print(
+        f"[OK] 재계산 완료 ({rebuilt['rebuild_ms']}ms): 분석 {rebuilt['total_analyses']}건, "
+        f"댓글 {rebuilt['total_comments']}개, 장르 {len(rebuilt['genre_distribution'])}개, "
+        f"분위기 {len(rebuilt['mood_distribution'])}개"
+    )
+
+
+if __name__ == "__main__":
+    main()
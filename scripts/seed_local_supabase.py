@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+로컬 SQLite 백엔드 시드 + 벤치마크
+
+SUPABASE_BACKEND=sqlite로 앱을 띄울 때 쓰는 DB(utils/local_supabase.py)에
+사용자/플레이리스트/곡/댓글/배틀/게시글을 대량으로 채웁니다.
+--seed가 같으면 ID와 내용까지 같은 데이터가 만들어지므로 측정을 반복할 수 있습니다.
+
+사용법:
+    python scripts/seed_local_supabase.py --tracks 100000
+    python scripts/seed_local_supabase.py --db /tmp/load.db --tracks 1000000 --reset --bench
+    SUPABASE_BACKEND=sqlite SUPABASE_SQLITE_PATH=/tmp/load.db python app.py
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from utils.local_supabase import LocalSupabase
+
+BATCH_SIZE = 5000
+
+ARTIST_WORDS = ["Blue", "Night", "Neon", "Velvet", "Paper", "Silver", "Echo", "Lunar", "Wild", "Glass", "Honey", "Static"]
+TITLE_WORDS = ["Love", "Rain", "City", "Dream", "Summer", "Ghost", "Heart", "Road", "Fire", "Ocean", "Letter", "Window",
+               "밤", "노래", "바다", "기억", "우리", "하늘", "봄", "거리"]
+POST_WORDS = ["오늘", "음악", "추천", "플레이리스트", "기분", "산책", "카페", "공부", "드라이브", "새벽",
+              "playlist", "vibe", "chill", "indie", "jazz", "kpop", "lofi", "live"]
+
+
+def make_uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def iso(base: datetime, rng: random.Random, days: int) -> str:
+    return (base - timedelta(seconds=rng.randint(0, days * 86400))).isoformat()
+
+
+def insert_rows(conn, table: str, rows: list) -> None:
+    if not rows:
+        return
+    columns = list(rows[0].keys())
+    conn.executemany(
+        f'INSERT INTO "{table}" ({", ".join(columns)}) VALUES ({", ".join("?" for _ in columns)})',
+        [tuple(row[c] for c in columns) for row in rows],
+    )
+
+
+def seed(db: LocalSupabase, args) -> None:
+    rng = random.Random(args.seed)
+    now = datetime.now()
+    conn = db.connection()
+    counts = {}
+
+    def write(table: str, rows: list) -> None:
+        with db.write() as wconn:
+            insert_rows(wconn, table, rows)
+        counts[table] = counts.get(table, 0) + len(rows)
+
+    # 사용자
+    users = [
+        {
+            "id": make_uuid(rng),
+            "username": f"user{i:06d}",
+            "email": f"user{i:06d}@example.com",
+            "password_hash": None,
+            "created_at": iso(now, rng, 365),
+        }
+        for i in range(args.users)
+    ]
+    write("users", users)
+    user_ids = [u["id"] for u in users]
+
+    # 플레이리스트 (사용자당 0~3개)
+    playlists = []
+    for user_id in user_ids:
+        for _ in range(rng.randint(0, 3)):
+            playlists.append({
+                "id": make_uuid(rng),
+                "name": f"{rng.choice(TITLE_WORDS)} {rng.choice(POST_WORDS)}",
+                "description": None,
+                "icon_url": None,
+                "user_id": user_id,
+                "created_at": iso(now, rng, 365),
+            })
+    write("playlists", playlists)
+    playlists_by_user = {}
+    for playlist in playlists:
+        playlists_by_user.setdefault(playlist["user_id"], []).append(playlist["id"])
+
+    # 곡: 사용자별 display_order는 1부터 이어서 부여 (곡 수가 사용자에게 고르게 분포하지 않도록 가중치)
+    cum_weights = list(itertools.accumulate(rng.paretovariate(1.2) for _ in user_ids))
+    next_order = {}
+    track_ids = []
+    started = time.perf_counter()
+    for start in range(0, args.tracks, BATCH_SIZE):
+        batch = []
+        for i in range(start, min(start + BATCH_SIZE, args.tracks)):
+            user_id = rng.choices(user_ids, cum_weights=cum_weights)[0] if user_ids else None
+            owned = playlists_by_user.get(user_id) or []
+            playlist_id = rng.choice(owned) if owned and rng.random() < 0.4 else None
+            next_order[user_id] = next_order.get(user_id, 0) + 1
+            video_id = f"{i:011d}"
+            synced = rng.random() < 0.7
+            metadata = {"stats": {
+                "view_count": int(rng.lognormvariate(9, 2)),
+                "like_count": int(rng.lognormvariate(5, 2)),
+                "last_synced_at": iso(now, rng, 14),
+            }} if synced else {}
+            track_id = make_uuid(rng)
+            batch.append({
+                "id": track_id,
+                "url": f"https://www.youtube.com/watch?v={video_id}",
+                "source": "youtube",
+                "source_id": video_id,
+                "title": f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_WORDS)} {i}",
+                "artist": f"{rng.choice(ARTIST_WORDS)} {rng.choice(ARTIST_WORDS)}",
+                "duration_seconds": rng.randint(90, 420),
+                "thumbnail_url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+                "metadata": json.dumps(metadata),
+                "user_id": user_id,
+                "playlist_id": playlist_id,
+                "display_order": next_order[user_id],
+                "random_key": rng.random(),
+                "created_at": iso(now, rng, 365),
+                "updated_at": now.isoformat(),
+            })
+            track_ids.append(track_id)
+        write("tracks", batch)
+        done = min(start + BATCH_SIZE, args.tracks)
+        print(f"  tracks {done}/{args.tracks} ({done / max(time.perf_counter() - started, 1e-6):.0f} rows/s)", end="\r")
+    print()
+
+    # 댓글 / 배틀: 인기 곡에 몰리도록 앞쪽 곡 위주로 선택
+    def popular_track() -> str:
+        return track_ids[min(int(rng.expovariate(1.0 / max(len(track_ids) / 20, 1))), len(track_ids) - 1)]
+
+    if track_ids:
+        for start in range(0, args.comments, BATCH_SIZE):
+            write("track_comments", [
+                {
+                    "id": make_uuid(rng),
+                    "track_id": popular_track(),
+                    "author": f"user{rng.randrange(max(args.users, 1)):06d}",
+                    "content": " ".join(rng.choices(POST_WORDS, k=rng.randint(2, 8))),
+                    "user_id": rng.choice(user_ids) if user_ids else None,
+                    "created_at": iso(now, rng, 90),
+                }
+                for _ in range(start, min(start + BATCH_SIZE, args.comments))
+            ])
+
+        for start in range(0, args.battles, BATCH_SIZE):
+            batch = []
+            for _ in range(start, min(start + BATCH_SIZE, args.battles)):
+                track_a, track_b = popular_track(), rng.choice(track_ids)
+                if track_a == track_b:
+                    continue
+                batch.append({
+                    "id": make_uuid(rng),
+                    "user_id": rng.choice(user_ids) if user_ids else None,
+                    "track_a_id": track_a,
+                    "track_b_id": track_b,
+                    "winner_id": rng.choice((track_a, track_b)),
+                    "created_at": iso(now, rng, 30),
+                })
+            write("track_battles", batch)
+
+    # 게시글
+    for start in range(0, args.posts, BATCH_SIZE):
+        batch = []
+        for _ in range(start, min(start + BATCH_SIZE, args.posts)):
+            author_index = rng.randrange(max(args.users, 1))
+            batch.append({
+                "id": make_uuid(rng),
+                "title": " ".join(rng.choices(POST_WORDS, k=rng.randint(2, 5))),
+                "content": " ".join(rng.choices(POST_WORDS + TITLE_WORDS, k=rng.randint(20, 120))),
+                "author": f"user{author_index:06d}",
+                "user_id": user_ids[author_index] if user_ids else None,
+                "created_at": iso(now, rng, 365),
+            })
+        write("posts", batch)
+
+    applied = db.rpc_rebuild_track_rankings() if counts.get("track_battles") else 0
+    conn.execute("ANALYZE")
+    for table, count in counts.items():
+        print(f"  {table:<16} +{count}")
+    print(f"  track_rankings   배틀 {applied}건 반영")
+
+
+def bench(db_path: str, iterations: int) -> None:
+    """SupabaseClient 주요 조회 메서드를 로컬 백엔드로 실행해 지연 시간 측정"""
+    os.environ["SUPABASE_BACKEND"] = "sqlite"
+    os.environ["SUPABASE_SQLITE_PATH"] = db_path
+    from utils.supabase_client import SupabaseClient
+
+    client = SupabaseClient()
+    conn = client.client.connection()
+    rng = random.Random(0)
+    user_ids = [r[0] for r in conn.execute("SELECT user_id FROM tracks WHERE user_id IS NOT NULL GROUP BY user_id ORDER BY count(*) DESC LIMIT 50")]
+    track_ids = [r[0] for r in conn.execute("SELECT id FROM tracks ORDER BY random_key LIMIT 200")]
+    if not track_ids:
+        print("[WARN] 곡이 없어 벤치마크를 건너뜁니다")
+        return
+
+    cases = {
+        "get_tracks(user)": lambda: client.get_tracks(limit=50, user_id=rng.choice(user_ids)),
+        "count_tracks(user)": lambda: client.count_tracks(user_id=rng.choice(user_ids)),
+        "get_track": lambda: client.get_track(rng.choice(track_ids)),
+        "get_track_comments": lambda: client.get_track_comments(rng.choice(track_ids), limit=50),
+        "get_track_battle_stats": lambda: client.get_track_battle_stats(rng.choice(track_ids)),
+        "get_random_tracks": lambda: client.get_random_tracks(count=2),
+        "get_worldcup_rankings": lambda: (SupabaseClient._rankings_cache.clear(), client.get_worldcup_rankings(limit=50)),
+        "search_posts": lambda: client.search_posts(search=rng.choice(POST_WORDS), limit=20, with_count=True),
+        "get_stalest_synced": lambda: client.get_stalest_synced_tracks(limit=50),
+    }
+    print(f"=== SupabaseClient (sqlite) 벤치마크, {iterations}회 ===")
+    for label, case in cases.items():
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            case()
+            timings.append((time.perf_counter() - started) * 1000)
+        ordered = sorted(timings)
+        p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+        print(f"{label:<24} median={statistics.median(timings):8.2f}ms  p95={p95:8.2f}ms  max={ordered[-1]:8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the local SQLite Supabase backend with a synthetic catalog")
+    parser.add_argument("--db", default=os.getenv("SUPABASE_SQLITE_PATH", str(project_root / "data" / "local_supabase.db")),
+                        help="SQLite 파일 경로 (기본: SUPABASE_SQLITE_PATH 또는 data/local_supabase.db)")
+    parser.add_argument("--tracks", type=int, default=10000, help="곡 수 (기본 10000, 최대 1000000)")
+    parser.add_argument("--users", type=int, default=None, help="사용자 수 (기본: 곡 수 / 50)")
+    parser.add_argument("--posts", type=int, default=None, help="게시글 수 (기본: 곡 수 / 10)")
+    parser.add_argument("--comments", type=int, default=None, help="댓글 수 (기본: 곡 수 / 2)")
+    parser.add_argument("--battles", type=int, default=None, help="월드컵 배틀 수 (기본: 곡 수)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (같으면 같은 데이터)")
+    parser.add_argument("--reset", action="store_true", help="기존 DB 파일을 지우고 새로 생성")
+    parser.add_argument("--bench", action="store_true", help="시드 후 SupabaseClient 조회 벤치마크 실행")
+    parser.add_argument("--bench-only", action="store_true", help="시드 없이 벤치마크만 실행")
+    parser.add_argument("-n", "--iterations", type=int, default=100, help="벤치마크 반복 횟수 (기본 100)")
+    args = parser.parse_args()
+
+    if not 0 <= args.tracks <= 1_000_000:
+        parser.error("--tracks는 0 ~ 1000000 사이여야 합니다")
+    args.users = args.users if args.users is not None else max(args.tracks // 50, 10)
+    args.posts = args.posts if args.posts is not None else args.tracks // 10
+    args.comments = args.comments if args.comments is not None else args.tracks // 2
+    args.battles = args.battles if args.battles is not None else args.tracks
+
+    if not args.bench_only:
+        if args.reset:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(args.db + suffix):
+                    os.remove(args.db + suffix)
+        print(f"=== 로컬 Supabase 시드: {args.db} (tracks={args.tracks}, seed={args.seed}) ===")
+        started = time.time()
+        seed(LocalSupabase(args.db), args)
+        print(f"[OK] 시드 완료 ({time.time() - started:.1f}s)")
+
+    if args.bench or args.bench_only:
+        bench(args.db, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
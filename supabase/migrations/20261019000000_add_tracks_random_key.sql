@@ -0,0 +1,64 @@
+-- 이상형 월드컵 랜덤 곡 샘플링을 DB에서 처리
+-- tracks 전체를 가져와 파이썬에서 random.sample 하던 방식 대신,
+-- 인덱스가 걸린 random_key 컬럼에서 "random_key >= random()" 한 행씩 고른다 (없으면 처음부터 wraparound).
+-- 곡 수와 무관하게 픽 하나당 인덱스 탐색 1회.
+
+-- 기존 행도 ADD COLUMN 시점에 행마다 random() 값이 채워짐
+ALTER TABLE tracks
+    ADD COLUMN IF NOT EXISTS random_key DOUBLE PRECISION NOT NULL DEFAULT random();
+
+CREATE INDEX IF NOT EXISTS idx_tracks_random_key ON tracks(random_key);
+CREATE INDEX IF NOT EXISTS idx_tracks_user_id_random_key ON tracks(user_id, random_key);
+
+-- p_count 개의 서로 다른 곡을 랜덤으로 반환
+-- p_user_id: 지정 시 해당 사용자의 곡만, p_exclude_ids: 제외할 곡 ID
+CREATE OR REPLACE FUNCTION sample_tracks(
+    p_count INTEGER DEFAULT 2,
+    p_user_id UUID DEFAULT NULL,
+    p_exclude_ids UUID[] DEFAULT '{}'
+)
+RETURNS SETOF tracks AS $$
+DECLARE
+    v_excluded UUID[] := COALESCE(p_exclude_ids, '{}');
+    v_pivot DOUBLE PRECISION;
+    v_pick tracks%ROWTYPE;
+BEGIN
+    FOR i IN 1..GREATEST(COALESCE(p_count, 0), 0) LOOP
+        v_pivot := random();
+
+        -- user_id 조건 유무에 따라 분기해 각각 맞는 인덱스를 타도록 함
+        IF p_user_id IS NULL THEN
+            SELECT * INTO v_pick FROM tracks t
+            WHERE t.random_key >= v_pivot AND NOT (t.id = ANY(v_excluded))
+            ORDER BY t.random_key
+            LIMIT 1;
+
+            IF NOT FOUND THEN
+                SELECT * INTO v_pick FROM tracks t
+                WHERE t.random_key < v_pivot AND NOT (t.id = ANY(v_excluded))
+                ORDER BY t.random_key
+                LIMIT 1;
+            END IF;
+        ELSE
+            SELECT * INTO v_pick FROM tracks t
+            WHERE t.user_id = p_user_id AND t.random_key >= v_pivot AND NOT (t.id = ANY(v_excluded))
+            ORDER BY t.random_key
+            LIMIT 1;
+
+            IF NOT FOUND THEN
+                SELECT * INTO v_pick FROM tracks t
+                WHERE t.user_id = p_user_id AND t.random_key < v_pivot AND NOT (t.id = ANY(v_excluded))
+                ORDER BY t.random_key
+                LIMIT 1;
+            END IF;
+        END IF;
+
+        EXIT WHEN NOT FOUND;
+
+        v_excluded := array_append(v_excluded, v_pick.id);
+        RETURN NEXT v_pick;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql VOLATILE;
+
+GRANT EXECUTE ON FUNCTION sample_tracks(INTEGER, UUID, UUID[]) TO anon, authenticated, service_role;
@@ -0,0 +1,138 @@
+-- 이상형 월드컵 곡별 랭킹 집계 테이블
+-- track_battles에 투표가 들어올 때마다 트리거가 승리/참여 횟수와 Elo 레이팅을 갱신한다.
+-- 순위/곡별 통계는 이 테이블의 인덱스 조회 1회로 끝난다 (track_battles 전체 집계 불필요).
+
+CREATE TABLE IF NOT EXISTS track_rankings (
+    track_id UUID PRIMARY KEY REFERENCES tracks(id) ON DELETE CASCADE,
+    wins INTEGER NOT NULL DEFAULT 0,
+    appearances INTEGER NOT NULL DEFAULT 0,
+    elo_rating DOUBLE PRECISION NOT NULL DEFAULT 1500,
+    last_battle_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_track_rankings_wins ON track_rankings(wins DESC, appearances ASC);
+CREATE INDEX IF NOT EXISTS idx_track_rankings_elo ON track_rankings(elo_rating DESC);
+
+-- 배틀 1건을 랭킹에 반영 (트리거와 재계산 함수가 함께 사용)
+CREATE OR REPLACE FUNCTION apply_track_battle_result(
+    p_track_a_id UUID,
+    p_track_b_id UUID,
+    p_winner_id UUID,
+    p_battle_at TIMESTAMPTZ DEFAULT NOW()
+)
+RETURNS VOID AS $$
+DECLARE
+    k_factor CONSTANT DOUBLE PRECISION := 32;
+    v_loser_id UUID;
+    v_winner_rating DOUBLE PRECISION;
+    v_loser_rating DOUBLE PRECISION;
+    v_expected DOUBLE PRECISION;
+    v_found INTEGER;
+BEGIN
+    IF p_track_a_id IS NULL OR p_track_b_id IS NULL OR p_track_a_id = p_track_b_id THEN
+        RETURN;
+    END IF;
+    IF p_winner_id IS DISTINCT FROM p_track_a_id AND p_winner_id IS DISTINCT FROM p_track_b_id THEN
+        RETURN;
+    END IF;
+
+    v_loser_id := CASE WHEN p_winner_id = p_track_a_id THEN p_track_b_id ELSE p_track_a_id END;
+
+    -- 삭제된 곡이 낀 배틀은 건너뜀 (track_rankings FK 위반으로 투표/재계산이 실패하지 않도록)
+    -- KEY SHARE 잠금으로 반영이 끝날 때까지 두 곡이 삭제되지 않게 함
+    PERFORM 1 FROM tracks
+    WHERE id IN (p_winner_id, v_loser_id)
+    ORDER BY id
+    FOR KEY SHARE;
+    GET DIAGNOSTICS v_found = ROW_COUNT;
+    IF v_found < 2 THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO track_rankings (track_id)
+    SELECT id FROM tracks WHERE id IN (p_winner_id, v_loser_id)
+    ON CONFLICT (track_id) DO NOTHING;
+
+    -- 두 행을 항상 같은 순서로 잠가 동시 투표 시 교착을 피함
+    PERFORM 1 FROM track_rankings
+    WHERE track_id IN (p_winner_id, v_loser_id)
+    ORDER BY track_id
+    FOR UPDATE;
+
+    SELECT elo_rating INTO v_winner_rating FROM track_rankings WHERE track_id = p_winner_id;
+    SELECT elo_rating INTO v_loser_rating FROM track_rankings WHERE track_id = v_loser_id;
+
+    v_expected := 1 / (1 + power(10, (v_loser_rating - v_winner_rating) / 400));
+
+    UPDATE track_rankings
+    SET wins = wins + 1,
+        appearances = appearances + 1,
+        elo_rating = elo_rating + k_factor * (1 - v_expected),
+        last_battle_at = GREATEST(COALESCE(last_battle_at, p_battle_at), p_battle_at),
+        updated_at = NOW()
+    WHERE track_id = p_winner_id;
+
+    UPDATE track_rankings
+    SET appearances = appearances + 1,
+        elo_rating = elo_rating - k_factor * (1 - v_expected),
+        last_battle_at = GREATEST(COALESCE(last_battle_at, p_battle_at), p_battle_at),
+        updated_at = NOW()
+    WHERE track_id = v_loser_id;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION on_track_battle_inserted()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM apply_track_battle_result(NEW.track_a_id, NEW.track_b_id, NEW.winner_id, COALESCE(NEW.created_at, NOW()));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS track_battles_update_rankings ON track_battles;
+CREATE TRIGGER track_battles_update_rankings
+    AFTER INSERT ON track_battles
+    FOR EACH ROW
+    EXECUTE FUNCTION on_track_battle_inserted();
+
+-- SECURITY DEFINER 함수는 PUBLIC 기본 실행 권한을 회수 (RPC로 임의 곡에 승리를 더하지 못하게)
+-- 트리거는 호출자 권한과 무관하게 실행되므로 투표 반영에는 영향 없음
+REVOKE EXECUTE ON FUNCTION apply_track_battle_result(UUID, UUID, UUID, TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION apply_track_battle_result(UUID, UUID, UUID, TIMESTAMPTZ) TO service_role;
+REVOKE EXECUTE ON FUNCTION on_track_battle_inserted() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION on_track_battle_inserted() TO service_role;
+
+-- 기존 배틀 전체로 랭킹 재계산 (백필)
+-- 재계산 중 들어오는 투표가 누락되지 않도록 track_battles 쓰기를 잠시 막는다.
+CREATE OR REPLACE FUNCTION rebuild_track_rankings()
+RETURNS INTEGER AS $$
+DECLARE
+    v_battle RECORD;
+    v_count INTEGER := 0;
+BEGIN
+    LOCK TABLE track_battles IN SHARE MODE;
+    DELETE FROM track_rankings;
+
+    FOR v_battle IN
+        SELECT track_a_id, track_b_id, winner_id, created_at
+        FROM track_battles
+        ORDER BY created_at ASC, id ASC
+    LOOP
+        PERFORM apply_track_battle_result(v_battle.track_a_id, v_battle.track_b_id, v_battle.winner_id, v_battle.created_at);
+        v_count := v_count + 1;
+    END LOOP;
+
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION rebuild_track_rankings() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION rebuild_track_rankings() TO service_role;
+
+ALTER TABLE track_rankings ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Anyone can read track rankings" ON track_rankings;
+CREATE POLICY "Anyone can read track rankings" ON track_rankings
+    FOR SELECT
+    USING (true);
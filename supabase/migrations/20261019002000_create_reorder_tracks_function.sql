@@ -0,0 +1,32 @@
+-- 플레이리스트 곡 순서 일괄 변경
+-- 곡마다 UPDATE를 보내지 않고 [{"id": ..., "order": ...}, ...] 배열을 받아 UPDATE 1회로 처리한다.
+-- p_user_id를 넘기면 해당 사용자의 곡만 갱신된다.
+
+-- display_order는 원격 DB에서 직접 추가된 컬럼이라 마이그레이션에 없던 경우를 대비
+ALTER TABLE tracks
+    ADD COLUMN IF NOT EXISTS display_order INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_tracks_user_id_display_order ON tracks(user_id, display_order);
+
+CREATE OR REPLACE FUNCTION reorder_tracks(
+    p_orders JSONB,
+    p_user_id UUID DEFAULT NULL
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    UPDATE tracks t
+    SET display_order = o."order",
+        updated_at = NOW()
+    FROM jsonb_to_recordset(COALESCE(p_orders, '[]'::jsonb)) AS o(id UUID, "order" INTEGER)
+    WHERE t.id = o.id
+      AND o."order" IS NOT NULL
+      AND (p_user_id IS NULL OR t.user_id = p_user_id);
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION reorder_tracks(JSONB, UUID) TO anon, authenticated, service_role;
@@ -0,0 +1,28 @@
+-- 다이어리(posts) 검색/필터/정렬을 DB에서 처리하기 위한 컬럼과 인덱스
+-- /diary가 최근 300개를 가져와 파이썬에서 거르던 방식을 대체한다.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 부분 문자열 검색용 (제목 + 본문 + 작성자, 소문자) - ilike '%검색어%'를 trigram 인덱스로 처리
+ALTER TABLE posts
+    ADD COLUMN IF NOT EXISTS search_text TEXT
+    GENERATED ALWAYS AS (
+        lower(coalesce(title, '') || ' ' || coalesce(content, '') || ' ' || coalesce(author, ''))
+    ) STORED;
+
+-- 전문 검색용 tsvector (한국어 형태소 분석기가 없으므로 'simple' 설정 사용)
+ALTER TABLE posts
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(author, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(content, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_posts_search_text_trgm ON posts USING GIN (search_text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_posts_search_vector ON posts USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_posts_author_trgm ON posts USING GIN (author gin_trgm_ops);
+
+-- 키셋 페이지네이션용 (정렬 키 + id)
+CREATE INDEX IF NOT EXISTS idx_posts_created_at_id ON posts(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_posts_title_id ON posts(title, id);
@@ -0,0 +1,39 @@
+-- 곡 통계 일괄 반영 (core/track_stats_refresher.py)
+-- [{"id", "metadata": {"provider", "stats"}, "source_id", "thumbnail_url", "duration_seconds", "artist", "title"}, ...]
+-- 배열을 받아 UPDATE 1회로 처리한다. 조회 후 YouTube 호출 동안 사용자가 바꾼 값을 되돌리지 않도록
+-- metadata는 서버에서 병합하고 (provider는 키 단위 병합, stats는 교체, 나머지 키 유지)
+-- 기본 컬럼은 비어 있을 때만 채운다.
+
+CREATE OR REPLACE FUNCTION apply_track_stats_updates(p_updates JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    UPDATE tracks t
+    SET metadata = COALESCE(t.metadata, '{}'::jsonb) || jsonb_build_object(
+            'provider', COALESCE(t.metadata->'provider', '{}'::jsonb) || COALESCE(u.metadata->'provider', '{}'::jsonb),
+            'stats', COALESCE(u.metadata->'stats', t.metadata->'stats', '{}'::jsonb)
+        ),
+        source_id = COALESCE(NULLIF(t.source_id, ''), u.source_id),
+        thumbnail_url = COALESCE(NULLIF(t.thumbnail_url, ''), u.thumbnail_url),
+        duration_seconds = COALESCE(NULLIF(t.duration_seconds, 0), u.duration_seconds),
+        artist = COALESCE(NULLIF(t.artist, ''), u.artist),
+        title = COALESCE(NULLIF(t.title, ''), u.title),
+        updated_at = NOW()
+    FROM jsonb_to_recordset(COALESCE(p_updates, '[]'::jsonb)) AS u(
+        id UUID,
+        metadata JSONB,
+        source_id TEXT,
+        thumbnail_url TEXT,
+        duration_seconds INTEGER,
+        artist TEXT,
+        title TEXT
+    )
+    WHERE t.id = u.id;
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION apply_track_stats_updates(JSONB) TO anon, authenticated, service_role;
@@ -0,0 +1,63 @@
+"""core.database.DatabaseManager.search_history 범위별 검색"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.database import DatabaseManager
+
+
+def make_result(index: int) -> dict:
+    video_id = f"vid{index:08d}"
+    return {
+        "video_info": {
+            "video_id": video_id,
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "title": f"Moonlight Song {index}",
+            "channel": "Test Channel",
+            "duration": 200,
+            "view_count": 100,
+            "like_count": 10,
+            "thumbnail": "",
+            "published_at": "2026-01-01T00:00:00Z",
+        },
+        "music_analysis": {
+            "artist": "IU",
+            "song": f"Moonlight {index}",
+            "genre": {"primary_genre": "ballad", "genre_scores": {}},
+            "mood": {"primary_mood": "calm", "mood_scores": {}},
+            "estimated_bpm": 80,
+            "estimated_key": "C",
+            "energy_level": "low",
+            "tags": ["kpop"],
+        },
+        "comments_data": {
+            "sentiment_analysis": {"average_sentiment": 0.1},
+            "comments": [
+                {"author": "fan", "text": f"moonlight forever {index}", "like_count": 1,
+                 "published_at": "2026-01-01T00:00:00Z"},
+            ],
+        },
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(db_path=str(tmp_path / "music_analysis.db"), console_log=lambda msg: None)
+    for index in range(5):
+        manager.bulk_save_analysis(make_result(index))
+    return manager
+
+
+@pytest.mark.parametrize("scope", ["all", "sessions", "comments"])
+def test_search_history_scope(db, scope):
+    result = db.search_history("moonlight", scope=scope)
+
+    assert result["total"] == 5
+    assert len(result["results"]) == 5
+    if scope == "sessions":
+        assert all(row["comment_hits"] == 0 for row in result["results"])
+    else:
+        assert all(row["comment_hits"] == 1 for row in result["results"])
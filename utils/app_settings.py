@@ -16,6 +16,107 @@ ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # Supabase 설정
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")  # anon key
+SUPABASE_POOL_MAX_CONNECTIONS = int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", "20"))
+SUPABASE_POOL_MAX_KEEPALIVE = int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "10"))
+SUPABASE_POOL_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_POOL_KEEPALIVE_EXPIRY", "30"))  # 초
+SUPABASE_HTTP_TIMEOUT = float(os.getenv("SUPABASE_HTTP_TIMEOUT", "10"))  # 초
+# 로컬 개발/부하 테스트용 백엔드: "supabase" 또는 "sqlite" (utils/local_supabase.py)
+SUPABASE_BACKEND = os.getenv("SUPABASE_BACKEND", "supabase").strip().lower()
+SUPABASE_SQLITE_PATH = os.getenv("SUPABASE_SQLITE_PATH", os.path.join(ROOT_DIR, "data", "local_supabase.db"))
+
+# YouTube Data API 설정
+YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))  # 일일 쿼터 (units)
+YOUTUBE_QUOTA_RESERVE = int(os.getenv("YOUTUBE_QUOTA_RESERVE", "500"))  # 이 이하로 남으면 고비용 호출 차단
+YOUTUBE_BATCH_WINDOW_MS = int(os.getenv("YOUTUBE_BATCH_WINDOW_MS", "30"))  # 단건 조회를 모으는 대기 시간
+
+# 트랙 외부 지표 백그라운드 갱신 설정
+TRACK_STATS_REFRESHER_ENABLED = os.getenv("TRACK_STATS_REFRESHER_ENABLED", "true").lower() in ("1", "true", "yes")
+TRACK_STATS_REFRESH_INTERVAL_SECONDS = int(os.getenv("TRACK_STATS_REFRESH_INTERVAL_SECONDS", "300"))
+TRACK_STATS_REFRESH_BATCH_SIZE = int(os.getenv("TRACK_STATS_REFRESH_BATCH_SIZE", "50"))
+TRACK_STATS_API_BUDGET_PER_HOUR = int(os.getenv("TRACK_STATS_API_BUDGET_PER_HOUR", "120"))  # 외부 호출 수 상한
+TRACK_STATS_STALE_AFTER_MINUTES = int(os.getenv("TRACK_STATS_STALE_AFTER_MINUTES", "360"))
+# 워커가 여러 개여도 lease를 가진 하나만 갱신 (빈 값이면 lease 없이 각 프로세스가 갱신, 0이면 주기의 3배)
+TRACK_STATS_REFRESHER_LEASE_DB = os.getenv(
+    "TRACK_STATS_REFRESHER_LEASE_DB", os.path.join(ROOT_DIR, "data", "track_stats_refresher.db")
+)
+TRACK_STATS_REFRESHER_LEASE_SECONDS = int(os.getenv("TRACK_STATS_REFRESHER_LEASE_SECONDS", "0"))
+
+# 랜딩/브랜드 페이지 공개 지표 스냅샷 설정
+PUBLIC_SNAPSHOT_REFRESH_SECONDS = int(os.getenv("PUBLIC_SNAPSHOT_REFRESH_SECONDS", "60"))
+PUBLIC_SNAPSHOT_STALE_SECONDS = int(os.getenv("PUBLIC_SNAPSHOT_STALE_SECONDS", "180"))  # 이보다 오래되면 즉시 재계산 예약
+
+# 이상형 월드컵 랭킹 조회 캐시 (프로세스 로컬)
+WORLDCUP_RANKINGS_CACHE_SECONDS = int(os.getenv("WORLDCUP_RANKINGS_CACHE_SECONDS", "30"))
+
+# 방문자 로그 일괄 기록 설정
+VISITOR_LOG_QUEUE_SIZE = int(os.getenv("VISITOR_LOG_QUEUE_SIZE", "5000"))
+VISITOR_LOG_BATCH_SIZE = int(os.getenv("VISITOR_LOG_BATCH_SIZE", "200"))
+VISITOR_LOG_FLUSH_INTERVAL_MS = int(os.getenv("VISITOR_LOG_FLUSH_INTERVAL_MS", "2000"))
+VISITOR_LOG_BUSY_SAMPLE_RATE = float(os.getenv("VISITOR_LOG_BUSY_SAMPLE_RATE", "0.25"))  # 큐가 80% 이상 찼을 때 기록 비율
+VISITOR_LOG_SPILL_PATH = os.getenv(
+    "VISITOR_LOG_SPILL_PATH", os.path.join(ROOT_DIR, "data", "visitor_logs", "spill.jsonl")
+)
+VISITOR_LOG_SPILL_MAX_BYTES = int(os.getenv("VISITOR_LOG_SPILL_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# 다이어리 검색 방식: ilike (부분 문자열, trigram 인덱스) | fts (tsvector 전문 검색)
+DIARY_SEARCH_MODE = os.getenv("DIARY_SEARCH_MODE", "ilike").strip().lower()
+
+# 트랙 상세 페이지 캐시 (곡 행 / 코멘트·배틀 통계 TTL, 최대 곡 수)
+TRACK_VIEW_CACHE_TRACK_TTL_SECONDS = int(os.getenv("TRACK_VIEW_CACHE_TRACK_TTL_SECONDS", "120"))
+TRACK_VIEW_CACHE_ACTIVITY_TTL_SECONDS = int(os.getenv("TRACK_VIEW_CACHE_ACTIVITY_TTL_SECONDS", "30"))
+TRACK_VIEW_CACHE_MAX_TRACKS = int(os.getenv("TRACK_VIEW_CACHE_MAX_TRACKS", "1000"))
+
+# 쓰기 API 요청 제한 (토큰 버킷) - memory: 프로세스별 / sqlite: 같은 호스트의 워커끼리 공유
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").strip().lower()
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", os.path.join(ROOT_DIR, "data", "rate_limits.db"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))  # memory 백엔드 최대 버킷 수
+
+# 로그인 세션 사용자 캐시 (Flask-Login user_loader)
+USER_SESSION_CACHE_TTL_SECONDS = int(os.getenv("USER_SESSION_CACHE_TTL_SECONDS", "300"))
+USER_SESSION_CACHE_MAX_ENTRIES = int(os.getenv("USER_SESSION_CACHE_MAX_ENTRIES", "5000"))
+
+# 관리자 API(/api/system/cache-stats, /api/growth/leads/summary)를 허용할 이메일 (쉼표 구분, 비어 있으면 비활성)
+SYSTEM_STATS_ADMIN_EMAILS = {
+    email.strip().lower() for email in os.getenv("SYSTEM_STATS_ADMIN_EMAILS", "").split(",") if email.strip()
+}
+
+# 분석 이력 DB (music_analysis.db) SQLite 연결 설정 (core/sqlite_pool.py)
+ANALYSIS_DB_BUSY_TIMEOUT_MS = int(os.getenv("ANALYSIS_DB_BUSY_TIMEOUT_MS", "5000"))
+ANALYSIS_DB_CACHE_SIZE_KB = int(os.getenv("ANALYSIS_DB_CACHE_SIZE_KB", "16384"))  # 연결당 페이지 캐시
+ANALYSIS_DB_MMAP_SIZE_MB = int(os.getenv("ANALYSIS_DB_MMAP_SIZE_MB", "64"))
+ANALYSIS_DB_SYNCHRONOUS = os.getenv("ANALYSIS_DB_SYNCHRONOUS", "NORMAL").strip().upper()  # WAL에서는 NORMAL로 충분
+
+# 분석 이력 보관: ANALYSIS_RETENTION_DAYS보다 오래된 세션을 압축 보관 DB로 이동 (0이면 비활성)
+ANALYSIS_RETENTION_DAYS = int(os.getenv("ANALYSIS_RETENTION_DAYS", "0"))
+ANALYSIS_RETENTION_INTERVAL_HOURS = float(os.getenv("ANALYSIS_RETENTION_INTERVAL_HOURS", "24"))
+ANALYSIS_RETENTION_BATCH_SIZE = int(os.getenv("ANALYSIS_RETENTION_BATCH_SIZE", "200"))
+ANALYSIS_ARCHIVE_PATH = os.getenv(
+    "ANALYSIS_ARCHIVE_PATH", os.path.join(ROOT_DIR, "data", "archive", "music_analysis_archive.db")
+)
+
+# 차트 수집 스케줄러 (analyzers/chart_scheduler.py) - 작업 정의/실행 기록/리더 lease를 SQLite에 보관
+CHART_SCHEDULER_DB_PATH = os.getenv("CHART_SCHEDULER_DB_PATH", os.path.join(ROOT_DIR, "data", "chart_scheduler.db"))
+CHART_SCHEDULER_TICK_SECONDS = float(os.getenv("CHART_SCHEDULER_TICK_SECONDS", "15"))
+CHART_SCHEDULER_LEASE_SECONDS = float(os.getenv("CHART_SCHEDULER_LEASE_SECONDS", "90"))  # 리더가 죽으면 이 시간 뒤 다른 워커가 인수
+CHART_SCHEDULER_JITTER_SECONDS = float(os.getenv("CHART_SCHEDULER_JITTER_SECONDS", "60"))
+CHART_SCHEDULER_CATCHUP_HOURS = float(os.getenv("CHART_SCHEDULER_CATCHUP_HOURS", "12"))  # 일일 작업을 늦게라도 보충하는 최대 지연
+CHART_SCHEDULER_RUN_HISTORY_DAYS = int(os.getenv("CHART_SCHEDULER_RUN_HISTORY_DAYS", "30"))
+
+# 차트 페이지 비동기 수집 (connectors/chart_fetcher.py)
+CHART_FETCH_PER_HOST_LIMIT = int(os.getenv("CHART_FETCH_PER_HOST_LIMIT", "4"))  # 음원사 호스트별 동시 연결 수
+CHART_FETCH_TOTAL_LIMIT = int(os.getenv("CHART_FETCH_TOTAL_LIMIT", "32"))
+CHART_FETCH_TIMEOUT_SECONDS = float(os.getenv("CHART_FETCH_TIMEOUT_SECONDS", "10"))
+CHART_FETCH_SERVICE_TIMEOUTS = os.getenv("CHART_FETCH_SERVICE_TIMEOUTS", "melon=10,bugs=10,genie=10,vibe=8,flo=5")
+CHART_FETCH_RETRIES = int(os.getenv("CHART_FETCH_RETRIES", "2"))
+CHART_FETCH_BACKOFF_SECONDS = float(os.getenv("CHART_FETCH_BACKOFF_SECONDS", "0.5"))
+
+# 차트 페이지 HTML 파서: auto (설치된 것 중 selectolax > lxml > bs4) | bs4 | lxml | selectolax
+CHART_HTML_PARSER = os.getenv("CHART_HTML_PARSER", "auto").strip().lower()
+
+# 차트 순위 기록 (analyzers/chart_history_store.py) - 수집 결과를 날짜별 행으로 SQLite에 보관
+CHART_HISTORY_DB_PATH = os.getenv("CHART_HISTORY_DB_PATH", os.path.join(ROOT_DIR, "data", "chart_history.db"))
+CHART_HISTORY_RETENTION_DAYS = int(os.getenv("CHART_HISTORY_RETENTION_DAYS", "400"))  # 월간/연간 통계용 보관 기간
 
 
 
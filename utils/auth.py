@@ -5,6 +5,9 @@
 """
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, Dict
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -19,6 +22,91 @@ except ImportError:
     from supabase_client import SupabaseClient
 
 
+class UserSessionCache:
+    """
+    로그인 세션용 사용자 정보 캐시 (TTL + LRU)
+    
+    Flask-Login user_loader가 매 요청마다 users 테이블을 조회하지 않도록 한다.
+    프로필/비밀번호 변경 시 invalidate로 즉시 비우고, 다른 워커 프로세스는 TTL 내에 갱신된다.
+    """
+    
+    def __init__(self, ttl_seconds: int = 300, max_entries: int = 5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # user_id -> (expires_at, user)
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+    
+    def get(self, user_id: str) -> Optional[Dict]:
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return dict(entry[1])
+            if entry:
+                self._entries.pop(key, None)
+            self._misses += 1
+            return None
+    
+    def set(self, user_id: str, user: Dict) -> None:
+        with self._lock:
+            self._entries[str(user_id)] = (time.time() + self.ttl_seconds, dict(user))
+            self._entries.move_to_end(str(user_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            if self._entries.pop(str(user_id), None) is not None:
+                self._invalidations += 1
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+                "invalidations": self._invalidations,
+            }
+
+
+# 프로세스 전역 세션 사용자 캐시
+user_session_cache = UserSessionCache(
+    ttl_seconds=app_settings.USER_SESSION_CACHE_TTL_SECONDS,
+    max_entries=app_settings.USER_SESSION_CACHE_MAX_ENTRIES,
+)
+
+
+def get_session_user(user_id: str) -> Optional[Dict]:
+    """
+    세션 사용자 조회 (캐시 우선, 미스일 때만 users 테이블 조회)
+    
+    Returns:
+        Optional[Dict]: {id, username, email, created_at, last_login}
+    """
+    if not user_id:
+        return None
+    cached = user_session_cache.get(user_id)
+    if cached is not None:
+        return cached
+    user = AuthManager().get_user_by_id(user_id)
+    if user:
+        user_session_cache.set(user_id, user)
+    return user
+
+
 class AuthManager:
     """
     인증 관리자
@@ -125,6 +213,8 @@ class AuthManager:
                 }).eq("id", user['id']).execute()
             except:
                 pass  # 업데이트 실패해도 로그인은 성공
+            # 세션 캐시에 이전 last_login이 남지 않도록
+            user_session_cache.invalidate(user['id'])
             
             # 비밀번호 해시는 반환하지 않음
             user_data = {
@@ -190,6 +280,28 @@ class AuthManager:
             print(f"[ERROR] 사용자 조회 실패: {e}")
             return None
     
+    def update_user(self, user_id: str, updates: Dict) -> bool:
+        """
+        사용자 프로필 수정 (세션 캐시 무효화 포함)
+        
+        Args:
+            user_id: 사용자 ID
+            updates: 변경할 컬럼 (username, email, picture 등)
+        
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            data = dict(updates)
+            data["updated_at"] = datetime.now().isoformat()
+            self.supabase.client.table("users").update(data).eq("id", user_id).execute()
+            return True
+        except Exception as e:
+            print(f"[ERROR] 사용자 정보 수정 실패: {e}")
+            return False
+        finally:
+            user_session_cache.invalidate(user_id)
+    
     def create_google_user(self, google_id: str, email: str, name: str, picture: str = None) -> Dict:
         """
         Google OAuth 사용자 생성
@@ -207,15 +319,11 @@ class AuthManager:
             # 이메일로 기존 사용자 확인
             existing_user = self.get_user_by_email(email)
             if existing_user:
-                # 기존 사용자 업데이트 (Google ID 추가)
-                try:
-                    self.supabase.client.table("users").update({
-                        "google_id": google_id,
-                        "picture": picture,
-                        "updated_at": datetime.now().isoformat()
-                    }).eq("id", existing_user['id']).execute()
-                except:
-                    pass  # 필드가 없어도 계속 진행
+                # 기존 사용자 업데이트 (Google ID 추가, 필드가 없어도 계속 진행)
+                self.update_user(existing_user['id'], {
+                    "google_id": google_id,
+                    "picture": picture,
+                })
                 
                 return {
                     'success': True,
@@ -3,37 +3,266 @@ Fallback store for monetization leads.
 
 Used when Supabase is unavailable or lead inserts fail, so conversion intent
 is still persisted locally during development or degraded runtime conditions.
+
+Each lead is written through a per-process append handle before append()
+returns, the active file is rotated by size or calendar day, and a small
+JSON index keeps lead counts per day by source page and lead type so
+summaries never rescan the JSONL history. The index also records how many
+bytes of each JSONL file it has counted; the batched index update (every
+few records or seconds) only reads the lines past that offset, so a flush
+lost to a crash is picked up by the next one. Disk writes happen under an
+advisory file lock so several worker processes can share the directory.
 """
 
 from __future__ import annotations
 
+import atexit
+import glob
 import json
 import os
 import threading
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+ACTIVE_FILE = "growth_leads.jsonl"
+INDEX_FILE = "growth_leads_index.json"
+LOCK_FILE = ".growth_leads.lock"
+
+
+def _source_key(source_page: Optional[str]) -> str:
+    """source_page를 인덱스 키로 정규화 (쿼리스트링 제거)"""
+    if not source_page:
+        return "unknown"
+    path = urlparse(str(source_page)).path or str(source_page)
+    return path[:120] or "unknown"
 
 
 class GrowthLeadStore:
-    """Append-only JSONL fallback for growth leads."""
+    """Rotating JSONL fallback for growth leads with a batched daily count index."""
 
-    def __init__(self, root_dir: str):
+    def __init__(
+        self,
+        root_dir: str,
+        flush_every: int = 20,
+        flush_interval_seconds: float = 2.0,
+        max_file_bytes: int = 10 * 1024 * 1024,
+    ):
         self._lock = threading.Lock()
         self.output_dir = os.path.join(root_dir, "data", "growth")
-        self.output_path = os.path.join(self.output_dir, "growth_leads.jsonl")
+        self.output_path = os.path.join(self.output_dir, ACTIVE_FILE)
+        self.index_path = os.path.join(self.output_dir, INDEX_FILE)
+        self.lock_path = os.path.join(self.output_dir, LOCK_FILE)
+        self.flush_every = flush_every
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_file_bytes = max_file_bytes
 
-    def append(self, payload: Dict) -> str:
-        os.makedirs(self.output_dir, exist_ok=True)
+        # 활성 파일 append 핸들 (리드마다 열고 닫지 않음, 회전되면 다시 엶)
+        self._handle = None
+        # 마지막 인덱스 갱신 이후 이 프로세스가 쓴 리드 수
+        self._pending_records = 0
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.close)
 
+    def append(self, payload: Dict) -> str:
         record = dict(payload)
         record["id"] = str(uuid.uuid4())
         record["stored_via"] = "local_fallback"
         record["created_at"] = datetime.now().isoformat()
 
         line = json.dumps(record, ensure_ascii=False) + "\n"
+        # 리드 자체는 반환 전에 기록 (실패하면 예외를 그대로 올려 호출자가 알 수 있게 함)
         with self._lock:
-            with open(self.output_path, "a", encoding="utf-8") as handle:
+            with self._file_lock():
+                self._rotate_if_needed(first_day=record["created_at"][:10])
+                handle = self._active_handle()
                 handle.write(line)
+                handle.flush()
+            self._pending_records += 1
+            should_flush = self._pending_records >= self.flush_every
+            if not should_flush:
+                self._schedule_flush()
 
+        if should_flush:
+            self.flush()
         return record["id"]
+
+    def _schedule_flush(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval_seconds, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def close(self) -> None:
+        """인덱스를 갱신하고 append 핸들을 닫음 (종료 시)"""
+        self.flush()
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    # =========================
+    # Disk
+    # =========================
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(self.lock_path, "a") as lock_handle:
+            if fcntl is not None:
+                fcntl.flock(lock_handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_handle, fcntl.LOCK_UN)
+
+    def _active_handle(self):
+        """활성 파일 핸들 (다른 워커가 회전했거나 파일이 없어졌으면 다시 엶, 파일 lock 안에서 호출)"""
+        if self._handle is not None:
+            try:
+                current = os.stat(self.output_path)
+                opened = os.fstat(self._handle.fileno())
+                if (current.st_dev, current.st_ino) == (opened.st_dev, opened.st_ino):
+                    return self._handle
+            except OSError:
+                pass
+            self._handle.close()
+        self._handle = open(self.output_path, "a", encoding="utf-8")
+        return self._handle
+
+    def flush(self) -> None:
+        """인덱스가 아직 세지 않은 JSONL 줄을 인덱스에 합침"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending_records = 0
+
+        try:
+            with self._file_lock():
+                index = self._load_index()
+                if self._catch_up(index):
+                    self._save_index(index)
+        except Exception as exc:
+            print(f"[ERROR] growth lead 인덱스 갱신 실패 (다시 시도 예정): {exc}")
+            with self._lock:
+                self._schedule_flush()
+
+    def _rotate_if_needed(self, first_day: Optional[str]) -> None:
+        """활성 파일이 크기 상한을 넘었거나 날짜가 바뀌었으면 새 파일로 교체 (파일 lock 안에서 호출)"""
+        if not os.path.exists(self.output_path):
+            return
+        stat = os.stat(self.output_path)
+        file_day = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d")
+        if stat.st_size < self.max_file_bytes and (first_day is None or file_day >= first_day):
+            return
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        rotated_name = f"growth_leads-{stamp}-{uuid.uuid4().hex[:6]}.jsonl"
+
+        # 회전 전에 남은 줄을 세고, 센 위치를 새 파일 이름으로 옮김
+        index = self._load_index()
+        self._catch_up(index)
+        os.replace(self.output_path, os.path.join(self.output_dir, rotated_name))
+        index["files"][rotated_name] = index["files"].pop(ACTIVE_FILE, 0)
+        self._save_index(index)
+
+    def _load_index(self) -> Dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as handle:
+                index = json.load(handle)
+            if isinstance(index, dict) and isinstance(index.get("days"), dict) and isinstance(index.get("files"), dict):
+                return index
+        except (OSError, ValueError):
+            pass
+        # 인덱스가 없거나 깨졌으면 모든 파일을 처음부터 다시 셈
+        return {"days": {}, "files": {}}
+
+    def _save_index(self, index: Dict) -> None:
+        index["updated_at"] = datetime.now().isoformat()
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(index, handle, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _merge_day(target: Dict, day: str, day_counts: Dict) -> None:
+        merged = target.setdefault(day, {"total": {"all": 0}, "by_source": {}, "by_type": {}})
+        for group, values in day_counts.items():
+            bucket = merged.setdefault(group, {})
+            for key, value in values.items():
+                bucket[key] = bucket.get(key, 0) + value
+
+    def _catch_up(self, index: Dict) -> bool:
+        """파일별로 인덱스가 센 위치 이후의 완성된 줄만 읽어 합침 (바뀐 것이 있으면 True)"""
+        changed = False
+        pattern = os.path.join(self.output_dir, "growth_leads*.jsonl")
+        for path in sorted(glob.glob(pattern)):
+            name = os.path.basename(path)
+            offset = index["files"].get(name, 0)
+            try:
+                size = os.path.getsize(path)
+                if size == offset:
+                    continue
+                if size < offset:
+                    # 파일이 바깥에서 교체됨 - 처음부터 다시 셈
+                    offset = 0
+                with open(path, "rb") as handle:
+                    handle.seek(offset)
+                    data = handle.read(size - offset)
+            except OSError:
+                continue
+
+            end = data.rfind(b"\n") + 1
+            for raw in data[:end].splitlines():
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    continue
+                day = str(record.get("created_at") or "")[:10] or "unknown"
+                self._merge_day(index["days"], day, {
+                    "total": {"all": 1},
+                    "by_source": {_source_key(record.get("source_page")): 1},
+                    "by_type": {str(record.get("lead_type") or "unknown"): 1},
+                })
+            index["files"][name] = offset + end
+            changed = True
+        return changed
+
+    # =========================
+    # Reads
+    # =========================
+    def summarize(self, date_from: str = None, date_to: str = None) -> Dict:
+        """
+        기간별 리드 수 집계 (인덱스 + 인덱스가 아직 세지 않은 줄만 읽음)
+
+        Args:
+            date_from: 시작일 YYYY-MM-DD (포함)
+            date_to: 종료일 YYYY-MM-DD (포함)
+
+        Returns:
+            Dict: {total, by_source, by_type, by_day}
+        """
+        with self._file_lock():
+            index = self._load_index()
+            if self._catch_up(index):
+                self._save_index(index)
+
+        summary = {"total": 0, "by_source": {}, "by_type": {}, "by_day": {}}
+        for day, day_counts in sorted(index["days"].items()):
+            if (date_from and day < date_from) or (date_to and day > date_to):
+                continue
+            day_total = day_counts.get("total", {}).get("all", 0)
+            summary["total"] += day_total
+            summary["by_day"][day] = day_total
+            for group in ("by_source", "by_type"):
+                for key, value in day_counts.get(group, {}).items():
+                    summary[group][key] = summary[group].get(key, 0) + value
+        return summary
@@ -0,0 +1,854 @@
+"""
+SQLite stand-in for the Supabase client used by SupabaseClient.
+
+Implements the subset of the supabase-py / postgrest-py query builder that
+this codebase uses (table().select/insert/update/upsert/delete, the filter
+methods, or_ logic trees, ordering, paging, exact counts, one level of
+embedded resources) plus the RPC functions defined in supabase/migrations.
+Select it with SUPABASE_BACKEND=sqlite to run and load-test the app without
+a Supabase project; scripts/seed_local_supabase.py fills it with a
+synthetic catalog.
+
+Schema and indexes mirror the Postgres migrations closely enough that the
+same query shapes hit comparable index paths.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT,
+    google_id TEXT UNIQUE,
+    picture TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    last_login TEXT
+);
+
+CREATE TABLE IF NOT EXISTS posts (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    author TEXT NOT NULL DEFAULT 'Anonymous',
+    user_id TEXT REFERENCES users(id) ON DELETE CASCADE,
+    created_at TEXT,
+    updated_at TEXT,
+    search_text TEXT GENERATED ALWAYS AS (
+        lower(coalesce(title, '') || ' ' || coalesce(content, '') || ' ' || coalesce(author, ''))
+    ) VIRTUAL
+);
+CREATE INDEX IF NOT EXISTS idx_posts_created_at_id ON posts(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_posts_title_id ON posts(title, id);
+CREATE INDEX IF NOT EXISTS idx_posts_author ON posts(author);
+CREATE INDEX IF NOT EXISTS idx_posts_user_id ON posts(user_id);
+
+CREATE TABLE IF NOT EXISTS playlists (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    icon_url TEXT,
+    user_id TEXT REFERENCES users(id) ON DELETE CASCADE,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_playlists_user_id ON playlists(user_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS tracks (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    source_id TEXT,
+    title TEXT NOT NULL,
+    artist TEXT,
+    duration_seconds INTEGER,
+    thumbnail_url TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    user_id TEXT REFERENCES users(id) ON DELETE CASCADE,
+    playlist_id TEXT REFERENCES playlists(id) ON DELETE SET NULL,
+    display_order INTEGER,
+    random_key REAL NOT NULL DEFAULT (abs(random()) / 9223372036854775808.0),
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tracks_created_at ON tracks(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_tracks_source ON tracks(source);
+CREATE INDEX IF NOT EXISTS idx_tracks_url ON tracks(url);
+CREATE INDEX IF NOT EXISTS idx_tracks_user_id_display_order ON tracks(user_id, display_order);
+CREATE INDEX IF NOT EXISTS idx_tracks_playlist_id ON tracks(playlist_id, display_order);
+CREATE INDEX IF NOT EXISTS idx_tracks_random_key ON tracks(random_key);
+CREATE INDEX IF NOT EXISTS idx_tracks_user_id_random_key ON tracks(user_id, random_key);
+-- 지표 동기화 대상 선정 (order metadata->stats->>last_synced_at)
+CREATE INDEX IF NOT EXISTS idx_tracks_last_synced_at ON tracks(json_extract("metadata", '$.stats.last_synced_at'));
+
+CREATE TABLE IF NOT EXISTS track_comments (
+    id TEXT PRIMARY KEY,
+    track_id TEXT NOT NULL REFERENCES tracks(id) ON DELETE CASCADE,
+    author TEXT NOT NULL DEFAULT 'Anonymous',
+    content TEXT NOT NULL,
+    user_id TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_track_comments_track_id_created_at ON track_comments(track_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS track_battles (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    track_a_id TEXT,
+    track_b_id TEXT,
+    winner_id TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_track_battles_created_at ON track_battles(created_at DESC);
+
+CREATE TABLE IF NOT EXISTS track_rankings (
+    track_id TEXT PRIMARY KEY REFERENCES tracks(id) ON DELETE CASCADE,
+    wins INTEGER NOT NULL DEFAULT 0,
+    appearances INTEGER NOT NULL DEFAULT 0,
+    elo_rating REAL NOT NULL DEFAULT 1500,
+    last_battle_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_track_rankings_wins ON track_rankings(wins DESC, appearances ASC);
+CREATE INDEX IF NOT EXISTS idx_track_rankings_elo ON track_rankings(elo_rating DESC);
+
+CREATE TABLE IF NOT EXISTS visitor_logs (
+    id TEXT PRIMARY KEY,
+    ip_address TEXT,
+    user_agent TEXT,
+    page_url TEXT,
+    referer TEXT,
+    visited_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_visitor_logs_visited_at ON visitor_logs(visited_at DESC);
+
+CREATE TABLE IF NOT EXISTS growth_leads (
+    id TEXT PRIMARY KEY,
+    lead_type TEXT NOT NULL,
+    email TEXT NOT NULL,
+    name TEXT,
+    company TEXT,
+    budget_range TEXT,
+    goal TEXT,
+    source_page TEXT,
+    referrer TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    user_id TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_growth_leads_created_at ON growth_leads(created_at DESC);
+"""
+
+# 테이블별 기본키 / JSON 컬럼 / 생성 컬럼(응답에서 제외)
+PRIMARY_KEYS = {"track_rankings": "track_id"}
+JSON_COLUMNS = {"tracks": {"metadata"}, "growth_leads": {"metadata"}}
+HIDDEN_COLUMNS = {"posts": {"search_text"}}
+# PostgREST 임베드용 외래키: (기준 테이블, 임베드 테이블) -> (기준 컬럼, 임베드 컬럼)
+EMBEDS = {
+    ("track_rankings", "tracks"): ("track_id", "id"),
+    ("track_comments", "tracks"): ("track_id", "id"),
+    ("tracks", "playlists"): ("playlist_id", "id"),
+    ("tracks", "users"): ("user_id", "id"),
+}
+# tsvector 컬럼은 검색용 텍스트 컬럼으로 대체
+TEXT_SEARCH_COLUMNS = {("posts", "search_vector"): "search_text"}
+
+ELO_K_FACTOR = 32.0
+ELO_BASE_RATING = 1500.0
+
+
+class LocalAPIError(Exception):
+    """postgrest APIError와 같은 형태 (args[0]에 code/message dict)"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__({"code": code, "message": message})
+
+
+class LocalResponse:
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+def _now_iso() -> str:
+    return datetime.now().isoformat()
+
+
+def _column_sql(column: str) -> str:
+    """컬럼 또는 JSON 경로(metadata->stats->>last_synced_at)를 SQL 식으로 변환"""
+    column = column.strip()
+    if "->" in column:
+        parts = re.split(r"->>?", column)
+        base, path = parts[0], parts[1:]
+        return f"json_extract({_quote_ident(base)}, '$.{'.'.join(path)}')"
+    return _quote_ident(column)
+
+
+def _quote_ident(name: str) -> str:
+    if not re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", name):
+        raise LocalAPIError("42703", f"invalid column: {name}")
+    return f'"{name}"'
+
+
+def _split_top_level(text: str, sep: str = ",") -> List[str]:
+    """괄호/따옴표 밖의 구분자로 분리"""
+    parts, depth, quoted, current = [], 0, False, []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\" and quoted and i + 1 < len(text):
+            current.append(text[i:i + 2])
+            i += 2
+            continue
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == sep and depth == 0 and not quoted:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+        i += 1
+    if current:
+        parts.append("".join(current).strip())
+    return [p for p in parts if p]
+
+
+def _unquote(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+
+def _like_pattern(value: str) -> str:
+    # PostgREST는 *를 %로 취급
+    return str(value).replace("*", "%")
+
+
+_OPERATORS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def _condition(column: str, op: str, value: Any) -> Tuple[str, List[Any]]:
+    """단일 필터를 (SQL, 파라미터)로 변환"""
+    col = _column_sql(column)
+    if op in _OPERATORS:
+        return f"{col} {_OPERATORS[op]} ?", [_to_sql_value(value)]
+    # PostgreSQL LIKE처럼 백슬래시를 이스케이프 문자로 사용
+    if op == "like":
+        return f"{col} LIKE ? ESCAPE '\\'", [_like_pattern(value)]
+    if op == "ilike":
+        return f"lower({col}) LIKE lower(?) ESCAPE '\\'", [_like_pattern(value)]
+    if op == "in":
+        values = list(value)
+        if not values:
+            return "0", []
+        return f"{col} IN ({', '.join('?' for _ in values)})", [_to_sql_value(v) for v in values]
+    if op == "is":
+        lowered = str(value).lower()
+        if lowered == "null" or value is None:
+            return f"{col} IS NULL", []
+        return f"{col} IS {1 if lowered == 'true' else 0}", []
+    raise LocalAPIError("PGRST100", f"unsupported operator: {op}")
+
+
+def _to_sql_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _parse_logic_tree(expression: str, joiner: str = "OR") -> Tuple[str, List[Any]]:
+    """PostgREST or/and 표현식 (a.eq.1,and(b.lt.2,c.gt.3)) 을 SQL로 변환"""
+    clauses, params = [], []
+    for part in _split_top_level(expression):
+        match = re.match(r"^(not\.)?(and|or)\((.*)\)$", part, re.S)
+        if match:
+            sql, sub_params = _parse_logic_tree(match.group(3), match.group(2).upper())
+            if match.group(1):
+                sql = f"NOT ({sql})"
+            clauses.append(f"({sql})")
+            params.extend(sub_params)
+            continue
+        column, rest = part.split(".", 1)
+        negate = False
+        if rest.startswith("not."):
+            negate, rest = True, rest[4:]
+        op, raw_value = rest.split(".", 1)
+        if op == "in":
+            value = [_unquote(v) for v in _split_top_level(raw_value.strip("()"))]
+        else:
+            value = _unquote(raw_value)
+        sql, sub_params = _condition(column, op, value)
+        clauses.append(f"NOT ({sql})" if negate else sql)
+        params.extend(sub_params)
+    return f" {joiner} ".join(clauses) or "1", params
+
+
+class _NotProxy:
+    """query.not_.in_(...) 처럼 다음 필터를 부정"""
+
+    def __init__(self, query: "LocalQuery"):
+        self._query = query
+
+    def __getattr__(self, name):
+        method = getattr(self._query, name)
+
+        def negated(*args, **kwargs):
+            before = len(self._query._filters)
+            result = method(*args, **kwargs)
+            sql, params = self._query._filters[before]
+            self._query._filters[before] = (f"NOT ({sql})", params)
+            return result
+
+        return negated
+
+
+class LocalQuery:
+    """postgrest-py 요청 빌더의 SQLite 구현 (이 코드베이스가 쓰는 부분만)"""
+
+    def __init__(self, backend: "LocalSupabase", table: str):
+        self._backend = backend
+        self._table = table
+        self._op = "select"
+        self._columns = "*"
+        self._count = None
+        self._head = False
+        self._filters: List[Tuple[str, List[Any]]] = []
+        self._orders: List[str] = []
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+        self._single = False
+        self._maybe_single = False
+        self._payload: Any = None
+        self._on_conflict: Optional[str] = None
+        self._returning = "representation"
+
+    # ---- operations ----
+    def select(self, columns: str = "*", count: str = None, head: bool = False):
+        self._op, self._columns, self._count, self._head = "select", columns or "*", count, head
+        return self
+
+    def insert(self, json_data, count: str = None, returning: str = "representation", **_):
+        self._op, self._payload, self._returning = "insert", json_data, str(getattr(returning, "value", returning))
+        return self
+
+    def upsert(self, json_data, on_conflict: str = None, returning: str = "representation", **_):
+        self._op, self._payload, self._on_conflict = "upsert", json_data, on_conflict
+        self._returning = str(getattr(returning, "value", returning))
+        return self
+
+    def update(self, json_data, **_):
+        self._op, self._payload = "update", json_data
+        return self
+
+    def delete(self, **_):
+        self._op = "delete"
+        return self
+
+    # ---- filters ----
+    def _add(self, column: str, op: str, value: Any):
+        self._filters.append(_condition(column, op, value))
+        return self
+
+    def eq(self, column, value):
+        return self._add(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._add(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._add(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._add(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._add(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._add(column, "lte", value)
+
+    def like(self, column, pattern):
+        return self._add(column, "like", pattern)
+
+    def ilike(self, column, pattern):
+        return self._add(column, "ilike", pattern)
+
+    def in_(self, column, values):
+        return self._add(column, "in", values)
+
+    def is_(self, column, value):
+        return self._add(column, "is", value)
+
+    def or_(self, filters: str, reference_table: str = None):
+        self._filters.append(_parse_logic_tree(filters, "OR"))
+        return self
+
+    def text_search(self, column: str, query: str, options: Dict = None):
+        """tsvector 검색 대신 검색 텍스트 컬럼에 단어별 LIKE (AND)"""
+        target = TEXT_SEARCH_COLUMNS.get((self._table, column), column)
+        terms = [t for t in re.split(r"\s+", str(query).strip().lower()) if t and t not in {"or", "and"}]
+        for term in terms:
+            self._filters.append((f"{_quote_ident(target)} LIKE ?", [f"%{term.strip(chr(34)).lstrip('-')}%"]))
+        return self
+
+    @property
+    def not_(self):
+        return _NotProxy(self)
+
+    # ---- modifiers ----
+    def order(self, column: str, desc: bool = False, nullsfirst: bool = None, **_):
+        clause = f"{_column_sql(column)} {'DESC' if desc else 'ASC'}"
+        if nullsfirst is not None:
+            clause += " NULLS FIRST" if nullsfirst else " NULLS LAST"
+        self._orders.append(clause)
+        return self
+
+    def limit(self, size: int, **_):
+        self._limit = int(size)
+        return self
+
+    def offset(self, size: int):
+        self._offset = int(size)
+        return self
+
+    def range(self, start: int, end: int, **_):
+        self._offset, self._limit = int(start), int(end) - int(start) + 1
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    def maybe_single(self):
+        self._maybe_single = True
+        return self
+
+    # ---- execution ----
+    def _where(self) -> Tuple[str, List[Any]]:
+        if not self._filters:
+            return "", []
+        params: List[Any] = []
+        for _, p in self._filters:
+            params.extend(p)
+        return " WHERE " + " AND ".join(f"({sql})" for sql, _ in self._filters), params
+
+    def execute(self) -> LocalResponse:
+        if self._op == "select":
+            return self._execute_select()
+        if self._op in ("insert", "upsert"):
+            return self._execute_insert()
+        if self._op == "update":
+            return self._execute_update()
+        return self._execute_delete()
+
+    def _execute_select(self) -> LocalResponse:
+        plain, embeds = self._parse_columns(self._columns)
+        where, params = self._where()
+        conn = self._backend.connection()
+
+        count = None
+        if self._count:
+            count = conn.execute(f'SELECT COUNT(*) FROM "{self._table}"{where}', params).fetchone()[0]
+        if self._head:
+            return LocalResponse([], count)
+
+        # 임베드 조인에 필요한 외래키 컬럼은 함께 조회
+        select_cols = list(plain)
+        extra = []
+        if select_cols != ["*"]:
+            for embed_table, _ in embeds:
+                fk = EMBEDS.get((self._table, embed_table), (None, None))[0]
+                if fk and fk not in select_cols:
+                    select_cols.append(fk)
+                    extra.append(fk)
+        columns_sql = "*" if select_cols == ["*"] else ", ".join(_quote_ident(c) for c in select_cols)
+
+        sql = f'SELECT {columns_sql} FROM "{self._table}"{where}'
+        if self._orders:
+            sql += " ORDER BY " + ", ".join(self._orders)
+        if self._limit is not None or self._offset is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = params + [self._limit if self._limit is not None else -1, self._offset or 0]
+
+        rows = [self._backend.decode_row(self._table, row) for row in conn.execute(sql, params).fetchall()]
+        for embed_table, embed_columns in embeds:
+            self._attach_embed(rows, embed_table, embed_columns)
+        for row in rows:
+            for key in extra:
+                row.pop(key, None)
+
+        if self._single or self._maybe_single:
+            if len(rows) != 1:
+                if self._maybe_single and not rows:
+                    return LocalResponse(None, count)
+                raise LocalAPIError("PGRST116", f"JSON object requested, multiple (or no) rows returned ({len(rows)})")
+            return LocalResponse(rows[0], count)
+        return LocalResponse(rows, count)
+
+    def _parse_columns(self, columns: str):
+        plain, embeds = [], []
+        for token in _split_top_level(columns):
+            match = re.match(r"^(?:\w+:)?(\w+)(?:!\w+)?\((.*)\)$", token, re.S)
+            if match:
+                embeds.append((match.group(1), match.group(2)))
+            else:
+                plain.append(token.strip())
+        return (plain or ["*"]), embeds
+
+    def _attach_embed(self, rows: List[Dict], embed_table: str, embed_columns: str) -> None:
+        fk, target = EMBEDS.get((self._table, embed_table), (None, None))
+        if not fk:
+            raise LocalAPIError("PGRST200", f"no relationship between {self._table} and {embed_table}")
+        keys = sorted({row.get(fk) for row in rows if row.get(fk) is not None})
+        related: Dict[Any, Dict] = {}
+        if keys:
+            cols = [c.strip() for c in _split_top_level(embed_columns)] or ["*"]
+            if cols != ["*"] and target not in cols:
+                cols.append(target)
+            cols_sql = "*" if cols == ["*"] else ", ".join(_quote_ident(c) for c in cols)
+            conn = self._backend.connection()
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                for row in conn.execute(
+                    f'SELECT {cols_sql} FROM "{embed_table}" WHERE "{target}" IN ({placeholders})', chunk
+                ).fetchall():
+                    decoded = self._backend.decode_row(embed_table, row)
+                    related[decoded[target]] = decoded
+        for row in rows:
+            row[embed_table] = related.get(row.get(fk))
+
+    def _rows_payload(self) -> List[Dict]:
+        payload = self._payload
+        return [dict(payload)] if isinstance(payload, dict) else [dict(r) for r in payload or []]
+
+    def _execute_insert(self) -> LocalResponse:
+        rows = [self._backend.prepare_insert(self._table, row) for row in self._rows_payload()]
+        if not rows:
+            return LocalResponse([])
+        pk = PRIMARY_KEYS.get(self._table, "id")
+        conflict = self._on_conflict or pk
+        inserted_ids = []
+        with self._backend.write() as conn:
+            for row in rows:
+                columns = list(row.keys())
+                sql = (
+                    f'INSERT INTO "{self._table}" ({", ".join(_quote_ident(c) for c in columns)}) '
+                    f'VALUES ({", ".join("?" for _ in columns)})'
+                )
+                if self._op == "upsert":
+                    updates = [c for c in columns if c != conflict]
+                    sql += f" ON CONFLICT({_quote_ident(conflict)}) DO " + (
+                        "UPDATE SET " + ", ".join(f"{_quote_ident(c)} = excluded.{_quote_ident(c)}" for c in updates)
+                        if updates else "NOTHING"
+                    )
+                conn.execute(sql, [_to_sql_value(row[c]) for c in columns])
+                inserted_ids.append(row.get(pk))
+                if self._table == "track_battles" and self._op == "insert":
+                    self._backend.apply_battle(conn, row)
+
+        if self._returning == "minimal":
+            return LocalResponse([])
+        return LocalResponse(self._backend.fetch_by_ids(self._table, pk, inserted_ids))
+
+    def _execute_update(self) -> LocalResponse:
+        data = dict(self._payload or {})
+        if not data:
+            return LocalResponse([])
+        where, params = self._where()
+        pk = PRIMARY_KEYS.get(self._table, "id")
+        conn = self._backend.connection()
+        ids = [r[0] for r in conn.execute(f'SELECT "{pk}" FROM "{self._table}"{where}', params).fetchall()]
+        if not ids:
+            return LocalResponse([])
+        assignments = ", ".join(f"{_quote_ident(c)} = ?" for c in data)
+        with self._backend.write() as wconn:
+            wconn.execute(
+                f'UPDATE "{self._table}" SET {assignments}{where}',
+                [_to_sql_value(v) for v in data.values()] + params,
+            )
+        return LocalResponse(self._backend.fetch_by_ids(self._table, pk, ids))
+
+    def _execute_delete(self) -> LocalResponse:
+        where, params = self._where()
+        deleted = self._backend.connection().execute(
+            f'SELECT * FROM "{self._table}"{where}', params
+        ).fetchall()
+        with self._backend.write() as conn:
+            conn.execute(f'DELETE FROM "{self._table}"{where}', params)
+        return LocalResponse([self._backend.decode_row(self._table, r) for r in deleted])
+
+
+class LocalRPC:
+    def __init__(self, backend: "LocalSupabase", name: str, params: Dict):
+        self._backend = backend
+        self._name = name
+        self._params = params or {}
+
+    def execute(self) -> LocalResponse:
+        handler = getattr(self._backend, f"rpc_{self._name}", None)
+        if handler is None:
+            raise LocalAPIError("PGRST202", f"Could not find the function public.{self._name}")
+        return LocalResponse(handler(**self._params))
+
+
+class _WriteContext:
+    def __init__(self, backend: "LocalSupabase"):
+        self._backend = backend
+        self._conn = None
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._backend._write_lock.acquire()
+        self._conn = self._backend.connection()
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._backend._write_lock.release()
+        return False
+
+
+class LocalSupabase:
+    """SQLite 파일 하나를 Supabase 프로젝트처럼 다루는 클라이언트"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._columns: Dict[str, List[str]] = {}
+        self.connection().executescript(SCHEMA)
+
+    # ---- connections ----
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def write(self) -> _WriteContext:
+        return _WriteContext(self)
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    from_ = table
+
+    def rpc(self, name: str, params: Dict = None) -> LocalRPC:
+        return LocalRPC(self, name, params)
+
+    # ---- row helpers ----
+    def columns(self, table: str) -> List[str]:
+        if table not in self._columns:
+            info = self.connection().execute(f'PRAGMA table_xinfo("{table}")').fetchall()
+            self._columns[table] = [row["name"] for row in info]
+        return self._columns[table]
+
+    def decode_row(self, table: str, row: sqlite3.Row) -> Dict:
+        data = dict(row)
+        for key in HIDDEN_COLUMNS.get(table, ()):
+            data.pop(key, None)
+        for key in JSON_COLUMNS.get(table, ()):
+            if isinstance(data.get(key), str):
+                try:
+                    data[key] = json.loads(data[key])
+                except ValueError:
+                    pass
+        return data
+
+    def prepare_insert(self, table: str, row: Dict) -> Dict:
+        columns = self.columns(table)
+        now = _now_iso()
+        pk = PRIMARY_KEYS.get(table, "id")
+        prepared = {k: v for k, v in row.items() if k in columns}
+        if pk == "id" and not prepared.get("id"):
+            prepared["id"] = str(uuid.uuid4())
+        for key in ("created_at", "updated_at"):
+            if key in columns and not prepared.get(key):
+                prepared[key] = now
+        if table == "visitor_logs" and not prepared.get("visited_at"):
+            prepared["visited_at"] = now
+        return prepared
+
+    def fetch_by_ids(self, table: str, pk: str, ids: List[Any]) -> List[Dict]:
+        ids = [i for i in ids if i is not None]
+        if not ids:
+            return []
+        conn = self.connection()
+        rows = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows.extend(
+                self.decode_row(table, r)
+                for r in conn.execute(
+                    f'SELECT * FROM "{table}" WHERE "{pk}" IN ({", ".join("?" for _ in chunk)})', chunk
+                ).fetchall()
+            )
+        return rows
+
+    # ---- worldcup rankings (track_battles 트리거 대응) ----
+    def apply_battle(self, conn: sqlite3.Connection, battle: Dict) -> None:
+        track_a, track_b, winner = battle.get("track_a_id"), battle.get("track_b_id"), battle.get("winner_id")
+        if not track_a or not track_b or track_a == track_b or winner not in (track_a, track_b):
+            return
+        loser = track_b if winner == track_a else track_a
+        # 삭제된 곡이 낀 배틀은 건너뜀 (track_rankings FK)
+        found = conn.execute("SELECT COUNT(*) FROM tracks WHERE id IN (?, ?)", (winner, loser)).fetchone()[0]
+        if found < 2:
+            return
+        at = battle.get("created_at") or _now_iso()
+        conn.executemany(
+            "INSERT INTO track_rankings (track_id, updated_at) VALUES (?, ?) ON CONFLICT(track_id) DO NOTHING",
+            [(winner, at), (loser, at)],
+        )
+        ratings = dict(conn.execute(
+            "SELECT track_id, elo_rating FROM track_rankings WHERE track_id IN (?, ?)", (winner, loser)
+        ).fetchall())
+        expected = 1 / (1 + math.pow(10, (ratings[loser] - ratings[winner]) / 400))
+        delta = ELO_K_FACTOR * (1 - expected)
+        conn.execute(
+            "UPDATE track_rankings SET wins = wins + 1, appearances = appearances + 1, elo_rating = elo_rating + ?, "
+            "last_battle_at = max(coalesce(last_battle_at, ?), ?), updated_at = ? WHERE track_id = ?",
+            (delta, at, at, at, winner),
+        )
+        conn.execute(
+            "UPDATE track_rankings SET appearances = appearances + 1, elo_rating = elo_rating - ?, "
+            "last_battle_at = max(coalesce(last_battle_at, ?), ?), updated_at = ? WHERE track_id = ?",
+            (delta, at, at, at, loser),
+        )
+
+    # ---- RPC (supabase/migrations 함수와 동일한 동작) ----
+    def rpc_sample_tracks(self, p_count: int = 2, p_user_id: str = None, p_exclude_ids: List[str] = None) -> List[Dict]:
+        conn = self.connection()
+        excluded = list(p_exclude_ids or [])
+        picks = []
+        for _ in range(max(int(p_count or 0), 0)):
+            pivot = random.random()
+            pick = None
+            for op in (">=", "<"):
+                sql = f"SELECT * FROM tracks WHERE random_key {op} ?"
+                params: List[Any] = [pivot]
+                if p_user_id:
+                    sql += " AND user_id = ?"
+                    params.append(p_user_id)
+                if excluded:
+                    sql += f" AND id NOT IN ({', '.join('?' for _ in excluded)})"
+                    params.extend(excluded)
+                pick = conn.execute(sql + " ORDER BY random_key LIMIT 1", params).fetchone()
+                if pick:
+                    break
+            if not pick:
+                break
+            row = self.decode_row("tracks", pick)
+            excluded.append(row["id"])
+            picks.append(row)
+        return picks
+
+    def rpc_reorder_tracks(self, p_orders: List[Dict] = None, p_user_id: str = None) -> int:
+        updated = 0
+        now = _now_iso()
+        with self.write() as conn:
+            for item in p_orders or []:
+                if item.get("order") is None:
+                    continue
+                sql = "UPDATE tracks SET display_order = ?, updated_at = ? WHERE id = ?"
+                params = [int(item["order"]), now, item.get("id")]
+                if p_user_id:
+                    sql += " AND user_id = ?"
+                    params.append(p_user_id)
+                updated += conn.execute(sql, params).rowcount
+        return updated
+
+    def rpc_apply_track_stats_updates(self, p_updates: List[Dict] = None) -> int:
+        updated = 0
+        now = _now_iso()
+        with self.write() as conn:
+            for item in p_updates or []:
+                row = conn.execute(
+                    "SELECT metadata, source_id, thumbnail_url, duration_seconds, artist, title FROM tracks WHERE id = ?",
+                    (item.get("id"),),
+                ).fetchone()
+                if row is None:
+                    continue
+                current = self.decode_row("tracks", row)
+                metadata = current.get("metadata") if isinstance(current.get("metadata"), dict) else {}
+                incoming = item.get("metadata") or {}
+                metadata = {
+                    **metadata,
+                    "provider": {**(metadata.get("provider") or {}), **(incoming.get("provider") or {})},
+                    "stats": incoming.get("stats") or metadata.get("stats") or {},
+                }
+                values = {"metadata": metadata, "updated_at": now}
+                # 기본 컬럼은 비어 있을 때만 채움
+                for column in ("source_id", "thumbnail_url", "duration_seconds", "artist", "title"):
+                    if not current.get(column) and item.get(column):
+                        values[column] = item[column]
+                assignments = ", ".join(f"{_quote_ident(c)} = ?" for c in values)
+                updated += conn.execute(
+                    f"UPDATE tracks SET {assignments} WHERE id = ?",
+                    [_to_sql_value(v) for v in values.values()] + [item.get("id")],
+                ).rowcount
+        return updated
+
+    def rpc_rebuild_track_rankings(self) -> int:
+        count = 0
+        with self.write() as conn:
+            conn.execute("DELETE FROM track_rankings")
+            battles = conn.execute(
+                "SELECT track_a_id, track_b_id, winner_id, created_at FROM track_battles ORDER BY created_at, id"
+            ).fetchall()
+            for battle in battles:
+                self.apply_battle(conn, dict(battle))
+                count += 1
+        return count
+
+
+# 경로별 공유 인스턴스
+_local_clients: Dict[str, LocalSupabase] = {}
+_local_clients_lock = threading.Lock()
+
+
+def get_local_supabase(path: str) -> LocalSupabase:
+    """경로별 LocalSupabase 공유 인스턴스 반환"""
+    key = os.path.abspath(path)
+    with _local_clients_lock:
+        client = _local_clients.get(key)
+        if client is None:
+            client = LocalSupabase(key)
+            _local_clients[key] = client
+        return client
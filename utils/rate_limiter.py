@@ -0,0 +1,276 @@
+"""
+Token-bucket rate limiting for write endpoints.
+
+Buckets are keyed by rule name plus a caller key (usually the client IP).
+Two interchangeable backends hold bucket state:
+
+- MemoryBucketStore: per-process, bounded by LRU size and dropped once a
+  bucket would be full again (TTL), so unique IPs never accumulate.
+- SQLiteBucketStore: one local SQLite file shared by every gunicorn worker
+  on the host (point it at /dev/shm to keep it in shared memory).
+
+Endpoints opt in with the ``RateLimiter.limit`` decorator.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Tuple
+
+from flask import jsonify, make_response
+
+try:
+    from utils import app_settings
+except ImportError:
+    import app_settings
+
+
+class MemoryBucketStore:
+    """In-process bucket store with LRU + TTL eviction."""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> (tokens, updated_at, full_at)
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def take(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.time()
+        with self._lock:
+            self._evict_expired(now)
+            tokens, updated_at, _ = self._buckets.pop(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            retry_after = 0.0 if allowed else (cost - tokens) / refill_per_second
+
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / refill_per_second)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed, retry_after
+
+    def refund(self, key: str, capacity: float, cost: float = 1.0) -> None:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return
+            tokens, updated_at, full_at = bucket
+            self._buckets[key] = (min(capacity, tokens + cost), updated_at, full_at)
+
+    def _evict_expired(self, now: float) -> None:
+        # 가장 오래 안 쓰인 쪽부터 이미 가득 찼을 버킷은 버림 (가득 찬 버킷 = 기록 없음과 동일)
+        while self._buckets:
+            key, (_, _, full_at) = next(iter(self._buckets.items()))
+            if full_at > now:
+                break
+            self._buckets.popitem(last=False)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._buckets)
+
+
+class SQLiteBucketStore:
+    """Bucket store in a local SQLite file shared across worker processes."""
+
+    PRUNE_EVERY = 500
+
+    def __init__(self, path: str, busy_timeout_ms: int = 2000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._ops = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            " bucket_key TEXT PRIMARY KEY,"
+            " tokens REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " full_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_limit_buckets_full_at ON rate_limit_buckets(full_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def take(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limit_buckets WHERE bucket_key = ?", (key,)
+            ).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * refill_per_second)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            retry_after = 0.0 if allowed else (cost - tokens) / refill_per_second
+
+            conn.execute(
+                "INSERT INTO rate_limit_buckets (bucket_key, tokens, updated_at, full_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(bucket_key) DO UPDATE SET tokens = excluded.tokens, "
+                "updated_at = excluded.updated_at, full_at = excluded.full_at",
+                (key, tokens, now, now + (capacity - tokens) / refill_per_second),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._ops += 1
+        if self._ops % self.PRUNE_EVERY == 0:
+            self._prune(now)
+        return allowed, retry_after
+
+    def refund(self, key: str, capacity: float, cost: float = 1.0) -> None:
+        self._conn().execute(
+            "UPDATE rate_limit_buckets SET tokens = MIN(?, tokens + ?) WHERE bucket_key = ?",
+            (capacity, cost, key),
+        )
+
+    def _prune(self, now: float) -> None:
+        try:
+            self._conn().execute("DELETE FROM rate_limit_buckets WHERE full_at <= ?", (now,))
+        except sqlite3.Error:
+            pass
+
+    def size(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM rate_limit_buckets").fetchone()[0]
+
+
+class RateLimiter:
+    """Token-bucket limiter applied to Flask views via ``limit``."""
+
+    def __init__(self, store=None, console_log=None):
+        self.console_log = console_log or print
+        self.store = store or MemoryBucketStore()
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._limited = 0
+
+    def hit(self, rule: str, key: str, capacity: float, per_seconds: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        버킷에서 토큰을 꺼냄
+
+        Args:
+            rule: 규칙 이름 (엔드포인트 단위)
+            key: 호출자 키 (IP 등)
+            capacity: 버킷 크기 (연속 허용 횟수)
+            per_seconds: 토큰 1개가 다시 차는 데 걸리는 시간
+
+        Returns:
+            (허용 여부, 다시 시도까지 남은 초)
+        """
+        try:
+            allowed, retry_after = self.store.take(f"{rule}:{key}", capacity, 1.0 / per_seconds, cost)
+        except Exception as exc:
+            # 저장소 오류로 서비스가 막히지 않도록 허용 처리
+            self.console_log(f"[RateLimit] 버킷 조회 실패 (허용 처리): {exc}")
+            return True, 0.0
+        with self._lock:
+            if allowed:
+                self._allowed += 1
+            else:
+                self._limited += 1
+        return allowed, retry_after
+
+    def refund(self, rule: str, key: str, capacity: float, cost: float = 1.0) -> None:
+        try:
+            self.store.refund(f"{rule}:{key}", capacity, cost)
+        except Exception as exc:
+            self.console_log(f"[RateLimit] 토큰 반환 실패: {exc}")
+
+    def limit(
+        self,
+        rule: str,
+        per_seconds: float,
+        key_func: Callable[[], str],
+        capacity: float = 1,
+        message: str = "너무 빠르게 요청하고 있어요. 잠시 후 다시 시도해주세요.",
+        refund_on_error: bool = True,
+    ):
+        """
+        뷰 함수에 토큰 버킷 제한 적용
+
+        한도를 넘으면 429와 Retry-After 헤더를 반환한다. message에는 {retry_after}(초)를 쓸 수 있다.
+        refund_on_error이면 뷰가 4xx/5xx를 반환하거나 예외를 던진 경우 토큰을 돌려준다
+        (검증 실패나 저장 실패는 제출 횟수로 세지 않음).
+        """
+
+        def decorator(view):
+            @wraps(view)
+            def wrapped(*args, **kwargs):
+                key = key_func() or "unknown"
+                allowed, retry_after = self.hit(rule, key, capacity, per_seconds)
+                if not allowed:
+                    seconds = max(1, int(math.ceil(retry_after)))
+                    response = make_response(
+                        jsonify({"success": False, "error": message.format(retry_after=seconds)}), 429
+                    )
+                    response.headers["Retry-After"] = str(seconds)
+                    return response
+
+                try:
+                    result = view(*args, **kwargs)
+                except Exception:
+                    if refund_on_error:
+                        self.refund(rule, key, capacity)
+                    raise
+
+                if refund_on_error and make_response(result).status_code >= 400:
+                    self.refund(rule, key, capacity)
+                return result
+
+            return wrapped
+
+        return decorator
+
+    def get_status(self):
+        with self._lock:
+            return {
+                "backend": type(self.store).__name__,
+                "buckets": self.store.size(),
+                "allowed": self._allowed,
+                "limited": self._limited,
+            }
+
+
+# 전역 limiter 인스턴스
+_global_rate_limiter = None
+
+
+def get_rate_limiter(console_log=None) -> RateLimiter:
+    """설정(RATE_LIMIT_BACKEND)에 맞는 전역 limiter 반환"""
+    global _global_rate_limiter
+    if _global_rate_limiter is None:
+        store = None
+        if app_settings.RATE_LIMIT_BACKEND == "sqlite":
+            try:
+                store = SQLiteBucketStore(app_settings.RATE_LIMIT_SQLITE_PATH)
+            except Exception as exc:
+                (console_log or print)(f"[RateLimit] SQLite 저장소 초기화 실패, 메모리 저장소 사용: {exc}")
+        if store is None:
+            store = MemoryBucketStore(max_keys=app_settings.RATE_LIMIT_MAX_KEYS)
+        _global_rate_limiter = RateLimiter(store=store, console_log=console_log)
+    return _global_rate_limiter
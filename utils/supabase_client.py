@@ -3,9 +3,14 @@
 Supabase 클라이언트 모듈
 PostgreSQL 기반 클라우드 데이터베이스 연동
 """
+import base64
+import json
 import os
 import sys
 import random
+import threading
+import time
+import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -23,6 +28,67 @@ except ImportError:
     Client = None
     create_client = None
 
+try:
+    from supabase import ClientOptions
+except ImportError:
+    try:
+        from supabase.lib.client_options import ClientOptions
+    except ImportError:
+        ClientOptions = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+# track_rankings.elo_rating 기본값 (마이그레이션의 DEFAULT와 동일)
+RANKING_BASE_RATING = 1500.0
+
+# posts 조회 컬럼 (검색용 생성 컬럼 search_text/search_vector는 응답에서 제외)
+POST_COLUMNS = "id, title, content, author, user_id, created_at, updated_at"
+
+# 다이어리 정렬 방식 -> (정렬 컬럼, 내림차순 여부). 동률은 id로 같은 방향 정렬
+POST_SORTS = {
+    "latest": ("created_at", True),
+    "oldest": ("created_at", False),
+    "title": ("title", False),
+}
+
+
+def encode_post_cursor(post: Dict, sort: str = "latest") -> Optional[str]:
+    """게시글 1건의 (정렬 키, id)를 키셋 페이지네이션 커서 문자열로 인코딩"""
+    if not post:
+        return None
+    column, _ = POST_SORTS.get(sort, POST_SORTS["latest"])
+    raw = json.dumps([post.get(column), str(post.get("id"))], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_post_cursor(cursor: str) -> Optional[tuple]:
+    """커서 문자열을 (정렬 키, id)로 디코딩 (잘못된 값이면 None)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, post_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        if value is None or not post_id:
+            return None
+        return str(value), str(uuid.UUID(str(post_id)))
+    except Exception:
+        return None
+
+
+def _quote_filter_value(value: str) -> str:
+    """PostgREST or 필터 안에서 쓸 수 있도록 값을 큰따옴표로 감쌈"""
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _escape_like(value: str) -> str:
+    """LIKE/ILIKE 패턴에서 사용자 입력의 \\, %, _ 를 문자 그대로 매치하도록 이스케이프"""
+    return str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 
 class SupabaseClient:
     """
@@ -33,15 +99,36 @@ class SupabaseClient:
     # visitor_logs 테이블이 없는 환경에서 에러 로그가 과도하게 쌓이는 것을 방지
     # (기능 자체가 핵심이 아니므로, 테이블 미존재 시 전체적으로 자동 비활성화)
     _visitor_logging_disabled_global = False
+
+    # 프로세스 단위로 공유하는 Supabase 클라이언트 풀 ((url, key) -> Client)
+    # 요청마다 create_client로 새 HTTP 세션을 만들지 않고 keep-alive 연결을 재사용
+    _shared_clients: Dict[tuple, "Client"] = {}
+    _shared_lock = threading.Lock()
+    _shared_pid = os.getpid()
+    # 월드컵 순위 캐시: (limit, order_by) -> (저장 시각, rankings)
+    _rankings_cache: Dict[tuple, tuple] = {}
     
-    def __init__(self, url: str = None, key: str = None):
+    def __init__(self, url: str = None, key: str = None, pooled: bool = True):
         """
         초기화
         
         Args:
             url: Supabase 프로젝트 URL
             key: Supabase API 키 (anon key)
+            pooled: True면 프로세스 공유 클라이언트 재사용, False면 새 클라이언트 생성
+
+        SUPABASE_BACKEND=sqlite이면 Supabase 대신 로컬 SQLite 백엔드(utils/local_supabase.py)를 사용
         """
+        if app_settings.SUPABASE_BACKEND == "sqlite":
+            try:
+                from utils.local_supabase import get_local_supabase
+            except ImportError:
+                from local_supabase import get_local_supabase
+            self.url = f"sqlite:///{app_settings.SUPABASE_SQLITE_PATH}"
+            self.key = None
+            self.client = get_local_supabase(app_settings.SUPABASE_SQLITE_PATH)
+            return
+
         if Client is None or create_client is None:
             raise ImportError("supabase가 설치되지 않았습니다. 'pip install supabase'를 실행하세요.")
         
@@ -51,10 +138,82 @@ class SupabaseClient:
         if not self.url or not self.key:
             raise ValueError("SUPABASE_URL과 SUPABASE_KEY가 설정되지 않았습니다.")
         
-        # Supabase 클라이언트 초기화
-        self.client: Client = create_client(self.url, self.key)
+        # Supabase 클라이언트 초기화 (기본: 프로세스 공유 풀 사용)
+        if pooled:
+            self.client: Client = SupabaseClient._get_shared_client(self.url, self.key)
+        else:
+            self.client: Client = create_client(self.url, self.key)
 
         # 인스턴스별 플래그는 두지 않고, 전역(class) 플래그를 사용
+
+    @staticmethod
+    def _create_pooled_client(url: str, key: str) -> "Client":
+        """커넥션 풀 설정을 적용한 Supabase 클라이언트 생성"""
+        if httpx is None or ClientOptions is None:
+            return create_client(url, key)
+
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=app_settings.SUPABASE_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=app_settings.SUPABASE_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=app_settings.SUPABASE_POOL_KEEPALIVE_EXPIRY,
+            ),
+            timeout=app_settings.SUPABASE_HTTP_TIMEOUT,
+        )
+        try:
+            options = ClientOptions(
+                httpx_client=http_client,
+                postgrest_client_timeout=app_settings.SUPABASE_HTTP_TIMEOUT,
+            )
+        except TypeError:
+            # httpx_client 옵션을 지원하지 않는 supabase-py 버전: 기본 세션을 쓰되 클라이언트는 계속 공유
+            http_client.close()
+            return create_client(url, key)
+        return create_client(url, key, options=options)
+
+    @classmethod
+    def _get_shared_client(cls, url: str, key: str) -> "Client":
+        """(url, key)별 공유 클라이언트 반환 (fork 이후에는 자식 프로세스에서 새로 생성)"""
+        if cls._shared_pid != os.getpid():
+            cls.reset_pool()
+
+        pool_key = (url, key)
+        client = cls._shared_clients.get(pool_key)
+        if client is not None:
+            return client
+
+        with cls._shared_lock:
+            client = cls._shared_clients.get(pool_key)
+            if client is None:
+                client = cls._create_pooled_client(url, key)
+                cls._shared_clients[pool_key] = client
+            return client
+
+    @classmethod
+    def reset_pool(cls) -> None:
+        """
+        공유 클라이언트 풀 초기화 (gunicorn fork 직후 자식 프로세스에서 호출)
+
+        부모 프로세스의 소켓/TLS 세션을 자식이 닫으면 부모 연결이 깨질 수 있으므로
+        close 하지 않고 참조만 버린 뒤 자식 전용 풀을 새로 만든다.
+        """
+        cls._shared_lock = threading.Lock()
+        cls._shared_clients = {}
+        cls._shared_pid = os.getpid()
+
+    def _count_rows(self, table: str, apply_filters=None) -> int:
+        """
+        count="exact" + head 요청으로 행 수만 조회 (행 데이터는 전송하지 않음)
+
+        Args:
+            table: 테이블 이름
+            apply_filters: 쿼리 빌더를 받아 필터를 적용해 반환하는 함수 (선택)
+        """
+        query = self.client.table(table).select("id", count="exact", head=True)
+        if apply_filters:
+            query = apply_filters(query)
+        response = query.execute()
+        return response.count if response.count else 0
     
     def create_post(self, title: str, content: str, author: str = "Anonymous", user_id: str = None) -> Optional[str]:
         """
@@ -152,7 +311,7 @@ class SupabaseClient:
             List[Dict]: 게시글 리스트
         """
         try:
-            query = self.client.table("posts").select("*")
+            query = self.client.table("posts").select(POST_COLUMNS)
             
             # user_id가 제공되면 필터링
             if user_id:
@@ -172,6 +331,122 @@ class SupabaseClient:
             print(f"[ERROR] Supabase 게시글 조회 실패: {e}")
             return []
     
+    def search_posts(
+        self,
+        search: str = None,
+        author: str = None,
+        date_from: str = None,
+        date_to: str = None,
+        sort: str = "latest",
+        limit: int = 20,
+        after: str = None,
+        before: str = None,
+        search_mode: str = "ilike",
+        with_count: bool = False,
+    ) -> Dict:
+        """
+        게시글 검색 (검색/필터/정렬/키셋 페이지네이션을 모두 DB에서 처리)
+        
+        Args:
+            search: 검색어 (제목/본문/작성자)
+            author: 작성자 부분 일치 필터
+            date_from: 작성일 시작 (ISO, 포함)
+            date_to: 작성일 끝 (ISO, 미포함)
+            sort: "latest" | "oldest" | "title"
+            limit: 페이지 크기
+            after: 다음 페이지 커서 (이전 응답의 next_cursor)
+            before: 이전 페이지 커서 (이전 응답의 prev_cursor)
+            search_mode: "ilike" (부분 문자열, trigram 인덱스) 또는 "fts" (tsvector 전문 검색)
+            with_count: 필터 조건 전체 결과 수도 함께 조회 (커서 조건 제외)
+        
+        Returns:
+            Dict: {posts, next_cursor, prev_cursor, has_next, has_prev, total}
+        """
+        empty = {"posts": [], "next_cursor": None, "prev_cursor": None, "has_next": False, "has_prev": False, "total": 0}
+        sort = sort if sort in POST_SORTS else "latest"
+        column, descending = POST_SORTS[sort]
+        search = (search or "").strip()
+        author = (author or "").strip()
+        
+        def apply_filters(query):
+            if search:
+                if search_mode == "fts":
+                    query = query.text_search(
+                        "search_vector", search, options={"config": "simple", "type": "websearch"}
+                    )
+                else:
+                    query = query.ilike("search_text", f"%{_escape_like(search.lower())}%")
+            if author:
+                query = query.ilike("author", f"%{_escape_like(author)}%")
+            if date_from:
+                query = query.gte("created_at", date_from)
+            if date_to:
+                query = query.lt("created_at", date_to)
+            return query
+        
+        try:
+            cursor = decode_post_cursor(before) if before else decode_post_cursor(after)
+            backward = bool(before and cursor)
+            # 이전 페이지는 정렬을 뒤집어 가져온 뒤 다시 뒤집는다
+            query_desc = descending != backward
+            
+            query = apply_filters(self.client.table("posts").select(POST_COLUMNS))
+            if cursor:
+                value, post_id = cursor
+                op = "lt" if query_desc else "gt"
+                quoted = _quote_filter_value(value)
+                query = query.or_(f"{column}.{op}.{quoted},and({column}.eq.{quoted},id.{op}.{post_id})")
+            
+            response = (
+                query
+                .order(column, desc=query_desc)
+                .order("id", desc=query_desc)
+                .limit(limit + 1)
+                .execute()
+            )
+            rows = response.data or []
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            if backward:
+                rows.reverse()
+            
+            total = None
+            if with_count:
+                total = self._count_rows("posts", apply_filters)
+            
+            return {
+                "posts": rows,
+                "next_cursor": encode_post_cursor(rows[-1], sort) if rows else None,
+                "prev_cursor": encode_post_cursor(rows[0], sort) if rows else None,
+                "has_next": has_more if not backward else bool(cursor),
+                "has_prev": bool(cursor) if not backward else has_more,
+                "total": total,
+            }
+        except Exception as e:
+            print(f"[ERROR] Supabase 게시글 검색 실패: {e}")
+            return empty
+    
+    def count_posts(self, user_id: str = None, raise_errors: bool = False) -> int:
+        """
+        게시글 수 조회 (서버 측 COUNT)
+        
+        Args:
+            user_id: 사용자 ID (None이면 전체 게시글)
+            raise_errors: True면 조회 실패 시 0 대신 예외를 그대로 올림
+        
+        Returns:
+            int: 게시글 수
+        """
+        try:
+            if user_id:
+                return self._count_rows("posts", lambda q: q.eq("user_id", user_id))
+            return self._count_rows("posts")
+        except Exception as e:
+            print(f"[ERROR] Supabase 게시글 count 조회 실패: {e}")
+            if raise_errors:
+                raise
+            return 0
+    
     def get_post(self, post_id: str) -> Optional[Dict]:
         """
         게시글 상세 조회
@@ -185,7 +460,7 @@ class SupabaseClient:
         try:
             response = (
                 self.client.table("posts")
-                .select("*")
+                .select(POST_COLUMNS)
                 .eq("id", post_id)
                 .single()
                 .execute()
@@ -289,6 +564,26 @@ class SupabaseClient:
             print(f"[ERROR] Supabase tracks 조회 실패: {e}")
             return []
 
+    def count_tracks(self, user_id: str = None, playlist_id: str = None, raise_errors: bool = False) -> int:
+        """곡 수 조회 (서버 측 COUNT, 필터 규칙은 get_tracks와 동일, raise_errors면 실패 시 예외)"""
+        def apply_filters(query):
+            if user_id:
+                query = query.eq("user_id", user_id)
+            if playlist_id is not None:
+                if playlist_id == "":
+                    query = query.is_("playlist_id", "null")
+                else:
+                    query = query.eq("playlist_id", playlist_id)
+            return query
+
+        try:
+            return self._count_rows("tracks", apply_filters)
+        except Exception as e:
+            print(f"[ERROR] Supabase tracks count 조회 실패: {e}")
+            if raise_errors:
+                raise
+            return 0
+
     def get_track(self, track_id: str) -> Optional[Dict]:
         """곡 상세 조회"""
         try:
@@ -438,13 +733,7 @@ class SupabaseClient:
     def get_track_comment_count(self, track_id: str) -> int:
         """곡 코멘트 총 개수 조회"""
         try:
-            response = (
-                self.client.table("track_comments")
-                .select("id", count="exact")
-                .eq("track_id", track_id)
-                .execute()
-            )
-            return response.count if response.count else 0
+            return self._count_rows("track_comments", lambda q: q.eq("track_id", track_id))
         except Exception as e:
             print(f"[ERROR] Supabase track_comments count 조회 실패: {e}")
             return 0
@@ -471,6 +760,90 @@ class SupabaseClient:
             print(f"[ERROR] Supabase tracks 업데이트 실패: {e}")
             return False
     
+    def get_tracks_by_ids(self, track_ids: List[str]) -> List[Dict]:
+        """여러 곡을 한 번의 in_ 쿼리로 조회"""
+        try:
+            if not track_ids:
+                return []
+            response = (
+                self.client.table("tracks")
+                .select("*")
+                .in_("id", list(track_ids))
+                .execute()
+            )
+            return response.data if response.data else []
+        except Exception as e:
+            print(f"[ERROR] Supabase tracks(ids) 조회 실패: {e}")
+            return []
+
+    def get_stalest_synced_tracks(self, limit: int = 50, sources: List[str] = None) -> List[Dict]:
+        """외부 지표 동기화가 가장 오래된(또는 한 번도 안 된) 곡 목록"""
+        try:
+            query = self.client.table("tracks").select("*")
+            if sources:
+                query = query.in_("source", list(sources))
+            response = (
+                query
+                .order("metadata->stats->>last_synced_at", desc=False, nullsfirst=True)
+                .limit(limit)
+                .execute()
+            )
+            return response.data if response.data else []
+        except Exception as e:
+            print(f"[ERROR] Supabase stale tracks 조회 실패: {e}")
+            return []
+
+    def get_track_comment_counts(self, track_ids: List[str]) -> Dict[str, int]:
+        """여러 곡의 코멘트 수를 한 번의 쿼리로 집계"""
+        counts = {str(track_id): 0 for track_id in track_ids or []}
+        try:
+            if not counts:
+                return counts
+            response = (
+                self.client.table("track_comments")
+                .select("track_id")
+                .in_("track_id", list(counts.keys()))
+                .execute()
+            )
+            for row in response.data or []:
+                track_id = str(row.get("track_id"))
+                if track_id in counts:
+                    counts[track_id] += 1
+            return counts
+        except Exception as e:
+            print(f"[ERROR] Supabase track_comments counts 조회 실패: {e}")
+            return counts
+
+    def bulk_update_tracks(self, rows: List[Dict]) -> bool:
+        """
+        곡 통계 갱신을 한 번에 반영 (apply_track_stats_updates RPC)
+
+        전체 행을 다시 쓰지 않으므로 조회 이후 사용자가 바꾼 제목/순서/metadata가 유지된다.
+        metadata는 서버에서 병합하고 기본 컬럼은 비어 있을 때만 채운다.
+        RPC가 없으면 곡별로 바뀐 컬럼만 UPDATE한다.
+
+        Args:
+            rows: id와 바뀐 컬럼만 담은 리스트 (TrackStatsService.build_track_update 결과)
+        """
+        if not rows:
+            return True
+
+        try:
+            self.client.rpc("apply_track_stats_updates", {"p_updates": rows}).execute()
+            return True
+        except Exception as e:
+            print(f"[WARN] Supabase apply_track_stats_updates RPC 실패, 곡별 업데이트로 대체: {e}")
+
+        try:
+            now_iso = datetime.now().isoformat()
+            for row in rows:
+                changes = {key: value for key, value in row.items() if key != "id"}
+                self.client.table("tracks").update({**changes, "updated_at": now_iso}).eq("id", row["id"]).execute()
+            return True
+        except Exception as e:
+            print(f"[ERROR] Supabase tracks 일괄 업데이트 실패: {e}")
+            return False
+
     def delete_track(self, track_id: str) -> bool:
         """곡 삭제"""
         try:
@@ -483,42 +856,65 @@ class SupabaseClient:
     def get_random_tracks(self, count: int = 2, user_id: str = None, exclude_ids: List[str] = None) -> List[Dict]:
         """
         랜덤 곡 조회 (이상형 월드컵용)
-        
+
+        tracks.random_key 인덱스를 이용해 DB에서 샘플링하므로 곡 수와 무관하게 비용이 일정하다.
+        sample_tracks RPC를 우선 사용하고, RPC가 없으면 같은 방식의 인덱스 쿼리로 대체한다.
+
         Args:
             count: 조회할 곡 개수
             user_id: 사용자 ID (해당 사용자의 곡만 조회)
             exclude_ids: 제외할 track ID 리스트
-        
+
         Returns:
             List[Dict]: 랜덤 곡 리스트
         """
+        if count <= 0:
+            return []
+
+        # 잘못된 ID가 섞이면 uuid[] 캐스팅이 실패하므로 미리 걸러냄
+        excluded = []
+        for track_id in exclude_ids or []:
+            try:
+                excluded.append(str(uuid.UUID(str(track_id))))
+            except (ValueError, TypeError):
+                continue
+
         try:
-            query = self.client.table("tracks").select("*")
-            
-            if user_id:
-                query = query.eq("user_id", user_id)
-            
-            if exclude_ids and len(exclude_ids) > 0:
-                # Supabase Python 클라이언트는 not_.in_을 직접 지원하지 않으므로
-                # 모든 결과를 가져온 후 필터링
-                pass
-            
-            # 모든 곡 조회 후 랜덤 선택 (Supabase는 직접 랜덤 쿼리를 지원하지 않으므로)
-            response = query.execute()
-            all_tracks = response.data if response.data else []
-            
-            # exclude_ids 필터링
-            if exclude_ids and len(exclude_ids) > 0:
-                all_tracks = [t for t in all_tracks if t.get("id") not in exclude_ids]
-            
-            if len(all_tracks) < count:
-                return all_tracks
-            
-            return random.sample(all_tracks, count)
+            response = self.client.rpc(
+                "sample_tracks",
+                {"p_count": count, "p_user_id": user_id, "p_exclude_ids": excluded},
+            ).execute()
+            return response.data or []
+        except Exception as e:
+            print(f"[WARN] Supabase sample_tracks RPC 실패, 인덱스 쿼리로 대체: {e}")
+
+        try:
+            picks: List[Dict] = []
+            for _ in range(count):
+                pick = self._pick_random_track(random.random(), user_id, excluded)
+                if not pick:
+                    break
+                picks.append(pick)
+                excluded.append(str(pick.get("id")))
+            return picks
         except Exception as e:
             print(f"[ERROR] Supabase 랜덤 tracks 조회 실패: {e}")
             return []
-    
+
+    def _pick_random_track(self, pivot: float, user_id: str = None, excluded: List[str] = None) -> Optional[Dict]:
+        """random_key >= pivot 인 첫 곡, 없으면 처음부터 다시 찾아 1곡 반환"""
+        for wrapped in (False, True):
+            query = self.client.table("tracks").select("*")
+            if user_id:
+                query = query.eq("user_id", user_id)
+            if excluded:
+                query = query.not_.in_("id", excluded)
+            query = query.lt("random_key", pivot) if wrapped else query.gte("random_key", pivot)
+            response = query.order("random_key").limit(1).execute()
+            if response.data:
+                return response.data[0]
+        return None
+
     def create_track_battle(self, user_id: str, track_a_id: str, track_b_id: str, winner_id: str) -> Optional[str]:
         """
         이상형 월드컵 투표 결과 저장
@@ -546,6 +942,8 @@ class SupabaseClient:
             if response.data:
                 record_id = response.data[0].get("id")
                 print(f"[INFO] Supabase track_battles 생성 성공: {record_id}")
+                # 랭킹 카운터는 DB 트리거가 갱신하므로 로컬 캐시만 비움
+                SupabaseClient.invalidate_rankings_cache()
                 return str(record_id)
             return None
         except Exception as e:
@@ -554,140 +952,157 @@ class SupabaseClient:
     
     def get_track_battle_stats(self, track_id: str) -> Dict:
         """
-        곡의 이상형 월드컵 통계 조회
+        곡의 이상형 월드컵 통계 조회 (track_rankings 집계 테이블 1회 조회)
         
         Args:
             track_id: 곡 ID
         
         Returns:
-            Dict: {wins: int, total_battles: int, win_rate: float}
+            Dict: {wins: int, total_battles: int, win_rate: float, elo_rating: float}
         """
         try:
-            # 승리한 횟수
-            wins_response = (
-                self.client.table("track_battles")
-                .select("id", count="exact")
-                .eq("winner_id", track_id)
-                .execute()
-            )
-            wins = wins_response.count if wins_response.count else 0
-            
-            # 참여한 총 배틀 수 (track_a_id 또는 track_b_id로 참여)
-            total_a_response = (
-                self.client.table("track_battles")
-                .select("id", count="exact")
-                .eq("track_a_id", track_id)
-                .execute()
-            )
-            total_b_response = (
-                self.client.table("track_battles")
-                .select("id", count="exact")
-                .eq("track_b_id", track_id)
+            response = (
+                self.client.table("track_rankings")
+                .select("wins, appearances, elo_rating")
+                .eq("track_id", track_id)
+                .limit(1)
                 .execute()
             )
-            
-            total_a = total_a_response.count if total_a_response.count else 0
-            total_b = total_b_response.count if total_b_response.count else 0
-            total = total_a + total_b
+            row = response.data[0] if response.data else {}
+            wins = int(row.get("wins") or 0)
+            total = int(row.get("appearances") or 0)
             
             win_rate = (wins / total * 100) if total > 0 else 0.0
             
             return {
                 "wins": wins,
                 "total_battles": total,
-                "win_rate": round(win_rate, 1)
+                "win_rate": round(win_rate, 1),
+                "elo_rating": round(float(row.get("elo_rating") or RANKING_BASE_RATING), 1),
             }
         except Exception as e:
-            print(f"[ERROR] Supabase track_battles 통계 조회 실패: {e}")
-            return {"wins": 0, "total_battles": 0, "win_rate": 0.0}
+            print(f"[ERROR] Supabase track_rankings 통계 조회 실패: {e}")
+            return {"wins": 0, "total_battles": 0, "win_rate": 0.0, "elo_rating": RANKING_BASE_RATING}
     
-    def get_worldcup_rankings(self, limit: int = 50) -> List[Dict]:
+    def get_worldcup_rankings(self, limit: int = 50, order_by: str = "wins") -> List[Dict]:
         """
-        이상형 월드컵 투표 결과 순위 조회 (승리 횟수 기준)
+        이상형 월드컵 투표 결과 순위 조회
+        
+        track_rankings 집계 테이블에서 곡 정보를 조인해 한 번에 가져오고,
+        결과는 프로세스 로컬 캐시에 WORLDCUP_RANKINGS_CACHE_SECONDS 동안 보관한다.
         
         Args:
             limit: 조회할 최대 순위 수
+            order_by: "wins" (승리 횟수) 또는 "elo" (Elo 레이팅)
         
         Returns:
-            List[Dict]: 순위별 곡 정보 리스트 (승리 횟수 내림차순)
+            List[Dict]: 순위별 곡 정보 리스트
         """
+        order_by = "elo" if order_by == "elo" else "wins"
+        cache_key = (limit, order_by)
+        cached = SupabaseClient._rankings_cache.get(cache_key)
+        if cached and time.time() - cached[0] < app_settings.WORLDCUP_RANKINGS_CACHE_SECONDS:
+            return [dict(r) for r in cached[1]]
+        
         try:
-            # 모든 투표에서 승리한 곡들의 승리 횟수 집계
-            response = (
-                self.client.table("track_battles")
-                .select("winner_id")
-                .execute()
+            query = self.client.table("track_rankings").select(
+                "track_id, wins, appearances, elo_rating, "
+                "tracks(title, artist, url, thumbnail_url, duration_seconds)"
             )
+            if order_by == "elo":
+                query = query.order("elo_rating", desc=True)
+            else:
+                query = query.order("wins", desc=True).order("appearances")
+            response = query.gt("wins", 0).limit(limit).execute()
             
-            # 승리 횟수 집계
-            win_counts = {}
-            for battle in response.data:
-                winner_id = battle.get("winner_id")
-                if winner_id:
-                    win_counts[winner_id] = win_counts.get(winner_id, 0) + 1
-            
-            # 승리 횟수로 정렬
-            sorted_tracks = sorted(win_counts.items(), key=lambda x: x[1], reverse=True)
-            
-            # 상위 limit개만 선택
-            top_tracks = sorted_tracks[:limit]
-            
-            # 곡 정보와 함께 반환
             rankings = []
-            for rank, (track_id, wins) in enumerate(top_tracks, 1):
-                # 곡 정보 조회
-                track_response = (
-                    self.client.table("tracks")
-                    .select("*")
-                    .eq("id", track_id)
-                    .execute()
-                )
-                
-                if track_response.data:
-                    track = track_response.data[0]
-                    rankings.append({
-                        "rank": rank,
-                        "track_id": track_id,
-                        "wins": wins,
-                        "title": track.get("title", "Unknown"),
-                        "artist": track.get("artist", "Unknown"),
-                        "cover_url": track.get("cover_url"),
-                        "source_url": track.get("source_url"),
-                        "duration_seconds": track.get("duration_seconds", 0)
-                    })
-            
-            return rankings
+            for row in response.data or []:
+                track = row.get("tracks") or {}
+                if not track:
+                    continue
+                wins = int(row.get("wins") or 0)
+                appearances = int(row.get("appearances") or 0)
+                rankings.append({
+                    "rank": len(rankings) + 1,
+                    "track_id": row.get("track_id"),
+                    "wins": wins,
+                    "total_battles": appearances,
+                    "win_rate": round(wins / appearances * 100, 1) if appearances else 0.0,
+                    "elo_rating": round(float(row.get("elo_rating") or RANKING_BASE_RATING), 1),
+                    "title": track.get("title", "Unknown"),
+                    "artist": track.get("artist", "Unknown"),
+                    "cover_url": track.get("thumbnail_url"),
+                    "source_url": track.get("url"),
+                    "duration_seconds": track.get("duration_seconds", 0)
+                })
+            
+            SupabaseClient._rankings_cache[cache_key] = (time.time(), rankings)
+            return [dict(r) for r in rankings]
         except Exception as e:
             print(f"[ERROR] Supabase 월드컵 순위 조회 실패: {e}")
             return []
     
-    def get_worldcup_stats(self) -> Dict:
+    @classmethod
+    def invalidate_rankings_cache(cls) -> None:
+        """월드컵 순위 로컬 캐시 비우기"""
+        cls._rankings_cache = {}
+    
+    def rebuild_track_rankings(self) -> Optional[int]:
         """
-        월드컵 투표 통계 조회
+        기존 track_battles 전체로 track_rankings 재계산 (백필, service_role 키 필요)
         
         Returns:
-            Dict: {total_battles: int, total_votes: int, recent_battles: int}
+            Optional[int]: 반영된 배틀 수 (실패 시 None)
         """
         try:
-            # 전체 배틀 수 (투표 수)
-            battles_response = (
+            response = self.client.rpc("rebuild_track_rankings", {}).execute()
+            SupabaseClient.invalidate_rankings_cache()
+            return int(response.data or 0)
+        except Exception as e:
+            print(f"[ERROR] Supabase track_rankings 재계산 실패: {e}")
+            return None
+    
+    def get_recent_battle_activity(self, since_iso: str, limit: int = 2000) -> Dict[str, int]:
+        """최근 배틀에 등장한 곡별 참여 횟수 (track_id -> 횟수)"""
+        try:
+            response = (
                 self.client.table("track_battles")
-                .select("id", count="exact")
+                .select("track_a_id, track_b_id")
+                .gte("created_at", since_iso)
+                .order("created_at", desc=True)
+                .limit(limit)
                 .execute()
             )
-            total_battles = battles_response.count if battles_response.count else 0
+            activity = {}
+            for battle in response.data or []:
+                for key in ("track_a_id", "track_b_id"):
+                    track_id = battle.get(key)
+                    if track_id:
+                        activity[str(track_id)] = activity.get(str(track_id), 0) + 1
+            return activity
+        except Exception as e:
+            print(f"[ERROR] Supabase 최근 배틀 활동 조회 실패: {e}")
+            return {}
+
+    def get_worldcup_stats(self, raise_errors: bool = False) -> Dict:
+        """
+        월드컵 투표 통계 조회
+        
+        Args:
+            raise_errors: True면 조회 실패 시 0 대신 예외를 그대로 올림
+        
+        Returns:
+            Dict: {total_battles: int, total_votes: int, recent_battles: int}
+        """
+        try:
+            # 전체 배틀 수 (투표 수)
+            total_battles = self._count_rows("track_battles")
             
             # 최근 7일간의 배틀 수
             from datetime import datetime, timedelta
             seven_days_ago = (datetime.now() - timedelta(days=7)).isoformat()
             
-            recent_response = (
-                self.client.table("track_battles")
-                .select("id", count="exact")
-                .gte("created_at", seven_days_ago)
-                .execute()
-            )
-            recent_battles = recent_response.count if recent_response.count else 0
+            recent_battles = self._count_rows("track_battles", lambda q: q.gte("created_at", seven_days_ago))
             
             return {
                 "total_battles": total_battles,
@@ -696,12 +1111,17 @@ class SupabaseClient:
             }
         except Exception as e:
             print(f"[ERROR] Supabase 월드컵 통계 조회 실패: {e}")
+            if raise_errors:
+                raise
             return {"total_battles": 0, "total_votes": 0, "recent_battles": 0}
     
-    def get_today_visits(self) -> int:
+    def get_today_visits(self, raise_errors: bool = False) -> int:
         """
         오늘 방문횟수 조회
         
+        Args:
+            raise_errors: True면 조회 실패 시 0 대신 예외를 그대로 올림
+        
         Returns:
             int: 오늘 방문횟수
         """
@@ -710,16 +1130,11 @@ class SupabaseClient:
             today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
             today_start_iso = today_start.isoformat()
             
-            response = (
-                self.client.table("visitor_logs")
-                .select("id", count="exact")
-                .gte("visited_at", today_start_iso)
-                .execute()
-            )
-            
-            return response.count if response.count else 0
+            return self._count_rows("visitor_logs", lambda q: q.gte("visited_at", today_start_iso))
         except Exception as e:
             print(f"[ERROR] Supabase 오늘 방문횟수 조회 실패: {e}")
+            if raise_errors:
+                raise
             return 0
     
     # =========================
@@ -890,25 +1305,65 @@ class SupabaseClient:
             print(f"[ERROR] Supabase playlist tracks 조회 실패: {e}")
             return []
     
-    def update_tracks_order(self, track_orders: List[Dict]) -> bool:
+    def get_track_owners(self, track_ids: List[str]) -> Dict[str, Optional[str]]:
+        """여러 곡의 소유자를 한 번의 in_ 쿼리로 조회 (track_id -> user_id, 없는 곡은 제외)"""
+        try:
+            if not track_ids:
+                return {}
+            response = (
+                self.client.table("tracks")
+                .select("id, user_id")
+                .in_("id", list(track_ids))
+                .execute()
+            )
+            return {
+                str(row.get("id")): (str(row["user_id"]) if row.get("user_id") else None)
+                for row in response.data or []
+            }
+        except Exception as e:
+            print(f"[ERROR] Supabase tracks 소유자 조회 실패: {e}")
+            return {}
+
+    def update_tracks_order(self, track_orders: List[Dict], user_id: str = None) -> bool:
         """
         여러 곡의 순서를 한 번에 업데이트
         
+        reorder_tracks RPC로 UPDATE 1회에 처리하고, RPC가 없으면 전체 행 upsert 1회로 대체한다.
+        
         Args:
             track_orders: [{"id": track_id, "order": order_value}, ...] 형태의 리스트
+            user_id: 지정 시 해당 사용자의 곡만 갱신
         
         Returns:
             bool: 성공 여부
         """
+        orders = [
+            {"id": str(item.get("id")), "order": int(item.get("order"))}
+            for item in track_orders
+            if item.get("id") and item.get("order") is not None
+        ]
+        if not orders:
+            return True
+
+        try:
+            self.client.rpc("reorder_tracks", {"p_orders": orders, "p_user_id": user_id}).execute()
+            return True
+        except Exception as e:
+            print(f"[WARN] Supabase reorder_tracks RPC 실패, upsert로 대체: {e}")
+
         try:
-            for item in track_orders:
-                track_id = item.get("id")
-                order_value = item.get("order")
-                if track_id and order_value is not None:
-                    self.client.table("tracks").update({
-                        "display_order": order_value,
-                        "updated_at": datetime.now().isoformat()
-                    }).eq("id", track_id).execute()
+            order_by_id = {item["id"]: item["order"] for item in orders}
+            rows = []
+            for track in self.get_tracks_by_ids(list(order_by_id.keys())):
+                if user_id and str(track.get("user_id")) != str(user_id):
+                    continue
+                rows.append({**track, "display_order": order_by_id[str(track.get("id"))]})
+            if not rows:
+                return True
+            now_iso = datetime.now().isoformat()
+            self.client.table("tracks").upsert(
+                [{**row, "updated_at": now_iso} for row in rows], on_conflict="id"
+            ).execute()
             return True
         except Exception as e:
             print(f"[ERROR] Supabase tracks 순서 업데이트 실패: {e}")
@@ -916,7 +1371,9 @@ class SupabaseClient:
     
     def log_visitor(self, ip_address: str, user_agent: str, page_url: str, referer: str = None) -> bool:
         """
-        방문자 로그 기록
+        방문자 로그 기록 (단건)
+        
+        요청 경로에서는 core.visitor_log_writer가 모아서 insert_visitor_logs로 일괄 저장한다.
         
         Args:
             ip_address: 방문자 IP 주소
@@ -924,29 +1381,41 @@ class SupabaseClient:
             page_url: 방문한 페이지 URL
             referer: 이전 페이지 URL (선택)
         
+        Returns:
+            bool: 성공 여부
+        """
+        data = {
+            "ip_address": ip_address,
+            "user_agent": user_agent[:500] if user_agent else None,  # 길이 제한
+            "page_url": page_url[:500] if page_url else None,
+            "referer": referer[:500] if referer else None,
+            "visited_at": datetime.now().isoformat()
+        }
+        return self.insert_visitor_logs([data])
+    
+    @property
+    def visitor_logging_disabled(self) -> bool:
+        """visitor_logs 테이블이 없어 방문자 로그가 비활성화되었는지 여부"""
+        return SupabaseClient._visitor_logging_disabled_global
+    
+    def insert_visitor_logs(self, rows: List[Dict]) -> bool:
+        """
+        방문자 로그 여러 건을 한 번의 insert로 기록
+        
+        Args:
+            rows: visitor_logs 행 리스트 (ip_address, user_agent, page_url, referer, visited_at)
+        
         Returns:
             bool: 성공 여부
         """
         try:
             if SupabaseClient._visitor_logging_disabled_global:
                 return False
-
-            data = {
-                "ip_address": ip_address,
-                "user_agent": user_agent[:500] if user_agent else None,  # 길이 제한
-                "page_url": page_url[:500] if page_url else None,
-                "referer": referer[:500] if referer else None,
-                "visited_at": datetime.now().isoformat()
-            }
-            
-            response = self.client.table("visitor_logs").insert(data).execute()
-            
-            if response.data:
-                print(f"[INFO] 방문자 로그 기록 성공: {ip_address} - {page_url}")
+            if not rows:
                 return True
-            else:
-                print("[ERROR] 방문자 로그 기록 실패: 응답 데이터 없음")
-                return False
+            
+            response = self.client.table("visitor_logs").insert(rows, returning="minimal").execute()
+            return response is not None
                 
         except Exception as e:
             # 로그 기록 실패해도 앱은 계속 동작해야 함
@@ -964,7 +1433,7 @@ class SupabaseClient:
                 print("[WARN] visitor_logs 테이블이 없어 방문자 로그를 비활성화합니다.")
                 return False
 
-            print(f"[ERROR] 방문자 로그 기록 실패: {e}")
+            print(f"[ERROR] 방문자 로그 기록 실패 ({len(rows)}건): {e}")
             return False
     
     def test_connection(self) -> bool:
@@ -985,6 +1454,10 @@ class SupabaseClient:
             return False
 
 
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=SupabaseClient.reset_pool)
+
+
 def main():
     """테스트용 메인 함수"""
     try: